@@ -0,0 +1 @@
+"""Offline microbenchmarks for hot domain/service functions (``python -m benchmarks``)."""
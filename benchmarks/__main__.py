@@ -0,0 +1,72 @@
+"""``python -m benchmarks``: run the suite, write JSON results, compare to the baseline."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from dataclasses import asdict
+from pathlib import Path
+
+from benchmarks.cases import CASES
+from benchmarks.runner import (
+    BASELINE_PATH,
+    DEFAULT_TOLERANCE,
+    compare_to_baseline,
+    format_comparison,
+    run_benchmarks,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--out", default="bench-results.json", help="JSON results path")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON path")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown vs baseline as a fraction (0.25 = 25%%)",
+    )
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("-k", dest="match", default=None, help="Only run cases containing this")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Write these results as the new baseline"
+    )
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.match is None or args.match in case.name]
+    if args.list:
+        for case in cases:
+            print(f"{case.name}: {case.description}")
+        return 0
+    if not cases:
+        print(f"no benchmark matches {args.match!r}")
+        return 2
+
+    # Cases that log still build their records; nothing is written to the terminal.
+    logging.basicConfig(handlers=[logging.NullHandler()], force=True)
+    current = run_benchmarks(cases, repeats=args.repeats, min_time_s=args.min_time)
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {baseline_path}")
+        return 0
+
+    baseline = (
+        json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+    )
+    comparisons = compare_to_baseline(current, baseline, tolerance=args.tolerance)
+    current["baseline"] = str(baseline_path)
+    current["tolerance"] = args.tolerance
+    current["comparison"] = [asdict(item) for item in comparisons]
+    Path(args.out).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+    print(format_comparison(comparisons, tolerance=args.tolerance))
+    print(f"results written to {args.out}")
+    return 1 if any(item.status == "regressed" for item in comparisons) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,394 @@
+"""Benchmark cases for the hot domain/service functions.
+
+Each case is a ``setup(work_dir)`` that builds deterministic, cycle-sized inputs and
+returns the zero-argument callable that is timed. Setup cost is never measured; inputs are seeded
+so every run (and the committed baseline) times the same work.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from btcbot.accounting.ledger import AccountingLedger
+from btcbot.accounting.models import AccountingEventType, AccountingLedgerEvent
+from btcbot.adapters.btcturk.market_data import MarketDataSnapshotBuilder
+from btcbot.config import Settings
+from btcbot.domain.ledger import LedgerEvent, LedgerEventType, LedgerState, apply_events
+from btcbot.domain.models import Balance, SymbolRules
+from btcbot.domain.money_policy import size_order_from_notional
+from btcbot.domain.stage4 import LifecycleAction, LifecycleActionType, PnLSnapshot, Position
+from btcbot.domain.strategy_core import Intent, PositionSummary
+from btcbot.logging_utils import JsonFormatter
+from btcbot.services.allocation_service import AllocationKnobs, AllocationService
+from btcbot.services.parity import compute_run_fingerprint
+from btcbot.services.portfolio_policy_service import PortfolioPolicyService
+from btcbot.services.risk_policy import RiskPolicy
+from btcbot.services.universe_selection_service import UniverseSelectionService, _RawMetrics
+
+Workload = Callable[[], object]
+
+_SEED = 20260101
+_T0 = datetime(2026, 1, 1, tzinfo=UTC)
+_SYMBOLS = ("BTCTRY", "ETHTRY", "SOLTRY", "XRPTRY", "AVAXTRY")
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    description: str
+    setup: Callable[[Path], Workload]
+
+
+def _price(rng: random.Random, base: int) -> Decimal:
+    return Decimal(str(round(base * rng.uniform(0.95, 1.05), 2)))
+
+
+def _domain_ledger_apply_events(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    events: list[LedgerEvent] = []
+    for index in range(500):
+        symbol = _SYMBOLS[index % len(_SYMBOLS)]
+        selling = (index // len(_SYMBOLS)) % 3 == 2
+        events.append(
+            LedgerEvent(
+                event_id=f"fill-{index:05d}",
+                ts=_T0 + timedelta(seconds=index * 7),
+                symbol=symbol,
+                type=LedgerEventType.FILL,
+                side="SELL" if selling else "BUY",
+                qty=Decimal("0.005")
+                if selling
+                else Decimal(str(round(rng.uniform(0.01, 0.05), 6))),
+                price=_price(rng, 1_000_000),
+                fee=Decimal("0.5"),
+                fee_currency="TRY",
+                exchange_trade_id=f"t-{index}",
+                exchange_order_id=f"o-{index}",
+                client_order_id=f"c-{index}",
+                meta={},
+            )
+        )
+    rng.shuffle(events)
+    state = LedgerState()
+    return lambda: apply_events(state, events)
+
+
+def _accounting_ledger_recompute(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    events: list[AccountingLedgerEvent] = []
+    for index in range(400):
+        symbol = _SYMBOLS[index % len(_SYMBOLS)]
+        ts = _T0 + timedelta(seconds=index * 11)
+        selling = (index // len(_SYMBOLS)) % 3 == 2
+        events.append(
+            AccountingLedgerEvent(
+                event_id=f"fill-{index:05d}",
+                ts=ts,
+                type=AccountingEventType.FILL_RECORDED,
+                symbol=symbol,
+                side="SELL" if selling else "BUY",
+                qty=Decimal("0.005")
+                if selling
+                else Decimal(str(round(rng.uniform(0.01, 0.05), 6))),
+                price_try=_price(rng, 1_000_000),
+                amount_try=None,
+                fee_currency="TRY",
+                reference_id=None,
+                metadata={},
+            )
+        )
+        events.append(
+            AccountingLedgerEvent(
+                event_id=f"fee-{index:05d}",
+                ts=ts,
+                type=AccountingEventType.FEE_RECORDED,
+                symbol=symbol,
+                side=None,
+                qty=Decimal("0"),
+                price_try=None,
+                amount_try=Decimal("0.75"),
+                fee_currency="TRY",
+                reference_id=None,
+                metadata={},
+            )
+        )
+    ledger = AccountingLedger()
+    as_of = _T0 + timedelta(days=1)
+    marks = {symbol: _price(rng, 1_000_000) for symbol in _SYMBOLS}
+    return lambda: ledger.recompute(
+        events=events,
+        as_of=as_of,
+        mark_prices_try=marks,
+        initial_trading_capital_try=Decimal("1000000"),
+    )
+
+
+def _money_policy_size_order_from_notional(_work_dir: Path) -> Workload:
+    rules = SymbolRules(
+        pair_symbol="BTCTRY",
+        price_scale=0,
+        quantity_scale=8,
+        min_total=Decimal("10"),
+        min_qty=Decimal("0.00000001"),
+        tick_size=Decimal("1"),
+        step_size=Decimal("0.00000001"),
+    )
+    return lambda: size_order_from_notional(
+        desired_notional_try=Decimal("1234.56"),
+        desired_price=Decimal("2345678.9"),
+        rules=rules,
+        fallback_min_notional_try=Decimal("10"),
+    )
+
+
+def _universe_score_candidates(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    raw_metrics = {
+        f"SYM{index:03d}TRY": _RawMetrics(
+            volume_try=None if index % 17 == 0 else Decimal(str(round(rng.uniform(1e4, 1e8), 2))),
+            spread_bps=Decimal(str(round(rng.uniform(1, 80), 3))),
+            volatility=None if index % 23 == 0 else Decimal(str(round(rng.uniform(0, 0.1), 6))),
+            age_sec=rng.uniform(0, 5),
+        )
+        for index in range(60)
+    }
+    service = UniverseSelectionService()
+    settings = Settings(DRY_RUN=True)
+    return lambda: service._score_candidates(raw_metrics=raw_metrics, settings=settings)
+
+
+def _allocation_service_allocate(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    intents = [
+        Intent(
+            symbol=_SYMBOLS[index % len(_SYMBOLS)],
+            side="buy" if index % 4 else "sell",
+            intent_type="place",
+            target_notional_try=Decimal(str(round(rng.uniform(50, 5000), 2))),
+            rationale="bench",
+            strategy_id="bench",
+        )
+        for index in range(40)
+    ]
+    positions = {
+        symbol: PositionSummary(symbol=symbol, qty=Decimal("0.02"), avg_cost=Decimal("900000"))
+        for symbol in _SYMBOLS
+    }
+    marks = {symbol: _price(rng, 1_000_000) for symbol in _SYMBOLS}
+    knobs = AllocationKnobs(
+        target_try_cash=Decimal("300"),
+        min_order_notional_try=Decimal("10"),
+        fee_buffer_bps=Decimal("10"),
+        max_intent_notional_try=Decimal("4000"),
+        max_position_try_per_symbol=Decimal("50000"),
+        max_total_notional_try_per_cycle=Decimal("60000"),
+    )
+    balances = {"TRY": Decimal("100000")}
+    return lambda: AllocationService.allocate(
+        intents=intents, balances=balances, positions=positions, mark_prices=marks, knobs=knobs
+    )
+
+
+def _portfolio_policy_build_plan(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    universe = [f"SYM{index:02d}_TRY" for index in range(20)]
+    marks = {symbol.replace("_", ""): _price(rng, 1000) for symbol in universe}
+    balances = [Balance(asset="TRY", free=Decimal("250000"))] + [
+        Balance(asset=symbol.split("_")[0], free=Decimal(str(round(rng.uniform(0, 30), 4))))
+        for symbol in universe[::2]
+    ]
+    settings = Settings(
+        DRY_RUN=True,
+        STAGE7_ENABLED=True,
+        SYMBOLS=",".join(universe),
+        TRY_CASH_TARGET="300",
+        TRY_CASH_MAX="600",
+        MAX_POSITION_NOTIONAL_TRY="50000",
+        NOTIONAL_CAP_TRY_PER_CYCLE="100000",
+        MAX_ORDERS_PER_CYCLE=20,
+        MIN_ORDER_NOTIONAL_TRY=10,
+    )
+    service = PortfolioPolicyService()
+    return lambda: service.build_plan(
+        universe=universe,
+        mark_prices_try=marks,
+        balances=balances,
+        settings=settings,
+        now_utc=_T0,
+    )
+
+
+def _risk_policy_filter_actions(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    actions = [
+        LifecycleAction(
+            action_type=LifecycleActionType.CANCEL
+            if index % 5 == 0
+            else LifecycleActionType.SUBMIT,
+            symbol=_SYMBOLS[index % len(_SYMBOLS)],
+            side="buy" if index % 3 else "sell",
+            price=_price(rng, 1_000_000),
+            qty=Decimal(str(round(rng.uniform(0.0001, 0.002), 6))),
+            reason="replace_submit" if index % 7 == 0 else "bench",
+            client_order_id=f"c-{index}",
+        )
+        for index in range(60)
+    ]
+    positions = {
+        symbol: Position(
+            symbol=symbol,
+            qty=Decimal("0.01"),
+            avg_cost_try=Decimal("990000"),
+            realized_pnl_try=Decimal("0"),
+            last_update_ts=_T0,
+        )
+        for symbol in _SYMBOLS
+    }
+    pnl = PnLSnapshot(
+        total_equity_try=Decimal("500000"),
+        realized_today_try=Decimal("0"),
+        drawdown_pct=Decimal("0.01"),
+        ts=_T0,
+        realized_total_try=Decimal("0"),
+    )
+    policy = RiskPolicy(
+        max_open_orders=40,
+        max_position_notional_try=Decimal("60000"),
+        max_daily_loss_try=Decimal("5000"),
+        max_drawdown_pct=Decimal("0.2"),
+        fee_bps_taker=Decimal("10"),
+        slippage_bps_buffer=Decimal("5"),
+        min_profit_bps=Decimal("5"),
+    )
+    return lambda: policy.filter_actions(
+        actions,
+        open_orders_count=5,
+        current_position_notional_try=Decimal("10000"),
+        pnl=pnl,
+        positions_by_symbol=positions,
+    )
+
+
+def _market_data_snapshot_build(_work_dir: Path) -> Workload:
+    rng = random.Random(_SEED)
+    builder = MarketDataSnapshotBuilder()
+    symbols = [f"SYM{index:02d}TRY" for index in range(40)]
+    now_ms = int(_T0.timestamp() * 1000)
+    for index, symbol in enumerate(symbols):
+        bid = _price(rng, 1000)
+        builder.ingest_orderbook(
+            symbol=symbol, bid=bid, ask=bid + Decimal("0.5"), ts_ms=now_ms - index * 100
+        )
+        if index % 4:
+            builder.ingest_trade(symbol=symbol, price=bid, qty=Decimal("1"), ts_ms=now_ms)
+    return lambda: builder.build(symbols, max_age_ms=2_000, now_ms=now_ms)
+
+
+def _json_formatter_format(_work_dir: Path) -> Workload:
+    formatter = JsonFormatter()
+    record = logging.LogRecord(
+        name="btcbot.services.execution_service",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=1,
+        msg="stage4_order_submitted",
+        args=(),
+        exc_info=None,
+    )
+    record.extra = {
+        "symbol": "BTCTRY",
+        "side": "buy",
+        "price": "2345678.9",
+        "qty": "0.00052",
+        "client_order_id": "s4-20260101-000001",
+        "api_key": "not-a-real-key",
+        "latency_ms": 41.7,
+    }
+    return lambda: formatter.format(record)
+
+
+def _parity_compute_run_fingerprint(work_dir: Path) -> Workload:
+    # The raw-scan path: no stored chain table, so every call folds all records.
+    db_path = work_dir / "parity.db"
+    rng = random.Random(_SEED)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE stage7_cycle_trace (cycle_id TEXT, ts TEXT, selected_universe_json TEXT,"
+            " intents_summary_json TEXT, mode_json TEXT, active_param_version INTEGER,"
+            " param_change_json TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE stage7_ledger_metrics (cycle_id TEXT, net_pnl_try TEXT, fees_try TEXT,"
+            " slippage_try TEXT, turnover_try TEXT)"
+        )
+        for index in range(500):
+            cycle_id = f"cycle-{index:05d}"
+            conn.execute(
+                "INSERT INTO stage7_cycle_trace VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cycle_id,
+                    (_T0 + timedelta(minutes=index)).isoformat(),
+                    '["BTCTRY","ETHTRY","SOLTRY"]',
+                    '{"order_intents_total": 3, "oms_summary": {"orders_filled": 2}}',
+                    '{"base_mode": "NORMAL", "final_mode": "NORMAL"}',
+                    1,
+                    "{}",
+                ),
+            )
+            conn.execute(
+                "INSERT INTO stage7_ledger_metrics VALUES (?, ?, ?, ?, ?)",
+                (
+                    cycle_id,
+                    str(round(rng.uniform(-50, 50), 8)),
+                    str(round(rng.uniform(0, 2), 8)),
+                    "0",
+                    str(round(rng.uniform(0, 5000), 8)),
+                ),
+            )
+    end = _T0 + timedelta(minutes=500)
+    return lambda: compute_run_fingerprint(db_path, _T0, end)
+
+
+CASES: tuple[BenchCase, ...] = (
+    BenchCase(
+        "domain.ledger.apply_events", "500 shuffled fills, 5 symbols", _domain_ledger_apply_events
+    ),
+    BenchCase(
+        "accounting.AccountingLedger.recompute",
+        "400 fills + 400 fees",
+        _accounting_ledger_recompute,
+    ),
+    BenchCase(
+        "money_policy.size_order_from_notional",
+        "one order against tick/step rules",
+        _money_policy_size_order_from_notional,
+    ),
+    BenchCase(
+        "UniverseSelectionService._score_candidates",
+        "60 candidates with gaps",
+        _universe_score_candidates,
+    ),
+    BenchCase("AllocationService.allocate", "40 intents, 5 symbols", _allocation_service_allocate),
+    BenchCase(
+        "PortfolioPolicyService.build_plan", "20-symbol universe", _portfolio_policy_build_plan
+    ),
+    BenchCase("RiskPolicy.filter_actions", "60 submit/cancel actions", _risk_policy_filter_actions),
+    BenchCase(
+        "MarketDataSnapshotBuilder.build",
+        "40 symbols, mixed staleness",
+        _market_data_snapshot_build,
+    ),
+    BenchCase("JsonFormatter.format", "structured record with redaction", _json_formatter_format),
+    BenchCase(
+        "parity.compute_run_fingerprint",
+        "500 cycles, raw-scan path",
+        _parity_compute_run_fingerprint,
+    ),
+)
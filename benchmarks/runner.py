@@ -0,0 +1,175 @@
+"""Timing, calibration and baseline comparison for the benchmark suite."""
+
+from __future__ import annotations
+
+import gc
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks.cases import BenchCase, Workload
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    description: str
+    loops: int
+    repeats: int
+    best_ns: float
+    median_ns: float
+    calibration_ns: float
+    normalized: float
+
+
+@dataclass(frozen=True)
+class BenchComparison:
+    name: str
+    baseline: float | None
+    current: float
+    ratio: float | None
+    status: str
+
+
+def _calibration_workload() -> object:
+    # Fixed Decimal/dict/str mix close to what the measured code does; every result is
+    # also reported relative to this so baselines compare across machines.
+    total = Decimal("0")
+    buckets: dict[str, Decimal] = {}
+    for index in range(200):
+        value = (Decimal(index) * Decimal("1.0001")).quantize(Decimal("0.0001"))
+        key = f"k{index % 16}"
+        buckets[key] = buckets.get(key, Decimal("0")) + value
+        total += value
+    return total, sorted(buckets)
+
+
+def _loops_for(workload: Workload, min_time_s: float) -> int:
+    loops = 1
+    while True:
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            workload()
+        elapsed_s = (time.perf_counter_ns() - started) / 1e9
+        if elapsed_s >= min_time_s or loops >= 1_000_000:
+            return loops
+        loops *= 2 if elapsed_s == 0 else max(2, min(10, int(min_time_s / elapsed_s) + 1))
+
+
+def _time_block(workload: Workload, loops: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(loops):
+        workload()
+    return (time.perf_counter_ns() - started) / loops
+
+
+def time_workload(
+    workload: Workload, *, repeats: int, min_time_s: float
+) -> tuple[int, list[float], list[float]]:
+    """``(loops, ns per call, calibration ns per call)`` for each repeat, GC paused.
+
+    A calibration block runs right before every repeat, so a machine that speeds up or
+    slows down during the run moves both numbers together.
+    """
+    workload()
+    loops = _loops_for(workload, min_time_s)
+    calibration_loops = _loops_for(_calibration_workload, min_time_s / 4)
+    per_call: list[float] = []
+    calibration: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            calibration.append(_time_block(_calibration_workload, calibration_loops))
+            per_call.append(_time_block(workload, loops))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return loops, per_call, calibration
+
+
+def run_benchmarks(
+    cases: Sequence[BenchCase], *, repeats: int = 7, min_time_s: float = 0.2
+) -> dict[str, object]:
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="btcbot-bench-") as tmp_dir:
+        for case in cases:
+            case_dir = Path(tmp_dir) / case.name
+            case_dir.mkdir()
+            loops, per_call, calibration = time_workload(
+                case.setup(case_dir), repeats=repeats, min_time_s=min_time_s
+            )
+            best = min(per_call)
+            calibration_ns = min(calibration)
+            # Each repeat is paired with the calibration block timed just before it.
+            paired = [
+                case_ns / cal_ns for case_ns, cal_ns in zip(per_call, calibration, strict=True)
+            ]
+            results.append(
+                BenchResult(
+                    name=case.name,
+                    description=case.description,
+                    loops=loops,
+                    repeats=repeats,
+                    best_ns=round(best, 1),
+                    median_ns=round(statistics.median(per_call), 1),
+                    calibration_ns=round(calibration_ns, 1),
+                    normalized=round(statistics.median(paired), 4),
+                )
+            )
+    return {
+        "version": 1,
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "machine": platform.machine(),
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, object], baseline: dict[str, object], *, tolerance: float
+) -> list[BenchComparison]:
+    """Compare calibration-normalized times; slower than ``1 + tolerance`` regresses."""
+    baseline_by_name = {str(item["name"]): item for item in baseline.get("results", [])}
+    comparisons: list[BenchComparison] = []
+    for item in current.get("results", []):
+        name = str(item["name"])
+        normalized = float(item["normalized"])
+        reference = baseline_by_name.get(name)
+        if reference is None:
+            comparisons.append(BenchComparison(name, None, normalized, None, "new"))
+            continue
+        base_value = float(reference["normalized"])
+        ratio = normalized / base_value if base_value > 0 else float("inf")
+        if ratio > 1 + tolerance:
+            status = "regressed"
+        elif ratio < 1 / (1 + tolerance):
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(BenchComparison(name, base_value, normalized, round(ratio, 3), status))
+    return comparisons
+
+
+def format_comparison(comparisons: Sequence[BenchComparison], *, tolerance: float) -> str:
+    lines = [
+        f"{'benchmark':<45} {'baseline':>10} {'current':>10} {'ratio':>7}  status",
+    ]
+    for item in comparisons:
+        baseline = "-" if item.baseline is None else f"{item.baseline:.4g}"
+        ratio = "-" if item.ratio is None else f"{item.ratio:.3f}"
+        lines.append(
+            f"{item.name:<45} {baseline:>10} {item.current:>10.4g} {ratio:>7}  {item.status}"
+        )
+    regressed = sum(1 for item in comparisons if item.status == "regressed")
+    lines.append(f"{regressed} regression(s) beyond {tolerance:.0%} tolerance")
+    return "\n".join(lines)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import time
+
+from btcbot.logging_context import with_cycle_context
+from btcbot.logging_utils import JsonFormatter, QueueLoggingHandler, SafeStreamHandler
+
+
+def _stream_handler(stream) -> logging.Handler:
+    handler = SafeStreamHandler(stream=stream)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def _measure(handler: logging.Handler, calls: int) -> dict[str, float]:
+    bench_logger = logging.getLogger("btcbot.bench.logging")
+    bench_logger.handlers = [handler]
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    samples: list[int] = []
+    with with_cycle_context(cycle_id="bench-cycle", run_id="bench-run"):
+        for idx in range(calls):
+            started = time.perf_counter_ns()
+            bench_logger.info(
+                "stage4_order_submitted",
+                extra={
+                    "extra": {
+                        "symbol": "BTCTRY",
+                        "client_order_id": f"cid-{idx}",
+                        "price": "1234567.89",
+                        "qty": "0.0012",
+                        "note": "url=https://api.btcturk.com/api/v1/order?apiKey=abc",
+                    }
+                },
+            )
+            samples.append(time.perf_counter_ns() - started)
+    drain_started = time.perf_counter()
+    handler.flush()
+    drain_seconds = time.perf_counter() - drain_started
+    handler.close()
+    samples.sort()
+    return {
+        "mean_us": round(statistics.fmean(samples) / 1000, 2),
+        "p50_us": round(samples[len(samples) // 2] / 1000, 2),
+        "p99_us": round(samples[int(len(samples) * 0.99)] / 1000, 2),
+        "max_us": round(samples[-1] / 1000, 2),
+        "drain_seconds": round(drain_seconds, 4),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-log-call latency on the calling thread")
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--capacity", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        results = {
+            "calls": args.calls,
+            "sync": _measure(_stream_handler(sink), args.calls),
+            "queue": _measure(
+                QueueLoggingHandler(_stream_handler(sink), capacity=args.capacity), args.calls
+            ),
+        }
+    print(json.dumps(results, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
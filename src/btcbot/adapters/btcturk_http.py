@@ -4,14 +4,15 @@ import asyncio
 import hashlib
 import logging
 import ssl
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal, InvalidOperation
-from math import isfinite
+from math import ceil, isfinite
 from random import Random
 from threading import Event, Lock
-from time import monotonic, sleep, time
+from time import monotonic, perf_counter, sleep, time
 from uuid import uuid4
 
 import httpx
@@ -20,6 +21,7 @@ from btcbot.adapters.btcturk_auth import MonotonicNonceGenerator, build_auth_hea
 from btcbot.adapters.exchange import ExchangeClient
 from btcbot.adapters.exchange_stage4 import ExchangeClientStage4, OrderAck
 from btcbot.domain.accounting import TradeFill
+from btcbot.domain.market_data_models import Candle
 from btcbot.domain.models import (
     Balance,
     BtcturkBalanceItem,
@@ -45,8 +47,10 @@ from btcbot.domain.models import (
     validate_order,
 )
 from btcbot.domain.stage4 import Order as Stage4Order
+from btcbot.obs.http_timings import endpoint_label, record_http_timing
 from btcbot.observability import get_instrumentation
 from btcbot.security.redaction import sanitize_mapping, sanitize_text
+from btcbot.services.candle_store import CandleStore
 from btcbot.services.rate_limiter import EndpointBudget, TokenBucketRateLimiter, map_endpoint_group
 from btcbot.services.retry import parse_retry_after_seconds, retry_with_backoff
 
@@ -65,6 +69,90 @@ _RETRY_TOTAL_WAIT_CAP_SECONDS = 8.0
 _DEFAULT_MIN_NOTIONAL_TRY = Decimal("10")
 _BREAKER_CONSECUTIVE_429_THRESHOLD = 3
 _BREAKER_COOLDOWN_SECONDS = 3.0
+_KLINE_HISTORY_PATH = "/v1/klines/history"
+_CANDLE_GAP_BUCKETS = 2
+_CANDLE_BACKFILL_RETRY_SECONDS = 300.0
+_LATENCY_WINDOW = 200
+_HTTP_REQUESTS_SENT = 0
+_HTTP_BYTES_SENT = 0
+_HTTP_BYTES_RECEIVED = 0
+# Event hooks run on every thread that issues requests (e.g. universe-metric workers).
+_HTTP_COUNTERS_LOCK = Lock()
+
+
+def _count_request(request: httpx.Request) -> None:
+    global _HTTP_REQUESTS_SENT, _HTTP_BYTES_SENT
+    try:
+        sent = len(request.content)
+    except httpx.RequestNotRead:
+        sent = 0
+    with _HTTP_COUNTERS_LOCK:
+        _HTTP_REQUESTS_SENT += 1
+        _HTTP_BYTES_SENT += sent
+
+
+def _count_response(response: httpx.Response) -> None:
+    global _HTTP_BYTES_RECEIVED
+    response.read()
+    # Responses built from in-memory content (mock transports) never stream raw bytes.
+    received = response.num_bytes_downloaded or len(response.content)
+    with _HTTP_COUNTERS_LOCK:
+        _HTTP_BYTES_RECEIVED += received
+
+
+def http_requests_sent() -> int:
+    """Requests handed to the transport by every client in this process, retries included."""
+    with _HTTP_COUNTERS_LOCK:
+        return _HTTP_REQUESTS_SENT
+
+
+def http_bytes_sent() -> int:
+    """Request body bytes sent by every client in this process (headers excluded)."""
+    with _HTTP_COUNTERS_LOCK:
+        return _HTTP_BYTES_SENT
+
+
+def http_bytes_received() -> int:
+    """Response body bytes received on the wire (before decompression), headers excluded."""
+    with _HTTP_COUNTERS_LOCK:
+        return _HTTP_BYTES_RECEIVED
+
+
+def http_traffic_counters() -> dict[str, Callable[[], int]]:
+    """Process-wide HTTP totals keyed for per-cycle resource accounting."""
+    return {
+        "http_requests": http_requests_sent,
+        "http_bytes_out": http_bytes_sent,
+        "http_bytes_in": http_bytes_received,
+    }
+
+
+class _RequestTimer:
+    """httpcore ``trace`` callback timing one round trip's connection and header phases."""
+
+    _CONNECT_EVENTS = (
+        "connection.connect_tcp",
+        "connection.connect_unix_socket",
+        "connection.start_tls",
+    )
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.connect_started: float | None = None
+        self.connect_done: float | None = None
+        self.headers_done: float | None = None
+
+    def __call__(self, event_name: str, info: dict[str, object]) -> None:
+        del info
+        now = perf_counter()
+        phase, _, status = event_name.rpartition(".")
+        if phase in self._CONNECT_EVENTS:
+            if status == "started" and self.connect_started is None:
+                self.connect_started = now
+            elif status == "complete":
+                self.connect_done = now
+        elif phase.endswith("receive_response_headers") and status == "complete":
+            self.headers_done = now
 
 
 def build_endpoint_budgets(
@@ -204,12 +292,22 @@ def _fmt_decimal(value: Decimal) -> str:
     return normalized or "0"
 
 
+def _latency_percentiles(window: list[float]) -> dict[str, float]:
+    ordered = sorted(window)
+    return {
+        "p50": round(ordered[max(0, ceil(0.50 * len(ordered)) - 1)], 3),
+        "p95": round(ordered[max(0, ceil(0.95 * len(ordered)) - 1)], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
 def _btcturk_pair_symbol(symbol: str) -> str:
     return normalize_symbol(symbol).replace("_", "")
 
 
 class BtcturkHttpClient(ExchangeClient):
     BASE_URL = "https://api.btcturk.com"
+    GRAPH_BASE_URL = "https://graph-api.btcturk.com"
 
     def __init__(
         self,
@@ -225,6 +323,9 @@ class BtcturkHttpClient(ExchangeClient):
         orderbook_cache_ttl_s: float = 0.2,
         orderbook_inflight_wait_timeout_s: float = 2.0,
         live_rules_require_exchangeinfo: bool = True,
+        candle_store: CandleStore | None = None,
+        candle_backfill_limit: int = 500,
+        graph_base_url: str | None = None,
     ) -> None:
         self.api_key = api_key
         self.api_secret = api_secret
@@ -237,6 +338,7 @@ class BtcturkHttpClient(ExchangeClient):
             base_url=base_url or self.BASE_URL,
             timeout=resolved_timeout,
             transport=transport,
+            event_hooks={"request": [_count_request], "response": [_count_response]},
         )
         self._nonce = MonotonicNonceGenerator()
         self._rate_limiter = rate_limiter or TokenBucketRateLimiter(
@@ -259,6 +361,12 @@ class BtcturkHttpClient(ExchangeClient):
         ] = {}
         self._orderbook_inflight: dict[tuple[str, int | None], Event] = {}
         self._orderbook_lock = Lock()
+        self._candle_store = candle_store
+        self._candle_backfill_limit = max(1, candle_backfill_limit)
+        self._graph_base_url = (graph_base_url or self.GRAPH_BASE_URL).rstrip("/")
+        self._candle_backfill_retry_at: dict[str, float] = {}
+        self._latency_window: dict[str, deque[float]] = {}
+        self._latency_lock = Lock()
 
     def __enter__(self) -> BtcturkHttpClient:
         return self
@@ -311,6 +419,7 @@ class BtcturkHttpClient(ExchangeClient):
 
     def _get(self, path: str, params: dict[str, str | int] | None = None) -> dict:
         group = self._request_group(path)
+        endpoint = endpoint_label("GET", path)
         request_id = uuid4().hex
 
         def _call() -> dict:
@@ -319,6 +428,7 @@ class BtcturkHttpClient(ExchangeClient):
             get_instrumentation().histogram(
                 "rate_limiter_wait_seconds", waited, attrs={"group": group}
             )
+            timer = _RequestTimer()
             with get_instrumentation().trace(
                 "rest_call", attrs={"method": "GET", "path": path, "group": group}
             ):
@@ -326,7 +436,9 @@ class BtcturkHttpClient(ExchangeClient):
                     path,
                     params=params,
                     headers={"X-Request-ID": request_id},
+                    extensions={"trace": timer},
                 )
+            self._observe_round_trip(endpoint, group, timer, response, limiter_wait_s=waited)
             get_instrumentation().counter(
                 "rest_requests_total",
                 1,
@@ -341,7 +453,7 @@ class BtcturkHttpClient(ExchangeClient):
                     request_path=path,
                     request_method="GET",
                 )
-            payload = response.json()
+            payload = self._parse_json(endpoint, group, response)
             if not isinstance(payload, dict):
                 raise ValueError("BTCTurk response payload must be a JSON object")
             if payload.get("success") is False:
@@ -393,6 +505,53 @@ class BtcturkHttpClient(ExchangeClient):
             self._consecutive_network_errors += 1
             raise
 
+    def _observe_round_trip(
+        self,
+        endpoint: str,
+        group: str,
+        timer: _RequestTimer,
+        response: httpx.Response,
+        *,
+        limiter_wait_s: float,
+    ) -> None:
+        total_s = perf_counter() - timer.started
+        seconds: dict[str, float] = {"rest_latency_seconds": total_s}
+        if timer.headers_done is not None:
+            seconds["rest_ttfb_seconds"] = timer.headers_done - timer.started
+        if timer.connect_started is not None and timer.connect_done is not None:
+            seconds["rest_connect_seconds"] = timer.connect_done - timer.connect_started
+        response_bytes = response.num_bytes_downloaded or len(response.content)
+        attrs = {"group": group, "endpoint": endpoint}
+        instrumentation = get_instrumentation()
+        for name, value in seconds.items():
+            instrumentation.histogram(name, value, attrs=attrs)
+        instrumentation.histogram("rest_response_bytes", response_bytes, attrs=attrs)
+        with self._latency_lock:
+            window = self._latency_window.get(endpoint)
+            if window is None:
+                window = self._latency_window[endpoint] = deque(maxlen=_LATENCY_WINDOW)
+            window.append(total_s * 1000.0)
+        observations = {
+            "limiter_wait_ms": limiter_wait_s * 1000.0,
+            "total_ms": total_s * 1000.0,
+            "response_bytes": float(response_bytes),
+        }
+        if "rest_ttfb_seconds" in seconds:
+            observations["ttfb_ms"] = seconds["rest_ttfb_seconds"] * 1000.0
+        if "rest_connect_seconds" in seconds:
+            observations["connect_ms"] = seconds["rest_connect_seconds"] * 1000.0
+        record_http_timing(endpoint, group, observations)
+
+    def _parse_json(self, endpoint: str, group: str, response: httpx.Response) -> object:
+        started = perf_counter()
+        payload = response.json()
+        elapsed_s = perf_counter() - started
+        get_instrumentation().histogram(
+            "rest_json_parse_seconds", elapsed_s, attrs={"group": group, "endpoint": endpoint}
+        )
+        record_http_timing(endpoint, group, {"json_parse_ms": elapsed_s * 1000.0})
+        return payload
+
     def _safe_sleep(self, seconds: float) -> None:
         try:
             asyncio.get_running_loop()
@@ -420,6 +579,7 @@ class BtcturkHttpClient(ExchangeClient):
         group = self._request_group(path)
         request_id = uuid4().hex
         normalized_method = method.upper()
+        endpoint = endpoint_label(normalized_method, path)
         is_private_write = normalized_method in {"POST", "PUT", "PATCH", "DELETE"}
 
         def _call() -> dict:
@@ -434,6 +594,7 @@ class BtcturkHttpClient(ExchangeClient):
                 stamp_ms=self._next_stamp_ms(),
             )
             headers["X-Request-ID"] = request_id
+            timer = _RequestTimer()
             with get_instrumentation().trace(
                 "rest_call", attrs={"method": normalized_method, "path": path, "group": group}
             ):
@@ -443,7 +604,9 @@ class BtcturkHttpClient(ExchangeClient):
                     params=params,
                     json=json,
                     headers=headers,
+                    extensions={"trace": timer},
                 )
+            self._observe_round_trip(endpoint, group, timer, response, limiter_wait_s=waited)
             get_instrumentation().counter(
                 "rest_requests_total",
                 1,
@@ -497,7 +660,7 @@ class BtcturkHttpClient(ExchangeClient):
                     ) from err
                 raise err
 
-            payload = response.json()
+            payload = self._parse_json(endpoint, group, response)
             if not isinstance(payload, dict):
                 raise ExchangeError("BTCTurk response payload must be a JSON object")
             if payload.get("success") is False:
@@ -826,11 +989,152 @@ class BtcturkHttpClient(ExchangeClient):
 
     def get_ticker_stats(self) -> list[dict[str, object]]:
         payload = self._get("/api/v2/ticker")
-        return self._extract_list_data(payload, path="/api/v2/ticker")
+        rows = self._extract_list_data(payload, path="/api/v2/ticker")
+        if self._candle_store is not None:
+            self._record_ticker_candles(rows)
+        return rows
 
     def get_candles(self, symbol: str, limit: int) -> list[dict[str, object]]:
-        del symbol, limit
-        return []
+        """Serve the most recent ``limit`` candles from the local candle store.
+
+        Without a configured store this returns ``[]`` as before. With one, history is
+        backfilled from the kline endpoint until the symbol has kline candles, and again
+        when more than a couple of buckets since the newest one were never observed;
+        otherwise no request is made.
+        """
+        if self._candle_store is None or limit <= 0:
+            return []
+        pair_symbol = _btcturk_pair_symbol(symbol)
+        self._ensure_candle_history(pair_symbol)
+        return [
+            {
+                "ts": int(item.ts.timestamp()),
+                "open": str(item.open),
+                "high": str(item.high),
+                "low": str(item.low),
+                "close": str(item.close),
+                "volume": str(item.volume),
+            }
+            for item in self._candle_store.get_candles(pair_symbol, limit)
+        ]
+
+    def _ensure_candle_history(self, pair_symbol: str) -> None:
+        store = self._candle_store
+        if store is None:
+            return
+        interval = store.interval_seconds
+        now_bucket = store.bucket_epoch(time())
+        # Ticker observations keep the newest bucket current, so coverage is judged from
+        # the newest kline candle: the buckets after it must all have been observed.
+        latest = store.latest_bucket_epoch(pair_symbol, source="kline")
+        if latest is not None:
+            missing = (now_bucket - latest) // interval - store.count_buckets(
+                pair_symbol, start_epoch=latest + interval, end_epoch=now_bucket
+            )
+            if missing < _CANDLE_GAP_BUCKETS:
+                return
+        if self._candle_backfill_retry_at.get(pair_symbol, 0.0) > monotonic():
+            return
+        earliest = now_bucket - interval * self._candle_backfill_limit
+        start = earliest if latest is None else max(earliest, latest)
+        try:
+            candles = self._fetch_klines(
+                pair_symbol, start_epoch=start, end_epoch=now_bucket + interval
+            )
+            written = store.upsert_candles(pair_symbol, candles, source="kline")
+        except Exception as exc:  # noqa: BLE001
+            self._candle_backfill_retry_at[pair_symbol] = (
+                monotonic() + _CANDLE_BACKFILL_RETRY_SECONDS
+            )
+            get_instrumentation().counter(
+                "candle_backfill_failures_total", 1, attrs={"symbol": pair_symbol}
+            )
+            logger.warning(
+                "candle_backfill_failed",
+                extra={
+                    "extra": {
+                        "symbol": pair_symbol,
+                        "error_type": type(exc).__name__,
+                        "safe_message": sanitize_text(str(exc)),
+                    }
+                },
+            )
+            return
+        if written:
+            self._candle_backfill_retry_at.pop(pair_symbol, None)
+        else:
+            # No exchange history yet (new listing): serve observed candles for a while.
+            self._candle_backfill_retry_at[pair_symbol] = (
+                monotonic() + _CANDLE_BACKFILL_RETRY_SECONDS
+            )
+        get_instrumentation().counter(
+            "candle_backfill_rows_total", written, attrs={"symbol": pair_symbol}
+        )
+
+    def _fetch_klines(self, pair_symbol: str, *, start_epoch: int, end_epoch: int) -> list[Candle]:
+        store = self._candle_store
+        resolution_minutes = max(1, (store.interval_seconds if store else 3600) // 60)
+        payload = self._get(
+            f"{self._graph_base_url}{_KLINE_HISTORY_PATH}",
+            params={
+                "symbol": pair_symbol,
+                "resolution": resolution_minutes,
+                "from": start_epoch,
+                "to": end_epoch,
+            },
+        )
+        if payload.get("s") == "no_data":
+            return []
+        columns = {key: payload.get(key) for key in ("t", "o", "h", "l", "c", "v")}
+        if not all(isinstance(values, list) for values in columns.values()):
+            raise ValueError(f"Malformed kline payload for {pair_symbol}")
+        candles: list[Candle] = []
+        for ts, open_, high, low, close, volume in zip(
+            columns["t"],
+            columns["o"],
+            columns["h"],
+            columns["l"],
+            columns["c"],
+            columns["v"],
+            strict=True,
+        ):
+            candles.append(
+                Candle(
+                    ts=datetime.fromtimestamp(int(ts), tz=UTC),
+                    open=parse_decimal(open_),
+                    high=parse_decimal(high),
+                    low=parse_decimal(low),
+                    close=parse_decimal(close),
+                    volume=parse_decimal(volume),
+                )
+            )
+        return candles
+
+    def _record_ticker_candles(self, rows: list[dict[str, object]]) -> None:
+        store = self._candle_store
+        if store is None:
+            return
+        observed_at = datetime.now(UTC)
+        observations: list[tuple[str, datetime, Decimal]] = []
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            symbol_raw = row.get("pairSymbol") or row.get("pair") or row.get("symbol")
+            last_raw = row.get("last")
+            if symbol_raw is None or last_raw is None:
+                continue
+            try:
+                last = parse_decimal(last_raw)
+            except (InvalidOperation, TypeError, ValueError):
+                continue
+            observations.append((_btcturk_pair_symbol(str(symbol_raw)), observed_at, last))
+        try:
+            store.record_prices(observations)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "candle_store_update_failed",
+                extra={"extra": {"error_type": type(exc).__name__}},
+            )
 
     def _to_pair_info(self, item: dict[str, object]) -> PairInfo:
         try:
@@ -1013,6 +1317,12 @@ class BtcturkHttpClient(ExchangeClient):
             recommended = max(recommended, float(self._last_retry_after_seconds))
         breaker_open = bool(open_groups)
         degraded = breaker_open or self._consecutive_network_errors >= 3
+        with self._latency_lock:
+            latency_windows = {
+                endpoint: list(window)
+                for endpoint, window in self._latency_window.items()
+                if window
+            }
         return {
             "breaker_open": breaker_open,
             "last_429_ts": (self._last_429_ts.isoformat() if self._last_429_ts else None),
@@ -1023,6 +1333,10 @@ class BtcturkHttpClient(ExchangeClient):
             "api_429_backoff_total": self._api_429_backoff_total,
             "orderbook_cache_hits_total": self._orderbook_cache_hits_total,
             "orderbook_requests_total": self._orderbook_requests_total,
+            "endpoint_latency_ms": {
+                endpoint: _latency_percentiles(window)
+                for endpoint, window in sorted(latency_windows.items())
+            },
         }
 
     def health_check(self) -> bool:
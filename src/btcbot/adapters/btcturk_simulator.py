@@ -0,0 +1,841 @@
+"""Local BTCTurk-compatible exchange simulator for load and soak testing.
+
+The simulator serves the REST endpoints that ``BtcturkHttpClient`` talks to from an
+in-memory matching engine. Latency and faults (429s, 5xx, periodic 5xx storms) are
+injected per request so retry/backoff and full-cycle throughput can be exercised at
+many times production request rates without touching the real exchange.
+
+This is not a fidelity model of BTCTurk matching: synthetic liquidity is generated
+around a seeded random-walk mid price, and user orders match against it.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from decimal import ROUND_DOWN, ROUND_UP, Decimal, InvalidOperation
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from random import Random
+from threading import Lock, Thread
+from time import monotonic, sleep, time
+from urllib.parse import parse_qs, urlsplit
+
+from btcbot.domain.symbols import canonical_symbol, split_symbol
+
+logger = logging.getLogger(__name__)
+
+_BPS = Decimal("10000")
+_LATENCY_DISTRIBUTIONS = frozenset({"fixed", "uniform", "lognormal"})
+_ADMIN_PREFIX = "/__sim/"
+
+
+class SimulatorRejectError(Exception):
+    """Order-level rejection surfaced to the client as a BTCTurk-style error payload."""
+
+    def __init__(self, message: str, *, status_code: int = 400, code: int | str = 0) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.code = code
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Per-request service latency.
+
+    ``fixed`` always waits ``base_ms``; ``uniform`` adds ``U(0, jitter_ms)``;
+    ``lognormal`` uses ``base_ms`` as the median with shape ``sigma`` plus the same jitter.
+    """
+
+    distribution: str = "fixed"
+    base_ms: float = 0.0
+    jitter_ms: float = 0.0
+    sigma: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.distribution not in _LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"latency distribution must be one of {sorted(_LATENCY_DISTRIBUTIONS)}; "
+                f"observed={self.distribution}"
+            )
+        if self.base_ms < 0 or self.jitter_ms < 0 or self.sigma < 0:
+            raise ValueError("latency parameters must be >= 0")
+
+    def sample_seconds(self, rng: Random) -> float:
+        if self.distribution == "fixed":
+            value_ms = self.base_ms
+        elif self.distribution == "uniform":
+            value_ms = self.base_ms + rng.uniform(0.0, self.jitter_ms)
+        else:
+            value_ms = self.base_ms * rng.lognormvariate(0.0, self.sigma)
+            value_ms += rng.uniform(0.0, self.jitter_ms)
+        return max(0.0, value_ms) / 1000.0
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Injected failures, applied after latency and before the request is served.
+
+    A storm answers every request with ``storm_status_code`` for ``storm_duration_seconds``
+    out of every ``storm_every_seconds`` (measured from server start).
+    """
+
+    rate_429_probability: float = 0.0
+    retry_after_seconds: float = 1.0
+    error_5xx_probability: float = 0.0
+    storm_every_seconds: float = 0.0
+    storm_duration_seconds: float = 0.0
+    storm_status_code: int = 503
+
+    def __post_init__(self) -> None:
+        for name in ("rate_429_probability", "error_5xx_probability"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be within [0, 1]; observed={value}")
+        if self.storm_duration_seconds < 0 or self.storm_every_seconds < 0:
+            raise ValueError("storm timings must be >= 0")
+        if not 500 <= self.storm_status_code < 600:
+            raise ValueError("storm_status_code must be a 5xx status")
+
+    def in_storm(self, elapsed_seconds: float) -> bool:
+        if self.storm_every_seconds <= 0 or self.storm_duration_seconds <= 0:
+            return False
+        return (elapsed_seconds % self.storm_every_seconds) < self.storm_duration_seconds
+
+
+@dataclass(frozen=True)
+class SimulatedPair:
+    symbol: str
+    mid_price: Decimal
+    tick_size: Decimal = Decimal("0.01")
+    step_size: Decimal = Decimal("0.00000001")
+    min_total: Decimal = Decimal("10")
+    spread_bps: Decimal = Decimal("10")
+    level_qty: Decimal = Decimal("1")
+    depth_levels: int = 20
+
+    @property
+    def base(self) -> str:
+        return split_symbol(self.symbol)[0]
+
+    @property
+    def quote(self) -> str:
+        return split_symbol(self.symbol)[1]
+
+
+def default_pairs(symbols: list[str] | None = None) -> list[SimulatedPair]:
+    """Build pairs with plausible TRY prices; unknown symbols default to a mid of 100."""
+
+    known = {
+        "BTCTRY": Decimal("2500000"),
+        "ETHTRY": Decimal("120000"),
+        "SOLTRY": Decimal("6000"),
+        "AVAXTRY": Decimal("1200"),
+        "XRPTRY": Decimal("20"),
+        "ADATRY": Decimal("15"),
+    }
+    resolved = [canonical_symbol(s) for s in (symbols or list(known))]
+    return [SimulatedPair(symbol=s, mid_price=known.get(s, Decimal("100"))) for s in resolved]
+
+
+@dataclass
+class _SimOrder:
+    order_id: int
+    client_order_id: str | None
+    symbol: str
+    side: str
+    price: Decimal
+    quantity: Decimal
+    created_ms: int
+    filled: Decimal = Decimal("0")
+    status: str = "Untouched"
+    updated_ms: int = 0
+
+    @property
+    def left(self) -> Decimal:
+        return self.quantity - self.filled
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in {"Untouched", "Partial"}
+
+
+@dataclass
+class _Balance:
+    free: Decimal = Decimal("0")
+    locked: Decimal = Decimal("0")
+
+
+class SimulatedExchange:
+    """Thread-safe in-memory matching engine behind the simulator HTTP server.
+
+    Each call to ``step`` moves a pair's mid price by a seeded Gaussian random walk and
+    matches resting user orders against the synthetic book; public orderbook/ticker
+    reads step the requested pairs so that a polling client sees a moving market.
+    """
+
+    def __init__(
+        self,
+        pairs: list[SimulatedPair] | None = None,
+        *,
+        balances: dict[str, Decimal] | None = None,
+        fee_rate: Decimal = Decimal("0.001"),
+        volatility_bps: Decimal = Decimal("5"),
+        seed: int = 0,
+        clock_ms: Callable[[], int] | None = None,
+    ) -> None:
+        resolved_pairs = pairs if pairs is not None else default_pairs()
+        self._pairs = {canonical_symbol(p.symbol): p for p in resolved_pairs}
+        self._mids = {symbol: pair.mid_price for symbol, pair in self._pairs.items()}
+        self._fee_rate = fee_rate
+        self._volatility_bps = volatility_bps
+        self._rng = Random(seed)
+        self._clock_ms = clock_ms or (lambda: int(time() * 1000))
+        self._lock = Lock()
+        self._orders: dict[int, _SimOrder] = {}
+        self._client_ids: dict[str, int] = {}
+        self._fills: list[dict[str, object]] = []
+        self._next_order_id = 1
+        self._next_fill_id = 1
+        self._balances: dict[str, _Balance] = {}
+        for asset, amount in (balances or {"TRY": Decimal("1000000")}).items():
+            self._balances[str(asset).upper()] = _Balance(free=Decimal(str(amount)))
+
+    # --- market ---------------------------------------------------------------
+
+    def _pair(self, pair_symbol: str) -> SimulatedPair:
+        pair = self._pairs.get(canonical_symbol(pair_symbol))
+        if pair is None:
+            raise SimulatorRejectError(f"unknown pairSymbol={pair_symbol}", code=1100)
+        return pair
+
+    def _best_prices_locked(self, pair: SimulatedPair) -> tuple[Decimal, Decimal]:
+        mid = self._mids[pair.symbol]
+        half_spread = mid * pair.spread_bps / _BPS / Decimal("2")
+        bid = ((mid - half_spread) / pair.tick_size).to_integral_value(ROUND_DOWN)
+        ask = ((mid + half_spread) / pair.tick_size).to_integral_value(ROUND_UP)
+        bid_price = bid * pair.tick_size
+        ask_price = max(ask * pair.tick_size, bid_price + pair.tick_size)
+        return bid_price, ask_price
+
+    def _levels_locked(
+        self, pair: SimulatedPair, limit: int | None
+    ) -> tuple[list[tuple[Decimal, Decimal]], list[tuple[Decimal, Decimal]]]:
+        depth = pair.depth_levels if limit is None else max(1, min(limit, pair.depth_levels))
+        bid, ask = self._best_prices_locked(pair)
+        bids = [(bid - pair.tick_size * i, pair.level_qty) for i in range(depth)]
+        asks = [(ask + pair.tick_size * i, pair.level_qty) for i in range(depth)]
+        return [lvl for lvl in bids if lvl[0] > 0], asks
+
+    def step(self, pair_symbol: str | None = None) -> None:
+        with self._lock:
+            symbols = [canonical_symbol(pair_symbol)] if pair_symbol else sorted(self._pairs)
+            for symbol in symbols:
+                pair = self._pairs.get(symbol)
+                if pair is None:
+                    continue
+                shock = Decimal(str(self._rng.gauss(0.0, float(self._volatility_bps))))
+                new_mid = self._mids[symbol] * (Decimal("1") + shock / _BPS)
+                self._mids[symbol] = max(new_mid, pair.tick_size * 10)
+                self._match_resting_locked(pair)
+
+    def orderbook(self, pair_symbol: str, limit: int | None = None) -> dict[str, object]:
+        pair = self._pair(pair_symbol)
+        self.step(pair.symbol)
+        with self._lock:
+            bids, asks = self._levels_locked(pair, limit)
+            return {
+                "timestamp": self._clock_ms(),
+                "bids": [[str(p), str(q)] for p, q in bids],
+                "asks": [[str(p), str(q)] for p, q in asks],
+            }
+
+    def ticker(self, pair_symbol: str | None = None) -> list[dict[str, object]]:
+        symbols = [self._pair(pair_symbol).symbol] if pair_symbol else sorted(self._pairs)
+        rows: list[dict[str, object]] = []
+        for symbol in symbols:
+            self.step(symbol)
+            with self._lock:
+                pair = self._pairs[symbol]
+                bid, ask = self._best_prices_locked(pair)
+                mid = self._mids[symbol]
+                opening = pair.mid_price
+                rows.append(
+                    {
+                        "pair": symbol,
+                        "pairNormalized": f"{pair.base}_{pair.quote}",
+                        "pairSymbol": symbol,
+                        "timestamp": self._clock_ms(),
+                        "last": str(mid.quantize(pair.tick_size)),
+                        "high": str(max(mid, opening).quantize(pair.tick_size)),
+                        "low": str(min(mid, opening).quantize(pair.tick_size)),
+                        "bid": str(bid),
+                        "ask": str(ask),
+                        "open": str(opening),
+                        "volume": str(pair.level_qty * pair.depth_levels * 100),
+                        "average": str(mid.quantize(pair.tick_size)),
+                        "dailyPercent": str(
+                            ((mid - opening) / opening * 100).quantize(Decimal("0.01"))
+                        ),
+                        "numeratorSymbol": pair.base,
+                        "denominatorSymbol": pair.quote,
+                    }
+                )
+        return rows
+
+    def exchange_info(self) -> dict[str, object]:
+        symbols: list[dict[str, object]] = []
+        for symbol in sorted(self._pairs):
+            pair = self._pairs[symbol]
+            symbols.append(
+                {
+                    "name": symbol,
+                    "nameNormalized": f"{pair.base}_{pair.quote}",
+                    "status": "TRADING",
+                    "numerator": pair.base,
+                    "denominator": pair.quote,
+                    "numeratorScale": _scale(pair.step_size),
+                    "denominatorScale": _scale(pair.tick_size),
+                    "filters": [
+                        {
+                            "filterType": "PRICE_FILTER",
+                            "minPrice": str(pair.tick_size),
+                            "maxPrice": str(pair.mid_price * 100),
+                            "tickSize": str(pair.tick_size),
+                            "minExchangeValue": str(pair.min_total),
+                        },
+                        {
+                            "filterType": "QUANTITY_FILTER",
+                            "minQuantity": str(pair.step_size),
+                            "stepSize": str(pair.step_size),
+                        },
+                    ],
+                }
+            )
+        return {"timeZone": "UTC", "serverTime": self._clock_ms(), "symbols": symbols}
+
+    # --- account --------------------------------------------------------------
+
+    def _balance_locked(self, asset: str) -> _Balance:
+        balance = self._balances.get(asset)
+        if balance is None:
+            balance = _Balance()
+            self._balances[asset] = balance
+        return balance
+
+    def balances(self) -> list[dict[str, object]]:
+        with self._lock:
+            return [
+                {
+                    "asset": asset,
+                    "assetname": asset,
+                    "balance": str(item.free + item.locked),
+                    "locked": str(item.locked),
+                    "free": str(item.free),
+                    "orderFund": str(item.locked),
+                    "requestFund": "0",
+                    "precision": 2 if asset == "TRY" else 8,
+                    "timestamp": self._clock_ms(),
+                }
+                for asset, item in sorted(self._balances.items())
+            ]
+
+    def submit(
+        self,
+        *,
+        pair_symbol: str,
+        side: str,
+        price: Decimal,
+        quantity: Decimal,
+        client_order_id: str | None,
+    ) -> dict[str, object]:
+        pair = self._pair(pair_symbol)
+        normalized_side = side.strip().lower()
+        if normalized_side not in {"buy", "sell"}:
+            raise SimulatorRejectError(f"unsupported orderType={side}", code=1101)
+        if price <= 0 or quantity <= 0:
+            raise SimulatorRejectError("price and quantity must be positive", code=1102)
+        if price % pair.tick_size != 0 or quantity % pair.step_size != 0:
+            raise SimulatorRejectError("price/quantity precision mismatch", code=1111)
+        if price * quantity < pair.min_total:
+            raise SimulatorRejectError("FAILED_MIN_TOTAL_AMOUNT", code=1123)
+
+        with self._lock:
+            if client_order_id and client_order_id in self._client_ids:
+                raise SimulatorRejectError("DUPLICATE_CLIENT_ORDER_ID", code=1126)
+            if normalized_side == "buy":
+                lock_asset = pair.quote
+                lock_amount = price * quantity * (Decimal("1") + self._fee_rate)
+            else:
+                lock_asset = pair.base
+                lock_amount = quantity
+            balance = self._balance_locked(lock_asset)
+            if balance.free < lock_amount:
+                raise SimulatorRejectError("BALANCE_NOT_ENOUGH", code=1055)
+            balance.free -= lock_amount
+            balance.locked += lock_amount
+
+            now_ms = self._clock_ms()
+            order = _SimOrder(
+                order_id=self._next_order_id,
+                client_order_id=client_order_id,
+                symbol=pair.symbol,
+                side=normalized_side,
+                price=price,
+                quantity=quantity,
+                created_ms=now_ms,
+                updated_ms=now_ms,
+            )
+            self._next_order_id += 1
+            self._orders[order.order_id] = order
+            if client_order_id:
+                self._client_ids[client_order_id] = order.order_id
+            self._match_taker_locked(pair, order)
+            return {
+                "id": order.order_id,
+                "datetime": order.created_ms,
+                "type": order.side,
+                "method": "limit",
+                "price": str(order.price),
+                "quantity": str(order.quantity),
+                "pairSymbol": order.symbol,
+                "pairSymbolNormalized": f"{pair.base}_{pair.quote}",
+                "newOrderClientId": order.client_order_id,
+            }
+
+    def cancel(self, *, order_id: int | None = None, client_order_id: str | None = None) -> bool:
+        with self._lock:
+            if order_id is None and client_order_id is not None:
+                order_id = self._client_ids.get(client_order_id)
+            order = self._orders.get(order_id) if order_id is not None else None
+            if order is None or not order.is_open:
+                return False
+            self._release_locked(order)
+            order.status = "Canceled"
+            order.updated_ms = self._clock_ms()
+            return True
+
+    def open_orders(self, pair_symbol: str | None) -> dict[str, list[dict[str, object]]]:
+        symbol = self._pair(pair_symbol).symbol if pair_symbol else None
+        with self._lock:
+            rows = [o for o in self._orders.values() if o.is_open and symbol in (None, o.symbol)]
+            return {
+                "bids": [self._order_view(o) for o in rows if o.side == "buy"],
+                "asks": [self._order_view(o) for o in rows if o.side == "sell"],
+            }
+
+    def all_orders(
+        self, pair_symbol: str, start_ms: int | None, end_ms: int | None
+    ) -> list[dict[str, object]]:
+        symbol = self._pair(pair_symbol).symbol
+        with self._lock:
+            return [
+                self._order_view(o)
+                for o in self._orders.values()
+                if o.symbol == symbol
+                and (start_ms is None or o.created_ms >= start_ms)
+                and (end_ms is None or o.created_ms <= end_ms)
+            ]
+
+    def order(self, order_id: int) -> dict[str, object] | None:
+        with self._lock:
+            order = self._orders.get(order_id)
+            return self._order_view(order) if order is not None else None
+
+    def fills(self, pair_symbol: str | None, start_ms: int | None) -> list[dict[str, object]]:
+        symbol = canonical_symbol(pair_symbol) if pair_symbol else None
+        with self._lock:
+            return [
+                dict(row)
+                for row in self._fills
+                if symbol in (None, row["pairSymbol"])
+                and (start_ms is None or int(row["timestamp"]) >= start_ms)
+            ]
+
+    # --- matching -------------------------------------------------------------
+
+    def _order_view(self, order: _SimOrder) -> dict[str, object]:
+        pair = self._pairs[order.symbol]
+        return {
+            "id": order.order_id,
+            "price": str(order.price),
+            "amount": str(order.quantity),
+            "quantity": str(order.quantity),
+            "leftAmount": str(order.left),
+            "stopPrice": "0",
+            "pairSymbol": order.symbol,
+            "pairSymbolNormalized": f"{pair.base}_{pair.quote}",
+            "type": "limit",
+            "method": order.side,
+            "orderClientId": order.client_order_id,
+            "time": order.created_ms,
+            "updateTime": order.updated_ms,
+            "status": order.status,
+        }
+
+    def _match_taker_locked(self, pair: SimulatedPair, order: _SimOrder) -> None:
+        bids, asks = self._levels_locked(pair, None)
+        levels = asks if order.side == "buy" else bids
+        for level_price, level_qty in levels:
+            crosses = (
+                level_price <= order.price if order.side == "buy" else level_price >= order.price
+            )
+            if not crosses or order.left <= 0:
+                break
+            self._fill_locked(pair, order, price=level_price, qty=min(level_qty, order.left))
+
+    def _match_resting_locked(self, pair: SimulatedPair) -> None:
+        bid, ask = self._best_prices_locked(pair)
+        for order in self._orders.values():
+            if order.symbol != pair.symbol or not order.is_open:
+                continue
+            crosses = ask <= order.price if order.side == "buy" else bid >= order.price
+            if crosses:
+                self._fill_locked(
+                    pair, order, price=order.price, qty=min(pair.level_qty, order.left)
+                )
+
+    def _fill_locked(
+        self, pair: SimulatedPair, order: _SimOrder, *, price: Decimal, qty: Decimal
+    ) -> None:
+        if qty <= 0:
+            return
+        notional = price * qty
+        fee = notional * self._fee_rate
+        quote = self._balance_locked(pair.quote)
+        base = self._balance_locked(pair.base)
+        if order.side == "buy":
+            reserved = order.price * qty * (Decimal("1") + self._fee_rate)
+            quote.locked -= reserved
+            quote.free += reserved - notional - fee
+            base.free += qty
+        else:
+            base.locked -= qty
+            quote.free += notional - fee
+        now_ms = self._clock_ms()
+        order.filled += qty
+        order.status = "Filled" if order.left <= 0 else "Partial"
+        order.updated_ms = now_ms
+        self._fills.append(
+            {
+                "id": self._next_fill_id,
+                "orderId": order.order_id,
+                "orderClientId": order.client_order_id,
+                "pairSymbol": order.symbol,
+                "orderType": order.side,
+                "price": str(price),
+                "amount": str(qty),
+                "fee": str(fee),
+                "feeCurrency": pair.quote,
+                "timestamp": now_ms,
+            }
+        )
+        self._next_fill_id += 1
+
+    def _release_locked(self, order: _SimOrder) -> None:
+        pair = self._pairs[order.symbol]
+        if order.side == "buy":
+            balance = self._balance_locked(pair.quote)
+            amount = order.price * order.left * (Decimal("1") + self._fee_rate)
+        else:
+            balance = self._balance_locked(pair.base)
+            amount = order.left
+        balance.locked -= amount
+        balance.free += amount
+
+
+def _scale(step: Decimal) -> int:
+    return max(0, -step.normalize().as_tuple().exponent)
+
+
+def _envelope(data: object) -> dict[str, object]:
+    return {"success": True, "message": None, "code": 0, "data": data}
+
+
+def _error_envelope(message: str, code: int | str) -> dict[str, object]:
+    return {"success": False, "message": message, "code": code, "data": None}
+
+
+def _decimal_field(payload: dict[str, object], key: str) -> Decimal:
+    try:
+        return Decimal(str(payload[key]))
+    except (KeyError, InvalidOperation) as exc:
+        raise SimulatorRejectError(f"invalid or missing {key}", code=1102) from exc
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    server: BtcturkSimulatorServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        logger.debug("exchange_sim_request", extra={"extra": {"line": format % args}})
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self._dispatch("DELETE")
+
+    def _read_json(self) -> dict[str, object]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            return {}
+        raw = self.rfile.read(length)
+        try:
+            payload = json.loads(raw)
+        except ValueError as exc:
+            raise SimulatorRejectError("malformed JSON body", code=1000) from exc
+        return payload if isinstance(payload, dict) else {}
+
+    def _write(
+        self,
+        status: int,
+        payload: dict[str, object],
+        *,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _dispatch(self, method: str) -> None:
+        split = urlsplit(self.path)
+        path = split.path.rstrip("/") or "/"
+        query = {key: values[-1] for key, values in parse_qs(split.query).items()}
+        sim = self.server
+        try:
+            body = self._read_json() if method in {"POST", "DELETE"} else {}
+        except SimulatorRejectError as exc:
+            sim.record(method, path, exc.status_code)
+            self._write(exc.status_code, _error_envelope(exc.message, exc.code))
+            return
+
+        if path.startswith(_ADMIN_PREFIX):
+            self._write(200, _envelope(sim.stats()))
+            return
+
+        injected = sim.inject_fault()
+        if injected is not None:
+            status, headers = injected
+            sim.record(method, path, status)
+            self._write(
+                status,
+                _error_envelope(HTTPStatus(status).phrase, status),
+                headers=headers,
+            )
+            return
+
+        try:
+            status, payload = self._route(method, path, query, body)
+        except SimulatorRejectError as exc:
+            status, payload = exc.status_code, _error_envelope(exc.message, exc.code)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("exchange_sim_handler_failed", extra={"extra": {"path": path}})
+            status, payload = 500, _error_envelope(type(exc).__name__, 500)
+        sim.record(method, path, status)
+        self._write(status, payload)
+
+    def _route(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, str],
+        body: dict[str, object],
+    ) -> tuple[int, dict[str, object]]:
+        exchange = self.server.exchange
+        if method == "GET" and path == "/api/v2/orderbook":
+            limit = int(query["limit"]) if "limit" in query else None
+            return 200, _envelope(exchange.orderbook(query.get("pairSymbol", ""), limit))
+        if method == "GET" and path == "/api/v2/ticker":
+            return 200, _envelope(exchange.ticker(query.get("pairSymbol")))
+        if method == "GET" and path == "/api/v2/server/exchangeinfo":
+            return 200, _envelope(exchange.exchange_info())
+
+        if not path.startswith("/api/v1/"):
+            return 404, _error_envelope(f"unknown path {path}", 404)
+        if not self.headers.get("X-PCK") or not self.headers.get("X-Signature"):
+            return 401, _error_envelope("missing API authentication headers", 401)
+
+        if method == "GET" and path == "/api/v1/users/balances":
+            return 200, _envelope(exchange.balances())
+        if method == "GET" and path == "/api/v1/openOrders":
+            return 200, _envelope(exchange.open_orders(query.get("pairSymbol")))
+        if method == "GET" and path == "/api/v1/allOrders":
+            return 200, _envelope(
+                exchange.all_orders(
+                    query.get("pairSymbol", ""),
+                    _optional_int(query.get("startDate")),
+                    _optional_int(query.get("endDate")),
+                )
+            )
+        if method == "GET" and path.startswith("/api/v1/order/"):
+            order = exchange.order(int(path.rsplit("/", 1)[-1]))
+            if order is None:
+                return 404, _error_envelope("ORDER_NOT_FOUND", 404)
+            return 200, _envelope(order)
+        if method == "GET" and path == "/api/v1/users/transactions/trade":
+            return 200, _envelope(
+                exchange.fills(query.get("pairSymbol"), _optional_int(query.get("startDate")))
+            )
+        if method == "POST" and path == "/api/v1/order":
+            data = exchange.submit(
+                pair_symbol=str(body.get("pairSymbol", "")),
+                side=str(body.get("orderType", "")),
+                price=_decimal_field(body, "price"),
+                quantity=_decimal_field(body, "quantity"),
+                client_order_id=(
+                    str(body["newOrderClientId"]) if body.get("newOrderClientId") else None
+                ),
+            )
+            return 200, _envelope(data)
+        if method == "DELETE" and path == "/api/v1/order":
+            raw_id = body.get("id", query.get("id"))
+            client_id = body.get("orderClientId", query.get("orderClientId"))
+            canceled = exchange.cancel(
+                order_id=int(raw_id) if raw_id is not None else None,
+                client_order_id=str(client_id) if client_id is not None else None,
+            )
+            if not canceled:
+                return 400, _error_envelope("ORDER_NOT_FOUND_OR_NOT_OPEN", 1120)
+            return 200, _envelope(None)
+        return 404, _error_envelope(f"unknown path {path}", 404)
+
+
+def _optional_int(raw: str | None) -> int | None:
+    return int(raw) if raw not in (None, "") else None
+
+
+class BtcturkSimulatorServer(ThreadingHTTPServer):
+    """HTTP front-end for ``SimulatedExchange`` with latency and fault injection.
+
+    Use ``port=0`` to bind an ephemeral port; ``base_url`` then reports the bound
+    address and can be passed straight to ``BtcturkHttpClient(base_url=...)``.
+    ``GET /__sim/stats`` returns per-endpoint request/status counts and bypasses faults.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        exchange: SimulatedExchange | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: LatencyProfile | None = None,
+        faults: FaultProfile | None = None,
+        seed: int = 0,
+    ) -> None:
+        super().__init__((host, port), _SimulatorHandler)
+        self.exchange = exchange or SimulatedExchange(seed=seed)
+        self.latency = latency or LatencyProfile()
+        self.faults = faults or FaultProfile()
+        self._rng = Random(seed)
+        self._rng_lock = Lock()
+        self._stats_lock = Lock()
+        self._counts: Counter[tuple[str, str, int]] = Counter()
+        self._started_at = monotonic()
+        self._thread: Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def inject_fault(self) -> tuple[int, dict[str, str]] | None:
+        with self._rng_lock:
+            delay = self.latency.sample_seconds(self._rng)
+            roll_429 = self._rng.random()
+            roll_5xx = self._rng.random()
+        if delay > 0:
+            sleep(delay)
+        if self.faults.in_storm(monotonic() - self._started_at):
+            return self.faults.storm_status_code, {}
+        if roll_429 < self.faults.rate_429_probability:
+            retry_after = str(max(0, math.ceil(self.faults.retry_after_seconds)))
+            return 429, {"Retry-After": retry_after}
+        if roll_5xx < self.faults.error_5xx_probability:
+            return 500, {}
+        return None
+
+    def record(self, method: str, path: str, status: int) -> None:
+        if path.startswith("/api/v1/order/"):
+            path = "/api/v1/order/{id}"
+        with self._stats_lock:
+            self._counts[(method, path, status)] += 1
+
+    def stats(self) -> dict[str, object]:
+        with self._stats_lock:
+            items = sorted(self._counts.items())
+        by_status: Counter[int] = Counter()
+        for (_method, _path, status), count in items:
+            by_status[status] += count
+        return {
+            "uptime_seconds": round(monotonic() - self._started_at, 3),
+            "requests_total": sum(by_status.values()),
+            "by_status": {str(status): count for status, count in sorted(by_status.items())},
+            "by_endpoint": [
+                {"method": method, "path": path, "status": status, "count": count}
+                for (method, path, status), count in items
+            ],
+        }
+
+    def start(self) -> BtcturkSimulatorServer:
+        if self._thread is None:
+            self._thread = Thread(target=self.serve_forever, name="btcturk-simulator", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> BtcturkSimulatorServer:
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        del exc_type, exc, tb
+        self.stop()
+
+
+@dataclass(frozen=True)
+class SimulatorConfig:
+    host: str = "127.0.0.1"
+    port: int = 18080
+    symbols: list[str] = field(default_factory=list)
+    seed: int = 0
+    balance_try: Decimal = Decimal("1000000")
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    faults: FaultProfile = field(default_factory=FaultProfile)
+
+
+def build_simulator_server(config: SimulatorConfig) -> BtcturkSimulatorServer:
+    exchange = SimulatedExchange(
+        default_pairs(config.symbols or None),
+        balances={"TRY": config.balance_try},
+        seed=config.seed,
+    )
+    return BtcturkSimulatorServer(
+        exchange,
+        host=config.host,
+        port=config.port,
+        latency=config.latency,
+        faults=config.faults,
+        seed=config.seed,
+    )
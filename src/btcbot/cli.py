@@ -7,24 +7,42 @@ import os
 import random
 import sqlite3
 import sys
+import tempfile
 import time
 from collections.abc import Callable, Mapping
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal, InvalidOperation
+from functools import partial
 from pathlib import Path
+from typing import TextIO
 from uuid import uuid4
 
 from btcbot.accounting.accounting_service import AccountingService
 from btcbot.adapters.btcturk_http import (
     BtcturkHttpClient,
     ConfigurationError,
+    http_requests_sent,
+)
+from btcbot.adapters.btcturk_simulator import (
+    FaultProfile,
+    LatencyProfile,
+    SimulatorConfig,
+    build_simulator_server,
 )
 from btcbot.config import Settings
 from btcbot.domain.anomalies import AnomalyCode, AnomalyEvent
 from btcbot.domain.models import PairInfo, normalize_symbol
 from btcbot.logging_context import with_logging_context
-from btcbot.logging_utils import setup_logging
+from btcbot.logging_utils import installed_log_handler, setup_logging
+from btcbot.obs.cycle_trace import CycleTracer, format_hotspot_table
+from btcbot.obs.log_sampling import (
+    DEFAULT_SAMPLING_RULES,
+    flush_log_sampling,
+    install_log_sampling,
+)
 from btcbot.obs.logging import set_base_context
+from btcbot.obs.metrics import LoggingMetricsSink, get_metrics_sink, set_metrics_sink
+from btcbot.obs.metrics_aggregator import AggregatingMetricsSink, start_metrics_http_server
 from btcbot.obs.process_role import ProcessRole, coerce_process_role
 from btcbot.observability import (
     configure_instrumentation,
@@ -32,7 +50,10 @@ from btcbot.observability import (
     get_instrumentation,
 )
 from btcbot.observability_decisions import emit_decision
-from btcbot.persistence.sqlite.sqlite_connection import sqlite_connection_context
+from btcbot.persistence.sqlite.sqlite_connection import (
+    configure_statement_profiler,
+    sqlite_connection_context,
+)
 from btcbot.replay import ReplayCaptureConfig, capture_replay_dataset, init_replay_dataset
 from btcbot.replay.validate import validate_replay_dataset
 from btcbot.risk.exchange_rules import MarketDataExchangeRulesProvider
@@ -52,7 +73,9 @@ from btcbot.security.secrets import (
 )
 from btcbot.services.cycle_account_snapshot import build_cycle_account_snapshot
 from btcbot.services.doctor import (
+    DoctorCheck,
     DoctorReport,
+    apply_missing_indexes,
     doctor_status,
     evaluate_slo_status_for_rows,
     normalize_drawdown_ratio,
@@ -68,6 +91,9 @@ from btcbot.services.parity import (
     compute_run_fingerprint,
     find_missing_stage7_parity_tables,
 )
+from btcbot.services.parity import (
+    find_first_divergence as find_first_stage7_divergence,
+)
 from btcbot.services.portfolio_service import PortfolioService
 from btcbot.services.preflight import run_preflight_checks
 from btcbot.services.process_lock import (
@@ -77,6 +103,12 @@ from btcbot.services.process_lock import (
     single_instance_lock,
 )
 from btcbot.services.risk_service import RiskService
+from btcbot.services.soak_harness import (
+    SoakHarness,
+    SoakThresholds,
+    format_soak_report,
+    synthetic_replay,
+)
 from btcbot.services.stage4_cycle_runner import (
     Stage4ConfigurationError,
     Stage4CycleRunner,
@@ -86,20 +118,21 @@ from btcbot.services.stage4_cycle_runner import (
 from btcbot.services.stage7_backtest_runner import Stage7BacktestRunner
 from btcbot.services.stage7_cycle_runner import Stage7CycleRunner
 from btcbot.services.stage7_reporting import (
-    STAGE7_REPORT_SCHEMA_VERSION,
-    build_cycle_rows,
-    validate_cycle_rows,
+    CsvCycleWriter,
+    JsonlReportWriter,
+    JsonReportWriter,
 )
 from btcbot.services.stage7_reporting import (
-    render_csv as render_stage7_csv,
+    iter_cycle_rows as iter_stage7_cycle_rows,
 )
 from btcbot.services.stage7_reporting import (
-    render_json as render_stage7_json,
+    materialized_rollups as materialized_stage7_rollups,
 )
 from btcbot.services.stage7_reporting import (
-    rollup as build_stage7_rollup,
+    stream_report as stream_stage7_report,
 )
 from btcbot.services.startup_recovery import StartupRecoveryService
+from btcbot.services.state_retention import StateRetentionService
 from btcbot.services.state_store import PENDING_GRACE_SECONDS, StateStore
 from btcbot.services.strategy_service import StrategyService
 from btcbot.services.sweep_service import SweepService
@@ -439,6 +472,40 @@ def main() -> int:
         help="Acknowledge stale pid-file cleanup risk when using --lock-account-key",
     )
 
+    db_compact_parser = subparsers.add_parser(
+        "state-db-compact",
+        help="Summarize, archive and delete state DB rows older than their retention window",
+    )
+    db_compact_parser.add_argument(
+        "--db",
+        default=None,
+        help="State sqlite DB path (defaults to env STATE_DB_PATH)",
+    )
+    db_compact_parser.add_argument(
+        "--dry-run", action="store_true", help="Only print the size/eligibility report"
+    )
+    db_compact_parser.add_argument(
+        "--max-chunks",
+        type=int,
+        default=None,
+        help="Stop after this many chunks (resume on the next invocation)",
+    )
+    db_compact_parser.add_argument(
+        "--archive-dir",
+        default=None,
+        help="Archive root (defaults to STATE_RETENTION_ARCHIVE_DIR or <db>_archive)",
+    )
+    db_compact_parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Keep daily summaries but do not write raw rows to archive files",
+    )
+    db_compact_parser.add_argument(
+        "--vacuum",
+        action="store_true",
+        help="VACUUM after compaction to return freed pages to the filesystem",
+    )
+
     stage7_run_parser = subparsers.add_parser("stage7-run", help="Run one Stage 7 dry-run cycle")
     stage7_run_parser.add_argument("--dry-run", action="store_true", help="Required for stage7")
     stage7_run_parser.add_argument(
@@ -504,6 +571,21 @@ def main() -> int:
     export_parser.add_argument("--format", choices=["csv", "json", "both", "jsonl"], default="csv")
     export_parser.add_argument("--out", required=False, default=None)
 
+    rollups_rebuild_parser = subparsers.add_parser(
+        "stage7-rollups-rebuild",
+        help="Recompute materialized Stage 7 daily/weekly rollups from raw cycles and verify",
+    )
+    rollups_rebuild_parser.add_argument(
+        "--db",
+        default=None,
+        help="State sqlite DB path (defaults to env STATE_DB_PATH)",
+    )
+    rollups_rebuild_parser.add_argument(
+        "--verify-only",
+        action="store_true",
+        help="Only report buckets that differ from raw rows (exit 1 if any)",
+    )
+
     alerts_parser = subparsers.add_parser("stage7-alerts", help="Print recent Stage 7 alert cycles")
     alerts_parser.add_argument(
         "--db",
@@ -602,6 +684,16 @@ def main() -> int:
     doctor_parser.add_argument(
         "--json", action="store_true", help="Print machine-readable JSON report"
     )
+    doctor_parser.add_argument(
+        "--db-perf",
+        action="store_true",
+        help="Audit hot-query plans (scans, temp B-trees) and report table/index sizes",
+    )
+    doctor_parser.add_argument(
+        "--apply-indexes",
+        action="store_true",
+        help="With --db-perf: create the missing indexes the audit proposes",
+    )
     doctor_parser.add_argument(
         "--allow-mismatched-db",
         action="store_true",
@@ -646,6 +738,81 @@ def main() -> int:
         help="Delay between capture polls in seconds",
     )
 
+    exchange_sim_parser = subparsers.add_parser(
+        "exchange-sim",
+        help="Serve a local BTCTurk-compatible exchange simulator for load/soak tests",
+    )
+    exchange_sim_parser.add_argument("--host", default="127.0.0.1")
+    exchange_sim_parser.add_argument("--port", type=int, default=18080)
+    exchange_sim_parser.add_argument(
+        "--symbols", default="", help="Comma-separated symbols (default: built-in TRY pairs)"
+    )
+    exchange_sim_parser.add_argument("--seed", type=int, default=0)
+    exchange_sim_parser.add_argument("--balance-try", default="1000000")
+    exchange_sim_parser.add_argument(
+        "--latency-distribution", choices=["fixed", "uniform", "lognormal"], default="fixed"
+    )
+    exchange_sim_parser.add_argument("--latency-ms", type=float, default=0.0)
+    exchange_sim_parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    exchange_sim_parser.add_argument(
+        "--rate-429", type=float, default=0.0, help="Probability of answering 429 per request"
+    )
+    exchange_sim_parser.add_argument("--retry-after-seconds", type=float, default=1.0)
+    exchange_sim_parser.add_argument(
+        "--error-5xx", type=float, default=0.0, help="Probability of answering 500 per request"
+    )
+    exchange_sim_parser.add_argument("--storm-every-seconds", type=float, default=0.0)
+    exchange_sim_parser.add_argument("--storm-duration-seconds", type=float, default=0.0)
+
+    profile_cycle_parser = subparsers.add_parser(
+        "profile-cycle",
+        help="Profile Stage 4 dry-run cycles per phase and write collapsed stacks",
+    )
+    profile_cycle_parser.add_argument("--cycles", type=int, default=5)
+    profile_cycle_parser.add_argument(
+        "--source",
+        choices=["sim", "live"],
+        default="sim",
+        help="Market data from an in-process exchange simulator or the live public API",
+    )
+    profile_cycle_parser.add_argument("--seed", type=int, default=0, help="Simulator seed")
+    profile_cycle_parser.add_argument(
+        "--db", default=None, help="State DB to run against (default: a throwaway temp DB)"
+    )
+    profile_cycle_parser.add_argument(
+        "--out",
+        default="profile-cycle.collapsed",
+        help="Collapsed-stack output (flamegraph.pl / speedscope compatible)",
+    )
+    profile_cycle_parser.add_argument("--top", type=int, default=15, help="Hotspot rows to print")
+
+    soak_parser = subparsers.add_parser(
+        "soak",
+        help="Run Stage 4 + Stage 7 dry-run cycles over simulated hours and check for leaks",
+    )
+    soak_parser.add_argument("--hours", type=float, default=6.0, help="Simulated hours to run")
+    soak_parser.add_argument(
+        "--step-seconds", type=int, default=60, help="Simulated seconds per cycle"
+    )
+    soak_parser.add_argument(
+        "--sample-every", type=int, default=30, help="Cycles between health samples"
+    )
+    soak_parser.add_argument("--seed", type=int, default=0, help="Replay and simulator seed")
+    soak_parser.add_argument(
+        "--no-stage4",
+        action="store_true",
+        help="Only run Stage 7 against the replay (skip the simulator-backed Stage 4 cycle)",
+    )
+    soak_parser.add_argument(
+        "--db", default=None, help="State DB to run against (default: a throwaway temp DB)"
+    )
+    soak_parser.add_argument("--out", default="soak-report.json", help="JSON report path")
+    soak_parser.add_argument(
+        "--summary", default=None, help="Also write the Markdown summary to this path"
+    )
+    soak_parser.add_argument("--max-rss-growth-mb", type=float, default=64.0)
+    soak_parser.add_argument("--max-p99-drift-ratio", type=float, default=0.5)
+
     backtest_export = subparsers.add_parser(
         "stage7-backtest-export",
         aliases=["stage7-backtest-report"],
@@ -684,6 +851,8 @@ def main() -> int:
         allow_shared_db_for_monitor=bool(getattr(args, "allow_shared_db_for_monitor", False)),
     )
     setup_logging(settings.log_level)
+    _configure_log_sampling(settings)
+    _configure_metrics_sink(settings, command_name=args.command)
     if args.command != "run":
         configure_instrumentation(
             enabled=bool(getattr(settings, "observability_enabled", False)),
@@ -787,6 +956,17 @@ def main() -> int:
             i_understand=bool(args.i_understand),
         )
 
+    if args.command == "state-db-compact":
+        return run_state_db_compact(
+            settings=settings,
+            db_path=args.db,
+            dry_run=bool(args.dry_run),
+            max_chunks=args.max_chunks,
+            archive_dir=args.archive_dir,
+            archive=not bool(args.no_archive),
+            vacuum=bool(args.vacuum),
+        )
+
     if args.command == "stage7-run":
         return run_cycle_stage7(
             settings,
@@ -816,6 +996,11 @@ def main() -> int:
             out_path=args.out,
         )
 
+    if args.command == "stage7-rollups-rebuild":
+        return run_stage7_rollups_rebuild(
+            settings, db_path=args.db, verify_only=bool(args.verify_only)
+        )
+
     if args.command == "stage7-alerts":
         return run_stage7_alerts(settings, db_path=args.db, last=args.last)
 
@@ -899,6 +1084,8 @@ def main() -> int:
             db_path=resolved_db_path,
             dataset_path=args.dataset,
             json_output=args.json,
+            db_perf=bool(args.db_perf or args.apply_indexes),
+            apply_indexes=bool(args.apply_indexes),
         )
 
     if args.command == "replay-init":
@@ -916,6 +1103,51 @@ def main() -> int:
             interval_seconds=args.interval_seconds,
         )
 
+    if args.command == "profile-cycle":
+        return run_profile_cycle(
+            settings,
+            cycles=args.cycles,
+            source=args.source,
+            seed=args.seed,
+            db_path=args.db,
+            out_path=args.out,
+            top_n=args.top,
+        )
+
+    if args.command == "soak":
+        return run_soak(
+            settings,
+            hours=args.hours,
+            step_seconds=args.step_seconds,
+            sample_every=args.sample_every,
+            seed=args.seed,
+            run_stage4=not args.no_stage4,
+            db_path=args.db,
+            out_path=args.out,
+            summary_path=args.summary,
+            thresholds=SoakThresholds(
+                max_rss_growth_bytes=int(args.max_rss_growth_mb * 1024 * 1024),
+                max_p99_drift_ratio=args.max_p99_drift_ratio,
+            ),
+        )
+
+    if args.command == "exchange-sim":
+        return run_exchange_sim(
+            host=args.host,
+            port=args.port,
+            symbols_csv=args.symbols,
+            seed=args.seed,
+            balance_try=args.balance_try,
+            latency_distribution=args.latency_distribution,
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            rate_429=args.rate_429,
+            retry_after_seconds=args.retry_after_seconds,
+            error_5xx=args.error_5xx,
+            storm_every_seconds=args.storm_every_seconds,
+            storm_duration_seconds=args.storm_duration_seconds,
+        )
+
     return 1
 
 
@@ -929,10 +1161,12 @@ def _command_touches_state_db(command_name: str) -> bool:
         "degrade",
         "state-db-locks",
         "state-db-unlock",
+        "state-db-compact",
         "stage7-run",
         "health",
         "stage7-report",
         "stage7-export",
+        "stage7-rollups-rebuild",
         "stage7-alerts",
         "stage7-backtest-export",
         "stage7-backtest-report",
@@ -951,9 +1185,11 @@ def _enforce_role_db_convention_for_command(command_name: str) -> bool:
         "degrade",
         "state-db-locks",
         "state-db-unlock",
+        "state-db-compact",
         "health",
         "stage7-report",
         "stage7-export",
+        "stage7-rollups-rebuild",
         "stage7-alerts",
         "stage7-db-count",
         "stage7-backtest-export",
@@ -1045,6 +1281,43 @@ def _prepare_runtime(
     return settings
 
 
+def _configure_log_sampling(settings: Settings) -> None:
+    handler = installed_log_handler()
+    if handler is None:
+        return
+    rules = getattr(settings, "log_sampling_rules", None)
+    install_log_sampling(
+        handler,
+        DEFAULT_SAMPLING_RULES if rules is None else rules,
+        summary_interval_seconds=float(getattr(settings, "log_sampling_summary_seconds", 60.0)),
+    )
+
+
+_METRICS_HTTP_COMMANDS = frozenset({"run", "stage4-run", "stage7-run"})
+_METRICS_HTTP_SERVER = None
+
+
+def _configure_metrics_sink(settings: Settings, *, command_name: str | None) -> None:
+    global _METRICS_HTTP_SERVER
+    if str(getattr(settings, "metrics_sink", "aggregating")) == "logging":
+        set_metrics_sink(LoggingMetricsSink())
+        return
+    sink = get_metrics_sink()
+    if not isinstance(sink, AggregatingMetricsSink):
+        sink = AggregatingMetricsSink()
+        set_metrics_sink(sink)
+    port = int(getattr(settings, "metrics_http_port", 0))
+    if port <= 0 or command_name not in _METRICS_HTTP_COMMANDS or _METRICS_HTTP_SERVER:
+        return
+    try:
+        _METRICS_HTTP_SERVER = start_metrics_http_server(sink.render_prometheus, port=port)
+    except OSError as exc:
+        logger.warning(
+            "metrics_http_server_failed",
+            extra={"extra": {"port": port, "error_type": type(exc).__name__}},
+        )
+
+
 def _load_settings(env_file: str | None) -> Settings:
     resolved_env_file = None if env_file in (None, "") else env_file
     provider = build_default_provider(env_file=resolved_env_file)
@@ -1231,6 +1504,9 @@ def _build_state_store(
             db_path=db_path,
             strict_instance_lock=strict_instance_lock,
             process_instance_ttl_seconds=int(getattr(resolved_settings, "process_instance_ttl_seconds", 180)),
+            heartbeat_interval_seconds=float(
+                getattr(resolved_settings, "process_instance_heartbeat_interval_seconds", 30)
+            ),
         )
     except TypeError:
         return StateStore(db_path=db_path)
@@ -2267,7 +2543,6 @@ def run_cycle(
         _close_best_effort(exchange, "exchange")
 
 
-
 def run_stage4_freeze_status(*, settings: Settings, db_path: str | None = None) -> int:
     resolved_db = normalize_db_path(db_path or settings.state_db_path)
     store = StateStore(str(resolved_db))
@@ -2427,7 +2702,7 @@ def _pid_appears_alive(pid: int) -> bool:
 
 def run_state_db_locks_list(*, settings: Settings, db_path: str | None = None) -> int:
     resolved_db = normalize_db_path(db_path or settings.state_db_path)
-    store = StateStore(str(resolved_db))
+    store = StateStore.open_read_only(str(resolved_db))
     now_epoch = int(datetime.now(UTC).timestamp())
     with store._connect() as conn:
         rows = conn.execute(
@@ -2556,6 +2831,63 @@ def run_state_db_unlock(
     print(json.dumps({"unlocked": True, "instance_id": instance_id, "forced": bool(force)}, sort_keys=True))
     return 0
 
+
+def run_state_db_compact(
+    *,
+    settings: Settings,
+    db_path: str | None = None,
+    dry_run: bool = False,
+    max_chunks: int | None = None,
+    archive_dir: str | None = None,
+    archive: bool = True,
+    vacuum: bool = False,
+) -> int:
+    resolved_db = normalize_db_path(db_path or settings.state_db_path)
+    store = StateStore(str(resolved_db))
+    try:
+        retention = StateRetentionService.from_settings(
+            store, settings, archive_dir=archive_dir, archive=archive
+        )
+    except ValueError as exc:
+        print(f"state-db-compact: {exc}")
+        return 2
+    before = retention.size_report()
+    if dry_run:
+        print(json.dumps({"dry_run": True, "report": before}, sort_keys=True, default=str))
+        return 0
+
+    results = retention.run(max_chunks=max_chunks)
+    with sqlite_connection_context(str(resolved_db)) as conn:
+        if vacuum:
+            conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    after = retention.size_report()
+    print(
+        json.dumps(
+            {
+                "dry_run": False,
+                "complete": all(item.complete for item in results),
+                "tables": [
+                    {
+                        "table": item.table,
+                        "cutoff": item.cutoff,
+                        "archived_rows": item.archived_rows,
+                        "chunks": item.chunks,
+                        "days": len(item.days),
+                        "complete": item.complete,
+                    }
+                    for item in results
+                ],
+                "db_bytes_before": before["db_bytes"],
+                "db_bytes_after": after["db_bytes"],
+                "freelist_pages_after": after["freelist_pages"],
+            },
+            sort_keys=True,
+        )
+    )
+    return 0
+
+
 def run_cycle_stage4(
     settings: Settings, force_dry_run: bool = False, db_path: str | None = None
 ) -> int:
@@ -2759,6 +3091,7 @@ def _flush_logging_handlers() -> None:
     if os.getenv("PYTEST_CURRENT_TEST"):
         return
 
+    flush_log_sampling()
     root = logging.getLogger()
     for handler in root.handlers:
         try:
@@ -2885,160 +3218,173 @@ def run_stage7_report(
     if resolved_db_path is None:
         return 2
 
-    with single_instance_lock(db_path=resolved_db_path, account_key=MONITOR_LOCK_ACCOUNT_KEY):
-        store = StateStore(db_path=resolved_db_path)
-        cycle_rows = build_cycle_rows(store=store, limit=last)
-        validations = validate_cycle_rows(cycle_rows)
-        daily = build_stage7_rollup(cycle_rows, "daily")
-        weekly = build_stage7_rollup(cycle_rows, "weekly")
-        report_obj = {
-            "schema_version": STAGE7_REPORT_SCHEMA_VERSION,
-            "cycles": cycle_rows,
-            "rollups": {"daily": daily, "weekly": weekly},
-            "validations": validations,
-        }
-        errors = [finding for finding in validations if finding.severity == "error"]
-
-        only_json = bool(json_only or json_output)
-        if not only_json:
-            print(
-                f"stage7-report: cycles={len(cycle_rows)} daily_buckets={len(daily.buckets)} "
-                f"weekly_buckets={len(weekly.buckets)} validation_errors={len(errors)}"
-            )
-
-        print(render_stage7_json(redact_data(report_obj)))
+    store = StateStore.open_read_only(resolved_db_path)
+    # Reads page through short read transactions (like the exports), so a slow stdout
+    # consumer never pins the WAL.
+    only_json = bool(json_only or json_output)
+    upper_key: tuple[str, str] | None = None
+    if not only_json:
+        # The summary line precedes the document, so count in a first streaming pass
+        # and pin its newest row as the cutoff for every later read.
+        summary = stream_stage7_report(
+            iter_stage7_cycle_rows(store, last),
+            rollup_source=partial(materialized_stage7_rollups, store),
+        )
+        upper_key = summary.newest_key
+        print(
+            f"stage7-report: cycles={summary.cycles_count} "
+            f"daily_buckets={len(summary.rollups['daily'].buckets)} "
+            f"weekly_buckets={len(summary.rollups['weekly'].buckets)} "
+            f"validation_errors={len(summary.errors)}"
+        )
+    rows_iter = (
+        iter(())
+        if not only_json and upper_key is None
+        else iter_stage7_cycle_rows(store, last, upper_key=upper_key)
+    )
+    streamed = stream_stage7_report(
+        rows_iter,
+        [JsonReportWriter(sys.stdout, redact=redact_data)],
+        rollup_source=partial(materialized_stage7_rollups, store),
+    )
+    sys.stdout.write("\n")
+    errors = streamed.errors
 
-        if errors:
-            print("stage7-report: FAIL_CLOSED financial validation errors detected", file=sys.stderr)
-            return 1
+    if errors:
+        print("stage7-report: FAIL_CLOSED financial validation errors detected", file=sys.stderr)
+        return 1
 
-        if only_json:
-            return 0
+    if only_json:
+        return 0
 
-        rows = store.fetch_stage7_run_metrics(limit=last, order_desc=True)
-        ledger_metrics = store.get_latest_stage7_ledger_metrics()
-        drawdown_ratio = (
-            normalize_drawdown_ratio(
-                ledger_metrics.get("max_drawdown_ratio") if ledger_metrics is not None else None,
-                ledger_metrics.get("max_drawdown_pct") if ledger_metrics is not None else None,
-            )
-            if ledger_metrics is not None
-            else None
+    rows = (
+        store.fetch_stage7_run_metrics(limit=last, order_desc=True, upper_key=upper_key)
+        if upper_key is not None
+        else []
+    )
+    ledger_metrics = store.get_latest_stage7_ledger_metrics()
+    drawdown_ratio = (
+        normalize_drawdown_ratio(
+            ledger_metrics.get("max_drawdown_ratio") if ledger_metrics is not None else None,
+            ledger_metrics.get("max_drawdown_pct") if ledger_metrics is not None else None,
         )
-        enriched_rows: list[dict[str, object]] = []
-        for row in rows:
-            cycle_status, _, _ = evaluate_slo_status_for_rows(
-                settings,
-                [row],
-                drawdown_ratio=normalize_drawdown_ratio(
-                    row.get("max_drawdown_ratio"),
-                    row.get("max_drawdown_pct"),
-                ),
-            )
-            enriched_rows.append({**row, "slo_status": cycle_status})
-
-        window_status, _, window_notes = evaluate_slo_status_for_rows(
+        if ledger_metrics is not None
+        else None
+    )
+    enriched_rows: list[dict[str, object]] = []
+    for row in rows:
+        cycle_status, _, _ = evaluate_slo_status_for_rows(
             settings,
-            rows,
-            drawdown_ratio=drawdown_ratio,
+            [row],
+            drawdown_ratio=normalize_drawdown_ratio(
+                row.get("max_drawdown_ratio"),
+                row.get("max_drawdown_pct"),
+            ),
         )
+        enriched_rows.append({**row, "slo_status": cycle_status})
 
+    window_status, _, window_notes = evaluate_slo_status_for_rows(
+        settings,
+        rows,
+        drawdown_ratio=drawdown_ratio,
+    )
+
+    print(
+        "cycle_id ts mode net_pnl_try max_dd turnover intents rejects throttled no_trades_reason slo_status"
+    )
+    for row in enriched_rows:
+        no_trades_reason = row.get("no_trades_reason") or "-"
+        no_metrics_reason = row.get("no_metrics_reason") or "-"
         print(
-            "cycle_id ts mode net_pnl_try max_dd turnover intents rejects throttled no_trades_reason slo_status"
+            f"{row['cycle_id']} {row['ts']} {row['mode_final']} "
+            f"{row['net_pnl_try']} {row['max_drawdown_pct']} {row['turnover_try']} "
+            f"{row['intents_planned_count']} {row['oms_rejected_count']} "
+            f"{_as_int(row.get('oms_throttled_count', 0))} {no_trades_reason} {row['slo_status'].upper()}"
         )
-        for row in enriched_rows:
-            no_trades_reason = row.get("no_trades_reason") or "-"
-            no_metrics_reason = row.get("no_metrics_reason") or "-"
+        print(f"  no_metrics_reason={no_metrics_reason}")
+
+        cycle_trace = store.get_stage7_cycle_trace(str(row["cycle_id"]))
+        if cycle_trace is not None:
+            summary = _as_mapping(cycle_trace.get("intents_summary", {}))
+            portfolio_plan = _as_mapping(cycle_trace.get("portfolio_plan", {}))
             print(
-                f"{row['cycle_id']} {row['ts']} {row['mode_final']} "
-                f"{row['net_pnl_try']} {row['max_drawdown_pct']} {row['turnover_try']} "
-                f"{row['intents_planned_count']} {row['oms_rejected_count']} "
-                f"{_as_int(row.get('oms_throttled_count', 0))} {no_trades_reason} {row['slo_status'].upper()}"
+                "  stage7_plan_summary="
+                f"planned={summary.get('order_intents_planned', 0)} "
+                f"skipped={summary.get('order_intents_skipped', 0)} "
+                f"actions={summary.get('order_decisions_total', 0)}"
             )
-            print(f"  no_metrics_reason={no_metrics_reason}")
-
-            cycle_trace = store.get_stage7_cycle_trace(str(row["cycle_id"]))
-            if cycle_trace is not None:
-                summary = _as_mapping(cycle_trace.get("intents_summary", {}))
-                portfolio_plan = _as_mapping(cycle_trace.get("portfolio_plan", {}))
+            planning_diag = _as_mapping(summary.get("planning_diagnostics"))
+            if planning_diag:
                 print(
-                    "  stage7_plan_summary="
-                    f"planned={summary.get('order_intents_planned', 0)} "
-                    f"skipped={summary.get('order_intents_skipped', 0)} "
-                    f"actions={summary.get('order_decisions_total', 0)}"
+                    "  planning_diagnostics="
+                    f"enabled={planning_diag.get('planning_enabled')} "
+                    f"disabled_reason={planning_diag.get('planning_disabled_reason') or '-'} "
+                    f"universe={planning_diag.get('selected_universe_count', 0)} "
+                    f"mark_prices={planning_diag.get('mark_prices_count', 0)} "
+                    f"planned={planning_diag.get('planned_intents_count', 0)} "
+                    f"skipped={planning_diag.get('skipped_intents_count', 0)}"
                 )
-                planning_diag = _as_mapping(summary.get("planning_diagnostics"))
-                if planning_diag:
-                    print(
-                        "  planning_diagnostics="
-                        f"enabled={planning_diag.get('planning_enabled')} "
-                        f"disabled_reason={planning_diag.get('planning_disabled_reason') or '-'} "
-                        f"universe={planning_diag.get('selected_universe_count', 0)} "
-                        f"mark_prices={planning_diag.get('mark_prices_count', 0)} "
-                        f"planned={planning_diag.get('planned_intents_count', 0)} "
-                        f"skipped={planning_diag.get('skipped_intents_count', 0)}"
+                skip_reasons = _as_mapping(planning_diag.get("skip_reasons"))
+                if skip_reasons:
+                    reason_items = ", ".join(
+                        f"{key}:{value}" for key, value in sorted(skip_reasons.items())
                     )
-                    skip_reasons = _as_mapping(planning_diag.get("skip_reasons"))
-                    if skip_reasons:
-                        reason_items = ", ".join(
-                            f"{key}:{value}" for key, value in sorted(skip_reasons.items())
-                        )
-                        print(f"  planning_skip_reasons={reason_items}")
-                if portfolio_plan:
-                    print(
-                        "  portfolio_plan="
-                        f"cash_target_try={portfolio_plan.get('cash_target_try', '-')} "
-                        f"actions={len(_as_list_of_mappings(portfolio_plan.get('actions', [])))}"
-                    )
-
-            allocation_plan = store.get_allocation_plan(str(row["cycle_id"]))
-            plan_source = "cycle_id"
-            if allocation_plan is None:
-                allocation_plan = store.get_latest_allocation_plan()
-                plan_source = "latest"
-            if allocation_plan is not None:
-                plan_items = _as_list_of_mappings(allocation_plan.get("plan") or [])
-                deferred_items = _as_list_of_mappings(allocation_plan.get("deferred") or [])
-                investable_total = allocation_plan.get(
-                    "investable_total_try"
-                ) or allocation_plan.get("investable_try")
-                unused_budget = allocation_plan.get("unused_budget_try") or allocation_plan.get(
-                    "unused_investable_try"
-                )
+                    print(f"  planning_skip_reasons={reason_items}")
+            if portfolio_plan:
                 print(
-                    "  allocation_plan="
-                    f"source={plan_source} "
-                    f"cycle_id={allocation_plan.get('cycle_id')} "
-                    f"investable_total_try={investable_total} "
-                    f"investable_this_cycle_try={allocation_plan.get('investable_this_cycle_try')} "
-                    f"deploy_budget_try={allocation_plan.get('deploy_budget_try')} "
-                    f"planned_total_try={allocation_plan.get('planned_total_try')} "
-                    f"unused_budget_try={unused_budget} "
-                    f"usage_reason={allocation_plan.get('usage_reason')}"
+                    "  portfolio_plan="
+                    f"cash_target_try={portfolio_plan.get('cash_target_try', '-')} "
+                    f"actions={len(_as_list_of_mappings(portfolio_plan.get('actions', [])))}"
                 )
-                print(
-                    "  stage4_plan_summary="
-                    f"planned_total_try={allocation_plan.get('planned_total_try')} "
-                    f"unused_budget_try={unused_budget} "
-                    f"actions={len(plan_items)} deferred={len(deferred_items)}"
+
+        allocation_plan = store.get_allocation_plan(str(row["cycle_id"]))
+        plan_source = "cycle_id"
+        if allocation_plan is None:
+            allocation_plan = store.get_latest_allocation_plan()
+            plan_source = "latest"
+        if allocation_plan is not None:
+            plan_items = _as_list_of_mappings(allocation_plan.get("plan") or [])
+            deferred_items = _as_list_of_mappings(allocation_plan.get("deferred") or [])
+            investable_total = allocation_plan.get(
+                "investable_total_try"
+            ) or allocation_plan.get("investable_try")
+            unused_budget = allocation_plan.get("unused_budget_try") or allocation_plan.get(
+                "unused_investable_try"
+            )
+            print(
+                "  allocation_plan="
+                f"source={plan_source} "
+                f"cycle_id={allocation_plan.get('cycle_id')} "
+                f"investable_total_try={investable_total} "
+                f"investable_this_cycle_try={allocation_plan.get('investable_this_cycle_try')} "
+                f"deploy_budget_try={allocation_plan.get('deploy_budget_try')} "
+                f"planned_total_try={allocation_plan.get('planned_total_try')} "
+                f"unused_budget_try={unused_budget} "
+                f"usage_reason={allocation_plan.get('usage_reason')}"
+            )
+            print(
+                "  stage4_plan_summary="
+                f"planned_total_try={allocation_plan.get('planned_total_try')} "
+                f"unused_budget_try={unused_budget} "
+                f"actions={len(plan_items)} deferred={len(deferred_items)}"
+            )
+            if plan_items:
+                selected = ", ".join(
+                    f"{item.get('symbol')}:{item.get('notional_try', '-')}"
+                    for item in plan_items[:5]
                 )
-                if plan_items:
-                    selected = ", ".join(
-                        f"{item.get('symbol')}:{item.get('notional_try', '-')}"
-                        for item in plan_items[:5]
-                    )
-                    print(f"  selected_symbols={selected}")
-                if deferred_items:
-                    deferred = ", ".join(
-                        f"{item.get('symbol')}:{item.get('reason', 'deferred')}"
-                        for item in deferred_items[:5]
-                    )
-                    print(f"  deferred_symbols={deferred}")
-                if no_trades_reason in {"-", None, ""} and plan_items:
-                    print("  no_trades_reason=NOT_ARMED")
+                print(f"  selected_symbols={selected}")
+            if deferred_items:
+                deferred = ", ".join(
+                    f"{item.get('symbol')}:{item.get('reason', 'deferred')}"
+                    for item in deferred_items[:5]
+                )
+                print(f"  deferred_symbols={deferred}")
+            if no_trades_reason in {"-", None, ""} and plan_items:
+                print("  no_trades_reason=NOT_ARMED")
 
-        print(f"stage7-report: window_status={window_status.upper()} rows={len(rows)}")
-        return 0
+    print(f"stage7-report: window_status={window_status.upper()} rows={len(rows)}")
+    return 0
 
 
 def run_stage7_export(
@@ -3053,43 +3399,108 @@ def run_stage7_export(
     )
     if resolved_db_path is None:
         return 2
-    with single_instance_lock(db_path=resolved_db_path, account_key=MONITOR_LOCK_ACCOUNT_KEY):
-        store = StateStore(db_path=resolved_db_path)
-        cycle_rows = build_cycle_rows(store=store, limit=last)
-    validations = validate_cycle_rows(cycle_rows)
-    if any(finding.severity == "error" for finding in validations):
-        print("stage7-export: FAIL_CLOSED financial validation errors detected", file=sys.stderr)
-        return 1
+    # Exports page through short read transactions so a long export never pins the WAL.
+    store = StateStore.open_read_only(resolved_db_path)
+    if out_path is None:
+        return _stream_stage7_export_stdout(store, last=last, export_format=export_format)
+    return _stream_stage7_export_files(
+        store, last=last, export_format=export_format, out=Path(out_path)
+    )
 
-    daily = build_stage7_rollup(cycle_rows, "daily")
-    weekly = build_stage7_rollup(cycle_rows, "weekly")
-    report_obj = {
-        "schema_version": STAGE7_REPORT_SCHEMA_VERSION,
-        "cycles": cycle_rows,
-        "rollups": {"daily": daily, "weekly": weekly},
-        "validations": validations,
-    }
 
-    normalized_format = "json" if export_format == "jsonl" else export_format
-    csv_text = render_stage7_csv(cycle_rows)
-    json_text = render_stage7_json(redact_data(report_obj))
+def run_stage7_rollups_rebuild(
+    settings: Settings, db_path: str | None, *, verify_only: bool = False
+) -> int:
+    resolved_db_path = _resolve_stage7_db_path(
+        "stage7-rollups-rebuild", db_path=db_path, settings_db_path=settings.state_db_path
+    )
+    if resolved_db_path is None:
+        return 2
+    store = StateStore(db_path=resolved_db_path)
+    mismatches = store.rebuild_stage7_rollups(apply=not verify_only)
+    print(
+        json.dumps(
+            {
+                "verify_only": verify_only,
+                "mismatched_buckets": len(mismatches),
+                "mismatches": mismatches,
+            },
+            sort_keys=True,
+        )
+    )
+    return 1 if verify_only and mismatches else 0
 
-    if out_path is None:
-        if normalized_format in {"csv", "both"}:
-            print(csv_text.rstrip("\n"))
-        if normalized_format in {"json", "both"}:
-            print(json_text)
-        return 0
 
-    out = Path(out_path)
-    if normalized_format == "csv":
-        out.write_text(csv_text, encoding="utf-8")
-    elif normalized_format == "json":
-        out.write_text(json_text + "\n", encoding="utf-8")
-    else:
+def _stage7_export_writer(
+    export_format: str, handle: TextIO
+) -> CsvCycleWriter | JsonReportWriter | JsonlReportWriter:
+    if export_format == "csv":
+        return CsvCycleWriter(handle)
+    if export_format == "jsonl":
+        return JsonlReportWriter(handle, redact=redact_data)
+    return JsonReportWriter(handle, redact=redact_data)
+
+
+def _stream_stage7_export_stdout(store: StateStore, *, last: int, export_format: str) -> int:
+    # Nothing may reach stdout before validation passes, so validate in a streaming
+    # first pass and then replay the same pinned window once per output format.
+    checked = stream_stage7_report(
+        iter_stage7_cycle_rows(store, last),
+        rollup_source=partial(materialized_stage7_rollups, store),
+    )
+    if checked.errors:
+        print("stage7-export: FAIL_CLOSED financial validation errors detected", file=sys.stderr)
+        return 1
+    formats = ["csv", "json"] if export_format == "both" else [export_format]
+    for fmt in formats:
+        rows = (
+            iter_stage7_cycle_rows(store, last, upper_key=checked.newest_key)
+            if checked.cycles_count
+            else iter(())
+        )
+        stream_stage7_report(
+            rows,
+            [_stage7_export_writer(fmt, sys.stdout)],
+            rollup_source=partial(materialized_stage7_rollups, store),
+        )
+        if fmt == "json":
+            sys.stdout.write("\n")
+    return 0
+
+
+def _stream_stage7_export_files(
+    store: StateStore, *, last: int, export_format: str, out: Path
+) -> int:
+    if export_format == "both":
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.with_suffix(".csv").write_text(csv_text, encoding="utf-8")
-        out.with_suffix(".json").write_text(json_text + "\n", encoding="utf-8")
+        targets = {"csv": out.with_suffix(".csv"), "json": out.with_suffix(".json")}
+    else:
+        targets = {export_format: out}
+    temp_paths = {fmt: path.with_name(f"{path.name}.partial") for fmt, path in targets.items()}
+    handles = {fmt: temp_paths[fmt].open("w", encoding="utf-8") for fmt in targets}
+    try:
+        streamed = stream_stage7_report(
+            iter_stage7_cycle_rows(store, last),
+            [_stage7_export_writer(fmt, handle) for fmt, handle in handles.items()],
+            rollup_source=partial(materialized_stage7_rollups, store),
+        )
+        if "json" in handles:
+            handles["json"].write("\n")
+    except BaseException:
+        for handle in handles.values():
+            handle.close()
+        for path in temp_paths.values():
+            path.unlink(missing_ok=True)
+        raise
+    for handle in handles.values():
+        handle.close()
+    if streamed.errors:
+        for path in temp_paths.values():
+            path.unlink(missing_ok=True)
+        print("stage7-export: FAIL_CLOSED financial validation errors detected", file=sys.stderr)
+        return 1
+    for fmt, path in temp_paths.items():
+        path.replace(targets[fmt])
     return 0
 
 
@@ -3099,9 +3510,8 @@ def run_stage7_alerts(settings: Settings, db_path: str | None, last: int) -> int
     )
     if resolved_db_path is None:
         return 2
-    with single_instance_lock(db_path=resolved_db_path, account_key=MONITOR_LOCK_ACCOUNT_KEY):
-        store = StateStore(db_path=resolved_db_path)
-        rows = store.fetch_stage7_run_metrics(limit=last, order_desc=True)
+    store = StateStore.open_read_only(resolved_db_path)
+    rows = store.fetch_stage7_run_metrics(limit=last, order_desc=True)
     print("cycle_id ts alerts")
     for row in rows:
         alerts = _as_mapping(row.get("alert_flags", {}))
@@ -3250,7 +3660,17 @@ def run_stage7_parity(
         include_adaptation=include_adaptation,
     )
     ok = compare_fingerprints(f1, f2)
-    print(json.dumps({"fingerprint_a": f1, "fingerprint_b": f2, "match": ok}, sort_keys=True))
+    payload: dict[str, object] = {"fingerprint_a": f1, "fingerprint_b": f2, "match": ok}
+    if not ok and not missing_a and not missing_b:
+        payload["first_divergence"] = find_first_stage7_divergence(
+            db_a,
+            db_b,
+            start_dt,
+            end_dt,
+            quantize_try=quantize,
+            include_adaptation=include_adaptation,
+        )
+    print(json.dumps(payload, sort_keys=True))
     return 0 if ok else 1
 
 
@@ -3385,6 +3805,181 @@ def run_replay_capture(
     return 0
 
 
+def run_exchange_sim(
+    *,
+    host: str,
+    port: int,
+    symbols_csv: str,
+    seed: int,
+    balance_try: str,
+    latency_distribution: str,
+    latency_ms: float,
+    latency_jitter_ms: float,
+    rate_429: float,
+    retry_after_seconds: float,
+    error_5xx: float,
+    storm_every_seconds: float,
+    storm_duration_seconds: float,
+) -> int:
+    symbols = [token.strip().upper() for token in symbols_csv.split(",") if token.strip()]
+    try:
+        config = SimulatorConfig(
+            host=host,
+            port=port,
+            symbols=symbols,
+            seed=seed,
+            balance_try=Decimal(str(balance_try)),
+            latency=LatencyProfile(
+                distribution=latency_distribution,
+                base_ms=latency_ms,
+                jitter_ms=latency_jitter_ms,
+            ),
+            faults=FaultProfile(
+                rate_429_probability=rate_429,
+                retry_after_seconds=retry_after_seconds,
+                error_5xx_probability=error_5xx,
+                storm_every_seconds=storm_every_seconds,
+                storm_duration_seconds=storm_duration_seconds,
+            ),
+        )
+    except (ValueError, InvalidOperation) as exc:
+        print(f"exchange-sim: invalid configuration: {exc}")
+        return 2
+
+    server = build_simulator_server(config)
+    print(f"exchange-sim: serving on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print(f"exchange-sim: stopped; stats={json.dumps(server.stats(), sort_keys=True)}")
+    return 0
+
+
+def run_profile_cycle(
+    settings: Settings,
+    *,
+    cycles: int,
+    source: str,
+    seed: int,
+    db_path: str | None,
+    out_path: str,
+    top_n: int,
+) -> int:
+    if cycles < 1:
+        print("profile-cycle: --cycles must be >= 1")
+        return 2
+    overrides: dict[str, object] = {
+        "process_role": ProcessRole.LIVE.value,
+        "safe_mode": False,
+        "dry_run": True,
+        "sqlite_profile_enabled": True,
+    }
+    simulator = None
+    if source == "sim":
+        simulator = build_simulator_server(
+            SimulatorConfig(port=0, symbols=list(settings.symbols), seed=seed)
+        ).start()
+        overrides["btcturk_base_url"] = simulator.base_url
+    profiler = configure_statement_profiler(
+        enabled=True, slow_query_ms=settings.sqlite_slow_query_ms
+    )
+    sql_capture = profiler.capture() if profiler is not None else None
+    tracer = CycleTracer(
+        {
+            "http_calls": http_requests_sent,
+            "sql_calls": lambda: sql_capture.statements if sql_capture is not None else 0,
+        }
+    )
+    runner = Stage4CycleRunner()
+    failures = 0
+    try:
+        with tempfile.TemporaryDirectory(prefix="btcbot-profile-") as tmp_dir:
+            overrides["state_db_path"] = db_path or str(Path(tmp_dir) / "profile_state.db")
+            effective_settings = settings.model_copy(update=overrides)
+            with tracer.activate():
+                for _ in range(cycles):
+                    try:
+                        runner.run_one_cycle(effective_settings)
+                    except Exception as exc:  # noqa: BLE001
+                        failures += 1
+                        logger.warning(
+                            "profile_cycle_failed",
+                            extra={"extra": {"error_type": type(exc).__name__}},
+                        )
+    finally:
+        if simulator is not None:
+            simulator.stop()
+        configure_statement_profiler(
+            enabled=settings.sqlite_profile_enabled,
+            slow_query_ms=settings.sqlite_slow_query_ms,
+        )
+
+    lines = tracer.collapsed_stacks()
+    Path(out_path).write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+    print(format_hotspot_table(tracer.hotspots(top_n=top_n)))
+    print(
+        f"profile-cycle: {cycles} cycle(s) from {source}, {failures} failed; "
+        f"collapsed stacks written to {out_path}"
+    )
+    return 1 if failures else 0
+
+
+def run_soak(
+    settings: Settings,
+    *,
+    hours: float,
+    step_seconds: int,
+    sample_every: int,
+    seed: int,
+    run_stage4: bool,
+    db_path: str | None,
+    out_path: str,
+    summary_path: str | None,
+    thresholds: SoakThresholds,
+) -> int:
+    if hours <= 0 or step_seconds < 1 or sample_every < 1:
+        print("soak: --hours must be > 0, --step-seconds and --sample-every >= 1")
+        return 2
+    cycles = max(1, int(hours * 3600 // step_seconds))
+    overrides: dict[str, object] = {
+        "process_role": ProcessRole.LIVE.value,
+        "safe_mode": False,
+        "dry_run": True,
+    }
+    simulator = None
+    if run_stage4:
+        simulator = build_simulator_server(
+            SimulatorConfig(port=0, symbols=list(settings.symbols), seed=seed)
+        ).start()
+        overrides["btcturk_base_url"] = simulator.base_url
+    try:
+        with tempfile.TemporaryDirectory(prefix="btcbot-soak-") as tmp_dir:
+            overrides["state_db_path"] = db_path or str(Path(tmp_dir) / "soak_state.db")
+            effective_settings = settings.model_copy(update=overrides)
+            replay = synthetic_replay(
+                effective_settings.symbols, hours=hours, step_seconds=step_seconds, seed=seed
+            )
+            report = SoakHarness(thresholds=thresholds, run_stage4=run_stage4).run(
+                effective_settings, replay=replay, cycles=cycles, sample_every=sample_every
+            )
+    finally:
+        if simulator is not None:
+            simulator.stop()
+
+    Path(out_path).write_text(
+        json.dumps(report.to_dict(), indent=2, sort_keys=True) + "\n", encoding="utf-8"
+    )
+    summary = format_soak_report(report)
+    if summary_path:
+        Path(summary_path).write_text(summary + "\n", encoding="utf-8")
+    print(summary)
+    print(f"soak: report written to {out_path}")
+    return 0 if report.passed else 1
+
+
 def _doctor_report_json(report: DoctorReport) -> str:
     status = doctor_status(report).upper()
     payload = {
@@ -3404,12 +3999,26 @@ def run_doctor(
     db_path: str | None,
     dataset_path: str | None,
     json_output: bool = False,
+    db_perf: bool = False,
+    apply_indexes: bool = False,
 ) -> int:
-    if db_path:
-        with single_instance_lock(db_path=db_path, account_key=MONITOR_LOCK_ACCOUNT_KEY):
-            report = run_health_checks(settings, db_path=db_path, dataset_path=dataset_path)
-    else:
-        report = run_health_checks(settings, db_path=db_path, dataset_path=dataset_path)
+    applied_indexes: list[str] = []
+    if apply_indexes and db_path and Path(db_path).is_file():
+        # The only doctor write, and only on explicit request: index DDL for the audit.
+        applied_indexes = apply_missing_indexes(db_path)
+    # Doctor reads the state DB through read-only stores; it takes no process lock.
+    report = run_health_checks(
+        settings, db_path=db_path, dataset_path=dataset_path, db_perf=db_perf
+    )
+    if apply_indexes:
+        report.checks.append(
+            DoctorCheck(
+                "db_perf",
+                "applied_indexes",
+                "pass",
+                f"applied={','.join(applied_indexes) or 'none'}",
+            )
+        )
     status = doctor_status(report)
 
     if json_output:
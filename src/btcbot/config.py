@@ -13,6 +13,7 @@ from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
 from btcbot.domain.anomalies import AnomalyCode
 from btcbot.domain.symbols import canonical_symbol
 from btcbot.domain.universe_models import UniverseKnobs
+from btcbot.obs.log_sampling import SamplingRule, parse_sampling_rules
 from btcbot.obs.process_role import ProcessRole, coerce_process_role
 
 logger = logging.getLogger(__name__)
@@ -92,6 +93,9 @@ class Settings(BaseSettings):
         default=True,
         alias="LIVE_RULES_REQUIRE_EXCHANGEINFO",
     )
+    candle_store_path: str | None = Field(default=None, alias="CANDLE_STORE_PATH")
+    candle_interval_seconds: int = Field(default=3600, alias="CANDLE_INTERVAL_SECONDS")
+    candle_backfill_limit: int = Field(default=500, alias="CANDLE_BACKFILL_LIMIT")
     kill_switch: bool = Field(default=True, alias="KILL_SWITCH")
     kill_switch_freeze_all: bool = Field(default=False, alias="KILL_SWITCH_FREEZE_ALL")
     stage4_unknown_freeze_enabled: bool = Field(
@@ -142,6 +146,27 @@ class Settings(BaseSettings):
     )
 
     state_db_path: str = Field(default="btcbot_state.db", alias="STATE_DB_PATH")
+    state_retention_default_hot_days: int = Field(
+        default=90, alias="STATE_RETENTION_DEFAULT_HOT_DAYS"
+    )
+    state_retention_hot_days: dict[str, int] | None = Field(
+        default=None, alias="STATE_RETENTION_HOT_DAYS"
+    )
+    state_retention_chunk_rows: int = Field(default=2000, alias="STATE_RETENTION_CHUNK_ROWS")
+    state_retention_archive_dir: str | None = Field(
+        default=None, alias="STATE_RETENTION_ARCHIVE_DIR"
+    )
+    sqlite_profile_enabled: bool = Field(default=False, alias="SQLITE_PROFILE_ENABLED")
+    sqlite_slow_query_ms: float = Field(default=50.0, alias="SQLITE_SLOW_QUERY_MS")
+    resource_accounting_enabled: bool = Field(default=False, alias="RESOURCE_ACCOUNTING_ENABLED")
+    resource_tracemalloc_enabled: bool = Field(default=False, alias="RESOURCE_TRACEMALLOC_ENABLED")
+    resource_tracemalloc_top_n: int = Field(default=10, alias="RESOURCE_TRACEMALLOC_TOP_N")
+    http_timing_stats_enabled: bool = Field(default=True, alias="HTTP_TIMING_STATS_ENABLED")
+    metrics_sink: str = Field(default="aggregating", alias="METRICS_SINK")
+    metrics_http_port: int = Field(default=0, alias="METRICS_HTTP_PORT")
+    metrics_snapshot_interval_seconds: float = Field(
+        default=60.0, alias="METRICS_SNAPSHOT_INTERVAL_SECONDS"
+    )
     process_role: str = Field(
         default=ProcessRole.MONITOR.value,
         validation_alias=AliasChoices("APP_ROLE", "PROCESS_ROLE"),
@@ -224,6 +249,16 @@ class Settings(BaseSettings):
         alias="STAGE7_MAX_SPREAD_BPS",
     )
     stage7_vol_lookback: int = Field(default=20, alias="STAGE7_VOL_LOOKBACK")
+    stage7_universe_fetch_concurrency: int = Field(
+        default=8, alias="STAGE7_UNIVERSE_FETCH_CONCURRENCY"
+    )
+    stage7_universe_fetch_deadline_sec: float = Field(
+        default=15.0, alias="STAGE7_UNIVERSE_FETCH_DEADLINE_SEC"
+    )
+    indicator_engine_enabled: bool = Field(default=True, alias="INDICATOR_ENGINE_ENABLED")
+    indicator_ema_span: int = Field(default=20, alias="INDICATOR_EMA_SPAN")
+    indicator_atr_period: int = Field(default=14, alias="INDICATOR_ATR_PERIOD")
+    strategy_anchor_source: str = Field(default="mark", alias="STRATEGY_ANCHOR_SOURCE")
     stage7_vol_low_threshold: Decimal = Field(
         default=Decimal("0.0025"), alias="STAGE7_VOL_LOW_THRESHOLD"
     )
@@ -374,6 +409,10 @@ class Settings(BaseSettings):
     )
 
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    log_sampling_rules: dict[str, SamplingRule] | None = Field(
+        default=None, alias="LOG_SAMPLING_RULES"
+    )
+    log_sampling_summary_seconds: float = Field(default=60.0, alias="LOG_SAMPLING_SUMMARY_SECONDS")
 
     observability_enabled: bool = Field(default=False, alias="OBSERVABILITY_ENABLED")
     observability_metrics_exporter: str = Field(
@@ -767,6 +806,108 @@ class Settings(BaseSettings):
                 raise ValueError("STAGE7_SCORE_WEIGHTS values must be numeric") from exc
         return normalized
 
+    @field_validator("state_retention_hot_days", mode="before")
+    def validate_state_retention_hot_days(
+        cls, value: str | dict[str, object] | None
+    ) -> dict[str, int] | None:
+        if value is None:
+            return None
+        parsed: object = value
+        if isinstance(value, str):
+            token = value.strip()
+            if not token:
+                return None
+            try:
+                parsed = json.loads(token)
+            except json.JSONDecodeError as exc:
+                raise ValueError("STATE_RETENTION_HOT_DAYS must be valid JSON") from exc
+        if not isinstance(parsed, dict):
+            raise ValueError("STATE_RETENTION_HOT_DAYS must be a dict[str,int]")
+        normalized: dict[str, int] = {}
+        for table, days in parsed.items():
+            if not isinstance(table, str) or not table.strip():
+                raise ValueError("STATE_RETENTION_HOT_DAYS keys must be table names")
+            try:
+                normalized[table.strip()] = int(days)
+            except (TypeError, ValueError) as exc:
+                raise ValueError("STATE_RETENTION_HOT_DAYS values must be integers") from exc
+            if normalized[table.strip()] < 1:
+                raise ValueError("STATE_RETENTION_HOT_DAYS values must be >= 1")
+        return normalized
+
+    @field_validator("state_retention_default_hot_days", "state_retention_chunk_rows")
+    def validate_state_retention_positive(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError(
+                "STATE_RETENTION_DEFAULT_HOT_DAYS and STATE_RETENTION_CHUNK_ROWS must be >= 1"
+            )
+        return value
+
+    @field_validator("sqlite_slow_query_ms")
+    def validate_sqlite_slow_query_ms(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("SQLITE_SLOW_QUERY_MS must be >= 0")
+        return value
+
+    @field_validator("resource_tracemalloc_top_n")
+    def validate_resource_tracemalloc_top_n(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("RESOURCE_TRACEMALLOC_TOP_N must be >= 1")
+        return value
+
+    @field_validator("log_sampling_rules", mode="before")
+    def validate_log_sampling_rules(
+        cls, value: str | dict[str, object] | None
+    ) -> dict[str, SamplingRule] | None:
+        if value is None:
+            return None
+        parsed: object = value
+        if isinstance(value, str):
+            token = value.strip()
+            if not token:
+                return None
+            try:
+                parsed = json.loads(token)
+            except json.JSONDecodeError as exc:
+                raise ValueError("LOG_SAMPLING_RULES must be valid JSON") from exc
+        if not isinstance(parsed, dict):
+            raise ValueError("LOG_SAMPLING_RULES must be a dict of event name to rule")
+        try:
+            return parse_sampling_rules(parsed)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"LOG_SAMPLING_RULES invalid: {exc}") from exc
+
+    @field_validator("log_sampling_summary_seconds")
+    def validate_log_sampling_summary_seconds(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("LOG_SAMPLING_SUMMARY_SECONDS must be >= 0")
+        return value
+
+    @field_validator("metrics_sink", mode="before")
+    def validate_metrics_sink(cls, value: object) -> str:
+        normalized = str(value).strip().lower()
+        if normalized not in {"aggregating", "logging"}:
+            raise ValueError("METRICS_SINK must be one of aggregating, logging")
+        return normalized
+
+    @field_validator("metrics_http_port")
+    def validate_metrics_http_port(cls, value: int) -> int:
+        if not 0 <= value <= 65535:
+            raise ValueError("METRICS_HTTP_PORT must be between 0 and 65535")
+        return value
+
+    @field_validator("metrics_snapshot_interval_seconds")
+    def validate_metrics_snapshot_interval_seconds(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("METRICS_SNAPSHOT_INTERVAL_SECONDS must be >= 0")
+        return value
+
+    @field_validator("state_retention_archive_dir", mode="before")
+    def normalize_state_retention_archive_dir(cls, value: object) -> object:
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
     @field_validator("stage7_slippage_bps", "stage7_fees_bps")
     def validate_stage7_non_negative_bps(cls, value: Decimal) -> Decimal:
         if value < 0:
@@ -780,12 +921,51 @@ class Settings(BaseSettings):
             raise ValueError("STAGE7_MARK_PRICE_SOURCE must be one of: mid,last")
         return normalized
 
-    @field_validator("stage7_universe_size", "stage7_vol_lookback")
+    @field_validator(
+        "stage7_universe_size", "stage7_vol_lookback", "stage7_universe_fetch_concurrency"
+    )
     def validate_stage7_positive_ints(cls, value: int) -> int:
         if value < 1:
             raise ValueError("Stage7 universe integer settings must be >= 1")
         return value
 
+    @field_validator("indicator_ema_span", "indicator_atr_period")
+    def validate_indicator_periods(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("INDICATOR_EMA_SPAN and INDICATOR_ATR_PERIOD must be >= 1")
+        return value
+
+    @field_validator("strategy_anchor_source")
+    def validate_strategy_anchor_source(cls, value: str) -> str:
+        normalized = value.strip().lower()
+        if normalized not in {"mark", "ema"}:
+            raise ValueError("STRATEGY_ANCHOR_SOURCE must be one of: mark,ema")
+        return normalized
+
+    @field_validator("candle_store_path", mode="before")
+    def normalize_candle_store_path(cls, value: object) -> object:
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+    @field_validator("candle_interval_seconds")
+    def validate_candle_interval_seconds(cls, value: int) -> int:
+        if value < 60 or value % 60 != 0:
+            raise ValueError("CANDLE_INTERVAL_SECONDS must be a positive multiple of 60")
+        return value
+
+    @field_validator("candle_backfill_limit")
+    def validate_candle_backfill_limit(cls, value: int) -> int:
+        if value < 1:
+            raise ValueError("CANDLE_BACKFILL_LIMIT must be >= 1")
+        return value
+
+    @field_validator("stage7_universe_fetch_deadline_sec")
+    def validate_stage7_universe_fetch_deadline(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("STAGE7_UNIVERSE_FETCH_DEADLINE_SEC must be > 0")
+        return value
+
     @field_validator(
         "universe_top_n",
         "universe_refresh_minutes",
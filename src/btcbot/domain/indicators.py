@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+
+INDICATOR_PAYLOAD_VERSION = 1
+
+
+class RollingWindow:
+    """Fixed-size sliding window over float64 samples.
+
+    ``push`` is O(1): mean and population variance are maintained with Welford's
+    update/downdate, min/max with monotonic deques (amortized O(1)). ``replace_last``
+    revises the newest sample (a still-forming candle); it keeps mean/variance O(1)
+    and rebuilds the min/max deques in O(size).
+    """
+
+    __slots__ = ("size", "_values", "_head", "_count", "_seq", "_mean", "_m2", "_mins", "_maxs")
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.size = size
+        self._values = array("d", [0.0]) * size
+        self._head = 0
+        self._count = 0
+        self._seq = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._mins: deque[tuple[int, float]] = deque()
+        self._maxs: deque[tuple[int, float]] = deque()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float | None:
+        return self._mean if self._count else None
+
+    @property
+    def variance(self) -> float | None:
+        if not self._count:
+            return None
+        return max(0.0, self._m2 / self._count)
+
+    @property
+    def std(self) -> float | None:
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    @property
+    def minimum(self) -> float | None:
+        return self._mins[0][1] if self._mins else None
+
+    @property
+    def maximum(self) -> float | None:
+        return self._maxs[0][1] if self._maxs else None
+
+    def values(self) -> list[float]:
+        """Return samples oldest first."""
+        start = (self._head - self._count) % self.size
+        return [self._values[(start + idx) % self.size] for idx in range(self._count)]
+
+    def push(self, value: float) -> None:
+        if self._count == self.size:
+            self._remove(self._values[self._head])
+        else:
+            self._count += 1
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.size
+        self._add(value)
+        self._seq += 1
+        oldest_seq = self._seq - self._count
+        while self._mins and self._mins[-1][1] >= value:
+            self._mins.pop()
+        self._mins.append((self._seq, value))
+        while self._maxs and self._maxs[-1][1] <= value:
+            self._maxs.pop()
+        self._maxs.append((self._seq, value))
+        while self._mins[0][0] <= oldest_seq:
+            self._mins.popleft()
+        while self._maxs[0][0] <= oldest_seq:
+            self._maxs.popleft()
+
+    def replace_last(self, value: float) -> None:
+        if not self._count:
+            self.push(value)
+            return
+        newest = (self._head - 1) % self.size
+        self._remove(self._values[newest])
+        self._values[newest] = value
+        self._add(value)
+        self._rebuild_extrema()
+
+    def _add(self, value: float) -> None:
+        # Welford update for a window that has already been resized to ``_count``.
+        n = self._count
+        delta = value - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        # Welford downdate: take ``value`` out of the current ``_count`` samples.
+        n = self._count
+        if n <= 1:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        old_mean = self._mean
+        self._mean = (n * old_mean - value) / (n - 1)
+        self._m2 -= (value - old_mean) * (value - self._mean)
+
+    def _rebuild_extrema(self) -> None:
+        self._mins.clear()
+        self._maxs.clear()
+        first_seq = self._seq - self._count + 1
+        for offset, value in enumerate(self.values()):
+            seq = first_seq + offset
+            while self._mins and self._mins[-1][1] >= value:
+                self._mins.pop()
+            self._mins.append((seq, value))
+            while self._maxs and self._maxs[-1][1] <= value:
+                self._maxs.pop()
+            self._maxs.append((seq, value))
+
+    @classmethod
+    def from_values(cls, size: int, values: list[float]) -> RollingWindow:
+        window = cls(size)
+        for value in values[-size:]:
+            window.push(float(value))
+        return window
+
+
+@dataclass(frozen=True)
+class IndicatorSnapshot:
+    """Decimal view of a series' indicators, produced at the decision boundary."""
+
+    key: str
+    as_of: datetime | None
+    samples: int
+    last: Decimal | None
+    return_count: int
+    return_mean: Decimal | None
+    return_std: Decimal | None
+    ema: Decimal | None
+    rolling_min: Decimal | None
+    rolling_max: Decimal | None
+    atr: Decimal | None
+
+
+class SeriesIndicators:
+    """O(1)-update indicators for one price series.
+
+    Samples are keyed by an integer timestamp. A sample with the same timestamp as the
+    newest one revises it in place (the current candle is still forming); older
+    timestamps are ignored, so re-feeding an overlapping history is idempotent.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: int,
+        ema_span: int,
+        atr_period: int,
+        log_returns: bool = False,
+    ) -> None:
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        if ema_span < 1 or atr_period < 1:
+            raise ValueError("ema_span and atr_period must be >= 1")
+        self.window = window
+        self.ema_span = ema_span
+        self.atr_period = atr_period
+        self.log_returns = log_returns
+        self.prices = RollingWindow(window)
+        self.returns = RollingWindow(window - 1)
+        self.last_ts: int | None = None
+        self.last_close: float | None = None
+        self.prev_close: float | None = None
+        self.ema: float | None = None
+        self.prev_ema: float | None = None
+        self.atr: float | None = None
+        self.atr_seed: list[float] = []
+        self._prev_atr: tuple[float | None, list[float]] = (None, [])
+
+    def config(self) -> dict[str, object]:
+        return {
+            "window": self.window,
+            "ema_span": self.ema_span,
+            "atr_period": self.atr_period,
+            "log_returns": self.log_returns,
+        }
+
+    def update(
+        self,
+        ts: int,
+        close: float,
+        *,
+        high: float | None = None,
+        low: float | None = None,
+    ) -> bool:
+        if not math.isfinite(close) or close <= 0:
+            return False
+        if self.last_ts is not None and ts < self.last_ts:
+            return False
+        revise = self.last_ts is not None and ts == self.last_ts
+        prev_close = self.prev_close if revise else self.last_close
+
+        if revise:
+            self.prices.replace_last(close)
+        else:
+            self.prices.push(close)
+        if prev_close is not None:
+            ret = math.log(close / prev_close) if self.log_returns else close / prev_close - 1.0
+            if revise and self.returns.count:
+                self.returns.replace_last(ret)
+            else:
+                self.returns.push(ret)
+
+        alpha = 2.0 / (self.ema_span + 1.0)
+        base_ema = self.prev_ema if revise else self.ema
+        self.prev_ema = base_ema
+        self.ema = close if base_ema is None else base_ema + alpha * (close - base_ema)
+
+        if revise:
+            self.atr, self.atr_seed = self._prev_atr[0], list(self._prev_atr[1])
+        self._prev_atr = (self.atr, list(self.atr_seed))
+        self._update_atr(
+            high=close if high is None else high,
+            low=close if low is None else low,
+            prev_close=prev_close,
+        )
+
+        self.prev_close = prev_close
+        self.last_close = close
+        self.last_ts = ts
+        return True
+
+    def _update_atr(self, *, high: float, low: float, prev_close: float | None) -> None:
+        true_range = high - low
+        if prev_close is not None:
+            true_range = max(true_range, abs(high - prev_close), abs(low - prev_close))
+        if self.atr is None:
+            self.atr_seed.append(true_range)
+            if len(self.atr_seed) >= self.atr_period:
+                self.atr = sum(self.atr_seed) / len(self.atr_seed)
+                self.atr_seed = []
+            return
+        # Wilder smoothing.
+        self.atr = (self.atr * (self.atr_period - 1) + true_range) / self.atr_period
+
+    def snapshot(self, key: str) -> IndicatorSnapshot:
+        return IndicatorSnapshot(
+            key=key,
+            as_of=None if self.last_ts is None else datetime.fromtimestamp(self.last_ts, tz=UTC),
+            samples=self.prices.count,
+            last=_to_decimal(self.last_close),
+            return_count=self.returns.count,
+            return_mean=_to_decimal(self.returns.mean),
+            return_std=_to_decimal(self.returns.std),
+            ema=_to_decimal(self.ema),
+            rolling_min=_to_decimal(self.prices.minimum),
+            rolling_max=_to_decimal(self.prices.maximum),
+            atr=_to_decimal(self.atr),
+        )
+
+    def to_payload(self) -> dict[str, object]:
+        return {
+            "version": INDICATOR_PAYLOAD_VERSION,
+            "config": self.config(),
+            "last_ts": self.last_ts,
+            "last_close": self.last_close,
+            "prev_close": self.prev_close,
+            "prices": self.prices.values(),
+            "returns": self.returns.values(),
+            "ema": self.ema,
+            "prev_ema": self.prev_ema,
+            "atr": self.atr,
+            "atr_seed": list(self.atr_seed),
+            "prev_atr": self._prev_atr[0],
+            "prev_atr_seed": list(self._prev_atr[1]),
+        }
+
+    @classmethod
+    def from_payload(
+        cls, payload: dict[str, object], *, expected_config: dict[str, object]
+    ) -> SeriesIndicators | None:
+        """Rebuild from :meth:`to_payload`; ``None`` if the payload no longer applies."""
+        if payload.get("version") != INDICATOR_PAYLOAD_VERSION:
+            return None
+        if payload.get("config") != expected_config:
+            return None
+        series = cls(
+            window=int(expected_config["window"]),
+            ema_span=int(expected_config["ema_span"]),
+            atr_period=int(expected_config["atr_period"]),
+            log_returns=bool(expected_config["log_returns"]),
+        )
+        series.prices = RollingWindow.from_values(series.window, list(payload["prices"]))
+        series.returns = RollingWindow.from_values(series.window - 1, list(payload["returns"]))
+        series.last_ts = _optional_int(payload.get("last_ts"))
+        series.last_close = _optional_float(payload.get("last_close"))
+        series.prev_close = _optional_float(payload.get("prev_close"))
+        series.ema = _optional_float(payload.get("ema"))
+        series.prev_ema = _optional_float(payload.get("prev_ema"))
+        series.atr = _optional_float(payload.get("atr"))
+        series.atr_seed = [float(item) for item in payload.get("atr_seed", [])]
+        series._prev_atr = (
+            _optional_float(payload.get("prev_atr")),
+            [float(item) for item in payload.get("prev_atr_seed", [])],
+        )
+        return series
+
+
+def _to_decimal(value: float | None) -> Decimal | None:
+    if value is None or not math.isfinite(value):
+        return None
+    return Decimal(str(value))
+
+
+def _optional_float(value: object) -> float | None:
+    return None if value is None else float(value)
+
+
+def _optional_int(value: object) -> int | None:
+    return None if value is None else int(value)
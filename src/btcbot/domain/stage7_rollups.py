@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta, tzinfo
+from decimal import Context, Decimal
+from typing import Literal
+
+RollupPeriod = Literal["daily", "weekly"]
+ROLLUP_PERIODS: tuple[RollupPeriod, ...] = ("daily", "weekly")
+
+_ZERO = Decimal("0")
+# Sums are carried with enough precision to be exact for per-cycle values, so a bucket
+# built incrementally at write time equals one re-bucketed from raw rows in any order.
+_SUM_CONTEXT = Context(prec=60)
+
+
+def parse_ts_utc(raw: str) -> datetime:
+    normalized = raw[:-1] + "+00:00" if raw.endswith("Z") else raw
+    parsed = datetime.fromisoformat(normalized)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.astimezone(UTC)
+
+
+def rollup_bucket_bounds(
+    ts: datetime, period: RollupPeriod, tz: tzinfo = UTC
+) -> tuple[datetime, datetime]:
+    """Return the inclusive ``(start, end)`` of the daily/weekly bucket holding ``ts``."""
+    local = ts.astimezone(tz)
+    day_start = datetime(local.year, local.month, local.day, tzinfo=tz)
+    if period == "daily":
+        return day_start, day_start.replace(hour=23, minute=59, second=59)
+    start = day_start - timedelta(days=day_start.weekday())
+    return start, start + timedelta(days=6, hours=23, minutes=59, seconds=59)
+
+
+def normalize_drawdown_fields(
+    *,
+    raw_ratio: object | None,
+    raw_pct: object | None,
+) -> tuple[Decimal, Decimal | None]:
+    if raw_ratio not in (None, ""):
+        ratio = _as_decimal(raw_ratio)
+        if ratio > Decimal("1"):
+            # Some legacy rows persisted percentage-like values in ratio columns.
+            pct = ratio
+            ratio = ratio / Decimal("100")
+            return ratio, pct
+        pct = ratio * Decimal("100")
+        return ratio, pct
+    if raw_pct in (None, ""):
+        return _ZERO, None
+    pct = _as_decimal(raw_pct)
+    ratio = pct / Decimal("100") if pct > Decimal("1") else pct
+    return ratio, pct
+
+
+@dataclass(slots=True)
+class RollupTotals:
+    """Additive per-bucket aggregates of Stage 7 run metrics."""
+
+    cycles_count: int = 0
+    gross_pnl_try: Decimal = _ZERO
+    net_pnl_try: Decimal = _ZERO
+    fees_try: Decimal = _ZERO
+    slippage_try: Decimal = _ZERO
+    turnover_try: Decimal = _ZERO
+    rejects: int = 0
+    fill_rate_total: Decimal = _ZERO
+    max_drawdown_ratio: Decimal = _ZERO
+
+    @classmethod
+    def from_cycle(
+        cls,
+        *,
+        gross_pnl_try: Decimal,
+        net_pnl_try: Decimal,
+        fees_try: Decimal,
+        slippage_try: Decimal,
+        turnover_try: Decimal,
+        rejects: int,
+        fill_rate: Decimal,
+        max_drawdown_ratio: Decimal,
+    ) -> RollupTotals:
+        return cls(
+            cycles_count=1,
+            gross_pnl_try=gross_pnl_try,
+            net_pnl_try=net_pnl_try,
+            fees_try=fees_try,
+            slippage_try=slippage_try,
+            turnover_try=turnover_try,
+            rejects=rejects,
+            fill_rate_total=fill_rate,
+            max_drawdown_ratio=max_drawdown_ratio,
+        )
+
+    @classmethod
+    def from_metrics_row(cls, row: Mapping[str, object]) -> RollupTotals:
+        """Contribution of one ``stage7_run_metrics`` row, as the report would read it."""
+        submitted = _as_int(row.get("oms_submitted_count"))
+        filled = _as_int(row.get("oms_filled_count"))
+        ratio, _ = normalize_drawdown_fields(
+            raw_ratio=row.get("max_drawdown_ratio"),
+            raw_pct=row.get("max_drawdown_pct"),
+        )
+        return cls.from_cycle(
+            gross_pnl_try=_as_decimal(row.get("gross_pnl_try")),
+            net_pnl_try=_as_decimal(row.get("net_pnl_try")),
+            fees_try=_as_decimal(row.get("fees_try")),
+            slippage_try=_as_decimal(row.get("slippage_try")),
+            turnover_try=_as_decimal(row.get("turnover_try")),
+            rejects=_as_int(row.get("oms_rejected_count")),
+            fill_rate=Decimal(filled) / Decimal(max(1, submitted)),
+            max_drawdown_ratio=ratio,
+        )
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, object]) -> RollupTotals:
+        return cls(
+            cycles_count=_as_int(record.get("cycles_count")),
+            gross_pnl_try=_as_decimal(record.get("gross_pnl_try")),
+            net_pnl_try=_as_decimal(record.get("net_pnl_try")),
+            fees_try=_as_decimal(record.get("fees_try")),
+            slippage_try=_as_decimal(record.get("slippage_try")),
+            turnover_try=_as_decimal(record.get("turnover_try")),
+            rejects=_as_int(record.get("rejects")),
+            fill_rate_total=_as_decimal(record.get("fill_rate_total")),
+            max_drawdown_ratio=_as_decimal(record.get("max_drawdown_ratio")),
+        )
+
+    def add(self, other: RollupTotals) -> None:
+        self.cycles_count += other.cycles_count
+        self.gross_pnl_try = _SUM_CONTEXT.add(self.gross_pnl_try, other.gross_pnl_try)
+        self.net_pnl_try = _SUM_CONTEXT.add(self.net_pnl_try, other.net_pnl_try)
+        self.fees_try = _SUM_CONTEXT.add(self.fees_try, other.fees_try)
+        self.slippage_try = _SUM_CONTEXT.add(self.slippage_try, other.slippage_try)
+        self.turnover_try = _SUM_CONTEXT.add(self.turnover_try, other.turnover_try)
+        self.rejects += other.rejects
+        self.fill_rate_total = _SUM_CONTEXT.add(self.fill_rate_total, other.fill_rate_total)
+        self.max_drawdown_ratio = max(self.max_drawdown_ratio, other.max_drawdown_ratio)
+
+    @property
+    def fill_rate_avg(self) -> Decimal:
+        return self.fill_rate_total / Decimal(max(1, self.cycles_count))
+
+    def to_record(self) -> dict[str, object]:
+        return {
+            "cycles_count": self.cycles_count,
+            "gross_pnl_try": str(self.gross_pnl_try),
+            "net_pnl_try": str(self.net_pnl_try),
+            "fees_try": str(self.fees_try),
+            "slippage_try": str(self.slippage_try),
+            "turnover_try": str(self.turnover_try),
+            "rejects": self.rejects,
+            "fill_rate_total": str(self.fill_rate_total),
+            "max_drawdown_ratio": str(self.max_drawdown_ratio),
+        }
+
+
+def _as_decimal(value: object) -> Decimal:
+    if value is None:
+        return _ZERO
+    return Decimal(str(value))
+
+
+def _as_int(value: object) -> int:
+    if value is None:
+        return 0
+    return int(value)
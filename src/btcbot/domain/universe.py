@@ -28,12 +28,18 @@ class UniverseSelectionResult:
     freeze_reasons: list[str] | None = None
     excluded_counts: dict[str, int] | None = None
     churn_count: int = 0
+    fetch_latency_ms: dict[str, float] | None = None
+    fetch_timed_out_symbols: list[str] | None = None
 
     def __post_init__(self) -> None:
         if self.freeze_reasons is None:
             object.__setattr__(self, "freeze_reasons", [])
         if self.excluded_counts is None:
             object.__setattr__(self, "excluded_counts", {})
+        if self.fetch_latency_ms is None:
+            object.__setattr__(self, "fetch_latency_ms", {})
+        if self.fetch_timed_out_symbols is None:
+            object.__setattr__(self, "fetch_timed_out_symbols", [])
         if self.freeze_reason is None and self.freeze_reasons:
             object.__setattr__(self, "freeze_reason", self.freeze_reasons[0])
 
@@ -3,8 +3,12 @@ from __future__ import annotations
 import json
 import logging
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import UTC, datetime
+from logging.handlers import QueueListener
 from typing import Any
 
 from btcbot.logging_context import get_logging_context
@@ -33,8 +37,13 @@ _STANDARD_LOG_RECORD_FIELDS = {
     "process",
     "message",
     "asctime",
+    "taskName",
+    "log_context",
 }
 
+DEFAULT_LOG_QUEUE_CAPACITY = 10_000
+LOG_QUEUE_FLUSH_TIMEOUT_SECONDS = 5.0
+
 
 def _extract_structured_fields(record: logging.LogRecord) -> dict[str, Any]:
     structured: dict[str, Any] = {}
@@ -51,14 +60,17 @@ def _extract_structured_fields(record: logging.LogRecord) -> dict[str, Any]:
 class JsonFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         payload: dict[str, Any] = {
-            "timestamp": datetime.now(UTC).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": sanitize_text(record.getMessage()),
         }
         payload.update(redact_data(_extract_structured_fields(record)))
 
-        context = get_logging_context()
+        # Records handed over by QueueLoggingHandler carry the caller's context.
+        context = getattr(record, "log_context", None)
+        if context is None:
+            context = get_logging_context()
         for field in ("run_id", "cycle_id", "client_order_id", "order_id", "symbol"):
             payload[field] = context.get(field)
 
@@ -87,6 +99,128 @@ class SafeStreamHandler(logging.StreamHandler):
             return
 
 
+class _QueueListener(QueueListener):
+    def __init__(self, owner: QueueLoggingHandler, *handlers: logging.Handler) -> None:
+        super().__init__(owner.queue, *handlers, respect_handler_level=True)
+        self._owner = owner
+
+    def handle(self, record: logging.LogRecord) -> None:
+        dropped = self._owner.take_unreported_drops()
+        if dropped:
+            super().handle(self._owner.overflow_record(dropped))
+        super().handle(record)
+
+    def enqueue_sentinel(self) -> None:
+        # Blocking put: a full queue must not make stop() raise or skip the drain.
+        self.queue.put(self._sentinel, timeout=LOG_QUEUE_FLUSH_TIMEOUT_SECONDS)
+
+
+class QueueLoggingHandler(logging.Handler):
+    """Hands records to a bounded queue; a listener thread formats and writes them.
+
+    The calling thread only captures the logging context, renders ``msg % args``,
+    copies the structured ``extra`` dict (callers may keep mutating theirs) and
+    enqueues, so JSON formatting, redaction and the stream write stay off the cycle
+    thread. When the queue is full the record is dropped and counted; the listener
+    reports the drops as a ``log_queue_overflow`` warning ahead of its next record.
+    """
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        *,
+        capacity: int = DEFAULT_LOG_QUEUE_CAPACITY,
+    ) -> None:
+        super().__init__()
+        self.queue: queue.Queue[logging.LogRecord | None] = queue.Queue(maxsize=max(1, capacity))
+        self.target = target
+        self.enqueued_total = 0
+        self.dropped_total = 0
+        self._unreported_drops = 0
+        self._drops_lock = threading.Lock()
+        self._listener: _QueueListener | None = _QueueListener(self, target)
+        self._listener.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            record.log_context = get_logging_context()
+            if record.args:
+                record.msg = record.getMessage()
+                record.args = None
+            extras = getattr(record, "extra", None)
+            if isinstance(extras, dict):
+                record.extra = dict(extras)
+            self.queue.put_nowait(record)
+            with self._drops_lock:
+                self.enqueued_total += 1
+        except queue.Full:
+            with self._drops_lock:
+                self.dropped_total += 1
+                self._unreported_drops += 1
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def take_unreported_drops(self) -> int:
+        if not self._unreported_drops:
+            return 0
+        with self._drops_lock:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+        return dropped
+
+    def overflow_record(self, dropped: int) -> logging.LogRecord:
+        record = logging.LogRecord(
+            name=__name__,
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg="log_queue_overflow",
+            args=None,
+            exc_info=None,
+        )
+        record.extra = {
+            "dropped": dropped,
+            "dropped_total": self.dropped_total,
+            "capacity": self.queue.maxsize,
+        }
+        return record
+
+    def stats(self) -> dict[str, int]:
+        with self._drops_lock:
+            enqueued_total, dropped_total = self.enqueued_total, self.dropped_total
+        return {
+            "enqueued_total": enqueued_total,
+            "dropped_total": dropped_total,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+        }
+
+    def flush(self, timeout: float = LOG_QUEUE_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """Wait until the listener has written everything enqueued so far."""
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        dropped = self.take_unreported_drops()
+        if dropped:
+            self.target.handle(self.overflow_record(dropped))
+        self.target.flush()
+        return True
+
+    def close(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            self.flush()
+            try:
+                listener.stop()
+            except queue.Full:
+                pass
+        self.target.close()
+        super().close()
+
+
 def _resolve_log_level(level: str | int | None) -> int:
     if isinstance(level, int):
         return level
@@ -104,12 +238,40 @@ def _resolve_named_level_from_env(env_name: str, default_level: int) -> int:
     return resolved if isinstance(resolved, int) else default_level
 
 
+def _log_queue_capacity() -> int:
+    """``LOG_QUEUE_CAPACITY``: records buffered for the writer thread; ``0`` logs synchronously."""
+    raw = os.getenv("LOG_QUEUE_CAPACITY")
+    if raw is None or not raw.strip():
+        return DEFAULT_LOG_QUEUE_CAPACITY
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_LOG_QUEUE_CAPACITY
+
+
+_INSTALLED_HANDLER: logging.Handler | None = None
+
+
+def installed_log_handler() -> logging.Handler | None:
+    """The root handler installed by the last :func:`setup_logging` call, if any."""
+    return _INSTALLED_HANDLER
+
+
 def setup_logging(level: str | int | None = None) -> None:
-    handler = SafeStreamHandler(stream=sys.__stderr__)
-    handler.setFormatter(JsonFormatter())
+    global _INSTALLED_HANDLER
+    stream_handler = SafeStreamHandler(stream=sys.__stderr__)
+    stream_handler.setFormatter(JsonFormatter())
+    capacity = _log_queue_capacity()
+    handler: logging.Handler = (
+        QueueLoggingHandler(stream_handler, capacity=capacity) if capacity else stream_handler
+    )
     root = logging.getLogger()
-    root.handlers.clear()
+    for previous in list(root.handlers):
+        root.removeHandler(previous)
+        if isinstance(previous, QueueLoggingHandler):
+            previous.close()
     root.addHandler(handler)
+    _INSTALLED_HANDLER = handler
     resolved_level = _resolve_log_level(level)
     root.setLevel(resolved_level)
 
@@ -1,38 +1,47 @@
 from btcbot.obs.alerts import (
     BASELINE_ALERT_RULES,
     DRY_RUN_ALERT_RULES,
+    RESOURCE_ALERT_RULES,
     AlertRule,
     format_alert_rules,
 )
 from btcbot.obs.logging import cycle_context, get_logger, set_base_context
 from btcbot.obs.metric_registry import REGISTRY, MetricDef, MetricType, validate_registry
 from btcbot.obs.metrics import (
+    LoggingMetricsSink,
     MetricsSink,
     emit_metric,
+    get_metrics_sink,
     inc_counter,
     observe_histogram,
     set_gauge,
     set_metrics_sink,
 )
+from btcbot.obs.metrics_aggregator import AggregatingMetricsSink, render_prometheus
 from btcbot.obs.process_role import ProcessRole, get_process_role_from_env
 
 __all__ = [
+    "AggregatingMetricsSink",
     "AlertRule",
     "BASELINE_ALERT_RULES",
     "DRY_RUN_ALERT_RULES",
+    "LoggingMetricsSink",
     "MetricDef",
     "MetricType",
     "MetricsSink",
     "ProcessRole",
     "REGISTRY",
+    "RESOURCE_ALERT_RULES",
     "cycle_context",
     "emit_metric",
     "format_alert_rules",
     "get_logger",
+    "get_metrics_sink",
     "get_process_role_from_env",
     "inc_counter",
     "set_base_context",
     "observe_histogram",
+    "render_prometheus",
     "set_gauge",
     "set_metrics_sink",
     "validate_registry",
@@ -7,6 +7,7 @@ import re
 from collections import deque
 from collections.abc import Iterable, Mapping
 from dataclasses import dataclass, field
+from typing import Protocol
 
 from btcbot.obs.alerts import AlertRule
 
@@ -17,6 +18,14 @@ _CONDITION_RE = re.compile(
     r"^\s*(?P<left>value|delta|rate_per_minute|p95|count)\s*"
     r"(?P<op>==|!=|>=|<=|>|<)\s*(?P<right>-?\d+(?:\.\d+)?)\s*$"
 )
+_EMPTY_STATS = {"value": 0.0, "delta": 0.0, "rate_per_minute": 0.0, "p95": 0.0, "count": 0.0}
+# Relative accuracy of the p95 sketch: estimates are within 1% of a sample in the window.
+_SKETCH_RELATIVE_ACCURACY = 0.01
+_SKETCH_GAMMA = (1 + _SKETCH_RELATIVE_ACCURACY) / (1 - _SKETCH_RELATIVE_ACCURACY)
+_SKETCH_LOG_GAMMA = math.log(_SKETCH_GAMMA)
+_SKETCH_MIN_ABS = 1e-9
+_SKETCH_OFFSET = 1 - math.floor(math.log(_SKETCH_MIN_ABS) / _SKETCH_LOG_GAMMA)
+_DEFAULT_PERSIST_HORIZON_SECONDS = 600
 
 
 @dataclass(frozen=True)
@@ -30,47 +39,238 @@ class AlertEvent:
     details: dict[str, object] = field(default_factory=dict)
 
 
-class MetricWindowStore:
-    def __init__(self, max_samples_per_metric: int = 2048) -> None:
-        self._max_samples_per_metric = max(2, max_samples_per_metric)
-        self._series: dict[str, deque[tuple[int, float]]] = {}
-
-    def record(self, metric_name: str, value: float | int, ts_epoch: int) -> None:
-        series = self._series.setdefault(
-            metric_name, deque(maxlen=self._max_samples_per_metric)
-        )
-        series.append((int(ts_epoch), float(value)))
+class _QuantileSketch:
+    """Log-bucketed counts (DDSketch-style) that support removal, for sliding windows."""
+
+    __slots__ = ("_counts",)
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+
+    @staticmethod
+    def _key(value: float) -> int:
+        magnitude = abs(value)
+        if magnitude < _SKETCH_MIN_ABS:
+            return 0
+        key = math.ceil(math.log(magnitude) / _SKETCH_LOG_GAMMA) + _SKETCH_OFFSET
+        return key if value > 0 else -key
+
+    @staticmethod
+    def _representative(key: int) -> float:
+        if key == 0:
+            return 0.0
+        index = abs(key) - _SKETCH_OFFSET
+        value = 2 * _SKETCH_GAMMA**index / (_SKETCH_GAMMA + 1)
+        return value if key > 0 else -value
+
+    def add(self, value: float) -> None:
+        key = self._key(value)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def remove(self, value: float) -> None:
+        key = self._key(value)
+        remaining = self._counts[key] - 1
+        if remaining:
+            self._counts[key] = remaining
+        else:
+            del self._counts[key]
+
+    def value_at_rank(self, rank: int) -> float:
+        seen = 0
+        for key in sorted(self._counts):
+            seen += self._counts[key]
+            if seen >= rank:
+                return self._representative(key)
+        return 0.0
 
-    def compute(self, window: str, metric_name: str) -> dict[str, float]:
-        series = self._series.get(metric_name)
-        if not series:
-            return {"value": 0.0, "delta": 0.0, "rate_per_minute": 0.0, "p95": 0.0, "count": 0.0}
 
-        window_seconds = _parse_window_to_seconds(window)
-        latest_ts = series[-1][0]
-        cutoff = latest_ts - window_seconds
-        samples = [(ts, value) for ts, value in series if ts >= cutoff]
-        if not samples:
-            return {"value": 0.0, "delta": 0.0, "rate_per_minute": 0.0, "p95": 0.0, "count": 0.0}
-
-        first_ts, first_value = samples[0]
-        last_ts, last_value = samples[-1]
+class _WindowView:
+    """Samples of one series inside one trailing window, maintained incrementally.
+
+    The window always ends at the series' latest sample, so appends only ever expire
+    samples from the front. Min/max are tracked with monotonic deques so the sketch
+    estimate can be clamped to (and the extreme ranks answered from) real samples.
+    """
+
+    __slots__ = ("seconds", "samples", "sketch", "maxima", "minima", "_p95")
+
+    def __init__(self, seconds: int) -> None:
+        self.seconds = seconds
+        self.samples: deque[tuple[int, int, float]] = deque()
+        self.sketch = _QuantileSketch()
+        self.maxima: deque[tuple[int, float]] = deque()
+        self.minima: deque[tuple[int, float]] = deque()
+        self._p95: float | None = None
+
+    def append(self, seq: int, ts: int, value: float) -> None:
+        self.samples.append((seq, ts, value))
+        self.sketch.add(value)
+        while self.maxima and self.maxima[-1][1] <= value:
+            self.maxima.pop()
+        self.maxima.append((seq, value))
+        while self.minima and self.minima[-1][1] >= value:
+            self.minima.pop()
+        self.minima.append((seq, value))
+        cutoff = ts - self.seconds
+        while self.samples[0][1] < cutoff:
+            self.pop_front()
+        self._p95 = None
+
+    def pop_front(self) -> None:
+        seq, _, value = self.samples.popleft()
+        self.sketch.remove(value)
+        if self.maxima[0][0] == seq:
+            self.maxima.popleft()
+        if self.minima[0][0] == seq:
+            self.minima.popleft()
+        self._p95 = None
+
+    def p95(self) -> float:
+        if self._p95 is None:
+            count = len(self.samples)
+            # Nearest-rank percentile, as the sorted-window implementation computed it.
+            rank = max(1, min(count, math.ceil(0.95 * count)))
+            low, high = self.minima[0][1], self.maxima[0][1]
+            if rank == count:
+                self._p95 = high
+            elif rank == 1:
+                self._p95 = low
+            else:
+                self._p95 = min(high, max(low, self.sketch.value_at_rank(rank)))
+        return self._p95
+
+    def stats(self) -> dict[str, float]:
+        _, first_ts, first_value = self.samples[0]
+        _, last_ts, last_value = self.samples[-1]
         delta = last_value - first_value
         elapsed_minutes = max((last_ts - first_ts) / 60.0, 0.0)
         rate_per_minute = (delta / elapsed_minutes) if elapsed_minutes > 0 else 0.0
-
-        values = [item[1] for item in samples]
-        p95 = _percentile(values, 95)
-
         return {
             "value": float(last_value),
             "delta": float(delta),
             "rate_per_minute": float(rate_per_minute),
-            "p95": float(p95),
-            "count": float(len(samples)),
+            "p95": float(self.p95()),
+            "count": float(len(self.samples)),
         }
 
 
+class _Series:
+    __slots__ = ("samples", "views", "next_seq")
+
+    def __init__(self, max_samples: int) -> None:
+        self.samples: deque[tuple[int, int, float]] = deque(maxlen=max_samples)
+        self.views: dict[int, _WindowView] = {}
+        self.next_seq = 0
+
+
+class AlertWindowStateStore(Protocol):
+    def load_alert_metric_windows(self) -> dict[str, list[tuple[int, float]]]: ...
+
+    def save_alert_metric_windows(self, samples: Mapping[str, list[tuple[int, float]]]) -> None: ...
+
+
+class MetricWindowStore:
+    """Per-metric sample series with incrementally maintained trailing windows.
+
+    Each (metric, window) pair queried by a rule gets a view that is updated on
+    :meth:`record`, so :meth:`compute` is O(1) apart from the bounded p95 sketch walk.
+    Samples are expected in non-decreasing ``ts_epoch`` order per metric; an older
+    sample rebuilds that metric's views.
+    """
+
+    def __init__(self, max_samples_per_metric: int = 2048) -> None:
+        self._max_samples_per_metric = max(2, max_samples_per_metric)
+        self._series: dict[str, _Series] = {}
+        self._dirty: set[str] = set()
+        self._max_window_seconds = _DEFAULT_PERSIST_HORIZON_SECONDS
+
+    def record(self, metric_name: str, value: float | int, ts_epoch: int) -> None:
+        series = self._series.get(metric_name)
+        if series is None:
+            series = self._series[metric_name] = _Series(self._max_samples_per_metric)
+        self._append(series, int(ts_epoch), float(value))
+        self._dirty.add(metric_name)
+
+    def _append(self, series: _Series, ts: int, value: float) -> None:
+        samples = series.samples
+        if samples and ts < samples[-1][1]:
+            # Out-of-order sample: keep the series sorted and recompute its views.
+            merged = sorted(
+                [(item[1], item[2]) for item in samples] + [(ts, value)], key=lambda item: item[0]
+            )
+            samples.clear()
+            views = series.views
+            series.views = {}
+            for item_ts, item_value in merged:
+                self._append(series, item_ts, item_value)
+            for seconds in views:
+                series.views[seconds] = self._build_view(series, seconds)
+            return
+        if len(samples) == samples.maxlen:
+            # The evicted head is in a view only if the view spans the whole series.
+            for view in series.views.values():
+                if len(view.samples) == len(samples):
+                    view.pop_front()
+        seq = series.next_seq
+        series.next_seq += 1
+        samples.append((seq, ts, value))
+        for view in series.views.values():
+            view.append(seq, ts, value)
+
+    @staticmethod
+    def _build_view(series: _Series, seconds: int) -> _WindowView:
+        view = _WindowView(seconds)
+        for seq, ts, value in series.samples:
+            view.append(seq, ts, value)
+        return view
+
+    def compute(self, window: str, metric_name: str) -> dict[str, float]:
+        series = self._series.get(metric_name)
+        if series is None or not series.samples:
+            return dict(_EMPTY_STATS)
+        window_seconds = _parse_window_to_seconds(window)
+        view = series.views.get(window_seconds)
+        if view is None:
+            view = series.views[window_seconds] = self._build_view(series, window_seconds)
+            self._max_window_seconds = max(self._max_window_seconds, window_seconds)
+        return view.stats()
+
+    def export_samples(self, *, only_dirty: bool = True) -> dict[str, list[tuple[int, float]]]:
+        """Samples still reachable by the widest window queried so far, per metric."""
+        names = sorted(self._dirty) if only_dirty else sorted(self._series)
+        exported: dict[str, list[tuple[int, float]]] = {}
+        for name in names:
+            samples = self._series[name].samples
+            if not samples:
+                continue
+            cutoff = samples[-1][1] - self._max_window_seconds
+            exported[name] = [(ts, value) for _, ts, value in samples if ts >= cutoff]
+        self._dirty.clear()
+        return exported
+
+    def restore(self, samples_by_metric: Mapping[str, Iterable[tuple[int, float]]]) -> None:
+        """Merge persisted samples (e.g. from before a restart) under any recorded since."""
+        for name, restored in samples_by_metric.items():
+            existing = self._series.get(name)
+            merged = [(int(ts), float(value)) for ts, value in restored]
+            if existing is not None:
+                merged.extend((ts, value) for _, ts, value in existing.samples)
+            series = self._series[name] = _Series(self._max_samples_per_metric)
+            for ts, value in sorted(merged, key=lambda item: item[0]):
+                self._append(series, ts, value)
+            if existing is not None:
+                for seconds in existing.views:
+                    series.views[seconds] = self._build_view(series, seconds)
+
+    def persist(self, state_store: AlertWindowStateStore) -> None:
+        exported = self.export_samples()
+        if exported:
+            state_store.save_alert_metric_windows(exported)
+
+    def load(self, state_store: AlertWindowStateStore) -> None:
+        self.restore(state_store.load_alert_metric_windows())
+
+
 class AlertRuleEvaluator:
     def parse_condition(self, condition: str) -> tuple[str, str, float]:
         match = _CONDITION_RE.match(condition)
@@ -199,14 +399,6 @@ def _parse_window_to_seconds(window: str) -> int:
     return n * multiplier
 
 
-def _percentile(values: list[float], percentile: int) -> float:
-    if not values:
-        return 0.0
-    sorted_values = sorted(values)
-    index = max(0, min(len(sorted_values) - 1, math.ceil((percentile / 100) * len(sorted_values)) - 1))
-    return float(sorted_values[index])
-
-
 def _compare(left: float, op: str, right: float) -> bool:
     if op == "==":
         return left == right
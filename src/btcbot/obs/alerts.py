@@ -133,3 +133,35 @@ DRY_RUN_ALERT_RULES: list[AlertRule] = [
         window="5m",
     ),
 ]
+
+
+RESOURCE_ALERT_RULES: list[AlertRule] = [
+    AlertRule(
+        name="process_rss_growth",
+        metric_name="bot_process_rss_bytes",
+        condition="delta > 134217728",
+        severity="medium",
+        window="1h",
+    ),
+    AlertRule(
+        name="cycle_retained_alloc_high",
+        metric_name="bot_cycle_retained_alloc_bytes",
+        condition="p95 > 8388608",
+        severity="medium",
+        window="30m",
+    ),
+    AlertRule(
+        name="cycle_cpu_high",
+        metric_name="bot_cycle_cpu_ms",
+        condition="p95 > 2000",
+        severity="medium",
+        window="10m",
+    ),
+    AlertRule(
+        name="sqlite_wal_large",
+        metric_name="bot_sqlite_wal_bytes",
+        condition="value > 268435456",
+        severity="medium",
+        window="10m",
+    ),
+]
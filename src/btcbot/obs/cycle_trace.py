@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+CounterSource = Callable[[], int]
+
+_ACTIVE_TRACER: ContextVar[CycleTracer | None] = ContextVar("btcbot_cycle_tracer", default=None)
+
+
+class SpanStats:
+    """One node of the span tree, aggregated over every time the same path was entered.
+
+    ``wall_ns``/``cpu_ns`` and ``counters`` are inclusive of children; CPU is the calling
+    thread's CPU time, so work handed to other threads shows up as wall time only.
+    """
+
+    __slots__ = ("name", "calls", "wall_ns", "cpu_ns", "counters", "children")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.counters: dict[str, int] = {}
+        self.children: dict[str, SpanStats] = {}
+
+    def child(self, name: str) -> SpanStats:
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = SpanStats(name)
+        return node
+
+    @property
+    def self_wall_ns(self) -> int:
+        return max(0, self.wall_ns - sum(child.wall_ns for child in self.children.values()))
+
+    @property
+    def self_cpu_ns(self) -> int:
+        return max(0, self.cpu_ns - sum(child.cpu_ns for child in self.children.values()))
+
+    def self_counter(self, name: str) -> int:
+        nested = sum(child.counters.get(name, 0) for child in self.children.values())
+        return max(0, self.counters.get(name, 0) - nested)
+
+    def walk(self, prefix: tuple[str, ...] = ()) -> Iterator[tuple[tuple[str, ...], SpanStats]]:
+        path = (*prefix, self.name)
+        yield path, self
+        for node in self.children.values():
+            yield from node.walk(path)
+
+
+class _Frame:
+    __slots__ = ("node", "wall_started", "cpu_started", "counters_started", "is_phase")
+
+    def __init__(
+        self, node: SpanStats, counters_started: tuple[int, ...], *, is_phase: bool
+    ) -> None:
+        self.node = node
+        self.counters_started = counters_started
+        self.is_phase = is_phase
+        self.cpu_started = time.thread_time_ns()
+        self.wall_started = time.perf_counter_ns()
+
+
+class CycleTracer:
+    """Nested wall/CPU spans with per-span deltas of cheap process-wide counters.
+
+    ``counters`` maps a name (e.g. ``http_calls``) to a zero-argument callable returning a
+    monotonically increasing total; each span records how far it moved. Spans only record
+    while the tracer is active (see :meth:`activate`) and only on the activating thread.
+    """
+
+    def __init__(
+        self, counters: Mapping[str, CounterSource] | None = None, *, root_name: str = "profile"
+    ) -> None:
+        self._counter_names = tuple((counters or {}).keys())
+        self._counter_sources = tuple((counters or {}).values())
+        self.root = SpanStats(root_name)
+        self._stack: list[_Frame] = []
+
+    def _read_counters(self) -> tuple[int, ...]:
+        return tuple(int(source()) for source in self._counter_sources)
+
+    def _push(self, name: str, *, is_phase: bool) -> _Frame:
+        parent = self._stack[-1].node if self._stack else self.root
+        frame = _Frame(parent.child(name), self._read_counters(), is_phase=is_phase)
+        self._stack.append(frame)
+        return frame
+
+    def _pop(self) -> None:
+        frame = self._stack.pop()
+        wall_ended = time.perf_counter_ns()
+        cpu_ended = time.thread_time_ns()
+        node = frame.node
+        node.calls += 1
+        node.wall_ns += wall_ended - frame.wall_started
+        node.cpu_ns += cpu_ended - frame.cpu_started
+        for name, started, ended in zip(
+            self._counter_names, frame.counters_started, self._read_counters(), strict=True
+        ):
+            node.counters[name] = node.counters.get(name, 0) + (ended - started)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        frame = self._push(name, is_phase=False)
+        try:
+            yield
+        finally:
+            # Close phases left open inside this span, then the span itself.
+            while self._stack and self._stack[-1] is not frame:
+                self._pop()
+            if self._stack:
+                self._pop()
+
+    def phase(self, name: str) -> None:
+        """End the current phase (if any) at this nesting level and start ``name``.
+
+        Phases let a long sequential method mark its steps without re-indenting each one
+        into a ``with`` block; the enclosing span closes whatever phase is still open.
+        """
+        if self._stack and self._stack[-1].is_phase:
+            self._pop()
+        self._push(name, is_phase=True)
+
+    @contextmanager
+    def activate(self) -> Iterator[CycleTracer]:
+        token = _ACTIVE_TRACER.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE_TRACER.reset(token)
+
+    def collapsed_stacks(self) -> list[str]:
+        """Brendan Gregg "collapsed" lines (``a;b;c <self µs>``) for flamegraph tools."""
+        lines: list[str] = []
+        for path, node in self.root.walk():
+            self_us = node.self_wall_ns // 1000
+            if self_us > 0:
+                lines.append(f"{';'.join(path)} {self_us}")
+        return lines
+
+    def hotspots(self, *, top_n: int = 15) -> list[dict[str, object]]:
+        """Spans ranked by self wall time, excluding the synthetic root."""
+        rows: list[dict[str, object]] = []
+        for path, node in self.root.walk():
+            if node is self.root:
+                continue
+            row: dict[str, object] = {
+                "span": ";".join(path[1:]),
+                "calls": node.calls,
+                "total_ms": round(node.wall_ns / 1e6, 3),
+                "self_ms": round(node.self_wall_ns / 1e6, 3),
+                "self_cpu_ms": round(node.self_cpu_ns / 1e6, 3),
+            }
+            for name in self._counter_names:
+                row[name] = node.self_counter(name)
+            rows.append(row)
+        rows.sort(key=lambda row: (-float(row["self_ms"]), str(row["span"])))  # type: ignore[arg-type]
+        return rows[: max(0, int(top_n))]
+
+
+def format_hotspot_table(rows: list[dict[str, object]]) -> str:
+    if not rows:
+        return "(no spans recorded)"
+    columns = list(rows[0].keys())
+    cells = [[str(row.get(column, "")) for column in columns] for row in rows]
+    widths = [
+        max(len(column), *(len(line[idx]) for line in cells)) for idx, column in enumerate(columns)
+    ]
+
+    def _line(values: list[str]) -> str:
+        first = values[0].ljust(widths[0])
+        rest = (value.rjust(width) for value, width in zip(values[1:], widths[1:], strict=True))
+        return "  ".join([first, *rest])
+
+    return "\n".join([_line(columns), *(_line(line) for line in cells)])
+
+
+def active_tracer() -> CycleTracer | None:
+    return _ACTIVE_TRACER.get()
+
+
+def trace_span(name: str):
+    """``with trace_span("x"):`` records a span under the active tracer, else does nothing."""
+    tracer = _ACTIVE_TRACER.get()
+    return nullcontext() if tracer is None else tracer.span(name)
+
+
+def trace_phase(name: str) -> None:
+    tracer = _ACTIVE_TRACER.get()
+    if tracer is not None:
+        tracer.phase(name)
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator form of :func:`trace_span`; costs one context-variable read when idle."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            tracer = _ACTIVE_TRACER.get()
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+import re
+import threading
+import weakref
+from collections.abc import Mapping, Sequence
+from urllib.parse import urlsplit
+
+_ID_SEGMENT = re.compile(r"^(?:\d+|[0-9a-fA-F-]{16,})$")
+
+# Per-request observations; ``*_ms`` are durations, ``response_bytes`` is wire size.
+HTTP_TIMING_FIELDS = (
+    "limiter_wait_ms",
+    "connect_ms",
+    "ttfb_ms",
+    "total_ms",
+    "json_parse_ms",
+    "response_bytes",
+)
+
+_LOCK = threading.Lock()
+_ACTIVE_CAPTURES: weakref.WeakSet[HttpTimingCapture] = weakref.WeakSet()
+
+
+def endpoint_label(method: str, path: str) -> str:
+    """``"GET /api/v1/order/{id}"``: host dropped, id-like path segments collapsed."""
+    segments = [
+        "{id}" if _ID_SEGMENT.match(segment) else segment
+        for segment in urlsplit(path).path.split("/")
+    ]
+    return f"{method.upper()} {'/'.join(segments) or '/'}"
+
+
+def _stats(values: Sequence[float]) -> dict[str, float | int]:
+    ordered = sorted(values)
+    count = len(ordered)
+
+    def _rank(q: float) -> float:
+        return ordered[max(0, math.ceil(q * count) - 1)]
+
+    return {
+        "count": count,
+        "sum": round(sum(ordered), 3),
+        "p50": round(_rank(0.50), 3),
+        "p95": round(_rank(0.95), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class HttpTimingCapture:
+    """Per-endpoint HTTP timings observed while the capture is alive (usually one cycle).
+
+    The HTTP client reports every round trip through ``record_http_timing``; each live
+    capture keeps the raw values, so the summary has exact per-cycle percentiles.
+    ``connect_ms`` only appears for requests that opened a new connection (DNS, TCP and
+    TLS); pooled requests skip it. ``limiter_wait_ms`` against ``total_ms`` separates
+    time queued in the client-side rate limiter from time on the wire.
+    """
+
+    def __init__(self) -> None:
+        self._groups: dict[str, str] = {}
+        self._values: dict[str, dict[str, list[float]]] = {}
+
+    def add(self, endpoint: str, group: str, observations: Mapping[str, float]) -> None:
+        self._groups.setdefault(endpoint, group)
+        series = self._values.setdefault(endpoint, {})
+        for name, value in observations.items():
+            series.setdefault(name, []).append(float(value))
+
+    def summary(self) -> dict[str, object]:
+        with _LOCK:
+            values = {endpoint: dict(series) for endpoint, series in self._values.items()}
+        endpoints: dict[str, object] = {}
+        groups: dict[str, dict[str, float | int]] = {}
+        for endpoint in sorted(values):
+            series = values[endpoint]
+            group = self._groups[endpoint]
+            requests = len(series.get("total_ms", ()))
+            endpoints[endpoint] = {
+                "group": group,
+                "requests": requests,
+                **{name: _stats(series[name]) for name in HTTP_TIMING_FIELDS if series.get(name)},
+            }
+            totals = groups.setdefault(
+                group, {"requests": 0, "limiter_wait_ms": 0.0, "wire_ms": 0.0, "bytes_in": 0}
+            )
+            totals["requests"] += requests
+            totals["limiter_wait_ms"] += sum(series.get("limiter_wait_ms", ()))
+            totals["wire_ms"] += sum(series.get("total_ms", ()))
+            totals["bytes_in"] += int(sum(series.get("response_bytes", ())))
+        for totals in groups.values():
+            totals["limiter_wait_ms"] = round(totals["limiter_wait_ms"], 3)
+            totals["wire_ms"] = round(totals["wire_ms"], 3)
+        return {"endpoints": endpoints, "groups": dict(sorted(groups.items()))}
+
+
+def record_http_timing(endpoint: str, group: str, observations: Mapping[str, float]) -> None:
+    """Feed one round trip (or part of one, e.g. JSON parse) to every live capture."""
+    if not _ACTIVE_CAPTURES:
+        return
+    with _LOCK:
+        for capture in list(_ACTIVE_CAPTURES):
+            capture.add(endpoint, group, observations)
+
+
+def begin_http_timing_capture(*, enabled: bool) -> HttpTimingCapture | None:
+    """Start a per-cycle HTTP timing capture (``None`` when disabled)."""
+    if not enabled:
+        return None
+    capture = HttpTimingCapture()
+    with _LOCK:
+        _ACTIVE_CAPTURES.add(capture)
+    return capture
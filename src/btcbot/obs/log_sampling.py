@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+SUPPRESSED_EVENT = "log_events_suppressed"
+
+
+@dataclass(frozen=True)
+class SamplingRule:
+    """How often one log event (record message) may reach the handlers.
+
+    The first ``first`` occurrences always pass; after that every ``every``-th one does
+    (``0`` drops the rest). ``rate_per_second`` > 0 additionally applies a token bucket of
+    ``burst`` tokens. Counters and buckets are kept per ``by`` extra-field values, so e.g.
+    ``by=("symbol",)`` keeps the first occurrence for every symbol.
+    """
+
+    first: int = 1
+    every: int = 1
+    rate_per_second: float = 0.0
+    burst: int = 1
+    by: tuple[str, ...] = ()
+
+    @classmethod
+    def from_mapping(cls, raw: Mapping[str, object]) -> SamplingRule:
+        unknown = sorted(set(raw) - {"first", "every", "rate_per_second", "burst", "by"})
+        if unknown:
+            raise ValueError(f"unknown sampling rule fields: {','.join(unknown)}")
+        by = raw.get("by", ())
+        if isinstance(by, str) or not isinstance(by, list | tuple):
+            raise ValueError("sampling rule 'by' must be a list of field names")
+        rule = cls(
+            first=int(raw.get("first", 1)),  # type: ignore[call-overload]
+            every=int(raw.get("every", 1)),  # type: ignore[call-overload]
+            rate_per_second=float(raw.get("rate_per_second", 0.0)),  # type: ignore[arg-type]
+            burst=int(raw.get("burst", 1)),  # type: ignore[call-overload]
+            by=tuple(str(field) for field in by),
+        )
+        if rule.first < 1 or rule.every < 0 or rule.rate_per_second < 0 or rule.burst < 1:
+            raise ValueError("sampling rule needs first>=1, every>=0, rate_per_second>=0, burst>=1")
+        return rule
+
+
+DEFAULT_SAMPLING_RULES: dict[str, SamplingRule] = {
+    "metric_emit": SamplingRule(first=100, every=1000),
+    "stage7_effective_settings": SamplingRule(first=1, every=100),
+    # Fires per symbol on every quote request for as long as the exchange is failing.
+    "market_data_degraded_serving_stale_cache": SamplingRule(first=1, every=100, by=("symbol",)),
+    "dynamic_universe_orderbook_parse_failed": SamplingRule(first=1, every=50, by=("symbol",)),
+    "EXCHANGE_429_BACKOFF": SamplingRule(first=1, rate_per_second=1.0, burst=10),
+}
+
+
+def parse_sampling_rules(raw: Mapping[str, object]) -> dict[str, SamplingRule]:
+    rules: dict[str, SamplingRule] = {}
+    for event, spec in raw.items():
+        if not isinstance(event, str) or not event.strip():
+            raise ValueError("sampling rule keys must be log event names")
+        if isinstance(spec, SamplingRule):
+            rules[event.strip()] = spec
+            continue
+        if not isinstance(spec, Mapping):
+            raise ValueError(f"sampling rule for {event} must be an object")
+        rules[event.strip()] = SamplingRule.from_mapping(spec)
+    return rules
+
+
+class _EventState:
+    __slots__ = ("count", "tokens", "refilled_at")
+
+    def __init__(self, burst: int, now: float) -> None:
+        self.count = 0
+        self.tokens = float(burst)
+        self.refilled_at = now
+
+
+class LogSamplingFilter(logging.Filter):
+    """Handler filter that samples/rate-limits configured events by name.
+
+    Events without a rule pass untouched after one dict lookup. Dropped records are
+    counted per event and reported as one ``log_events_suppressed`` warning at most every
+    ``summary_interval_seconds`` (and on :meth:`flush`).
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[str, SamplingRule],
+        *,
+        summary_interval_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__()
+        self._rules = dict(rules)
+        self._summary_interval_seconds = max(0.0, float(summary_interval_seconds))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: dict[tuple[object, ...], _EventState] = {}
+        self._suppressed: dict[str, int] = {}
+        self._summary_due = clock() + self._summary_interval_seconds
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = record.msg
+        rule = self._rules.get(event) if isinstance(event, str) else None
+        if rule is None:
+            return True
+        key: tuple[object, ...] = (event,)
+        if rule.by:
+            extra = getattr(record, "extra", None)
+            fields = extra if isinstance(extra, dict) else record.__dict__
+            key = (event, *(str(fields.get(name)) for name in rule.by))
+        now = self._clock()
+        with self._lock:
+            allowed = self._admit(key, rule, now)
+            if not allowed:
+                self._suppressed[event] = self._suppressed.get(event, 0) + 1
+            summary = self._take_summary(now)
+        if summary:
+            self._emit_summary(summary)
+        return allowed
+
+    def _admit(self, key: tuple[object, ...], rule: SamplingRule, now: float) -> bool:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _EventState(rule.burst, now)
+        state.count += 1
+        if state.count <= rule.first:
+            sampled = True
+        else:
+            sampled = rule.every > 0 and (state.count - rule.first) % rule.every == 0
+        if rule.rate_per_second > 0:
+            state.tokens = min(
+                float(rule.burst), state.tokens + (now - state.refilled_at) * rule.rate_per_second
+            )
+            state.refilled_at = now
+            if state.count == 1:
+                # The first occurrence of every key is always kept.
+                state.tokens = max(0.0, state.tokens - 1.0)
+                return True
+            if not sampled or state.tokens < 1.0:
+                return False
+            state.tokens -= 1.0
+        return sampled
+
+    def _take_summary(self, now: float) -> dict[str, int]:
+        if not self._suppressed or now < self._summary_due:
+            return {}
+        summary, self._suppressed = self._suppressed, {}
+        self._summary_due = now + self._summary_interval_seconds
+        return summary
+
+    def _emit_summary(self, summary: dict[str, int]) -> None:
+        logger.warning(
+            SUPPRESSED_EVENT,
+            extra={
+                "extra": {
+                    "suppressed": dict(sorted(summary.items())),
+                    "suppressed_total": sum(summary.values()),
+                    "interval_seconds": self._summary_interval_seconds,
+                }
+            },
+        )
+
+    def flush(self) -> None:
+        with self._lock:
+            summary, self._suppressed = self._suppressed, {}
+            self._summary_due = self._clock() + self._summary_interval_seconds
+        if summary:
+            self._emit_summary(summary)
+
+
+_ACTIVE_FILTER: LogSamplingFilter | None = None
+
+
+def install_log_sampling(
+    handler: logging.Handler,
+    rules: Mapping[str, SamplingRule],
+    *,
+    summary_interval_seconds: float = 60.0,
+) -> LogSamplingFilter | None:
+    """Replace any sampling filter on ``handler``; an empty rule set removes it."""
+    global _ACTIVE_FILTER
+    for existing in [f for f in handler.filters if isinstance(f, LogSamplingFilter)]:
+        existing.flush()
+        handler.removeFilter(existing)
+    _ACTIVE_FILTER = None
+    if not rules:
+        return None
+    _ACTIVE_FILTER = LogSamplingFilter(rules, summary_interval_seconds=summary_interval_seconds)
+    handler.addFilter(_ACTIVE_FILTER)
+    return _ACTIVE_FILTER
+
+
+def flush_log_sampling() -> None:
+    if _ACTIVE_FILTER is not None:
+        _ACTIVE_FILTER.flush()
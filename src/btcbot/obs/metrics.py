@@ -6,6 +6,7 @@ from decimal import Decimal
 from typing import Protocol
 
 from btcbot.obs.metric_registry import REGISTRY, MetricDef, MetricType
+from btcbot.obs.metrics_aggregator import AggregatingMetricsSink
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,8 @@ class MetricsSink(Protocol):
 
 
 class LoggingMetricsSink:
+    """One ``metric_emit`` log line per call; kept for debugging metric wiring."""
+
     def emit(self, defn: MetricDef, value: float | int | Decimal, labels: dict[str, str]) -> None:
         logger.info(
             "metric_emit",
@@ -31,13 +34,20 @@ class LoggingMetricsSink:
         )
 
 
-_DEFAULT_SINK: MetricsSink = LoggingMetricsSink()
+_DEFAULT_SINK: MetricsSink = AggregatingMetricsSink()
+# Sinks that check required labels themselves (once per label set) skip the per-call check.
+_SINK_VALIDATES_LABELS = True
 _STRICT_REGISTRY = os.getenv("OBS_METRICS_STRICT", "1") != "0"
 
 
 def set_metrics_sink(sink: MetricsSink) -> None:
-    global _DEFAULT_SINK
+    global _DEFAULT_SINK, _SINK_VALIDATES_LABELS
     _DEFAULT_SINK = sink
+    _SINK_VALIDATES_LABELS = bool(getattr(sink, "validates_labels", False))
+
+
+def get_metrics_sink() -> MetricsSink:
+    return _DEFAULT_SINK
 
 
 def _validate_labels(defn: MetricDef, labels: dict[str, str]) -> None:
@@ -54,7 +64,12 @@ def emit_metric(name: str, value: float | int | Decimal, labels: dict[str, str])
             raise ValueError(message)
         logger.error("metric_unknown", extra={"extra": {"name": name}})
         return
-    _validate_labels(defn, labels)
+    _emit(defn, value, labels)
+
+
+def _emit(defn: MetricDef, value: float | int | Decimal, labels: dict[str, str]) -> None:
+    if not _SINK_VALIDATES_LABELS:
+        _validate_labels(defn, labels)
     _DEFAULT_SINK.emit(defn, value, labels)
 
 
@@ -65,7 +80,7 @@ def inc_counter(name: str, labels: dict[str, str], delta: int = 1) -> None:
         return
     if defn.type is not MetricType.COUNTER:
         raise ValueError(f"metric {name} is not a counter")
-    emit_metric(name, delta, labels)
+    _emit(defn, delta, labels)
 
 
 def set_gauge(name: str, value: float | int | Decimal, labels: dict[str, str]) -> None:
@@ -75,7 +90,7 @@ def set_gauge(name: str, value: float | int | Decimal, labels: dict[str, str]) -
         return
     if defn.type is not MetricType.GAUGE:
         raise ValueError(f"metric {name} is not a gauge")
-    emit_metric(name, value, labels)
+    _emit(defn, value, labels)
 
 
 def observe_histogram(name: str, value: float | int | Decimal, labels: dict[str, str]) -> None:
@@ -85,4 +100,4 @@ def observe_histogram(name: str, value: float | int | Decimal, labels: dict[str,
         return
     if defn.type is not MetricType.HISTOGRAM:
         raise ValueError(f"metric {name} is not a histogram")
-    emit_metric(name, value, labels)
+    _emit(defn, value, labels)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Protocol, cast
+
+from btcbot.obs.metric_registry import MetricDef, MetricType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS_MS: tuple[float, ...] = (
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+)
+DEFAULT_BUCKETS_SECONDS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+_STRIPES = 16
+
+LabelItems = tuple[tuple[str, str], ...]
+
+
+def default_buckets(defn: MetricDef) -> tuple[float, ...]:
+    return DEFAULT_BUCKETS_MS if defn.name.endswith("_ms") else DEFAULT_BUCKETS_SECONDS
+
+
+class _Series:
+    __slots__ = ("defn", "labels", "lock", "value", "bounds", "bucket_counts", "sum", "count")
+
+    def __init__(
+        self, defn: MetricDef, labels: LabelItems, lock: threading.Lock, bounds: tuple[float, ...]
+    ) -> None:
+        self.defn = defn
+        self.labels = labels
+        self.lock = lock
+        self.value = 0.0
+        self.bounds = bounds
+        # One slot per bound plus the implicit +Inf bucket; counts are per bucket, not cumulative.
+        self.bucket_counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def snapshot(self) -> dict[str, object]:
+        with self.lock:
+            item: dict[str, object] = {
+                "name": self.defn.name,
+                "type": self.defn.type.value,
+                "labels": dict(self.labels),
+            }
+            if self.defn.type is MetricType.HISTOGRAM:
+                cumulative = 0
+                buckets: list[list[object]] = []
+                for bound, bucket_count in zip(
+                    (*self.bounds, "+Inf"), self.bucket_counts, strict=True
+                ):
+                    cumulative += bucket_count
+                    buckets.append([bound, cumulative])
+                item.update({"count": self.count, "sum": self.sum, "buckets": buckets})
+            else:
+                item["value"] = self.value
+        return item
+
+
+class AggregatingMetricsSink:
+    """In-memory counters, gauges and fixed-bucket histograms, read by scrape or snapshot.
+
+    A series is keyed by metric plus the label items exactly as the caller passed them, so
+    the steady-state emit is one dict lookup and one striped lock; label sets are
+    validated against the registry, canonicalized and given bucket bounds only the
+    first time a key is seen.
+    """
+
+    validates_labels = True
+
+    def __init__(
+        self,
+        *,
+        buckets: Mapping[str, tuple[float, ...]] | None = None,
+        stripes: int = _STRIPES,
+    ) -> None:
+        self._buckets = dict(buckets or {})
+        self._stripes = [threading.Lock() for _ in range(max(1, int(stripes)))]
+        self._series: dict[tuple[str, LabelItems], _Series] = {}
+        self._canonical: dict[tuple[str, LabelItems], _Series] = {}
+        self._register_lock = threading.Lock()
+        self._snapshot_due_monotonic = 0.0
+
+    def emit(self, defn: MetricDef, value: float | int | Decimal, labels: dict[str, str]) -> None:
+        key = (defn.name, tuple(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = self._register(defn, key)
+        numeric = float(value)
+        kind = defn.type
+        lock = series.lock
+        lock.acquire()
+        try:
+            if kind is MetricType.COUNTER:
+                series.value += numeric
+            elif kind is MetricType.GAUGE:
+                series.value = numeric
+            else:
+                series.bucket_counts[bisect_left(series.bounds, numeric)] += 1
+                series.sum += numeric
+                series.count += 1
+        finally:
+            lock.release()
+
+    def _register(self, defn: MetricDef, key: tuple[str, LabelItems]) -> _Series:
+        missing = [label for label in defn.required_labels if label not in dict(key[1])]
+        if missing:
+            raise ValueError(f"missing labels for {defn.name}: {missing}")
+        canonical_key = (defn.name, tuple(sorted((k, str(v)) for k, v in key[1])))
+        with self._register_lock:
+            series = self._canonical.get(canonical_key)
+            if series is None:
+                lock = self._stripes[hash(canonical_key) % len(self._stripes)]
+                bounds = tuple(sorted(self._buckets.get(defn.name, default_buckets(defn))))
+                series = _Series(defn, canonical_key[1], lock, bounds)
+                self._canonical[canonical_key] = series
+            self._series[key] = series
+        return series
+
+    def snapshot(self) -> list[dict[str, object]]:
+        with self._register_lock:
+            series = sorted(self._canonical.items())
+        return [item.snapshot() for _, item in series]
+
+    def reset(self) -> None:
+        with self._register_lock:
+            self._series = {}
+            self._canonical = {}
+
+    def snapshot_due(self, interval_seconds: float, now_monotonic: float | None = None) -> bool:
+        if interval_seconds <= 0:
+            return False
+        resolved_now = time.monotonic() if now_monotonic is None else now_monotonic
+        with self._register_lock:
+            if resolved_now < self._snapshot_due_monotonic:
+                return False
+            self._snapshot_due_monotonic = resolved_now + interval_seconds
+            return True
+
+    def render_prometheus(self) -> str:
+        return render_prometheus(self.snapshot())
+
+
+def _escape_label_value(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Mapping[str, object], extra: tuple[str, object] | None = None) -> str:
+    items = list(labels.items())
+    if extra is not None:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in items) + "}"
+
+
+def _format_value(value: object) -> str:
+    number = float(value)  # type: ignore[arg-type]
+    if number.is_integer() and abs(number) < 1e15:
+        return str(int(number))
+    return repr(number)
+
+
+def render_prometheus(snapshot: list[dict[str, object]]) -> str:
+    """Prometheus text exposition (format 0.0.4) of an aggregating sink snapshot."""
+    lines: list[str] = []
+    typed: set[str] = set()
+    for item in snapshot:
+        name = str(item["name"])
+        labels = cast(dict[str, object], item["labels"])
+        if name not in typed:
+            lines.append(f"# TYPE {name} {item['type']}")
+            typed.add(name)
+        if item["type"] == MetricType.HISTOGRAM.value:
+            for bound, cumulative in item["buckets"]:  # type: ignore[union-attr]
+                le = bound if isinstance(bound, str) else _format_value(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(item['sum'])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {item['count']}")
+        else:
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(item['value'])}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class MetricsSnapshotStore(Protocol):
+    def save_metrics_snapshot(self, *, ts: str, series: list[dict[str, object]]) -> None: ...
+
+
+def persist_metrics_snapshot_if_due(
+    sink: object,
+    state_store: MetricsSnapshotStore,
+    *,
+    interval_seconds: float,
+    now_monotonic: float | None = None,
+) -> bool:
+    """Write the sink's series to the state DB at most once per interval (process-wide).
+
+    Best effort: a failed write is logged and never fails the cycle that triggered it.
+    """
+    if not isinstance(sink, AggregatingMetricsSink):
+        return False
+    if not sink.snapshot_due(interval_seconds, now_monotonic):
+        return False
+    series = sink.snapshot()
+    if not series:
+        return False
+    try:
+        state_store.save_metrics_snapshot(ts=datetime.now(UTC).isoformat(), series=series)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning(
+            "metrics_snapshot_persist_failed",
+            extra={"extra": {"series": len(series), "error_type": type(exc).__name__}},
+        )
+        return False
+    return True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    render: Callable[[], str]
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?", 1)[0] not in {"/metrics", "/"}:
+            self.send_error(404)
+            return
+        body = self.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return None
+
+
+def start_metrics_http_server(
+    render: Callable[[], str], *, host: str = "127.0.0.1", port: int
+) -> ThreadingHTTPServer:
+    """Serve ``render()`` at ``/metrics`` from a daemon thread; ``port=0`` picks a free port."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"render": staticmethod(render)})
+    server = ThreadingHTTPServer((host, int(port)), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    logger.info(
+        "metrics_http_server_started",
+        extra={"extra": {"host": host, "port": server.server_address[1]}},
+    )
+    return server
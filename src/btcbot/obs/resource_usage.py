@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Mapping
+from pathlib import Path
+
+try:  # POSIX only; Windows reports no peak RSS.
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None  # type: ignore[assignment]
+
+CounterSource = Callable[[], int]
+
+_TRACEMALLOC_FRAMES = 1
+_TRACEMALLOC_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+_PROC_STATM = Path("/proc/self/statm")
+_PROC_IO = Path("/proc/self/io")
+_PROC_FD = Path("/proc/self/fd")
+
+
+def current_rss_bytes() -> int | None:
+    """Resident set size from ``/proc/self/statm``; ``None`` where procfs is unavailable."""
+    try:
+        resident_pages = int(_PROC_STATM.read_text(encoding="ascii").split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss_bytes() -> int | None:
+    """Process high-water RSS (``ru_maxrss`` is KiB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    peak = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def disk_io_bytes() -> tuple[int, int] | None:
+    """``(read_bytes, write_bytes)`` that reached the storage layer, from ``/proc/self/io``."""
+    try:
+        fields = dict(
+            line.split(":", 1) for line in _PROC_IO.read_text(encoding="ascii").splitlines()
+        )
+        return int(fields["read_bytes"]), int(fields["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def open_fd_count() -> int | None:
+    """Open file descriptors from ``/proc/self/fd``; ``None`` where procfs is unavailable."""
+    try:
+        return sum(1 for _ in _PROC_FD.iterdir())
+    except OSError:
+        return None
+
+
+def sqlite_file_sizes(db_path: str) -> tuple[int, int]:
+    """``(db_bytes, wal_bytes)`` on disk; missing files count as zero."""
+    sizes: list[int] = []
+    for suffix in ("", "-wal"):
+        try:
+            sizes.append(os.stat(f"{Path(db_path).expanduser()}{suffix}").st_size)
+        except OSError:
+            sizes.append(0)
+    return sizes[0], sizes[1]
+
+
+class ResourceCapture:
+    """Process resource deltas over one capture window (usually one cycle).
+
+    CPU is process-wide (all threads, user + system). Disk I/O is the process's storage
+    traffic, which for the bot is dominated by SQLite; the DB and WAL file sizes are read
+    at summary time. ``counters`` maps names to monotonically increasing process totals
+    (e.g. HTTP bytes) whose movement is reported. With ``tracemalloc_top_n`` the capture
+    also reports Python allocations retained since it started and the top allocation
+    sites; tracing is started on first use and left running for later captures.
+    """
+
+    def __init__(
+        self,
+        *,
+        db_path: str | None = None,
+        counters: Mapping[str, CounterSource] | None = None,
+        tracemalloc_top_n: int | None = None,
+    ) -> None:
+        self._db_path = db_path
+        self._counters = dict(counters or {})
+        self._tracemalloc_top_n = tracemalloc_top_n
+        self._snapshot: tracemalloc.Snapshot | None = None
+        if tracemalloc_top_n is not None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(_TRACEMALLOC_FRAMES)
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(_TRACEMALLOC_IGNORED)
+        self._counters_started = {name: int(source()) for name, source in self._counters.items()}
+        self._wal_started = sqlite_file_sizes(db_path)[1] if db_path else 0
+        self._rss_started = current_rss_bytes()
+        self._io_started = disk_io_bytes()
+        self._times_started = os.times()
+        self._wall_started = time.perf_counter()
+
+    def summary(self) -> dict[str, object]:
+        wall_ms = (time.perf_counter() - self._wall_started) * 1000.0
+        times = os.times()
+        cpu_user_ms = (times.user - self._times_started.user) * 1000.0
+        cpu_system_ms = (times.system - self._times_started.system) * 1000.0
+        rss = current_rss_bytes()
+        payload: dict[str, object] = {
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": round(cpu_user_ms + cpu_system_ms, 3),
+            "cpu_user_ms": round(cpu_user_ms, 3),
+            "cpu_system_ms": round(cpu_system_ms, 3),
+            "rss_bytes": rss,
+            "rss_delta_bytes": (
+                None if rss is None or self._rss_started is None else rss - self._rss_started
+            ),
+            "peak_rss_bytes": peak_rss_bytes(),
+        }
+        io = disk_io_bytes()
+        if io is not None and self._io_started is not None:
+            payload["disk_read_bytes"] = io[0] - self._io_started[0]
+            payload["disk_write_bytes"] = io[1] - self._io_started[1]
+        if self._db_path:
+            db_bytes, wal_bytes = sqlite_file_sizes(self._db_path)
+            payload["sqlite_db_bytes"] = db_bytes
+            payload["sqlite_wal_bytes"] = wal_bytes
+            payload["sqlite_wal_growth_bytes"] = wal_bytes - self._wal_started
+        for name, source in self._counters.items():
+            payload[name] = int(source()) - self._counters_started[name]
+        if self._snapshot is not None and tracemalloc.is_tracing():
+            payload["tracemalloc"] = self._tracemalloc_summary()
+        return payload
+
+    def _tracemalloc_summary(self) -> dict[str, object]:
+        assert self._snapshot is not None
+        _, traced_peak = tracemalloc.get_traced_memory()
+        current = tracemalloc.take_snapshot().filter_traces(_TRACEMALLOC_IGNORED)
+        diffs = current.compare_to(self._snapshot, "lineno")
+        top = [
+            {
+                "site": f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                "size_diff_bytes": diff.size_diff,
+                "count_diff": diff.count_diff,
+            }
+            for diff in diffs[: max(0, int(self._tracemalloc_top_n or 0))]
+            if diff.size_diff or diff.count_diff
+        ]
+        return {
+            "net_blocks": sum(diff.count_diff for diff in diffs),
+            "net_bytes": sum(diff.size_diff for diff in diffs),
+            "traced_peak_bytes": traced_peak,
+            "top": top,
+        }
+
+
+def begin_resource_capture(
+    *,
+    enabled: bool,
+    tracemalloc_enabled: bool = False,
+    tracemalloc_top_n: int = 10,
+    db_path: str | None = None,
+    counters: Mapping[str, CounterSource] | None = None,
+) -> ResourceCapture | None:
+    """Start a per-cycle resource capture (``None`` when accounting is disabled)."""
+    if not enabled:
+        return None
+    return ResourceCapture(
+        db_path=db_path,
+        counters=counters,
+        tracemalloc_top_n=tracemalloc_top_n if tracemalloc_enabled else None,
+    )
@@ -9,6 +9,7 @@ def build_cycle_metrics(
     health_snapshot: dict | None,
     final_mode: dict,
     cursor_diag: dict | None,
+    resource_stats: Mapping[str, object] | None = None,
 ) -> dict[str, float | int]:
     summary = stage4_cycle_summary or {}
     reconcile = reconcile_result or {}
@@ -32,7 +33,7 @@ def build_cycle_metrics(
     degraded_mode = bool(health.get("degraded", False) or mode.get("observe_only", False))
     breaker_open = bool(health.get("breaker_open", False) or summary.get("breaker_open", False))
 
-    return {
+    metrics: dict[str, float | int] = {
         "bot_cycle_latency_ms": _to_int(summary.get("cycle_duration_ms", 0)),
         "bot_intents_created_total": _to_int(summary.get("intents_created", 0)),
         "bot_intents_executed_total": _to_int(summary.get("intents_executed", 0)),
@@ -60,6 +61,25 @@ def build_cycle_metrics(
         ),
         "dryrun_cycle_duration_ms": _to_int(summary.get("cycle_duration_ms", 0)),
     }
+    metrics.update(_resource_metrics(resource_stats))
+    return metrics
+
+
+def _resource_metrics(resource_stats: Mapping[str, object] | None) -> dict[str, float | int]:
+    """Series from a resource capture summary; values the platform did not report are skipped."""
+    stats = resource_stats or {}
+    sources = {
+        "bot_process_rss_bytes": stats.get("rss_bytes"),
+        "bot_process_peak_rss_bytes": stats.get("peak_rss_bytes"),
+        "bot_cycle_cpu_ms": stats.get("cpu_ms"),
+        "bot_sqlite_wal_bytes": stats.get("sqlite_wal_bytes"),
+        "bot_cycle_retained_alloc_bytes": _coerce_dict(stats.get("tracemalloc")).get("net_bytes"),
+    }
+    return {
+        name: value
+        for name, value in sources.items()
+        if isinstance(value, int | float) and not isinstance(value, bool)
+    }
 
 
 def _coerce_dict(value: object) -> dict[str, object]:
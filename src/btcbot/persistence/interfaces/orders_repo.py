@@ -32,6 +32,13 @@ class OrdersRepoProtocol(Protocol):
         include_unknown: bool = False,
     ): ...
 
+    def stage4_order_index_rows(
+        self,
+        *,
+        client_order_id: str | None = None,
+        exchange_order_id: str | None = None,
+    ) -> list[tuple[int, object]]: ...
+
     def is_order_terminal(self, client_order_id: str) -> bool: ...
 
     def stage4_submit_dedupe_status(
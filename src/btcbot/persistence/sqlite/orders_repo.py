@@ -92,6 +92,21 @@ class SqliteOrdersRepo:
         rows = self._conn.execute(query, params).fetchall()
         return [self._row_to_stage4_order(row) for row in rows]
 
+    def stage4_order_index_rows(
+        self,
+        *,
+        client_order_id: str | None = None,
+        exchange_order_id: str | None = None,
+    ) -> list[tuple[int, Stage4Order]]:
+        """Rows keyed by rowid for the in-memory order index; all rows when no id is given."""
+        query = "SELECT * FROM stage4_orders"
+        params: tuple[str | None, ...] = ()
+        if client_order_id is not None or exchange_order_id is not None:
+            query += " WHERE client_order_id = ? OR exchange_order_id = ?"
+            params = (client_order_id, exchange_order_id)
+        rows = self._conn.execute(query, params).fetchall()
+        return [(int(row["id"]), self._row_to_stage4_order(row)) for row in rows]
+
     def is_order_terminal(self, client_order_id: str) -> bool:
         row = self._conn.execute(
             "SELECT status FROM stage4_orders WHERE client_order_id = ?",
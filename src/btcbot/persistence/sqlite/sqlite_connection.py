@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import logging
+import os
+import re
 import sqlite3
-from collections.abc import Iterator
+import threading
+import weakref
+from collections.abc import Callable, Iterator
 from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from urllib.parse import quote
+
+logger = logging.getLogger(__name__)
 
 
 def create_sqlite_connection(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path, timeout=30.0)
+    conn = sqlite3.connect(db_path, timeout=30.0, factory=_connection_factory())
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA busy_timeout = 30000")
     conn.execute("PRAGMA journal_mode = WAL")
@@ -27,6 +39,291 @@ def sqlite_connection_context(db_path: str) -> Iterator[sqlite3.Connection]:
         conn.close()
 
 
+def create_readonly_sqlite_connection(db_path: str) -> sqlite3.Connection:
+    """Open ``db_path`` with ``mode=ro``: no DDL, no writes, no journal-mode change.
+
+    Under WAL a reader never takes the write lock and never blocks checkpoints beyond
+    the snapshot it is reading, so monitors can poll a live database freely.
+    """
+    uri = f"file:{quote(str(Path(db_path).expanduser().resolve()))}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=30.0, factory=_connection_factory())
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 30000")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+@contextmanager
+def readonly_sqlite_connection_context(db_path: str) -> Iterator[sqlite3.Connection]:
+    conn = create_readonly_sqlite_connection(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def db_file_identity(db_path: str) -> tuple[int, int]:
+    """``(st_dev, st_ino)`` of the database file; ``(0, 0)`` while it does not exist.
+
+    Process-wide caches keyed by path use it to notice a database replaced underneath them.
+    """
+    try:
+        stat = os.stat(Path(db_path).expanduser())
+    except OSError:
+        return (0, 0)
+    return (stat.st_dev, stat.st_ino)
+
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_SUMMARY_TOP_N = 10
+_FINGERPRINT_MAX_CHARS = 500
+
+
+@lru_cache(maxsize=2048)
+def sql_fingerprint(sql: str) -> str:
+    """Normalize ``sql`` so statements differing only in literals/IN-list arity group."""
+    normalized = _STRING_LITERAL_RE.sub("?", sql)
+    normalized = _NUMBER_LITERAL_RE.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST_RE.sub("(?...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()[:_FINGERPRINT_MAX_CHARS]
+
+
+def _p95(samples: list[float]) -> float:
+    ordered = sorted(samples)
+    return ordered[int((len(ordered) - 1) * 0.95)]
+
+
+class _FingerprintStats:
+    __slots__ = ("count", "total_ms", "rows", "samples_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.samples_ms: list[float] = []
+
+
+class StatementStats:
+    """Per-fingerprint statement aggregates for one capture window (usually one cycle).
+
+    ``p95_ms`` is over execute latency (prepare + first step); ``total_ms`` also includes
+    the time spent fetching the remaining rows.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_fingerprint: dict[str, _FingerprintStats] = {}
+        self.statements = 0
+        self.slow_statements = 0
+
+    def _record_execute(self, fingerprint: str, elapsed_ms: float, rows: int, slow: bool) -> None:
+        with self._lock:
+            stats = self._by_fingerprint.get(fingerprint)
+            if stats is None:
+                stats = self._by_fingerprint[fingerprint] = _FingerprintStats()
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.rows += rows
+            stats.samples_ms.append(elapsed_ms)
+            self.statements += 1
+            if slow:
+                self.slow_statements += 1
+
+    def _record_fetch(self, fingerprint: str, elapsed_ms: float, rows: int) -> None:
+        with self._lock:
+            stats = self._by_fingerprint.get(fingerprint)
+            if stats is not None:
+                stats.total_ms += elapsed_ms
+                stats.rows += rows
+
+    def summary(self, *, top_n: int = _SUMMARY_TOP_N) -> dict[str, object]:
+        with self._lock:
+            items = [
+                {
+                    "fingerprint": fingerprint,
+                    "count": stats.count,
+                    "total_ms": round(stats.total_ms, 3),
+                    "p95_ms": round(_p95(stats.samples_ms), 3),
+                    "rows": stats.rows,
+                }
+                for fingerprint, stats in self._by_fingerprint.items()
+            ]
+            slow_statements = self.slow_statements
+        items.sort(key=lambda item: (-float(item["total_ms"]), str(item["fingerprint"])))
+        return {
+            "statements": sum(int(item["count"]) for item in items),
+            "fingerprints": len(items),
+            "total_ms": round(sum(float(item["total_ms"]) for item in items), 3),
+            "slow_statements": slow_statements,
+            "top": items[: max(0, int(top_n))],
+        }
+
+
+class SqliteStatementProfiler:
+    """Fans statement timings out to every live capture and logs slow statements."""
+
+    def __init__(self, *, slow_query_ms: float) -> None:
+        self.slow_query_ms = float(slow_query_ms)
+        self._captures: weakref.WeakSet[StatementStats] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def capture(self) -> StatementStats:
+        """Start a capture; it stops receiving statements once it is garbage-collected."""
+        stats = StatementStats()
+        with self._lock:
+            self._captures.add(stats)
+        return stats
+
+    def _targets(self) -> list[StatementStats]:
+        with self._lock:
+            return list(self._captures)
+
+    def record_execute(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        parameters: object,
+        elapsed_ms: float,
+        rows: int,
+    ) -> None:
+        fingerprint = sql_fingerprint(sql)
+        slow = elapsed_ms >= self.slow_query_ms
+        for stats in self._targets():
+            stats._record_execute(fingerprint, elapsed_ms, rows, slow)
+        if slow:
+            logger.warning(
+                "sqlite_slow_query",
+                extra={
+                    "extra": {
+                        "fingerprint": fingerprint,
+                        "elapsed_ms": round(elapsed_ms, 3),
+                        "threshold_ms": self.slow_query_ms,
+                        "query_plan": _explain_query_plan(conn, sql, parameters),
+                    }
+                },
+            )
+
+    def record_fetch(self, sql: str, elapsed_ms: float, rows: int) -> None:
+        fingerprint = sql_fingerprint(sql)
+        for stats in self._targets():
+            stats._record_fetch(fingerprint, elapsed_ms, rows)
+
+
+def _explain_query_plan(conn: sqlite3.Connection, sql: str, parameters: object) -> list[str]:
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE_PREFIXES):
+        return []
+    try:
+        rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters)
+        return [str(row[3]) for row in rows.fetchall()]
+    except (sqlite3.Error, TypeError, ValueError):
+        return []
+
+
+class _InstrumentedCursor(sqlite3.Cursor):
+    _sql: str | None = None
+
+    def execute(self, sql: str, parameters: object = (), /) -> sqlite3.Cursor:
+        profiler = _active_profiler
+        if profiler is None:
+            return super().execute(sql, parameters)
+        started = perf_counter()
+        super().execute(sql, parameters)
+        elapsed_ms = (perf_counter() - started) * 1000.0
+        self._sql = sql
+        profiler.record_execute(self.connection, sql, parameters, elapsed_ms, max(0, self.rowcount))
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: object, /) -> sqlite3.Cursor:
+        profiler = _active_profiler
+        if profiler is None:
+            return super().executemany(sql, seq_of_parameters)
+        started = perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        elapsed_ms = (perf_counter() - started) * 1000.0
+        self._sql = None
+        profiler.record_execute(self.connection, sql, (), elapsed_ms, max(0, self.rowcount))
+        return self
+
+    def _timed_fetch(self, fetch: Callable[..., Any], *args: int) -> Any:
+        profiler = _active_profiler
+        if profiler is None or self._sql is None:
+            return fetch(*args)
+        started = perf_counter()
+        result = fetch(*args)
+        elapsed_ms = (perf_counter() - started) * 1000.0
+        rows = len(result) if isinstance(result, list) else int(result is not None)
+        profiler.record_fetch(self._sql, elapsed_ms, rows)
+        return result
+
+    def fetchone(self) -> Any:
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size: int | None = None) -> list[Any]:
+        if size is None:
+            return self._timed_fetch(super().fetchmany)
+        return self._timed_fetch(super().fetchmany, size)
+
+    def fetchall(self) -> list[Any]:
+        return self._timed_fetch(super().fetchall)
+
+    def __iter__(self) -> _InstrumentedCursor:
+        return self
+
+    def __next__(self) -> Any:
+        row = self._timed_fetch(super().fetchone)
+        if row is None:
+            raise StopIteration
+        return row
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements report to the active :class:`SqliteStatementProfiler`."""
+
+    def cursor(self, factory: type[sqlite3.Cursor] = _InstrumentedCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: object = (), /) -> sqlite3.Cursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: object, /) -> sqlite3.Cursor:
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+_active_profiler: SqliteStatementProfiler | None = None
+_profiler_lock = threading.Lock()
+
+
+def _connection_factory() -> type[sqlite3.Connection]:
+    return InstrumentedConnection if _active_profiler is not None else sqlite3.Connection
+
+
+def configure_statement_profiler(
+    *, enabled: bool, slow_query_ms: float
+) -> SqliteStatementProfiler | None:
+    """Install (or remove) the process-wide profiler; connections opened afterwards report.
+
+    Profiling is opt-in: with no profiler installed, connections are plain
+    ``sqlite3.Connection`` objects and pay nothing.
+    """
+    global _active_profiler
+    with _profiler_lock:
+        if not enabled:
+            _active_profiler = None
+        elif _active_profiler is None or _active_profiler.slow_query_ms != float(slow_query_ms):
+            _active_profiler = SqliteStatementProfiler(slow_query_ms=slow_query_ms)
+        return _active_profiler
+
+
+def begin_statement_capture(*, enabled: bool, slow_query_ms: float) -> StatementStats | None:
+    """Configure the profiler and start a per-cycle capture (``None`` when disabled)."""
+    profiler = configure_statement_profiler(enabled=enabled, slow_query_ms=slow_query_ms)
+    return None if profiler is None else profiler.capture()
+
+
 def ensure_stage4_schema(conn: sqlite3.Connection) -> None:
     conn.execute(
         """
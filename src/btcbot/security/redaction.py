@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 from collections.abc import Mapping
+from functools import lru_cache
 from typing import Any
 
 REDACTED = "***REDACTED***"
@@ -71,6 +72,49 @@ _JSON_KEY_VALUE_PATTERN = re.compile(
     r'("(?:api_key|apiKey|secret|api_secret|passphrase|password|token|access_token|refresh_token|signature|authorization|auth)"\s*:\s*")([^"\\]*)(")',
     re.IGNORECASE,
 )
+# Every text pattern above contains one of these literals, so lower-cased ASCII text
+# without any of them cannot be changed by sanitize_text. Non-ASCII text always takes the
+# full path: IGNORECASE also matches e.g. Turkish "İ"/"ı" against "i".
+_TEXT_TRIGGERS = (
+    "auth",
+    "x-api-key",
+    "x-pck",
+    "x-stamp",
+    "apikey",
+    "api_key",
+    "secret",
+    "passphrase",
+    "password",
+    "token",
+    "signature",
+)
+
+# Structured-log fields whose names are known not to be sensitive; their key decision
+# is precomputed. Values are still sanitized like any other string.
+SAFE_LOG_FIELDS = frozenset(
+    {
+        "cycle_id",
+        "run_id",
+        "client_order_id",
+        "order_id",
+        "exchange_order_id",
+        "symbol",
+        "side",
+        "status",
+        "price",
+        "qty",
+        "mode",
+        "reason_code",
+        "error_type",
+        "process_role",
+        "instance_id",
+        "db_path",
+        "event_type",
+        "metric_name",
+        "labels",
+    }
+)
+_KEY_DECISION_CACHE_SIZE = 4096
 
 
 def _safe_to_str(value: object) -> str:
@@ -80,12 +124,28 @@ def _safe_to_str(value: object) -> str:
         return _TEXT_REDACTED
 
 
-def _is_sensitive_key(key: object) -> bool:
-    normalized = _safe_to_str(key).replace("-", "_").casefold()
+def _classify_key(key: str) -> bool:
+    normalized = key.replace("-", "_").casefold()
     compact = normalized.replace("_", "")
     return compact in _SENSITIVE_COMPACT_KEYS or any(part in normalized for part in _SENSITIVE_PARTS)
 
 
+_KEY_DECISIONS = {key: _classify_key(key) for key in SAFE_LOG_FIELDS}
+
+
+@lru_cache(maxsize=_KEY_DECISION_CACHE_SIZE)
+def _cached_key_decision(key: str) -> bool:
+    return _classify_key(key)
+
+
+def _is_sensitive_key(key: object) -> bool:
+    key_str = _safe_to_str(key)
+    decision = _KEY_DECISIONS.get(key_str)
+    if decision is None:
+        return _cached_key_decision(key_str)
+    return decision
+
+
 def redact_value(value: str) -> str:
     _ = value
     return REDACTED
@@ -107,6 +167,11 @@ def sanitize_text(text: str, known_secrets: list[str] | None = None) -> str:
             if secret:
                 redacted = redacted.replace(secret, _TEXT_REDACTED)
 
+        if redacted.isascii():
+            lowered = redacted.lower()
+            if not any(trigger in lowered for trigger in _TEXT_TRIGGERS):
+                return redacted
+
         for pattern in _PLAIN_SECRET_PATTERNS:
             redacted = pattern.sub(_redact_text_match, redacted)
 
@@ -131,7 +196,7 @@ def sanitize_mapping(obj: Mapping[str, Any]) -> dict[str, Any]:
     try:
         sanitized: dict[str, Any] = {}
         for key, value in obj.items():
-            key_str = _safe_to_str(key)
+            key_str = key if type(key) is str else _safe_to_str(key)
             if _is_sensitive_key(key_str):
                 sanitized[key_str] = REDACTED
                 continue
@@ -7,6 +7,7 @@ from decimal import Decimal
 from btcbot.adapters.exchange_stage4 import ExchangeClientStage4
 from btcbot.domain.models import normalize_symbol
 from btcbot.domain.stage4 import Fill, PnLSnapshot, Position
+from btcbot.obs.cycle_trace import traced
 from btcbot.services.state_store import StateStore
 
 
@@ -64,6 +65,7 @@ class AccountingService:
 
         return Decimal("0"), f"missing_fee_conversion:{currency}"
 
+    @traced("accounting.fetch_new_fills")
     def fetch_new_fills(self, symbol: str) -> FetchFillsResult:
         """Fetch fills with a lookback while preserving idempotency invariants.
 
@@ -133,6 +135,7 @@ class AccountingService:
             last_seen_ts_ms=last_seen_ts_ms,
         )
 
+    @traced("accounting.apply_fills")
     def apply_fills(
         self,
         fills: list[Fill],
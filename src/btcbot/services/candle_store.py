@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from btcbot.domain.market_data_models import Candle
+from btcbot.domain.symbols import canonical_symbol
+from btcbot.persistence.sqlite.sqlite_connection import sqlite_connection_context
+
+_SQLITE_IN_CHUNK_SIZE = 500
+
+
+class CandleStore:
+    """Persistent per-symbol OHLC candles at a fixed bucket interval.
+
+    Candles are keyed by ``(symbol, interval_seconds, bucket_epoch)`` in a clustered
+    ``WITHOUT ROWID`` table, so reading the most recent ``limit`` candles is a single
+    index range scan. History is seeded from the exchange kline endpoint and extended
+    from price observations (ticker last prices) between backfills.
+    """
+
+    def __init__(self, db_path: str, *, interval_seconds: int = 3600) -> None:
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be > 0")
+        self.db_path = db_path
+        self.interval_seconds = int(interval_seconds)
+        with sqlite_connection_context(self.db_path) as conn:
+            self._ensure_schema(conn)
+
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS market_candles (
+                symbol TEXT NOT NULL,
+                interval_seconds INTEGER NOT NULL,
+                bucket_epoch INTEGER NOT NULL,
+                open TEXT NOT NULL,
+                high TEXT NOT NULL,
+                low TEXT NOT NULL,
+                close TEXT NOT NULL,
+                volume TEXT NOT NULL DEFAULT '0',
+                source TEXT NOT NULL,
+                PRIMARY KEY(symbol, interval_seconds, bucket_epoch)
+            ) WITHOUT ROWID
+            """
+        )
+
+    def bucket_epoch(self, ts: datetime | int | float) -> int:
+        epoch = int(ts.timestamp()) if isinstance(ts, datetime) else int(ts)
+        return epoch - (epoch % self.interval_seconds)
+
+    def upsert_candles(self, symbol: str, candles: Iterable[Candle], *, source: str) -> int:
+        """Insert or replace whole candles (e.g. from a kline backfill)."""
+        key = canonical_symbol(symbol)
+        rows = [
+            (
+                key,
+                self.interval_seconds,
+                self.bucket_epoch(candle.ts),
+                str(candle.open),
+                str(candle.high),
+                str(candle.low),
+                str(candle.close),
+                str(candle.volume),
+                source,
+            )
+            for candle in candles
+        ]
+        if not rows:
+            return 0
+        with sqlite_connection_context(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT INTO market_candles(
+                    symbol, interval_seconds, bucket_epoch, open, high, low, close, volume, source
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(symbol, interval_seconds, bucket_epoch) DO UPDATE SET
+                    open=excluded.open,
+                    high=excluded.high,
+                    low=excluded.low,
+                    close=excluded.close,
+                    volume=excluded.volume,
+                    source=excluded.source
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def record_prices(self, observations: Iterable[tuple[str, datetime, Decimal]]) -> int:
+        """Fold ``(symbol, observed_at, price)`` observations into their candles.
+
+        Observations are applied in the given order: the first one in a new bucket opens
+        it, later ones widen high/low and move the close. Volume is left untouched since
+        ticker volumes are rolling 24h totals rather than per-bucket amounts.
+        """
+        folded: dict[tuple[str, int], list[Decimal]] = {}
+        for symbol, observed_at, price in observations:
+            if price <= 0:
+                continue
+            bucket_key = (canonical_symbol(symbol), self.bucket_epoch(observed_at))
+            current = folded.get(bucket_key)
+            if current is None:
+                folded[bucket_key] = [price, price, price, price]
+                continue
+            current[1] = max(current[1], price)
+            current[2] = min(current[2], price)
+            current[3] = price
+        if not folded:
+            return 0
+
+        with sqlite_connection_context(self.db_path) as conn:
+            existing = self._load_buckets(conn, list(folded))
+            rows = []
+            for (symbol, bucket), (open_, high, low, close) in folded.items():
+                stored = existing.get((symbol, bucket))
+                volume = Decimal("0")
+                if stored is not None:
+                    open_ = stored.open
+                    high = max(high, stored.high)
+                    low = min(low, stored.low)
+                    volume = stored.volume
+                rows.append(
+                    (
+                        symbol,
+                        self.interval_seconds,
+                        bucket,
+                        str(open_),
+                        str(high),
+                        str(low),
+                        str(close),
+                        str(volume),
+                        "observed" if stored is None else stored.source,
+                    )
+                )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO market_candles(
+                    symbol, interval_seconds, bucket_epoch, open, high, low, close, volume, source
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def _load_buckets(
+        self, conn: sqlite3.Connection, keys: list[tuple[str, int]]
+    ) -> dict[tuple[str, int], _StoredCandle]:
+        loaded: dict[tuple[str, int], _StoredCandle] = {}
+        symbols = sorted({symbol for symbol, _bucket in keys})
+        buckets = sorted({bucket for _symbol, bucket in keys})
+        for start in range(0, len(symbols), _SQLITE_IN_CHUNK_SIZE):
+            chunk = symbols[start : start + _SQLITE_IN_CHUNK_SIZE]
+            rows = conn.execute(
+                f"""
+                SELECT symbol, bucket_epoch, open, high, low, volume, source
+                FROM market_candles
+                WHERE interval_seconds = ?
+                  AND symbol IN ({",".join("?" for _ in chunk)})
+                  AND bucket_epoch BETWEEN ? AND ?
+                """,
+                (self.interval_seconds, *chunk, buckets[0], buckets[-1]),
+            ).fetchall()
+            for row in rows:
+                loaded[(str(row["symbol"]), int(row["bucket_epoch"]))] = _StoredCandle(
+                    open=Decimal(str(row["open"])),
+                    high=Decimal(str(row["high"])),
+                    low=Decimal(str(row["low"])),
+                    volume=Decimal(str(row["volume"])),
+                    source=str(row["source"]),
+                )
+        return loaded
+
+    def latest_bucket_epoch(self, symbol: str, *, source: str | None = None) -> int | None:
+        """Newest stored bucket, optionally only among candles written by ``source``.
+
+        Observed candles keep the source of the candle they extend, so
+        ``source="kline"`` marks how far exchange history has been backfilled.
+        """
+        query = """
+            SELECT MAX(bucket_epoch) AS latest
+            FROM market_candles
+            WHERE symbol = ? AND interval_seconds = ?
+        """
+        params: tuple[object, ...] = (canonical_symbol(symbol), self.interval_seconds)
+        if source is not None:
+            query += " AND source = ?"
+            params = (*params, source)
+        with sqlite_connection_context(self.db_path) as conn:
+            row = conn.execute(query, params).fetchone()
+        if row is None or row["latest"] is None:
+            return None
+        return int(row["latest"])
+
+    def count_buckets(self, symbol: str, *, start_epoch: int, end_epoch: int) -> int:
+        """Number of stored candles with ``start_epoch <= bucket_epoch <= end_epoch``."""
+        with sqlite_connection_context(self.db_path) as conn:
+            row = conn.execute(
+                """
+                SELECT COUNT(*) FROM market_candles
+                WHERE symbol = ? AND interval_seconds = ? AND bucket_epoch BETWEEN ? AND ?
+                """,
+                (canonical_symbol(symbol), self.interval_seconds, start_epoch, end_epoch),
+            ).fetchone()
+        return int(row[0])
+
+    def get_candles(self, symbol: str, limit: int) -> list[Candle]:
+        """Return up to ``limit`` most recent candles, oldest first."""
+        if limit <= 0:
+            return []
+        with sqlite_connection_context(self.db_path) as conn:
+            rows = conn.execute(
+                """
+                SELECT bucket_epoch, open, high, low, close, volume
+                FROM market_candles
+                WHERE symbol = ? AND interval_seconds = ?
+                ORDER BY bucket_epoch DESC
+                LIMIT ?
+                """,
+                (canonical_symbol(symbol), self.interval_seconds, int(limit)),
+            ).fetchall()
+        return [
+            Candle(
+                ts=datetime.fromtimestamp(int(row["bucket_epoch"]), tz=UTC),
+                open=Decimal(str(row["open"])),
+                high=Decimal(str(row["high"])),
+                low=Decimal(str(row["low"])),
+                close=Decimal(str(row["close"])),
+                volume=Decimal(str(row["volume"])),
+            )
+            for row in reversed(rows)
+        ]
+
+
+@dataclass(frozen=True)
+class _StoredCandle:
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    volume: Decimal
+    source: str
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from threading import Lock
+from typing import TypeVar
+
+from btcbot.persistence.sqlite.sqlite_connection import db_file_identity
+
+T = TypeVar("T")
+
+# op_state keys whose writes bump ``control_state_version``; degrade_state_current always does.
+CONTROL_OP_STATE_PREFIXES = ("kill_switch:", "stage4_freeze:")
+
+
+class ControlStateCache:
+    """Parsed control-plane rows (kill switch, freeze, degrade) tagged with a DB version.
+
+    Triggers bump ``control_state_version`` on every write to those rows from any
+    process, so one integer read tells whether a cached value is still current.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._version: int | None = None
+        self._values: dict[str, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: int, key: str, load: Callable[[], T]) -> T:
+        with self._lock:
+            if self._version == version and key in self._values:
+                self.hits += 1
+                return self._values[key]  # type: ignore[return-value]
+            self.misses += 1
+        value = load()
+        with self._lock:
+            if self._version != version:
+                self._version = version
+                self._values = {}
+            self._values[key] = value
+        return value
+
+
+_SHARED_CACHES: dict[str, tuple[tuple[int, int], ControlStateCache]] = {}
+_SHARED_CACHES_LOCK = Lock()
+
+
+def shared_control_state_cache(db_path_abs: str) -> ControlStateCache:
+    """Cache for ``db_path_abs`` shared by every store in the process; reset if the file is replaced."""
+    identity = db_file_identity(db_path_abs)
+    with _SHARED_CACHES_LOCK:
+        entry = _SHARED_CACHES.get(db_path_abs)
+        if entry is not None and entry[0] == identity:
+            return entry[1]
+        cache = ControlStateCache()
+        _SHARED_CACHES[db_path_abs] = (identity, cache)
+        return cache
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, field
+
+FLAG_FULL_SCAN = "full_scan"
+FLAG_TEMP_BTREE = "temp_btree"
+
+
+@dataclass(frozen=True)
+class IndexSuggestion:
+    name: str
+    table: str
+    columns: tuple[str, ...]
+
+    @property
+    def ddl(self) -> str:
+        return f"CREATE INDEX IF NOT EXISTS {self.name} ON {self.table}({', '.join(self.columns)})"
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A statement the cycle issues often enough that its plan must stay index-backed.
+
+    ``sql`` mirrors the statement in ``source``; ``params`` are placeholders only needed
+    to bind it for ``EXPLAIN QUERY PLAN``. ``accepted_flags`` lists plan features known to
+    be harmless for that query (e.g. sorting a handful of open orders).
+    """
+
+    name: str
+    source: str
+    sql: str
+    params: tuple[object, ...] = ()
+    suggestion: IndexSuggestion | None = None
+    accepted_flags: frozenset[str] = field(default_factory=frozenset)
+
+
+@dataclass(frozen=True)
+class QueryPlanFinding:
+    query: HotQuery
+    plan: list[str]
+    flags: list[str]
+    skipped_reason: str | None = None
+
+    @property
+    def unaccepted_flags(self) -> list[str]:
+        return [flag for flag in self.flags if flag not in self.query.accepted_flags]
+
+    @property
+    def missing_index(self) -> IndexSuggestion | None:
+        return self.query.suggestion if self.unaccepted_flags else None
+
+
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    HotQuery(
+        name="open_or_unknown_orders",
+        source="StateStore.find_open_or_unknown_orders",
+        sql=(
+            "SELECT order_id, status, created_at, updated_at FROM orders "
+            "WHERE status IN ('new', 'open', 'partial', 'unknown') AND symbol IN (?)"
+        ),
+        params=("BTCTRY",),
+        suggestion=IndexSuggestion("idx_orders_status_symbol", "orders", ("status", "symbol")),
+    ),
+    HotQuery(
+        name="stage4_open_orders",
+        source="SqliteOrdersRepo.list_stage4_open_orders",
+        sql=(
+            "SELECT * FROM stage4_orders "
+            "WHERE status IN ('open', 'submitted', 'cancel_requested') AND mode != 'external' "
+            "ORDER BY symbol, side, created_at"
+        ),
+        # An IN over statuses cannot deliver (symbol, side, created_at) order from any
+        # index; the sort only ever sees the open set, which is small.
+        accepted_flags=frozenset({FLAG_TEMP_BTREE}),
+    ),
+    HotQuery(
+        name="stage4_unknown_orders",
+        source="SqliteOrdersRepo.stage4_unknown_client_order_ids",
+        sql=(
+            "SELECT client_order_id FROM stage4_orders WHERE status = 'unknown' "
+            "ORDER BY updated_at DESC"
+        ),
+        suggestion=IndexSuggestion(
+            "idx_stage4_orders_status_updated_at", "stage4_orders", ("status", "updated_at")
+        ),
+    ),
+    HotQuery(
+        name="stage4_order_by_client_id",
+        source="SqliteOrdersRepo.get_stage4_order_by_client_id",
+        sql="SELECT * FROM stage4_orders WHERE client_order_id = ?",
+        params=("cid",),
+    ),
+    HotQuery(
+        name="latest_dynamic_universe_selection",
+        source="StateStore.get_latest_dynamic_universe_selection",
+        sql="SELECT * FROM dynamic_universe_cycles ORDER BY ts DESC LIMIT 1",
+        suggestion=IndexSuggestion(
+            "idx_dynamic_universe_cycles_ts", "dynamic_universe_cycles", ("ts",)
+        ),
+    ),
+    HotQuery(
+        name="realized_total_at_day_start",
+        source="StateStore.realized_total_at_day_start",
+        sql="SELECT realized_total_try FROM pnl_snapshots WHERE ts >= ? ORDER BY ts ASC LIMIT 1",
+        params=("1970-01-01T00:00:00+00:00",),
+        suggestion=IndexSuggestion("idx_pnl_snapshots_ts", "pnl_snapshots", ("ts",)),
+    ),
+    HotQuery(
+        name="ledger_checkpoint_tail",
+        source="LedgerService.checkpoint",
+        sql="SELECT ts, event_id FROM ledger_events ORDER BY ts DESC, event_id DESC LIMIT 1",
+        suggestion=IndexSuggestion(
+            "idx_ledger_events_ts_event_id", "ledger_events", ("ts", "event_id")
+        ),
+    ),
+    HotQuery(
+        name="stage7_run_metrics_tail",
+        source="StateStore.fetch_stage7_run_metrics",
+        sql="SELECT * FROM stage7_run_metrics ORDER BY ts DESC LIMIT ?",
+        params=(50,),
+        suggestion=IndexSuggestion("idx_stage7_run_metrics_ts", "stage7_run_metrics", ("ts",)),
+    ),
+    HotQuery(
+        name="stage7_rollup_bucket_rows",
+        source="StateStore._stage7_bucket_rows_with_conn",
+        sql=(
+            "SELECT ts, cycle_id FROM stage7_run_metrics "
+            "WHERE ts >= ? AND ts < ? ORDER BY ts, cycle_id"
+        ),
+        params=("2024-01-01", "2024-01-09"),
+        suggestion=IndexSuggestion(
+            "idx_stage7_run_metrics_ts_cycle_id", "stage7_run_metrics", ("ts", "cycle_id")
+        ),
+    ),
+    HotQuery(
+        name="idempotency_keys_expired",
+        source="StateStore.prune_expired_idempotency_keys",
+        sql=(
+            "DELETE FROM idempotency_keys WHERE rowid IN ("
+            "SELECT rowid FROM idempotency_keys WHERE expires_at_epoch <= ? LIMIT ?)"
+        ),
+        params=(0, 500),
+        suggestion=IndexSuggestion(
+            "idx_idempotency_keys_expires_at", "idempotency_keys", ("expires_at_epoch",)
+        ),
+    ),
+)
+
+
+def plan_flags(plan: list[str]) -> list[str]:
+    """Classify ``EXPLAIN QUERY PLAN`` detail lines into scan/sort flags."""
+    flags: list[str] = []
+    for line in plan:
+        detail = line.strip().upper()
+        # "SCAN t USING [COVERING] INDEX" walks an index in order; only a bare SCAN reads
+        # every row of the table.
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            flags.append(FLAG_FULL_SCAN)
+        elif "USE TEMP B-TREE" in detail:
+            flags.append(FLAG_TEMP_BTREE)
+    return sorted(set(flags))
+
+
+def audit_hot_queries(
+    conn: sqlite3.Connection, queries: tuple[HotQuery, ...] = HOT_QUERIES
+) -> list[QueryPlanFinding]:
+    findings: list[QueryPlanFinding] = []
+    for query in queries:
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params).fetchall()
+        except sqlite3.OperationalError as exc:
+            findings.append(
+                QueryPlanFinding(query=query, plan=[], flags=[], skipped_reason=str(exc))
+            )
+            continue
+        plan = [str(row[3]) for row in rows]
+        findings.append(QueryPlanFinding(query=query, plan=plan, flags=plan_flags(plan)))
+    return findings
+
+
+def object_sizes(conn: sqlite3.Connection) -> list[dict[str, object]]:
+    """Per table/index size, largest first; ``bytes`` is ``None`` without ``dbstat``."""
+    objects = {
+        str(row[0]): (str(row[1]), str(row[2]))
+        for row in conn.execute(
+            "SELECT name, type, tbl_name FROM sqlite_master WHERE type IN ('table', 'index')"
+        )
+    }
+    sizes: list[dict[str, object]] = []
+    try:
+        rows = conn.execute(
+            """
+            SELECT name,
+                   SUM(pgsize) AS bytes,
+                   SUM(ncell) AS cells,
+                   SUM(CASE WHEN pagetype = 'leaf' THEN ncell ELSE 0 END) AS leaf_cells
+            FROM dbstat
+            GROUP BY name
+            """
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = None
+    if rows is not None:
+        for name, size_bytes, cells, leaf_cells in rows:
+            kind, table = objects.get(str(name), ("internal", str(name)))
+            sizes.append(
+                {
+                    "name": str(name),
+                    "type": kind,
+                    "table": table,
+                    "bytes": int(size_bytes or 0),
+                    # Table rows live only in leaf cells; index entries also sit in interior pages.
+                    "entries": int((leaf_cells if kind == "table" else cells) or 0),
+                }
+            )
+        sizes.sort(key=lambda item: (-int(item["bytes"]), str(item["name"])))
+        return sizes
+    for name, (kind, table) in sorted(objects.items()):
+        if kind != "table" or name.startswith("sqlite_"):
+            continue
+        count = conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+        sizes.append(
+            {"name": name, "type": kind, "table": table, "bytes": None, "entries": int(count)}
+        )
+    sizes.sort(key=lambda item: (-int(item["entries"]), str(item["name"])))
+    return sizes
+
+
+def missing_indexes(findings: list[QueryPlanFinding]) -> list[IndexSuggestion]:
+    suggestions: dict[str, IndexSuggestion] = {}
+    for finding in findings:
+        suggestion = finding.missing_index
+        if suggestion is not None:
+            suggestions.setdefault(suggestion.name, suggestion)
+    return list(suggestions.values())
+
+
+def apply_indexes(conn: sqlite3.Connection, suggestions: list[IndexSuggestion]) -> list[str]:
+    applied: list[str] = []
+    for suggestion in suggestions:
+        conn.execute(suggestion.ddl)
+        applied.append(suggestion.name)
+    if applied:
+        conn.execute("ANALYZE")
+    return applied
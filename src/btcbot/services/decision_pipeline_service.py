@@ -24,6 +24,7 @@ from btcbot.domain.symbols import canonical_symbol
 from btcbot.domain.universe_models import SymbolInfo
 from btcbot.observability_decisions import emit_decision
 from btcbot.services.allocation_service import AllocationKnobs, AllocationService
+from btcbot.services.indicator_engine import IndicatorEngine, mark_series_key
 from btcbot.services.universe_service import select_universe
 from btcbot.strategies.baseline_mean_reversion import BaselineMeanReversionStrategy
 from btcbot.strategies.stage5_core import StrategyRegistry
@@ -62,12 +63,14 @@ class DecisionPipelineService:
         universe_selector: Callable[..., list[str]] = select_universe,
         allocation_service: type[AllocationService] = AllocationService,
         now_provider: Callable[[], datetime] | None = None,
+        indicator_engine: IndicatorEngine | None = None,
     ) -> None:
         self.settings = settings
         self.universe_selector = universe_selector
         self.allocation_service = allocation_service
         self.registry = strategy_registry or self._default_registry()
         self.now_provider = now_provider or (lambda: datetime.now(UTC))
+        self.indicator_engine = indicator_engine
 
     def run_cycle(
         self,
@@ -521,6 +524,7 @@ class DecisionPipelineService:
                 position=positions.get(symbol),
                 open_orders=orders_summary.get(symbol, OpenOrdersSummary()),
                 knobs=StrategyKnobs(
+                    anchor_price=self._anchor_price(symbol, mark=mark, now_ts=now_ts),
                     max_notional_try=self._to_decimal(self.settings.stage5_max_intent_notional_try),
                     bootstrap_notional_try=self._to_decimal(
                         self.settings.stage5_bootstrap_notional_try
@@ -540,6 +544,18 @@ class DecisionPipelineService:
             )
         return intents
 
+    def _anchor_price(self, symbol: str, *, mark: Decimal, now_ts: datetime) -> Decimal | None:
+        """Mean-reversion anchor; ``None`` keeps the strategy's mark-price default."""
+        engine = self.indicator_engine
+        if engine is None or self.settings.strategy_anchor_source != "ema":
+            return None
+        key = mark_series_key(symbol)
+        engine.update(key, ts=now_ts, close=mark)
+        snapshot = engine.snapshot(key)
+        if snapshot is None or snapshot.samples < 2:
+            return None
+        return snapshot.ema
+
     def _to_orderbooks(self, mark_prices: Mapping[str, Decimal]) -> dict[str, OrderBookSummary]:
         return {
             symbol: OrderBookSummary(best_bid=mark, best_ask=mark)
@@ -11,9 +11,18 @@ from time import perf_counter
 
 from btcbot.config import Settings
 from btcbot.observability import get_instrumentation
-from btcbot.persistence.sqlite.sqlite_connection import sqlite_connection_context
+from btcbot.persistence.sqlite.sqlite_connection import (
+    readonly_sqlite_connection_context,
+    sqlite_connection_context,
+)
 from btcbot.replay.validate import DatasetValidationReport, validate_replay_dataset
 from btcbot.runtime.guards import enforce_role_db_convention, normalize_db_path
+from btcbot.services.db_perf import (
+    apply_indexes,
+    audit_hot_queries,
+    missing_indexes,
+    object_sizes,
+)
 from btcbot.services.effective_universe import resolve_effective_universe
 from btcbot.services.exchange_factory import build_exchange_stage4
 from btcbot.services.exchange_rules_service import ExchangeRulesService
@@ -67,6 +76,7 @@ def run_health_checks(
     *,
     db_path: str | None,
     dataset_path: str | None,
+    db_perf: bool = False,
 ) -> DoctorReport:
     started = perf_counter()
     checks: list[DoctorCheck] = []
@@ -203,6 +213,8 @@ def run_health_checks(
         warnings=warnings,
         actions=actions,
     )
+    if db_perf:
+        _run_db_perf_checks(db_path=db_path, checks=checks, actions=actions)
 
     report = DoctorReport(checks=checks, errors=errors, warnings=warnings, actions=actions)
     derived_ok = all(check.status != "fail" for check in report.checks)
@@ -344,7 +356,7 @@ def _run_slo_checks(
         checks.append(DoctorCheck("slo", "coverage", "warn", message))
         return
 
-    store = StateStore(db_path=db_path)
+    store = StateStore.open_read_only(db_path)
     rows = store.fetch_stage7_run_metrics(limit=settings.doctor_slo_lookback, order_desc=True)
     ledger_metrics = store.get_latest_stage7_ledger_metrics()
     drawdown_ratio = (
@@ -509,7 +521,7 @@ def _run_ops_stability_checks(
             DoctorCheck("ops", "shared_db_between_roles", "pass", f"role={role} db_path={normalized}")
         )
 
-    store = StateStore(db_path=str(normalized))
+    store = StateStore.open_read_only(str(normalized))
     now_epoch = int(datetime.now(UTC).timestamp())
     ttl = int(store.process_instance_ttl_seconds)
     with store._connect() as conn:
@@ -543,7 +555,7 @@ def _run_p14_accounting_checks(
         checks.append(DoctorCheck("p1_4", "coverage", "warn", "db_path not provided; skipping P1.4 checks"))
         return
 
-    store = StateStore(db_path=db_path)
+    store = StateStore.open_read_only(db_path)
     with store._connect() as conn:
         row = conn.execute("SELECT COUNT(*) AS c FROM ledger_events").fetchone()
         ledger_event_count = int(row["c"]) if row is not None else 0
@@ -698,6 +710,68 @@ def _run_p14_accounting_checks(
         )
     checks.append(DoctorCheck("p1_4", "accounting_ledger_consistency", mismatch_status, mismatch_msg))
 
+
+def _run_db_perf_checks(
+    *,
+    db_path: str | None,
+    checks: list[DoctorCheck],
+    actions: list[str],
+    top_objects: int = 10,
+) -> None:
+    if db_path is None or not Path(db_path).is_file():
+        checks.append(
+            DoctorCheck("db_perf", "coverage", "warn", "db_path not found; skipping DB perf audit")
+        )
+        return
+
+    with readonly_sqlite_connection_context(db_path) as conn:
+        findings = audit_hot_queries(conn)
+        sizes = object_sizes(conn)
+
+    for finding in findings:
+        name = f"plan_{finding.query.name}"
+        if finding.skipped_reason is not None:
+            checks.append(
+                DoctorCheck("db_perf", name, "pass", f"skipped: {finding.skipped_reason}")
+            )
+            continue
+        plan = " | ".join(finding.plan)
+        unaccepted = finding.unaccepted_flags
+        if not unaccepted:
+            accepted = f" accepted={','.join(finding.flags)}" if finding.flags else ""
+            checks.append(DoctorCheck("db_perf", name, "pass", f"plan={plan}{accepted}"))
+            continue
+        suggestion = finding.missing_index
+        remedy = f" suggest={suggestion.ddl}" if suggestion is not None else ""
+        checks.append(
+            DoctorCheck(
+                "db_perf",
+                name,
+                "warn",
+                f"source={finding.query.source} flags={','.join(unaccepted)} plan={plan}{remedy}",
+            )
+        )
+
+    suggestions = missing_indexes(findings)
+    if suggestions:
+        actions.extend(f"Missing index: {item.ddl}" for item in suggestions)
+        actions.append("Apply missing indexes: btcbot doctor --db-perf --apply-indexes")
+
+    largest = ", ".join(
+        f"{item['name']}({item['type']})="
+        + (f"{item['bytes']}B" if item["bytes"] is not None else "?B")
+        + f"/{item['entries']}"
+        for item in sizes[: max(0, top_objects)]
+    )
+    checks.append(DoctorCheck("db_perf", "object_sizes", "pass", f"largest={largest or 'none'}"))
+
+
+def apply_missing_indexes(db_path: str) -> list[str]:
+    """Create the indexes the hot-query audit reports missing; returns their names."""
+    with sqlite_connection_context(db_path) as conn:
+        return apply_indexes(conn, missing_indexes(audit_hot_queries(conn)))
+
+
 def _slo_metric_check(
     name: str,
     value: float,
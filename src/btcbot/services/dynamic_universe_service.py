@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from math import log
@@ -10,8 +10,9 @@ from time import perf_counter
 from btcbot.config import Settings
 from btcbot.domain.models import PairInfo
 from btcbot.domain.symbols import canonical_symbol
+from btcbot.obs.cycle_trace import traced
 from btcbot.observability import get_instrumentation
-from btcbot.services.state_store import StateStore
+from btcbot.services.state_store import DynamicUniverseSymbolStateUpdate, StateStore
 
 logger = logging.getLogger(__name__)
 _BPS = Decimal("10000")
@@ -54,6 +55,7 @@ class _Candidate:
 
 
 class DynamicUniverseService:
+    @traced("dynamic_universe.select")
     def select(
         self,
         *,
@@ -135,8 +137,14 @@ class DynamicUniverseService:
         skipped_for_scan_budget = max(0, len(symbols) - len(scanned_symbols))
 
         t_books = perf_counter()
+        # Symbol state, price snapshots and lookbacks are read/written in bulk so a
+        # selection pass costs a constant number of queries regardless of scan budget.
+        scanned_set = set(scanned_symbols)
+        symbol_states = state_store.load_dynamic_universe_states(scanned_set)
+        price_snapshots: list[tuple[str, datetime, Decimal]] = []
+        priced: list[tuple[str, _OrderbookMetrics, dict[str, object]]] = []
         for symbol in scanned_symbols:
-            symbol_state = state_store.get_dynamic_universe_symbol_state(symbol) or {}
+            symbol_state = symbol_states.get(symbol, {})
             if self._is_cooldown(symbol_state, now_utc):
                 self._inc(ineligible_counts, "cooldown")
                 continue
@@ -174,23 +182,24 @@ class DynamicUniverseService:
                 instr.counter("depth_unavailable", 1)
                 continue
 
-            state_store.upsert_universe_price_snapshot(
-                pair_symbol=symbol,
-                ts_bucket=now_bucket,
-                mid_price=metrics.mid_price,
-            )
+            price_snapshots.append((symbol, now_bucket, metrics.mid_price))
             if metrics.spread_bps > settings.universe_spread_max_bps:
                 self._inc(ineligible_counts, "spread_too_wide")
                 continue
             if metrics.depth_try < settings.universe_min_depth_try:
                 self._inc(ineligible_counts, "insufficient_depth")
                 continue
+            priced.append((symbol, metrics, symbol_state))
 
-            lookback_price = state_store.get_universe_price_lookback(
-                pair_symbol=symbol,
-                target_ts=now_utc - timedelta(hours=24),
-                tolerance=timedelta(minutes=settings.universe_history_tolerance_minutes),
-            )
+        state_store.upsert_universe_price_snapshots_many(price_snapshots)
+        lookback_prices = state_store.get_universe_price_lookbacks(
+            pair_symbols=[symbol for symbol, _metrics, _state in priced],
+            target_ts=now_utc - timedelta(hours=24),
+            tolerance=timedelta(minutes=settings.universe_history_tolerance_minutes),
+        )
+        state_updates: dict[str, DynamicUniverseSymbolStateUpdate] = {}
+        for symbol, metrics, symbol_state in priced:
+            lookback_price = lookback_prices.get(symbol)
             if lookback_price is None or lookback_price <= 0:
                 self._inc(ineligible_counts, "insufficient_history")
                 continue
@@ -202,16 +211,10 @@ class DynamicUniverseService:
             )
             if reject_counts.get("1123", 0) >= settings.universe_reject_1123_threshold:
                 self._inc(ineligible_counts, "reject_1123")
-                state_store.upsert_dynamic_universe_symbol_state(
-                    symbol=symbol,
-                    updated_at=now_utc,
+                state_updates[symbol] = replace(
+                    self._state_update(symbol, symbol_state, now_utc),
                     cooldown_until_ts=now_utc
                     + timedelta(minutes=settings.universe_symbol_cooldown_minutes),
-                    last_selected_ts=_parse_optional_ts(symbol_state.get("last_selected_ts")),
-                    probation_until_ts=_parse_optional_ts(symbol_state.get("probation_until_ts")),
-                    reject_window_start_ts=_parse_optional_ts(
-                        symbol_state.get("reject_window_start_ts")
-                    ),
                     reject_counts=reject_counts,
                 )
                 continue
@@ -277,20 +280,24 @@ class DynamicUniverseService:
             if item.symbol in selected_set
         }
 
+        unloaded = [
+            symbol
+            for symbol in selected
+            if symbol not in state_updates and symbol not in scanned_set
+        ]
+        if unloaded:
+            symbol_states.update(state_store.load_dynamic_universe_states(unloaded))
         for symbol in selected:
-            symbol_state = state_store.get_dynamic_universe_symbol_state(symbol) or {}
-            probation_until = _parse_optional_ts(symbol_state.get("probation_until_ts"))
+            update = state_updates.get(symbol) or self._state_update(
+                symbol, symbol_states.get(symbol, {}), now_utc
+            )
+            probation_until = update.probation_until_ts
             if probation_until is None:
                 probation_until = now_utc + timedelta(minutes=settings.universe_probation_minutes)
-            state_store.upsert_dynamic_universe_symbol_state(
-                symbol=symbol,
-                updated_at=now_utc,
-                last_selected_ts=now_utc,
-                cooldown_until_ts=_parse_optional_ts(symbol_state.get("cooldown_until_ts")),
-                probation_until_ts=probation_until,
-                reject_window_start_ts=_parse_optional_ts(symbol_state.get("reject_window_start_ts")),
-                reject_counts=dict(symbol_state.get("reject_counts", {})),
+            state_updates[symbol] = replace(
+                update, last_selected_ts=now_utc, probation_until_ts=probation_until
             )
+        state_store.upsert_dynamic_universe_symbol_states_many(state_updates.values())
 
         state_store.save_dynamic_universe_selection(
             cycle_id=cycle_id,
@@ -614,6 +621,22 @@ class DynamicUniverseService:
             return {}
         return counts
 
+    @staticmethod
+    def _state_update(
+        symbol: str, state: dict[str, object], now_utc: datetime
+    ) -> DynamicUniverseSymbolStateUpdate:
+        return DynamicUniverseSymbolStateUpdate(
+            symbol=symbol,
+            updated_at=now_utc,
+            last_selected_ts=_parse_optional_ts(state.get("last_selected_ts")),
+            cooldown_until_ts=_parse_optional_ts(state.get("cooldown_until_ts")),
+            probation_until_ts=_parse_optional_ts(state.get("probation_until_ts")),
+            reject_window_start_ts=_parse_optional_ts(state.get("reject_window_start_ts")),
+            reject_counts={
+                str(k): int(v) for k, v in dict(state.get("reject_counts", {})).items()
+            },
+        )
+
     @staticmethod
     def _inc(target: dict[str, int], key: str) -> None:
         target[key] = target.get(key, 0) + 1
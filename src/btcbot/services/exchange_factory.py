@@ -14,6 +14,7 @@ from btcbot.adapters.exchange import ExchangeClient
 from btcbot.adapters.exchange_stage4 import ExchangeClientStage4
 from btcbot.config import Settings
 from btcbot.domain.models import Balance
+from btcbot.services.candle_store import CandleStore
 from btcbot.services.rate_limiter import TokenBucketRateLimiter
 
 logger = logging.getLogger(__name__)
@@ -82,6 +83,8 @@ def build_exchange_stage3(settings: Settings, *, force_dry_run: bool) -> Exchang
         breaker_cooldown_seconds=settings.breaker_cooldown_seconds,
         orderbook_inflight_wait_timeout_s=settings.orderbook_inflight_wait_timeout_s,
         live_rules_require_exchangeinfo=settings.live_rules_require_exchangeinfo,
+        candle_store=_build_candle_store(settings),
+        candle_backfill_limit=settings.candle_backfill_limit,
     )
 
 
@@ -101,6 +104,8 @@ def build_exchange_stage4(settings: Settings, *, dry_run: bool) -> ExchangeClien
         breaker_cooldown_seconds=settings.breaker_cooldown_seconds,
         orderbook_inflight_wait_timeout_s=settings.orderbook_inflight_wait_timeout_s,
         live_rules_require_exchangeinfo=settings.live_rules_require_exchangeinfo,
+        candle_store=_build_candle_store(settings),
+        candle_backfill_limit=settings.candle_backfill_limit,
     )
     return BtcturkHttpClientStage4(live_client)
 
@@ -117,6 +122,14 @@ def _close_best_effort(resource: object, label: str) -> None:
         )
 
 
+def _build_candle_store(settings: Settings) -> CandleStore | None:
+    if not settings.candle_store_path:
+        return None
+    return CandleStore(
+        settings.candle_store_path, interval_seconds=settings.candle_interval_seconds
+    )
+
+
 def _build_rate_limiter(settings: Settings) -> TokenBucketRateLimiter:
     return TokenBucketRateLimiter(
         build_endpoint_budgets(
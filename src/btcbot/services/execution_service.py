@@ -808,7 +808,7 @@ class ExecutionService:
             return 0
 
         canceled = 0
-        self.state_store.prune_expired_idempotency_keys()
+        self.state_store.prune_expired_idempotency_keys_if_due()
         now = datetime.now(UTC)
         for order in open_orders:
             created_at = order.created_at
@@ -1062,7 +1062,7 @@ class ExecutionService:
             self.refresh_order_lifecycle(symbols)
             if execution_cycle_id:
                 self.mark_lifecycle_refreshed(cycle_id=execution_cycle_id)
-        self.state_store.prune_expired_idempotency_keys()
+        self.state_store.prune_expired_idempotency_keys_if_due()
         self.last_execute_summary = {
             "orders_submitted": 0,
             "orders_failed_exchange": 0,
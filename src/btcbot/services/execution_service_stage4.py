@@ -17,6 +17,7 @@ from btcbot.domain.stage4 import (
     Stage4RejectReason,
     map_stage4_reject_reason,
 )
+from btcbot.obs.cycle_trace import traced
 from btcbot.obs.process_role import coerce_process_role
 from btcbot.observability import get_instrumentation
 from btcbot.observability_decisions import emit_decision
@@ -146,6 +147,7 @@ class ExecutionService:
             },
         )
 
+    @traced("execution.execute_with_report")
     def execute_with_report(self, actions: list[LifecycleAction]) -> ExecutionReport:
         if self.settings.live_trading and not self.settings.is_live_trading_enabled():
             raise RuntimeError("LIVE_TRADING requires LIVE_TRADING_ACK=I_UNDERSTAND")
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from decimal import Decimal
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from btcbot.domain.indicators import IndicatorSnapshot, SeriesIndicators
+
+if TYPE_CHECKING:
+    from btcbot.config import Settings
+    from btcbot.services.state_store import StateStore
+
+EQUITY_SERIES_KEY = "equity:total_try"
+
+
+CANDLE_SERIES_PREFIX = "candles:"
+MARK_SERIES_PREFIX = "mark:"
+
+
+def candle_series_key(symbol: str) -> str:
+    return f"{CANDLE_SERIES_PREFIX}{symbol}"
+
+
+def mark_series_key(symbol: str) -> str:
+    return f"{MARK_SERIES_PREFIX}{symbol}"
+
+
+class IndicatorEngine:
+    """Per-series rolling indicators shared by the universe scorer, risk and strategies.
+
+    State lives in float64 ring buffers and is updated incrementally: feeding the same
+    candle history every cycle only costs the new (or revised) samples. Consumers read
+    Decimal :class:`IndicatorSnapshot` values. ``restore``/``persist`` round-trip the
+    state through the ``indicator_states`` table so it survives restarts.
+    """
+
+    def __init__(self, *, window: int, ema_span: int = 20, atr_period: int = 14) -> None:
+        self.window = max(2, int(window))
+        self.ema_span = int(ema_span)
+        self.atr_period = int(atr_period)
+        self._series: dict[str, SeriesIndicators] = {}
+        self._dirty: set[str] = set()
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> IndicatorEngine:
+        return cls(
+            window=settings.stage7_vol_lookback,
+            ema_span=settings.indicator_ema_span,
+            atr_period=settings.indicator_atr_period,
+        )
+
+    def _new_series(self, *, log_returns: bool) -> SeriesIndicators:
+        return SeriesIndicators(
+            window=self.window,
+            ema_span=self.ema_span,
+            atr_period=self.atr_period,
+            log_returns=log_returns,
+        )
+
+    def _series_for(self, key: str, *, log_returns: bool) -> SeriesIndicators:
+        series = self._series.get(key)
+        if series is None or series.log_returns != log_returns:
+            series = self._new_series(log_returns=log_returns)
+            self._series[key] = series
+        return series
+
+    def update(
+        self,
+        key: str,
+        *,
+        ts: datetime | int,
+        close: Decimal | float,
+        high: Decimal | float | None = None,
+        low: Decimal | float | None = None,
+        log_returns: bool = False,
+    ) -> bool:
+        epoch = int(ts.timestamp()) if isinstance(ts, datetime) else int(ts)
+        with self._lock:
+            applied = self._series_for(key, log_returns=log_returns).update(
+                epoch,
+                float(close),
+                high=None if high is None else float(high),
+                low=None if low is None else float(low),
+            )
+            if applied:
+                self._dirty.add(key)
+        return applied
+
+    def update_candles(self, key: str, rows: Iterable[object]) -> int:
+        """Feed candle rows (dicts with ``ts``/``close`` or Candle objects), oldest first.
+
+        Returns the number of samples applied; rows without a timestamp are skipped.
+        """
+        applied = 0
+        for row in rows:
+            if isinstance(row, dict):
+                ts_raw = row.get("ts")
+                close_raw = row.get("close") or row.get("c")
+                high_raw = row.get("high") or row.get("h")
+                low_raw = row.get("low") or row.get("l")
+            else:
+                ts_raw = getattr(row, "ts", None)
+                close_raw = getattr(row, "close", None)
+                high_raw = getattr(row, "high", None)
+                low_raw = getattr(row, "low", None)
+            if ts_raw is None or close_raw is None:
+                continue
+            try:
+                ts = ts_raw if isinstance(ts_raw, datetime) else int(ts_raw)
+                close = float(Decimal(str(close_raw)))
+                high = None if high_raw is None else float(Decimal(str(high_raw)))
+                low = None if low_raw is None else float(Decimal(str(low_raw)))
+            except (ArithmeticError, TypeError, ValueError):
+                continue
+            if self.update(key, ts=ts, close=close, high=high, low=low):
+                applied += 1
+        return applied
+
+    def snapshot(self, key: str) -> IndicatorSnapshot | None:
+        with self._lock:
+            series = self._series.get(key)
+            return None if series is None else series.snapshot(key)
+
+    def restore(
+        self,
+        state_store: StateStore,
+        keys: Iterable[str] | None = None,
+        *,
+        key_prefix: str | None = None,
+    ) -> int:
+        """Load persisted series; entries written under a different config are dropped."""
+        payloads = state_store.load_indicator_states(keys, key_prefix=key_prefix)
+        restored = 0
+        with self._lock:
+            for key, payload in payloads.items():
+                config = payload.get("config")
+                log_returns = bool(config.get("log_returns")) if isinstance(config, dict) else False
+                expected = self._new_series(log_returns=log_returns).config()
+                series = SeriesIndicators.from_payload(payload, expected_config=expected)
+                if series is None:
+                    continue
+                self._series[key] = series
+                restored += 1
+        return restored
+
+    def persist(self, state_store: StateStore, *, now_utc: datetime | None = None) -> int:
+        """Write series changed since the last persist in a single transaction."""
+        with self._lock:
+            payloads = {key: self._series[key].to_payload() for key in sorted(self._dirty)}
+            self._dirty.clear()
+        if not payloads:
+            return 0
+        try:
+            state_store.save_indicator_states(payloads, updated_at=now_utc or datetime.now(UTC))
+        except Exception:
+            with self._lock:
+                self._dirty.update(payloads)
+            raise
+        return len(payloads)
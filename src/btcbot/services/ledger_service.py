@@ -24,11 +24,15 @@ from btcbot.domain.ledger import (
 from btcbot.domain.models import normalize_symbol
 from btcbot.domain.money_policy import DEFAULT_MONEY_POLICY, round_quote
 from btcbot.domain.stage4 import Fill, LifecycleAction, LifecycleActionType
+from btcbot.obs.cycle_trace import traced
 from btcbot.ports_price_conversion import FeeConversionRateError, PriceConverter
 from btcbot.services.price_conversion_service import MarkPriceConverter
 from btcbot.services.state_store import StateStore
 
 LEDGER_REDUCER_SNAPSHOT_VERSION = 1
+# Reducer checkpoint written by state retention before it archives ledger_events rows;
+# scopes without their own checkpoint start from it instead of rowid 0.
+LEDGER_RETENTION_BASE_SCOPE = "retention_base"
 
 
 @dataclass(frozen=True)
@@ -108,6 +112,7 @@ class LedgerService:
         self.logger = logger
         self.last_reduce_delta_events = 0
 
+    @traced("ledger.ingest_exchange_updates")
     def ingest_exchange_updates(self, fills: list[Fill]) -> LedgerIngestResult:
         events: list[LedgerEvent] = []
         for fill in fills:
@@ -335,6 +340,7 @@ class LedgerService:
             )
             for row in rows
         ]
+        points = _archived_equity_points(self.state_store) + points
         if ts is not None:
             points.append(EquityPoint(ts=ts, equity_try=breakdown.equity_try))
 
@@ -352,6 +358,7 @@ class LedgerService:
             max_drawdown=compute_max_drawdown(points) if points else Decimal("0"),
         )
 
+    @traced("ledger.report")
     def report(
         self,
         mark_prices: dict[str, Decimal],
@@ -440,6 +447,8 @@ class LedgerService:
         self, scope_id: str = "global"
     ) -> tuple[LedgerState, int, bool, int]:
         checkpoint = self.state_store.get_ledger_checkpoint(scope_id)
+        if checkpoint is None:
+            checkpoint = self.state_store.get_ledger_checkpoint(LEDGER_RETENTION_BASE_SCOPE)
         used_checkpoint = False
         cursor = 0
         state = LedgerState()
@@ -493,8 +502,12 @@ class LedgerService:
         turnover = Decimal("0")
         for row in rows:
             turnover += abs(Decimal(str(row["price"])) * Decimal(str(row["qty"])))
+        archived = self.state_store.get_retention_checkpoint("ledger_events")
+        if archived is not None:
+            turnover += Decimal(str(archived.get("fill_notional_try", "0")))
         return turnover
 
+    @traced("ledger.checkpoint")
     def checkpoint(self) -> LedgerCheckpoint:
         self.load_state_incremental()
         with self.state_store._connect() as conn:
@@ -511,3 +524,20 @@ class LedgerService:
             last_ts=datetime.fromisoformat(str(last_row["ts"])),
             last_event_id=str(last_row["event_id"]),
         )
+
+
+def _archived_equity_points(state_store: StateStore) -> list[EquityPoint]:
+    """Replay the drawdown state of archived pnl_snapshots as three synthetic points.
+
+    ``(mdd_peak, mdd_trough, peak)`` reproduces both the running peak and the worst
+    drawdown of the archived prefix, so compute_max_drawdown over the remaining rows
+    matches the result over the full history.
+    """
+    archived = state_store.get_retention_checkpoint("pnl_snapshots")
+    if archived is None or archived.get("peak") is None or archived.get("last_ts") is None:
+        return []
+    ts = datetime.fromisoformat(str(archived["last_ts"]))
+    values = [archived.get("mdd_peak"), archived.get("mdd_trough"), archived["peak"]]
+    return [
+        EquityPoint(ts=ts, equity_try=Decimal(str(value))) for value in values if value is not None
+    ]
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from threading import Lock, RLock
+
+from btcbot.domain.stage4 import Order as Stage4Order
+from btcbot.persistence.sqlite.sqlite_connection import db_file_identity
+
+LIVE_STATUSES = frozenset({"open", "submitted", "cancel_requested", "unknown"})
+OPEN_STATUSES = ("open", "submitted", "cancel_requested")
+TERMINAL_STATUSES = frozenset({"filled", "canceled", "rejected", "unknown_closed"})
+
+IndexRow = tuple[int, Stage4Order]
+_RowKeys = tuple[str | None, str | None, str]
+
+
+@dataclass(frozen=True)
+class OrderIndexDrift:
+    """Difference between the in-memory index and ``stage4_orders`` at check time."""
+
+    rows: int
+    missing: int = 0
+    stale: int = 0
+    extra: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.stale or self.extra)
+
+
+class Stage4OrderIndex:
+    """Process-local view of ``stage4_orders`` kept in step by the StateStore write paths.
+
+    Every row contributes its client/exchange ids and status, so existence, terminal and
+    exchange-id checks never touch SQLite. Full ``Order`` records are held only for live
+    rows (open, submitted, cancel_requested, unknown); historical rows are served from
+    the database on demand.
+    """
+
+    def __init__(self, verify_interval_seconds: float = 900.0) -> None:
+        self._lock = RLock()
+        self._keys: dict[int, _RowKeys] = {}
+        self._row_by_client_id: dict[str, int] = {}
+        self._rows_by_exchange_id: dict[str, set[int]] = {}
+        self._live: dict[int, Stage4Order] = {}
+        self._live_by_status: dict[str, set[int]] = {}
+        self._live_by_symbol: dict[str, set[int]] = {}
+        self._verify_interval_seconds = max(0.0, float(verify_interval_seconds))
+        self._verify_due_monotonic = time.monotonic() + self._verify_interval_seconds
+
+    def load(self, rows: Iterable[IndexRow]) -> None:
+        with self._lock:
+            self._keys = {}
+            self._row_by_client_id = {}
+            self._rows_by_exchange_id = {}
+            self._live = {}
+            self._live_by_status = {}
+            self._live_by_symbol = {}
+            for row_id, order in rows:
+                self._add(row_id, order)
+
+    def upsert(self, rows: Iterable[IndexRow]) -> None:
+        with self._lock:
+            for row_id, order in rows:
+                self._remove(row_id)
+                self._add(row_id, order)
+
+    def _add(self, row_id: int, order: Stage4Order) -> None:
+        status = order.status.lower()
+        self._keys[row_id] = (order.client_order_id, order.exchange_order_id, status)
+        if order.client_order_id:
+            self._row_by_client_id[order.client_order_id] = row_id
+        if order.exchange_order_id:
+            self._rows_by_exchange_id.setdefault(order.exchange_order_id, set()).add(row_id)
+        if status in LIVE_STATUSES:
+            self._live[row_id] = order
+            self._live_by_status.setdefault(status, set()).add(row_id)
+            self._live_by_symbol.setdefault(order.symbol, set()).add(row_id)
+
+    def _remove(self, row_id: int) -> None:
+        keys = self._keys.pop(row_id, None)
+        if keys is None:
+            return
+        client_order_id, exchange_order_id, status = keys
+        if client_order_id and self._row_by_client_id.get(client_order_id) == row_id:
+            del self._row_by_client_id[client_order_id]
+        if exchange_order_id:
+            _discard(self._rows_by_exchange_id, exchange_order_id, row_id)
+        order = self._live.pop(row_id, None)
+        if order is not None:
+            _discard(self._live_by_status, status, row_id)
+            _discard(self._live_by_symbol, order.symbol, row_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+    def status_for(self, client_order_id: str) -> str | None:
+        with self._lock:
+            row_id = self._row_by_client_id.get(client_order_id)
+            return None if row_id is None else self._keys[row_id][2]
+
+    def live_order(self, client_order_id: str) -> Stage4Order | None:
+        with self._lock:
+            row_id = self._row_by_client_id.get(client_order_id)
+            return None if row_id is None else self._live.get(row_id)
+
+    def knows_exchange_id(self, exchange_order_id: str) -> bool:
+        with self._lock:
+            return exchange_order_id in self._rows_by_exchange_id
+
+    def live_order_by_exchange_id(self, exchange_order_id: str) -> Stage4Order | None:
+        """Live order owning ``exchange_order_id``; ``None`` when the first such row is not live."""
+        with self._lock:
+            row_ids = self._rows_by_exchange_id.get(exchange_order_id)
+            if not row_ids:
+                return None
+            # The table has no index on exchange_order_id, so SQLite returns the lowest rowid.
+            return self._live.get(min(row_ids))
+
+    def has_unknown(self) -> bool:
+        with self._lock:
+            return bool(self._live_by_status.get("unknown"))
+
+    def unknown_client_order_ids(self) -> list[str]:
+        with self._lock:
+            orders = [
+                (row_id, self._live[row_id])
+                for row_id in self._live_by_status.get("unknown", ())
+                if self._live[row_id].client_order_id
+            ]
+        orders.sort(key=lambda item: (item[1].updated_at, -item[0]), reverse=True)
+        return [str(order.client_order_id) for _, order in orders]
+
+    def open_orders(
+        self,
+        symbol: str | None = None,
+        *,
+        include_external: bool = False,
+        include_unknown: bool = False,
+    ) -> list[Stage4Order]:
+        statuses = OPEN_STATUSES + (("unknown",) if include_unknown else ())
+        with self._lock:
+            row_ids: set[int] = set()
+            for status in statuses:
+                row_ids.update(self._live_by_status.get(status, ()))
+            if symbol is not None:
+                row_ids &= self._live_by_symbol.get(symbol, set())
+            orders = [
+                (row_id, self._live[row_id])
+                for row_id in row_ids
+                if include_external or self._live[row_id].mode != "external"
+            ]
+        orders.sort(key=lambda item: (item[1].symbol, item[1].side, item[1].created_at, item[0]))
+        return [order for _, order in orders]
+
+    def verify_due(self, now_monotonic: float | None = None) -> bool:
+        resolved_now = time.monotonic() if now_monotonic is None else now_monotonic
+        with self._lock:
+            if resolved_now < self._verify_due_monotonic:
+                return False
+            self._verify_due_monotonic = resolved_now + self._verify_interval_seconds
+            return True
+
+    def verify(self, loader: Callable[[], Iterable[IndexRow]]) -> OrderIndexDrift:
+        """Compare against a full read of the table and adopt the database on any drift.
+
+        The read happens under the index lock so a write-through cannot land between
+        the snapshot and the swap.
+        """
+        expected = Stage4OrderIndex()
+        with self._lock:
+            expected.load(loader())
+            missing = sum(1 for row_id in expected._keys if row_id not in self._keys)
+            extra = sum(1 for row_id in self._keys if row_id not in expected._keys)
+            stale = sum(
+                1
+                for row_id, keys in expected._keys.items()
+                if row_id in self._keys
+                and (
+                    self._keys[row_id] != keys
+                    or self._live.get(row_id) != expected._live.get(row_id)
+                )
+            )
+            drift = OrderIndexDrift(
+                rows=len(expected._keys), missing=missing, stale=stale, extra=extra
+            )
+            if not drift.ok:
+                self._keys = expected._keys
+                self._row_by_client_id = expected._row_by_client_id
+                self._rows_by_exchange_id = expected._rows_by_exchange_id
+                self._live = expected._live
+                self._live_by_status = expected._live_by_status
+                self._live_by_symbol = expected._live_by_symbol
+        return drift
+
+
+def _discard(buckets: dict[str, set[int]], key: str, row_id: int) -> None:
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    bucket.discard(row_id)
+    if not bucket:
+        del buckets[key]
+
+
+_SHARED_INDEXES: dict[str, tuple[tuple[int, int], Stage4OrderIndex]] = {}
+_SHARED_INDEXES_LOCK = Lock()
+
+
+def shared_order_index(
+    db_path_abs: str, loader: Callable[[], Iterable[IndexRow]]
+) -> Stage4OrderIndex:
+    """Index for ``db_path_abs``, loaded from ``loader`` once per process and database file.
+
+    Stores are re-created every cycle, so the index outlives them; a database file that
+    was replaced (different inode) is loaded afresh.
+    """
+    identity = db_file_identity(db_path_abs)
+    with _SHARED_INDEXES_LOCK:
+        entry = _SHARED_INDEXES.get(db_path_abs)
+        if entry is not None and entry[0] == identity:
+            return entry[1]
+        index = Stage4OrderIndex()
+        index.load(loader())
+        _SHARED_INDEXES[db_path_abs] = (identity, index)
+        return index
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import hashlib
 import json
+import sqlite3
+from collections.abc import Iterator, Mapping
 from datetime import UTC, datetime
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
@@ -23,6 +25,68 @@ def find_missing_stage7_parity_tables(db_path: str | Path) -> list[str]:
     return [name for name in _REQUIRED_PARITY_TABLES if name not in existing]
 
 
+# Columns of ``stage7_cycle_trace c JOIN stage7_ledger_metrics l`` that feed the record.
+CANONICAL_SOURCE_COLUMNS = """
+              c.cycle_id,
+              c.ts,
+              c.selected_universe_json,
+              c.intents_summary_json,
+              c.mode_json,
+              c.active_param_version,
+              c.param_change_json,
+              l.net_pnl_try,
+              l.fees_try,
+              l.slippage_try,
+              l.turnover_try
+"""
+
+# Fingerprint of an empty range; also the value every chain starts from.
+CHAIN_GENESIS = hashlib.sha256(b"[]").hexdigest()
+FINGERPRINT_TABLE = "stage7_cycle_fingerprints"
+
+
+def canonical_cycle_record(
+    row: Mapping[str, object],
+    *,
+    quantize_try: Decimal | None = None,
+    include_adaptation: bool = False,
+) -> dict[str, object]:
+    intents_summary = _safe_load_json(row["intents_summary_json"], fallback={})
+    mode_payload = _safe_load_json(row["mode_json"], fallback={})
+    universe_payload = _safe_load_json(row["selected_universe_json"], fallback=[])
+    universe = sorted({str(item) for item in universe_payload})
+    oms_summary_raw = intents_summary.get("oms_summary")
+    oms_summary = dict(oms_summary_raw) if isinstance(oms_summary_raw, dict) else {}
+    item: dict[str, object] = {
+        "ts": row["ts"],
+        "cycle_id": row["cycle_id"],
+        "base_mode": mode_payload.get("base_mode"),
+        "final_mode": mode_payload.get("final_mode"),
+        "selected_universe": universe,
+        "net_pnl_try": _format_try_metric(row["net_pnl_try"], quantize=quantize_try),
+        "fees_try": _format_try_metric(row["fees_try"], quantize=quantize_try),
+        "slippage_try": _format_try_metric(row["slippage_try"], quantize=quantize_try),
+        "turnover_try": _format_try_metric(row["turnover_try"], quantize=quantize_try),
+        "intents_count": int(str(intents_summary.get("order_intents_total", 0))),
+        "filled_count": int(oms_summary.get("orders_filled", 0)),
+        "rejected_count": int(oms_summary.get("orders_rejected", 0)),
+    }
+    if include_adaptation:
+        item["active_param_version"] = row["active_param_version"]
+        item["param_change"] = _safe_load_json(row["param_change_json"], fallback={})
+    return item
+
+
+def record_digest(record: Mapping[str, object]) -> str:
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chain_digest(previous: str, digest: str) -> str:
+    """``h_n = H(h_{n-1} || H(record_n))``; equal chains imply equal record prefixes."""
+    return hashlib.sha256(f"{previous}{digest}".encode("ascii")).hexdigest()
+
+
 def compute_run_fingerprint(
     db_path: str | Path,
     from_ts: datetime,
@@ -31,6 +95,13 @@ def compute_run_fingerprint(
     quantize_try: Decimal | None = None,
     include_adaptation: bool = False,
 ) -> str:
+    """Chain fingerprint of the cycles with ``from_ts <= ts <= to_ts``.
+
+    Databases written by ``StateStore`` keep a per-cycle chain in
+    ``stage7_cycle_fingerprints``; a range that starts at the head of that chain is a
+    single indexed lookup, other ranges fold the stored record digests. Quantized
+    fingerprints and databases without the table are recomputed from the raw rows.
+    """
     start = _iso(from_ts)
     end = _iso(to_ts)
     missing = find_missing_stage7_parity_tables(db_path)
@@ -46,57 +117,227 @@ def compute_run_fingerprint(
         ).hexdigest()
 
     with sqlite_connection_context(str(db_path)) as conn:
-        rows = conn.execute(
-            """
-            SELECT
-              c.cycle_id,
-              c.ts,
-              c.selected_universe_json,
-              c.intents_summary_json,
-              c.mode_json,
-              c.active_param_version,
-              c.param_change_json,
-              l.net_pnl_try,
-              l.fees_try,
-              l.slippage_try,
-              l.turnover_try
-            FROM stage7_cycle_trace c
-            JOIN stage7_ledger_metrics l ON l.cycle_id = c.cycle_id
-            WHERE c.ts >= ? AND c.ts <= ?
-            ORDER BY c.ts ASC, c.cycle_id ASC
-            """,
-            (start, end),
-        ).fetchall()
-
-    canonical: list[dict[str, object]] = []
-    for row in rows:
-        intents_summary = _safe_load_json(row["intents_summary_json"], fallback={})
-        mode_payload = _safe_load_json(row["mode_json"], fallback={})
-        universe_payload = _safe_load_json(row["selected_universe_json"], fallback=[])
-        universe = sorted({str(item) for item in universe_payload})
-        oms_summary_raw = intents_summary.get("oms_summary")
-        oms_summary = dict(oms_summary_raw) if isinstance(oms_summary_raw, dict) else {}
-        item: dict[str, object] = {
-            "ts": row["ts"],
-            "cycle_id": row["cycle_id"],
-            "base_mode": mode_payload.get("base_mode"),
-            "final_mode": mode_payload.get("final_mode"),
-            "selected_universe": universe,
-            "net_pnl_try": _format_try_metric(row["net_pnl_try"], quantize=quantize_try),
-            "fees_try": _format_try_metric(row["fees_try"], quantize=quantize_try),
-            "slippage_try": _format_try_metric(row["slippage_try"], quantize=quantize_try),
-            "turnover_try": _format_try_metric(row["turnover_try"], quantize=quantize_try),
-            "intents_count": int(str(intents_summary.get("order_intents_total", 0))),
-            "filled_count": int(oms_summary.get("orders_filled", 0)),
-            "rejected_count": int(oms_summary.get("orders_rejected", 0)),
-        }
-        if include_adaptation:
-            item["active_param_version"] = row["active_param_version"]
-            item["param_change"] = _safe_load_json(row["param_change_json"], fallback={})
-        canonical.append(item)
+        if quantize_try is None and _has_fingerprint_table(conn):
+            return _stored_range_fingerprint(conn, start, end, include_adaptation)
+        chain = CHAIN_GENESIS
+        for record in _scan_records(conn, start, end, quantize_try, include_adaptation):
+            chain = chain_digest(chain, record_digest(record))
+        return chain
+
+
+def find_first_divergence(
+    db_a: str | Path,
+    db_b: str | Path,
+    from_ts: datetime,
+    to_ts: datetime,
+    *,
+    quantize_try: Decimal | None = None,
+    include_adaptation: bool = False,
+) -> dict[str, object] | None:
+    """Locate the first cycle (and its differing fields) where two runs disagree.
+
+    With stored chains on both sides and a common chain value just before the range,
+    this binary-searches the chains: O(log n) indexed lookups. Otherwise the per-cycle
+    digests are compared in order. ``None`` means the ranges are identical.
+    """
+    start = _iso(from_ts)
+    end = _iso(to_ts)
+    with (
+        sqlite_connection_context(str(db_a)) as conn_a,
+        sqlite_connection_context(str(db_b)) as conn_b,
+    ):
+        stored = (
+            quantize_try is None
+            and _has_fingerprint_table(conn_a)
+            and _has_fingerprint_table(conn_b)
+        )
+        if stored:
+            index = _bisect_stored_chains(conn_a, conn_b, start, end, include_adaptation)
+            if index is None:
+                return None
+            record_a = _record_at(conn_a, start, end, index, include_adaptation)
+            record_b = _record_at(conn_b, start, end, index, include_adaptation)
+        else:
+            records_a = _scan_records(conn_a, start, end, quantize_try, include_adaptation)
+            records_b = _scan_records(conn_b, start, end, quantize_try, include_adaptation)
+            index = 0
+            while True:
+                record_a = next(records_a, None)
+                record_b = next(records_b, None)
+                if record_a is None and record_b is None:
+                    return None
+                if record_a != record_b:
+                    break
+                index += 1
+    return _divergence(index, record_a, record_b)
+
+
+def _divergence(
+    index: int,
+    record_a: dict[str, object] | None,
+    record_b: dict[str, object] | None,
+) -> dict[str, object]:
+    keys = sorted(set(record_a or {}) | set(record_b or {}))
+    fields = [
+        key
+        for key in keys
+        if record_a is None or record_b is None or record_a.get(key) != record_b.get(key)
+    ]
+    return {
+        "index": index,
+        "cycle_id_a": None if record_a is None else record_a.get("cycle_id"),
+        "cycle_id_b": None if record_b is None else record_b.get("cycle_id"),
+        "ts_a": None if record_a is None else record_a.get("ts"),
+        "ts_b": None if record_b is None else record_b.get("ts"),
+        "fields": fields,
+        "values_a": {key: (record_a or {}).get(key) for key in fields},
+        "values_b": {key: (record_b or {}).get(key) for key in fields},
+    }
+
+
+def _scan_records(
+    conn: sqlite3.Connection,
+    start: str,
+    end: str,
+    quantize_try: Decimal | None,
+    include_adaptation: bool,
+) -> Iterator[dict[str, object]]:
+    cursor = conn.execute(
+        f"""
+        SELECT {CANONICAL_SOURCE_COLUMNS}
+        FROM stage7_cycle_trace c
+        JOIN stage7_ledger_metrics l ON l.cycle_id = c.cycle_id
+        WHERE c.ts >= ? AND c.ts <= ?
+        ORDER BY c.ts ASC, c.cycle_id ASC
+        """,
+        (start, end),
+    )
+    for row in cursor:
+        yield canonical_cycle_record(
+            row, quantize_try=quantize_try, include_adaptation=include_adaptation
+        )
+
+
+def _has_fingerprint_table(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (FINGERPRINT_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def _chain_columns(include_adaptation: bool) -> tuple[str, str]:
+    if include_adaptation:
+        return "record_hash_adapt", "chain_hash_adapt"
+    return "record_hash", "chain_hash"
+
+
+def _seq_bounds(conn: sqlite3.Connection, start: str, end: str) -> tuple[int, int] | None:
+    row = conn.execute(
+        f"SELECT MIN(seq) AS lo, MAX(seq) AS hi FROM {FINGERPRINT_TABLE} WHERE ts >= ? AND ts <= ?",
+        (start, end),
+    ).fetchone()
+    if row is None or row["lo"] is None:
+        return None
+    return int(row["lo"]), int(row["hi"])
+
+
+def _chain_at(conn: sqlite3.Connection, seq: int, include_adaptation: bool) -> str:
+    if seq <= 0:
+        return CHAIN_GENESIS
+    _, chain_column = _chain_columns(include_adaptation)
+    row = conn.execute(
+        f"SELECT {chain_column} AS chain FROM {FINGERPRINT_TABLE} WHERE seq = ?", (seq,)
+    ).fetchone()
+    return CHAIN_GENESIS if row is None else str(row["chain"])
+
+
+def _stored_range_fingerprint(
+    conn: sqlite3.Connection, start: str, end: str, include_adaptation: bool
+) -> str:
+    bounds = _seq_bounds(conn, start, end)
+    if bounds is None:
+        return CHAIN_GENESIS
+    lo, hi = bounds
+    if lo == 1:
+        return _chain_at(conn, hi, include_adaptation)
+    digest_column, _ = _chain_columns(include_adaptation)
+    chain = CHAIN_GENESIS
+    for row in conn.execute(
+        f"SELECT {digest_column} AS digest FROM {FINGERPRINT_TABLE} "
+        "WHERE seq BETWEEN ? AND ? ORDER BY seq",
+        (lo, hi),
+    ):
+        chain = chain_digest(chain, str(row["digest"]))
+    return chain
+
+
+def _bisect_stored_chains(
+    conn_a: sqlite3.Connection,
+    conn_b: sqlite3.Connection,
+    start: str,
+    end: str,
+    include_adaptation: bool,
+) -> int | None:
+    bounds_a = _seq_bounds(conn_a, start, end) or (1, 0)
+    bounds_b = _seq_bounds(conn_b, start, end) or (1, 0)
+    count_a = bounds_a[1] - bounds_a[0] + 1
+    count_b = bounds_b[1] - bounds_b[0] + 1
+    common = min(count_a, count_b)
+
+    if _chain_at(conn_a, bounds_a[0] - 1, include_adaptation) != _chain_at(
+        conn_b, bounds_b[0] - 1, include_adaptation
+    ):
+        # Histories differ before the range: chains are not comparable, digests are.
+        digest_column, _ = _chain_columns(include_adaptation)
+        query = (
+            f"SELECT {digest_column} AS digest FROM {FINGERPRINT_TABLE} "
+            "WHERE seq BETWEEN ? AND ? ORDER BY seq"
+        )
+        digests_a = conn_a.execute(query, bounds_a)
+        digests_b = conn_b.execute(query, bounds_b)
+        for index, (row_a, row_b) in enumerate(zip(digests_a, digests_b, strict=False)):
+            if row_a["digest"] != row_b["digest"]:
+                return index
+        return None if count_a == count_b else common
+
+    low, high = 0, common
+    # Invariant: chains agree through offset ``low - 1``; the answer is in [low, high].
+    while low < high:
+        mid = (low + high) // 2
+        if _chain_at(conn_a, bounds_a[0] + mid, include_adaptation) == _chain_at(
+            conn_b, bounds_b[0] + mid, include_adaptation
+        ):
+            low = mid + 1
+        else:
+            high = mid
+    if low == common and count_a == count_b:
+        return None
+    return low
+
 
-    canonical_payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(canonical_payload.encode("utf-8")).hexdigest()
+def _record_at(
+    conn: sqlite3.Connection,
+    start: str,
+    end: str,
+    index: int,
+    include_adaptation: bool,
+) -> dict[str, object] | None:
+    bounds = _seq_bounds(conn, start, end)
+    if bounds is None or bounds[0] + index > bounds[1]:
+        return None
+    row = conn.execute(
+        f"""
+        SELECT {CANONICAL_SOURCE_COLUMNS}
+        FROM {FINGERPRINT_TABLE} f
+        JOIN stage7_cycle_trace c ON c.cycle_id = f.cycle_id
+        JOIN stage7_ledger_metrics l ON l.cycle_id = c.cycle_id
+        WHERE f.seq = ?
+        """,
+        (bounds[0] + index,),
+    ).fetchone()
+    if row is None:
+        return None
+    return canonical_cycle_record(row, include_adaptation=include_adaptation)
 
 
 def compare_fingerprints(f1: str, f2: str) -> bool:
@@ -168,6 +168,7 @@ def map_endpoint_group(path: str) -> str:
 
     Examples:
     - ``/api/v2/orderbook`` -> ``market_data``
+    - ``https://graph-api.btcturk.com/v1/klines/history`` -> ``market_data``
     - ``/api/v1/order`` -> ``orders``
     - ``/api/v1/users/balances`` -> ``account``
     - unknown paths -> ``default``
@@ -179,6 +180,7 @@ def map_endpoint_group(path: str) -> str:
         "/orderbook",
         "/ticker",
         "/ohlc",
+        "/klines",
         "/api/v2/trades",
         "/symbols",
         "/server/exchangeinfo",
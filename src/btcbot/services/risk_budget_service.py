@@ -15,6 +15,7 @@ from btcbot.domain.stage4 import PnLSnapshot, Position
 from btcbot.observability_decisions import emit_decision
 from btcbot.persistence.uow import UnitOfWorkFactory
 from btcbot.risk.budget import RiskBudgetPolicy, RiskBudgetView
+from btcbot.services.indicator_engine import EQUITY_SERIES_KEY, IndicatorEngine
 from btcbot.services.ledger_service import PnlReport
 from btcbot.services.state_store import StateStore
 
@@ -441,12 +442,7 @@ class RiskBudgetService:
             pnl_snapshots,
             lookback=self.settings.stage7_max_consecutive_losses,
         )
-        volatility_regime, computed_vol = self.compute_volatility_regime(
-            pnl_snapshots,
-            lookback=self.settings.stage7_vol_lookback,
-            low_threshold=self.settings.stage7_vol_low_threshold,
-            high_threshold=self.settings.stage7_vol_high_threshold,
-        )
+        volatility_regime, computed_vol = self._equity_volatility_regime(pnl_snapshots)
 
         budget_view = self.budget_policy.evaluate(
             accounting=accounting,
@@ -666,6 +662,59 @@ class RiskBudgetService:
             break
         return streak
 
+    def _equity_volatility_regime(
+        self, snapshots_desc: list[PnLSnapshot]
+    ) -> tuple[str, float | None]:
+        """Equity-return volatility regime, read from the shared indicator engine.
+
+        Only snapshots newer than the persisted equity series are applied. Falls back to
+        :meth:`compute_volatility_regime` when the engine is disabled or unavailable.
+        """
+        lookback = self.settings.stage7_vol_lookback
+        low_threshold = self.settings.stage7_vol_low_threshold
+        high_threshold = self.settings.stage7_vol_high_threshold
+        if lookback < 2 or not self.settings.indicator_engine_enabled:
+            return self.compute_volatility_regime(
+                snapshots_desc,
+                lookback=lookback,
+                low_threshold=low_threshold,
+                high_threshold=high_threshold,
+            )
+        try:
+            load = getattr(self.state_store, "load_indicator_states", None)
+            save = getattr(self.state_store, "save_indicator_states", None)
+            if not callable(load) or not callable(save):
+                raise TypeError("state store does not persist indicator state")
+            engine = IndicatorEngine.from_settings(self.settings)
+            engine.restore(self.state_store, [EQUITY_SERIES_KEY])
+            for snapshot in reversed(snapshots_desc[:lookback]):
+                engine.update(
+                    EQUITY_SERIES_KEY,
+                    ts=snapshot.ts,
+                    close=snapshot.total_equity_try,
+                    log_returns=True,
+                )
+            engine.persist(self.state_store, now_utc=self.now_provider())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "risk_budget_indicator_fallback",
+                extra={"extra": {"error_type": type(exc).__name__}},
+            )
+            return self.compute_volatility_regime(
+                snapshots_desc,
+                lookback=lookback,
+                low_threshold=low_threshold,
+                high_threshold=high_threshold,
+            )
+        indicators = engine.snapshot(EQUITY_SERIES_KEY)
+        if indicators is None or indicators.return_count < 5 or indicators.return_std is None:
+            return "normal", None
+        return self.classify_volatility(
+            round(float(indicators.return_std), 8),
+            low_threshold=low_threshold,
+            high_threshold=high_threshold,
+        )
+
     @staticmethod
     def compute_volatility_regime(
         snapshots_desc: list[PnLSnapshot],
@@ -693,11 +742,16 @@ class RiskBudgetService:
         mean = sum(returns) / len(returns)
         variance = sum((ret - mean) ** 2 for ret in returns) / len(returns)
         vol = round(math.sqrt(variance), 8)
-        low = float(low_threshold)
-        high = float(high_threshold)
+        return RiskBudgetService.classify_volatility(
+            vol, low_threshold=low_threshold, high_threshold=high_threshold
+        )
 
-        if vol <= low:
+    @staticmethod
+    def classify_volatility(
+        vol: float, *, low_threshold: Decimal, high_threshold: Decimal
+    ) -> tuple[str, float]:
+        if vol <= float(low_threshold):
             return "low", vol
-        if vol >= high:
+        if vol >= float(high_threshold):
             return "high", vol
         return "normal", vol
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from decimal import Decimal
 
 from btcbot.domain.stage4 import LifecycleAction, LifecycleActionType, Order, PnLSnapshot, Position
+from btcbot.obs.cycle_trace import traced
 
 
 @dataclass(frozen=True)
@@ -51,6 +52,7 @@ class RiskPolicy:
             else max_position_notional_try
         )
 
+    @traced("risk_policy.filter_actions")
     def filter_actions(
         self,
         actions: list[LifecycleAction],
@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import gc
+import logging
+import math
+import random
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from btcbot.adapters.replay_exchange import ReplayExchangeClient
+from btcbot.config import Settings
+from btcbot.domain.market_data_models import Candle, OrderBookTop, TickerStat
+from btcbot.domain.models import normalize_symbol
+from btcbot.obs.cycle_trace import CycleTracer, trace_span
+from btcbot.obs.resource_usage import current_rss_bytes, open_fd_count, sqlite_file_sizes
+from btcbot.services.market_data_replay import MarketDataReplay
+from btcbot.services.stage4_cycle_runner import Stage4CycleRunner
+from btcbot.services.stage7_cycle_runner import Stage7CycleRunner
+from btcbot.services.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+_SOAK_START = datetime(2026, 1, 1, tzinfo=UTC)
+_TOP_OBJECT_TYPES = 15
+_PHASE_DEPTH = 2
+
+
+@dataclass(frozen=True)
+class SoakThresholds:
+    """Failure limits; growth limits apply only to series that rise in most sample steps."""
+
+    warmup_samples: int = 2
+    monotonic_fraction: float = 0.8
+    max_rss_growth_bytes: int = 64 * 1024 * 1024
+    max_fd_growth: int = 8
+    max_wal_growth_bytes: int = 64 * 1024 * 1024
+    max_object_growth: int = 20_000
+    max_p99_drift_ratio: float = 0.5
+    min_p99_drift_ms: float = 5.0
+
+
+@dataclass(frozen=True)
+class SoakSample:
+    cycle: int
+    simulated_ts: str
+    wall_seconds: float
+    rss_bytes: int | None
+    open_fds: int | None
+    db_bytes: int
+    wal_bytes: int
+    object_counts: dict[str, int] = field(repr=False)
+    phase_p99_ms: dict[str, float]
+
+
+@dataclass(frozen=True)
+class SoakCheck:
+    name: str
+    ok: bool
+    first: float
+    last: float
+    growth: float
+    limit: float
+    monotonic_fraction: float | None = None
+
+
+def synthetic_replay(
+    symbols: Sequence[str],
+    *,
+    hours: float,
+    step_seconds: int,
+    seed: int,
+    start: datetime = _SOAK_START,
+) -> MarketDataReplay:
+    """Seeded random-walk candles/books/tickers covering ``hours`` of simulated time."""
+    rng = random.Random(seed)
+    points = max(1, int(hours * 3600 // step_seconds) + 1)
+    candles: dict[str, list[Candle]] = {}
+    books: dict[str, list[OrderBookTop]] = {}
+    tickers: dict[str, list[TickerStat]] = {}
+    for index, symbol in enumerate(sorted({normalize_symbol(item) for item in symbols})):
+        price = Decimal(100_000 // (index + 1))
+        candles[symbol], books[symbol], tickers[symbol] = [], [], []
+        for point in range(points):
+            ts = start + timedelta(seconds=point * step_seconds)
+            move = Decimal(str(round(rng.gauss(0.0, 0.002), 6)))
+            close = max(Decimal("1"), (price * (1 + move)).quantize(Decimal("0.01")))
+            spread = max(Decimal("0.01"), (close * Decimal("0.0005")).quantize(Decimal("0.01")))
+            volume = Decimal(str(round(rng.uniform(1.0, 5.0), 4)))
+            high, low = max(price, close) + spread, min(price, close) - spread
+            candles[symbol].append(Candle(ts, price, high, low, close, volume))
+            books[symbol].append(OrderBookTop(ts, close - spread, close + spread))
+            tickers[symbol].append(TickerStat(ts, close, high, low, volume, close * volume))
+            price = close
+    return MarketDataReplay(
+        candles_by_symbol=candles,
+        orderbook_by_symbol=books,
+        ticker_by_symbol=tickers,
+        start_ts=start,
+        end_ts=start + timedelta(seconds=(points - 1) * step_seconds),
+        step_seconds=step_seconds,
+        seed=seed,
+    )
+
+
+def object_counts_by_type() -> Counter[str]:
+    """Live GC-tracked objects per type name (containers, instances; not ints/strs)."""
+    gc.collect()
+    return Counter(type(obj).__name__ for obj in gc.get_objects())
+
+
+def _p99(values: Sequence[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)]
+
+
+def _phase_latencies(tracer: CycleTracer) -> dict[str, float]:
+    """Wall ms per cycle span and per phase directly under it, for one traced cycle."""
+    latencies: dict[str, float] = {}
+    for path, node in tracer.root.walk():
+        if 1 < len(path) <= _PHASE_DEPTH + 1:
+            latencies[";".join(path[1:])] = node.wall_ns / 1e6
+    return latencies
+
+
+def _growth_check(
+    name: str, values: Sequence[float], *, limit: float, thresholds: SoakThresholds
+) -> SoakCheck:
+    steps = list(zip(values, values[1:], strict=False))
+    rising = sum(1 for before, after in steps if after >= before)
+    fraction = rising / len(steps) if steps else 0.0
+    growth = values[-1] - values[0]
+    leaking = growth > limit and fraction >= thresholds.monotonic_fraction
+    return SoakCheck(
+        name=name,
+        ok=not leaking,
+        first=values[0],
+        last=values[-1],
+        growth=growth,
+        limit=limit,
+        monotonic_fraction=round(fraction, 3),
+    )
+
+
+def evaluate_soak_samples(
+    samples: Sequence[SoakSample], thresholds: SoakThresholds
+) -> list[SoakCheck]:
+    """Leak and latency-drift checks over the samples taken after warm-up."""
+    steady = list(samples[thresholds.warmup_samples :])
+    if len(steady) < 2:
+        return []
+    checks: list[SoakCheck] = []
+    series: list[tuple[str, list[int | None], float]] = [
+        ("rss_bytes", [s.rss_bytes for s in steady], thresholds.max_rss_growth_bytes),
+        ("open_fds", [s.open_fds for s in steady], thresholds.max_fd_growth),
+        ("wal_bytes", [s.wal_bytes for s in steady], thresholds.max_wal_growth_bytes),
+    ]
+    for name, raw, limit in series:
+        if all(value is not None for value in raw):
+            values = [float(value) for value in raw if value is not None]
+            checks.append(_growth_check(name, values, limit=limit, thresholds=thresholds))
+    type_names = set(steady[0].object_counts) | set(steady[-1].object_counts)
+    for type_name in sorted(type_names):
+        values = [float(s.object_counts.get(type_name, 0)) for s in steady]
+        if values[-1] - values[0] > thresholds.max_object_growth:
+            checks.append(
+                _growth_check(
+                    f"objects:{type_name}",
+                    values,
+                    limit=thresholds.max_object_growth,
+                    thresholds=thresholds,
+                )
+            )
+    for phase in sorted(steady[0].phase_p99_ms):
+        if phase not in steady[-1].phase_p99_ms:
+            continue
+        first, last = steady[0].phase_p99_ms[phase], steady[-1].phase_p99_ms[phase]
+        limit = max(first * thresholds.max_p99_drift_ratio, thresholds.min_p99_drift_ms)
+        checks.append(
+            SoakCheck(
+                name=f"p99_ms:{phase}",
+                ok=last - first <= limit,
+                first=first,
+                last=last,
+                growth=round(last - first, 3),
+                limit=round(limit, 3),
+            )
+        )
+    return checks
+
+
+@dataclass(frozen=True)
+class SoakReport:
+    cycles_run: int
+    cycle_failures: int
+    simulated_seconds: int
+    wall_seconds: float
+    thresholds: SoakThresholds
+    samples: list[SoakSample]
+    checks: list[SoakCheck]
+
+    @property
+    def passed(self) -> bool:
+        return self.cycle_failures == 0 and all(check.ok for check in self.checks)
+
+    def to_dict(self) -> dict[str, object]:
+        samples = []
+        for sample in self.samples:
+            item = asdict(sample)
+            item["top_object_types"] = dict(
+                Counter(item.pop("object_counts")).most_common(_TOP_OBJECT_TYPES)
+            )
+            samples.append(item)
+        return {
+            "passed": self.passed,
+            "cycles_run": self.cycles_run,
+            "cycle_failures": self.cycle_failures,
+            "simulated_seconds": self.simulated_seconds,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "thresholds": asdict(self.thresholds),
+            "checks": [asdict(check) for check in self.checks],
+            "samples": samples,
+        }
+
+
+def _fmt(value: float) -> str:
+    return f"{value:,.0f}" if abs(value) >= 1000 else f"{value:g}"
+
+
+def format_soak_report(report: SoakReport) -> str:
+    """Markdown summary suitable for attaching to a release."""
+    verdict = "PASS" if report.passed else "FAIL"
+    lines = [
+        f"# Soak report: {verdict}",
+        "",
+        f"- cycles: {report.cycles_run} ({report.cycle_failures} failed)",
+        f"- simulated time: {report.simulated_seconds / 3600:.2f}h, "
+        f"wall time: {report.wall_seconds:.1f}s",
+        f"- samples: {len(report.samples)} (first {report.thresholds.warmup_samples} are warm-up)",
+        "",
+        "| check | ok | first | last | growth | limit | rising steps |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for check in report.checks:
+        fraction = "" if check.monotonic_fraction is None else f"{check.monotonic_fraction:.2f}"
+        lines.append(
+            f"| {check.name} | {'yes' if check.ok else 'NO'} | {_fmt(check.first)} "
+            f"| {_fmt(check.last)} | {_fmt(check.growth)} | {_fmt(check.limit)} | {fraction} |"
+        )
+    return "\n".join(lines)
+
+
+class SoakHarness:
+    """Drives Stage 4 and Stage 7 cycles for a long simulated run and samples health.
+
+    Stage 4 builds its own exchange from ``settings`` (point ``btcturk_base_url`` at the
+    local exchange simulator); Stage 7 trades against ``ReplayExchangeClient`` and the
+    replay clock advances one step between cycles, so a run spans ``(cycles - 1) * step``.
+    """
+
+    def __init__(
+        self,
+        *,
+        thresholds: SoakThresholds | None = None,
+        run_stage4: bool = True,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.thresholds = thresholds or SoakThresholds()
+        self.run_stage4 = run_stage4
+        self._clock = clock
+
+    def run(
+        self,
+        settings: Settings,
+        *,
+        replay: MarketDataReplay,
+        cycles: int,
+        sample_every: int,
+    ) -> SoakReport:
+        effective = settings.model_copy(update={"dry_run": True, "kill_switch": False})
+        exchange = ReplayExchangeClient(
+            replay=replay,
+            symbols=effective.symbols,
+            balances={
+                str(effective.stage7_universe_quote_ccy).upper(): Decimal(
+                    str(effective.dry_run_try_balance)
+                )
+            },
+        )
+        state_store = StateStore(db_path=effective.state_db_path)
+        stage4 = Stage4CycleRunner(command="soak")
+        stage7 = Stage7CycleRunner()
+        started_wall = self._clock()
+        started_sim = replay.now()
+        window: dict[str, list[float]] = {}
+        samples: list[SoakSample] = []
+        failures = 0
+        cycles_run = 0
+        for cycle in range(cycles):
+            tracer = CycleTracer()
+            with tracer.activate():
+                try:
+                    stage4_result = stage4.run_one_cycle(effective) if self.run_stage4 else 0
+                    with trace_span("stage7_cycle"):
+                        stage7.run_one_cycle(
+                            effective,
+                            exchange=exchange,
+                            state_store=state_store,
+                            now_utc=replay.now(),
+                            cycle_id=f"soak:{cycle:07d}",
+                            run_id="soak",
+                            stage4_result=stage4_result,
+                            enable_adaptation=False,
+                        )
+                except Exception as exc:  # noqa: BLE001
+                    failures += 1
+                    logger.warning(
+                        "soak_cycle_failed",
+                        extra={"extra": {"cycle": cycle, "error_type": type(exc).__name__}},
+                    )
+            cycles_run += 1
+            for phase, elapsed_ms in _phase_latencies(tracer).items():
+                window.setdefault(phase, []).append(elapsed_ms)
+            last_cycle = cycle == cycles - 1 or not replay.advance()
+            if (cycle + 1) % sample_every == 0 or last_cycle:
+                samples.append(
+                    self._sample(
+                        cycle=cycle + 1,
+                        simulated_ts=replay.now(),
+                        wall_seconds=self._clock() - started_wall,
+                        db_path=effective.state_db_path,
+                        window=window,
+                    )
+                )
+                window = {}
+            if last_cycle:
+                break
+        return SoakReport(
+            cycles_run=cycles_run,
+            cycle_failures=failures,
+            simulated_seconds=int((replay.now() - started_sim).total_seconds()),
+            wall_seconds=self._clock() - started_wall,
+            thresholds=self.thresholds,
+            samples=samples,
+            checks=evaluate_soak_samples(samples, self.thresholds),
+        )
+
+    @staticmethod
+    def _sample(
+        *,
+        cycle: int,
+        simulated_ts: datetime,
+        wall_seconds: float,
+        db_path: str,
+        window: dict[str, list[float]],
+    ) -> SoakSample:
+        db_bytes, wal_bytes = sqlite_file_sizes(db_path)
+        return SoakSample(
+            cycle=cycle,
+            simulated_ts=simulated_ts.isoformat(),
+            wall_seconds=round(wall_seconds, 3),
+            rss_bytes=current_rss_bytes(),
+            open_fds=open_fd_count(),
+            db_bytes=db_bytes,
+            wal_bytes=wal_bytes,
+            object_counts=dict(object_counts_by_type()),
+            phase_p99_ms={
+                phase: round(_p99(values), 3) for phase, values in sorted(window.items())
+            },
+        )
@@ -12,7 +12,7 @@ from decimal import Decimal, InvalidOperation
 from uuid import uuid4
 
 from btcbot.adapters.action_to_order import build_exchange_rules
-from btcbot.adapters.btcturk_http import ConfigurationError
+from btcbot.adapters.btcturk_http import ConfigurationError, http_traffic_counters
 from btcbot.agent.audit import AgentAuditTrail
 from btcbot.agent.contracts import AgentContext, AgentDecision, DecisionAction, DecisionRationale
 from btcbot.agent.guardrails import SafetyGuard
@@ -31,12 +31,17 @@ from btcbot.domain.stage4 import (
 )
 from btcbot.domain.strategy_core import OrderBookSummary, PositionSummary
 from btcbot.obs.alert_engine import AlertDedupe, AlertRuleEvaluator, LogNotifier, MetricWindowStore
-from btcbot.obs.alerts import BASELINE_ALERT_RULES, DRY_RUN_ALERT_RULES
-from btcbot.obs.metrics import observe_histogram, set_gauge
+from btcbot.obs.alerts import BASELINE_ALERT_RULES, DRY_RUN_ALERT_RULES, RESOURCE_ALERT_RULES
+from btcbot.obs.cycle_trace import trace_phase, traced
+from btcbot.obs.http_timings import begin_http_timing_capture
+from btcbot.obs.metrics import get_metrics_sink, observe_histogram, set_gauge
+from btcbot.obs.metrics_aggregator import persist_metrics_snapshot_if_due
 from btcbot.obs.process_role import ProcessRole, coerce_process_role
+from btcbot.obs.resource_usage import begin_resource_capture
 from btcbot.obs.stage4_alarm_hook import build_cycle_metrics
 from btcbot.observability import get_instrumentation
 from btcbot.observability_decisions import emit_decision
+from btcbot.persistence.sqlite.sqlite_connection import begin_statement_capture
 from btcbot.persistence.uow import UnitOfWorkFactory
 from btcbot.planning_kernel import ExecutionPort, Plan
 from btcbot.services import metrics_service
@@ -48,6 +53,7 @@ from btcbot.services.dynamic_universe_service import DynamicUniverseService
 from btcbot.services.exchange_factory import build_exchange_stage4
 from btcbot.services.exchange_rules_service import ExchangeRulesService
 from btcbot.services.execution_service_stage4 import ExecutionService
+from btcbot.services.indicator_engine import MARK_SERIES_PREFIX, IndicatorEngine
 from btcbot.services.ledger_service import LedgerService
 from btcbot.services.market_data_service import MarketDataService
 from btcbot.services.metrics_service import CycleMetrics
@@ -126,6 +132,7 @@ class Stage4CycleRunner:
     _alert_notifier: LogNotifier = dataclass_field(init=False, repr=False)
     _dryrun_consecutive_exchange_degraded: int = dataclass_field(init=False, repr=False, default=0)
     _last_cycle_completed_epoch: int | None = dataclass_field(init=False, repr=False, default=None)
+    _alert_windows_restored: bool = dataclass_field(init=False, repr=False, default=False)
 
     def __post_init__(self) -> None:
         object.__setattr__(self, "_alert_store", MetricWindowStore())
@@ -134,11 +141,27 @@ class Stage4CycleRunner:
         object.__setattr__(self, "_alert_notifier", LogNotifier(logger))
         object.__setattr__(self, "_dryrun_consecutive_exchange_degraded", 0)
         object.__setattr__(self, "_last_cycle_completed_epoch", None)
+        object.__setattr__(self, "_alert_windows_restored", False)
 
     @staticmethod
     def norm(symbol: str) -> str:
         return normalize_symbol(symbol)
 
+    def _restore_alert_windows(self, state_store: StateStore) -> None:
+        if self._alert_windows_restored:
+            return
+        object.__setattr__(self, "_alert_windows_restored", True)
+        if not callable(getattr(state_store, "load_alert_metric_windows", None)):
+            return
+        try:
+            self._alert_store.load(state_store)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "alert_windows_restore_failed",
+                extra={"extra": {"error_type": type(exc).__name__}},
+            )
+
+    @traced("stage4_cycle")
     def run_one_cycle(self, settings: Settings, *, force_dry_run_submit: bool = False) -> int:
         instrumentation = get_instrumentation()
         cycle_started_monotonic = datetime.now(UTC)
@@ -154,10 +177,24 @@ class Stage4CycleRunner:
                     stall_seconds,
                     int(datetime.now(UTC).timestamp()),
                 )
+        trace_phase("setup")
         exchange = build_exchange_stage4(settings, dry_run=settings.dry_run)
         live_mode = settings.is_live_trading_enabled() and not settings.dry_run
+        db_stats = begin_statement_capture(
+            enabled=settings.sqlite_profile_enabled,
+            slow_query_ms=settings.sqlite_slow_query_ms,
+        )
+        resource_capture = begin_resource_capture(
+            enabled=settings.resource_accounting_enabled,
+            tracemalloc_enabled=settings.resource_tracemalloc_enabled,
+            tracemalloc_top_n=settings.resource_tracemalloc_top_n,
+            db_path=settings.state_db_path,
+            counters=http_traffic_counters(),
+        )
+        http_timings = begin_http_timing_capture(enabled=settings.http_timing_stats_enabled)
         state_store = StateStore(db_path=settings.state_db_path)
         uow_factory = UnitOfWorkFactory(settings.state_db_path)
+        self._restore_alert_windows(state_store)
         if live_mode and state_store.get_latest_stage7_ledger_metrics() is not None:
             logger.warning(
                 "stage4_live_stage7_data_present",
@@ -171,6 +208,7 @@ class Stage4CycleRunner:
         cycle_id = uuid4().hex
         cycle_now = datetime.now(UTC)
         cycle_started_at = cycle_now
+        trace_phase("universe")
         pair_info = self._resolve_pair_info(exchange) or []
         active_symbols = [self.norm(symbol) for symbol in settings.symbols]
         aggressive_scores: dict[str, Decimal] | None = None
@@ -334,7 +372,10 @@ class Stage4CycleRunner:
                     }
                 },
             )
-            decision_pipeline = DecisionPipelineService(settings=settings)
+            strategy_indicators = self._restore_strategy_indicators(state_store, settings)
+            decision_pipeline = DecisionPipelineService(
+                settings=settings, indicator_engine=strategy_indicators
+            )
             anomaly_detector = AnomalyDetectorService(
                 config=AnomalyDetectorConfig(
                     stale_market_data_seconds=settings.stale_market_data_seconds,
@@ -347,6 +388,7 @@ class Stage4CycleRunner:
                 ),
             )
 
+            trace_phase("mark_prices")
             market_snapshot = self._resolve_market_snapshot(
                 exchange,
                 active_symbols,
@@ -402,6 +444,7 @@ class Stage4CycleRunner:
                 },
             )
 
+            trace_phase("lifecycle_refresh")
             exchange_open_orders: list[Order] = []
             open_order_failures = 0
             failed_symbols: set[str] = set(mark_price_errors)
@@ -417,6 +460,7 @@ class Stage4CycleRunner:
                         extra={"extra": {"symbol": normalized, "error_type": type(exc).__name__}},
                     )
 
+            state_store.verify_stage4_order_index_if_due()
             db_open_orders = state_store.list_stage4_open_orders(include_unknown=True)
             try:
                 reconcile_result = reconcile_service.resolve(
@@ -510,6 +554,7 @@ class Stage4CycleRunner:
                 attrs={"process_role": process_role},
             )
 
+            trace_phase("fills")
             fills = []
             fills_fetched = 0
             fills_failures = 0
@@ -553,6 +598,7 @@ class Stage4CycleRunner:
                         extra={"extra": {"symbol": normalized, "error_type": type(exc).__name__}},
                     )
 
+            trace_phase("ledger")
             try:
                 with state_store.transaction():
                     ledger_ingest = ledger_service.ingest_exchange_updates(fills)
@@ -649,6 +695,7 @@ class Stage4CycleRunner:
                     attrs={"currency": missing_currency},
                 )
             ledger_checkpoint = ledger_service.checkpoint()
+            trace_phase("capital")
             capital_result = None
             try:
                 capital_result = risk_budget_service.apply_self_financing_checkpoint(
@@ -699,6 +746,7 @@ class Stage4CycleRunner:
                     1,
                     attrs={"applied": "true" if capital_result.applied else "false"},
                 )
+            trace_phase("planning")
             current_open_orders = state_store.list_stage4_open_orders()
             positions = state_store.list_stage4_positions()
             positions_by_symbol = {self.norm(position.symbol): position for position in positions}
@@ -854,6 +902,9 @@ class Stage4CycleRunner:
                     aggressive_scores=aggressive_scores,
                     budget_notional_multiplier=budget_notional_multiplier,
                 )
+                self._persist_strategy_indicators(
+                    strategy_indicators, state_store, now_utc=cycle_now
+                )
             planned_payload = [
                 {
                     "symbol": item.symbol,
@@ -1023,6 +1074,7 @@ class Stage4CycleRunner:
                 for action in lifecycle_plan.actions
                 if self.norm(action.symbol) not in failed_symbols
             ]
+            trace_phase("risk")
             open_orders_by_client_id = {
                 order.client_order_id: order
                 for order in current_open_orders
@@ -1083,6 +1135,7 @@ class Stage4CycleRunner:
                     },
                 )
 
+            trace_phase("degrade")
             degrade_state = state_store.get_degrade_state_current()
             cooldown_until_raw = degrade_state.get("cooldown_until")
             cooldown_until = (
@@ -1310,6 +1363,7 @@ class Stage4CycleRunner:
                     planned_actions=planned_submit_actions,
                     intents=persist_intents,
                 )
+            trace_phase("execution")
             execution_report = execution_service.execute_with_report(prefiltered_actions)
             self._assert_execution_invariant(execution_report)
 
@@ -1416,6 +1470,7 @@ class Stage4CycleRunner:
                 },
             )
 
+            trace_phase("persistence")
             try:
                 state_store.persist_degrade(
                     cycle_id=cycle_id,
@@ -1598,6 +1653,7 @@ class Stage4CycleRunner:
             )
             api_snapshot: dict[str, object] = {}
             rejects_by_code: dict[str, int] = {}
+            resource_stats = None if resource_capture is None else resource_capture.summary()
             try:
                 health_snapshot_fn = getattr(exchange, "health_snapshot", None)
                 api_snapshot = health_snapshot_fn() if callable(health_snapshot_fn) else {}
@@ -1629,6 +1685,9 @@ class Stage4CycleRunner:
                     rejects_by_code=rejects_by_code,
                     breaker_state=("open" if breaker_is_open else "closed"),
                     degraded_mode=degraded_mode,
+                    db_stats=None if db_stats is None else db_stats.summary(),
+                    resource_stats=resource_stats,
+                    http_stats=None if http_timings is None else http_timings.summary(),
                 )
             except Exception as exc:  # noqa: BLE001
                 logger.warning(
@@ -1641,6 +1700,11 @@ class Stage4CycleRunner:
                         }
                     },
                 )
+            persist_metrics_snapshot_if_due(
+                get_metrics_sink(),
+                state_store,
+                interval_seconds=float(getattr(settings, "metrics_snapshot_interval_seconds", 0)),
+            )
 
             try:
                 stage4_alert_metrics = build_cycle_metrics(
@@ -1681,6 +1745,7 @@ class Stage4CycleRunner:
                         "kill_switch": bool(effective_kill_switch),
                     },
                     cursor_diag=cursor_diag,
+                    resource_stats=resource_stats,
                 )
                 now_epoch = int(datetime.now(UTC).timestamp())
                 if settings.dry_run:
@@ -1715,6 +1780,8 @@ class Stage4CycleRunner:
                 alert_rules = list(BASELINE_ALERT_RULES)
                 if settings.dry_run:
                     alert_rules.extend(DRY_RUN_ALERT_RULES)
+                if resource_stats is not None:
+                    alert_rules.extend(RESOURCE_ALERT_RULES)
                 alert_events = self._alert_evaluator.evaluate_rules(
                     alert_rules,
                     self._alert_store,
@@ -1722,6 +1789,8 @@ class Stage4CycleRunner:
                 )
                 for event in self._alert_dedupe.filter(alert_events):
                     self._alert_notifier.notify(event)
+                if callable(getattr(state_store, "save_alert_metric_windows", None)):
+                    self._alert_store.persist(state_store)
             except Exception as exc:  # noqa: BLE001
                 logger.warning(
                     "alert_eval_failed",
@@ -2003,6 +2072,7 @@ class Stage4CycleRunner:
         snapshot = self._resolve_market_snapshot(exchange, symbols, cycle_now=effective_now)
         return snapshot.mark_prices, snapshot.anomalies
 
+    @traced("market_snapshot")
     def _resolve_market_snapshot(
         self,
         exchange: object,
@@ -2702,6 +2772,30 @@ class Stage4CycleRunner:
     def _fills_cursor_key(self, symbol: str) -> str:
         return f"fills_cursor:{self.norm(symbol)}"
 
+    @staticmethod
+    def _restore_strategy_indicators(
+        state_store: StateStore, settings: Settings
+    ) -> IndicatorEngine | None:
+        if not settings.indicator_engine_enabled or settings.strategy_anchor_source != "ema":
+            return None
+        engine = IndicatorEngine.from_settings(settings)
+        try:
+            engine.restore(state_store, key_prefix=MARK_SERIES_PREFIX)
+        except Exception:  # noqa: BLE001
+            logger.warning("stage4_strategy_indicator_restore_failed", exc_info=True)
+        return engine
+
+    @staticmethod
+    def _persist_strategy_indicators(
+        engine: IndicatorEngine | None, state_store: StateStore, *, now_utc: datetime
+    ) -> None:
+        if engine is None:
+            return
+        try:
+            engine.persist(state_store, now_utc=now_utc)
+        except Exception:  # noqa: BLE001
+            logger.warning("stage4_strategy_indicator_persist_failed", exc_info=True)
+
     def _to_position_summary(self, position: Position) -> PositionSummary:
         return PositionSummary(
             symbol=position.symbol,
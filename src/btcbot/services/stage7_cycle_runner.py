@@ -8,6 +8,7 @@ from hashlib import sha256
 from typing import cast
 from uuid import uuid4
 
+from btcbot.adapters.btcturk_http import http_traffic_counters
 from btcbot.adapters.exchange import ExchangeClient
 from btcbot.adapters.replay_exchange import ReplayExchangeClient
 from btcbot.config import Settings
@@ -22,8 +23,12 @@ from btcbot.domain.risk_budget import Mode
 from btcbot.domain.risk_mode_codec import dump_risk_mode
 from btcbot.domain.stage4 import LifecycleAction, LifecycleActionType
 from btcbot.logging_context import with_cycle_context
-from btcbot.obs.metrics import observe_histogram, set_gauge
+from btcbot.obs.http_timings import begin_http_timing_capture
+from btcbot.obs.metrics import get_metrics_sink, observe_histogram, set_gauge
+from btcbot.obs.metrics_aggregator import persist_metrics_snapshot_if_due
 from btcbot.obs.process_role import coerce_process_role
+from btcbot.obs.resource_usage import begin_resource_capture
+from btcbot.persistence.sqlite.sqlite_connection import begin_statement_capture
 from btcbot.planning_kernel import ExecutionPort, Plan, PlanningKernel
 from btcbot.services.adaptation_service import AdaptationService
 from btcbot.services.exchange_factory import build_exchange_stage4
@@ -281,6 +286,18 @@ class Stage7CycleRunner:
     ) -> int:
         now = now_utc.astimezone(UTC)
         collector = MetricsCollector()
+        db_stats = begin_statement_capture(
+            enabled=settings.sqlite_profile_enabled,
+            slow_query_ms=settings.sqlite_slow_query_ms,
+        )
+        resource_capture = begin_resource_capture(
+            enabled=settings.resource_accounting_enabled,
+            tracemalloc_enabled=settings.resource_tracemalloc_enabled,
+            tracemalloc_top_n=settings.resource_tracemalloc_top_n,
+            db_path=settings.state_db_path,
+            counters=http_traffic_counters(),
+        )
+        http_timings = begin_http_timing_capture(enabled=settings.http_timing_stats_enabled)
         process_role = coerce_process_role(getattr(settings, "process_role", None)).value
         collector.set("run_id", run_id)
         collector.set("ts", now.isoformat())
@@ -1112,6 +1129,11 @@ class Stage7CycleRunner:
                 "ledger_ms": _coerce_int(finalized.get("ledger_ms", 0)),
                 "persist_ms": _coerce_int(finalized.get("persist_ms", 0)),
                 "cycle_total_ms": _coerce_int(finalized.get("cycle_total_ms", 0)),
+                "db_stats": None if db_stats is None else db_stats.summary(),
+                "resource_stats": (
+                    None if resource_capture is None else resource_capture.summary()
+                ),
+                "http_stats": None if http_timings is None else http_timings.summary(),
             }
             state_store.save_stage7_run_metrics(cycle_id, run_metrics)
             observe_histogram(
@@ -1124,6 +1146,11 @@ class Stage7CycleRunner:
                 1 if bool(runtime.kill_switch) else 0,
                 labels={"process_role": process_role},
             )
+            persist_metrics_snapshot_if_due(
+                get_metrics_sink(),
+                state_store,
+                interval_seconds=float(getattr(runtime, "metrics_snapshot_interval_seconds", 0)),
+            )
             if enable_adaptation:
                 param_change = adaptation_service.evaluate_and_apply(
                     state_store=state_store, settings=runtime, now_utc=now
@@ -3,16 +3,25 @@ from __future__ import annotations
 import csv
 import io
 import json
-from dataclasses import asdict, dataclass
-from datetime import UTC, datetime, timedelta
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
 from decimal import Decimal
-from typing import Literal
-
+from typing import Literal, TextIO
+
+from btcbot.domain.stage7_rollups import (
+    ROLLUP_PERIODS,
+    RollupTotals,
+    rollup_bucket_bounds,
+)
+from btcbot.domain.stage7_rollups import normalize_drawdown_fields as _normalize_drawdown_fields
+from btcbot.domain.stage7_rollups import parse_ts_utc as _parse_ts_utc
 from btcbot.services.state_store import StateStore
 
 _DECIMAL_ZERO = Decimal("0")
 _NET_TOLERANCE_TRY = Decimal("0.01")
 STAGE7_REPORT_SCHEMA_VERSION = "phase6-v1"
+EXPORT_PAGE_SIZE = 500
 
 
 @dataclass(slots=True)
@@ -74,58 +83,87 @@ class RollupReport:
 
 
 def build_cycle_rows(store: StateStore, limit: int) -> list[CycleReportRow]:
-    rows = store.fetch_stage7_cycles_for_export(limit=max(0, int(limit)))
-    payload: list[CycleReportRow] = []
-    for row in rows:
-        submitted = _as_int(row.get("oms_submitted_count"))
-        filled = _as_int(row.get("oms_filled_count"))
-        fill_rate = Decimal(filled) / Decimal(max(1, submitted))
-        ratio, pct = _normalize_drawdown_fields(
-            raw_ratio=row.get("max_drawdown_ratio"),
-            raw_pct=row.get("max_drawdown_pct"),
-        )
-        payload.append(
-            CycleReportRow(
-                ts=str(row.get("ts", "")),
-                cycle_id=str(row.get("cycle_id", "")),
-                run_id=(str(row["run_id"]) if row.get("run_id") not in (None, "") else None),
-                mode_base=str(row.get("mode_base", "")),
-                mode_final=str(row.get("mode_final", "")),
-                universe_size=_as_int(row.get("universe_size")),
-                gross_pnl_try=_as_decimal(row.get("gross_pnl_try")),
-                net_pnl_try=_as_decimal(row.get("net_pnl_try")),
-                realized_pnl_try=_as_decimal(row.get("ledger_realized_pnl_try")),
-                unrealized_pnl_try=_as_decimal(row.get("ledger_unrealized_pnl_try")),
-                fees_try=_as_decimal(row.get("fees_try")),
-                funding_cost_try=_as_decimal(row.get("funding_cost_try")),
-                slippage_try=_as_decimal(row.get("slippage_try")),
-                turnover_try=_as_decimal(row.get("turnover_try")),
-                equity_try=_as_decimal(row.get("equity_try")),
-                max_drawdown_ratio=ratio,
-                max_drawdown_pct=pct,
-                rejects=_as_int(row.get("oms_rejected_count")),
-                fill_rate=fill_rate,
-                intents_planned_count=_as_int(row.get("intents_planned_count")),
-                oms_submitted_count=submitted,
-                oms_filled_count=filled,
-                quality_flags=_as_dict(row.get("quality_flags")),
-                alert_flags=_as_dict(row.get("alert_flags")),
-            )
-        )
-    return payload
+    return list(iter_cycle_rows(store, limit))
+
+
+def iter_cycle_rows(
+    store: StateStore,
+    limit: int,
+    *,
+    page_size: int = EXPORT_PAGE_SIZE,
+    upper_key: tuple[str, str] | None = None,
+) -> Iterator[CycleReportRow]:
+    """Yield report rows newest first, reading the DB one keyset page at a time."""
+    for row in store.iter_stage7_cycles_for_export(
+        limit=max(0, int(limit)), page_size=page_size, upper_key=upper_key
+    ):
+        yield _cycle_report_row(row)
+
+
+def _cycle_report_row(row: dict[str, object]) -> CycleReportRow:
+    submitted = _as_int(row.get("oms_submitted_count"))
+    filled = _as_int(row.get("oms_filled_count"))
+    fill_rate = Decimal(filled) / Decimal(max(1, submitted))
+    ratio, pct = _normalize_drawdown_fields(
+        raw_ratio=row.get("max_drawdown_ratio"),
+        raw_pct=row.get("max_drawdown_pct"),
+    )
+    return CycleReportRow(
+        ts=str(row.get("ts", "")),
+        cycle_id=str(row.get("cycle_id", "")),
+        run_id=(str(row["run_id"]) if row.get("run_id") not in (None, "") else None),
+        mode_base=str(row.get("mode_base", "")),
+        mode_final=str(row.get("mode_final", "")),
+        universe_size=_as_int(row.get("universe_size")),
+        gross_pnl_try=_as_decimal(row.get("gross_pnl_try")),
+        net_pnl_try=_as_decimal(row.get("net_pnl_try")),
+        realized_pnl_try=_as_decimal(row.get("ledger_realized_pnl_try")),
+        unrealized_pnl_try=_as_decimal(row.get("ledger_unrealized_pnl_try")),
+        fees_try=_as_decimal(row.get("fees_try")),
+        funding_cost_try=_as_decimal(row.get("funding_cost_try")),
+        slippage_try=_as_decimal(row.get("slippage_try")),
+        turnover_try=_as_decimal(row.get("turnover_try")),
+        equity_try=_as_decimal(row.get("equity_try")),
+        max_drawdown_ratio=ratio,
+        max_drawdown_pct=pct,
+        rejects=_as_int(row.get("oms_rejected_count")),
+        fill_rate=fill_rate,
+        intents_planned_count=_as_int(row.get("intents_planned_count")),
+        oms_submitted_count=submitted,
+        oms_filled_count=filled,
+        quality_flags=_as_dict(row.get("quality_flags")),
+        alert_flags=_as_dict(row.get("alert_flags")),
+    )
 
 
 def validate_cycle_rows(rows: list[CycleReportRow]) -> list[ValidationFinding]:
-    findings: list[ValidationFinding] = []
-    last_ts: datetime | None = None
-    required = (
+    validator = CycleRowValidator()
+    for row in rows:
+        validator.check(row)
+    return validator.findings
+
+
+class CycleRowValidator:
+    """Incremental form of :func:`validate_cycle_rows` for rows streamed newest first."""
+
+    _REQUIRED = (
         "cycle_id",
         "ts",
         "mode_base",
         "mode_final",
     )
-    for row in rows:
-        for field_name in required:
+
+    def __init__(self) -> None:
+        self.findings: list[ValidationFinding] = []
+        self._last_ts: datetime | None = None
+
+    @property
+    def has_errors(self) -> bool:
+        return any(finding.severity == "error" for finding in self.findings)
+
+    def check(self, row: CycleReportRow) -> list[ValidationFinding]:
+        findings: list[ValidationFinding] = []
+        for field_name in self._REQUIRED:
             if not getattr(row, field_name):
                 findings.append(
                     ValidationFinding(
@@ -148,8 +186,10 @@ def validate_cycle_rows(rows: list[CycleReportRow]) -> list[ValidationFinding]:
                     details={"ts": row.ts},
                 )
             )
-            continue
+            self.findings.extend(findings)
+            return findings
 
+        last_ts = self._last_ts
         if last_ts is not None and current_ts > last_ts:
             findings.append(
                 ValidationFinding(
@@ -160,7 +200,7 @@ def validate_cycle_rows(rows: list[CycleReportRow]) -> list[ValidationFinding]:
                     details={"previous_ts": last_ts.isoformat(), "current_ts": current_ts.isoformat()},
                 )
             )
-        last_ts = current_ts
+        self._last_ts = current_ts
 
         expected_net = row.gross_pnl_try - row.fees_try - row.funding_cost_try - row.slippage_try
         delta = abs(row.net_pnl_try - expected_net)
@@ -195,133 +235,302 @@ def validate_cycle_rows(rows: list[CycleReportRow]) -> list[ValidationFinding]:
                 )
             )
 
-    return findings
+        self.findings.extend(findings)
+        return findings
 
 
 def rollup(rows: list[CycleReportRow], period: Literal["daily", "weekly"], tz: UTC = UTC) -> RollupReport:
-    buckets: dict[str, dict[str, object]] = {}
+    accumulator = RollupAccumulator(period, tz=tz)
     for row in rows:
-        ts = _parse_ts_utc(row.ts).astimezone(tz)
-        day_start = datetime(ts.year, ts.month, ts.day, tzinfo=tz)
-        if period == "daily":
-            start = day_start
-            end = day_start.replace(hour=23, minute=59, second=59)
-            bucket_key = start.date().isoformat()
-        else:
-            start = day_start - timedelta(days=day_start.weekday())
-            end = start + timedelta(days=6, hours=23, minutes=59, seconds=59)
-            bucket_key = start.date().isoformat()
-
-        bucket = buckets.setdefault(
-            bucket_key,
-            {
-                "start": start,
-                "end": end,
-                "cycles_count": 0,
-                "gross_pnl_try": _DECIMAL_ZERO,
-                "net_pnl_try": _DECIMAL_ZERO,
-                "fees_try": _DECIMAL_ZERO,
-                "slippage_try": _DECIMAL_ZERO,
-                "turnover_try": _DECIMAL_ZERO,
-                "rejects": 0,
-                "fill_rate_total": _DECIMAL_ZERO,
-                "max_drawdown_ratio": _DECIMAL_ZERO,
-            },
+        accumulator.add(row)
+    return accumulator.report()
+
+
+class RollupAccumulator:
+    """Running daily/weekly buckets; memory grows with buckets, not with cycles."""
+
+    def __init__(self, period: Literal["daily", "weekly"], tz: UTC = UTC) -> None:
+        self.period = period
+        self.tz = tz
+        self._buckets: dict[datetime, RollupTotals] = {}
+
+    def add(self, row: CycleReportRow) -> None:
+        start, _ = rollup_bucket_bounds(_parse_ts_utc(row.ts), self.period, self.tz)
+        self._buckets.setdefault(start, RollupTotals()).add(
+            RollupTotals.from_cycle(
+                gross_pnl_try=row.gross_pnl_try,
+                net_pnl_try=row.net_pnl_try,
+                fees_try=row.fees_try,
+                slippage_try=row.slippage_try,
+                turnover_try=row.turnover_try,
+                rejects=row.rejects,
+                fill_rate=row.fill_rate,
+                max_drawdown_ratio=row.max_drawdown_ratio,
+            )
         )
-        bucket["cycles_count"] = int(bucket["cycles_count"]) + 1
-        bucket["gross_pnl_try"] = Decimal(bucket["gross_pnl_try"]) + row.gross_pnl_try
-        bucket["net_pnl_try"] = Decimal(bucket["net_pnl_try"]) + row.net_pnl_try
-        bucket["fees_try"] = Decimal(bucket["fees_try"]) + row.fees_try
-        bucket["slippage_try"] = Decimal(bucket["slippage_try"]) + row.slippage_try
-        bucket["turnover_try"] = Decimal(bucket["turnover_try"]) + row.turnover_try
-        bucket["rejects"] = int(bucket["rejects"]) + row.rejects
-        bucket["fill_rate_total"] = Decimal(bucket["fill_rate_total"]) + row.fill_rate
-        bucket["max_drawdown_ratio"] = max(Decimal(bucket["max_drawdown_ratio"]), row.max_drawdown_ratio)
 
+    def report(self) -> RollupReport:
+        return _rollup_report(self.period, self._buckets, self.tz)
+
+
+def materialized_rollups(
+    store: StateStore,
+    oldest_key: tuple[str, str],
+    newest_key: tuple[str, str],
+) -> dict[str, RollupReport]:
+    """Rollups for the cycles between two ``(ts, cycle_id)`` keys (inclusive).
+
+    Buckets strictly inside the window come from the ``stage7_rollups`` table maintained
+    at cycle write time; only the two edge buckets, which the window may cut, are
+    re-bucketed from raw rows. Cost is O(buckets + cycles per edge bucket).
+    """
+    reports: dict[str, RollupReport] = {}
+    for period in ROLLUP_PERIODS:
+        oldest_start, _ = rollup_bucket_bounds(_parse_ts_utc(oldest_key[0]), period)
+        newest_start, _ = rollup_bucket_bounds(_parse_ts_utc(newest_key[0]), period)
+        buckets: dict[datetime, RollupTotals] = {
+            _parse_ts_utc(str(record["period_start"])): RollupTotals.from_record(record)
+            for record in store.load_stage7_rollups(
+                period, start_after=oldest_start, start_before=newest_start
+            )
+        }
+        for edge_start in {oldest_start, newest_start}:
+            totals = RollupTotals()
+            for row in store.load_stage7_bucket_rows(period, edge_start):
+                if oldest_key <= (str(row["ts"]), str(row["cycle_id"])) <= newest_key:
+                    totals.add(RollupTotals.from_metrics_row(row))
+            if totals.cycles_count:
+                buckets[edge_start] = totals
+        reports[period] = _rollup_report(period, buckets)
+    return reports
+
+
+def _rollup_report(
+    period: Literal["daily", "weekly"],
+    buckets: dict[datetime, RollupTotals],
+    tz: UTC = UTC,
+) -> RollupReport:
     ordered: list[RollupBucket] = []
-    for key in sorted(buckets.keys(), reverse=True):
-        item = buckets[key]
-        cycles_count = int(item["cycles_count"])
-        fill_rate_avg = Decimal(item["fill_rate_total"]) / Decimal(max(1, cycles_count))
+    for start in sorted(buckets, reverse=True):
+        totals = buckets[start]
+        _, end = rollup_bucket_bounds(start, period, tz)
         ordered.append(
             RollupBucket(
-                period_start=item["start"].isoformat(),
-                period_end=item["end"].isoformat(),
-                cycles_count=cycles_count,
-                gross_pnl_try=Decimal(item["gross_pnl_try"]),
-                net_pnl_try=Decimal(item["net_pnl_try"]),
-                fees_try=Decimal(item["fees_try"]),
-                slippage_try=Decimal(item["slippage_try"]),
-                turnover_try=Decimal(item["turnover_try"]),
-                rejects=int(item["rejects"]),
-                fill_rate_avg=fill_rate_avg,
-                max_drawdown_ratio=Decimal(item["max_drawdown_ratio"]),
+                period_start=start.isoformat(),
+                period_end=end.isoformat(),
+                cycles_count=totals.cycles_count,
+                gross_pnl_try=totals.gross_pnl_try,
+                net_pnl_try=totals.net_pnl_try,
+                fees_try=totals.fees_try,
+                slippage_try=totals.slippage_try,
+                turnover_try=totals.turnover_try,
+                rejects=totals.rejects,
+                fill_rate_avg=totals.fill_rate_avg,
+                max_drawdown_ratio=totals.max_drawdown_ratio,
             )
         )
-
     return RollupReport(period=period, buckets=ordered)
 
 
+CSV_COLUMNS = (
+    "ts",
+    "cycle_id",
+    "run_id",
+    "mode_base",
+    "mode_final",
+    "universe_size",
+    "gross_pnl_try",
+    "net_pnl_try",
+    "realized_pnl_try",
+    "unrealized_pnl_try",
+    "fees_try",
+    "funding_cost_try",
+    "slippage_try",
+    "turnover_try",
+    "equity_try",
+    "max_drawdown_ratio",
+    "rejects",
+    "fill_rate",
+    "intents_planned_count",
+    "oms_submitted_count",
+    "oms_filled_count",
+    "quality_flags_json",
+    "alert_flags_json",
+)
+
+
 def render_csv(rows: list[CycleReportRow]) -> str:
-    columns = [
-        "ts",
-        "cycle_id",
-        "run_id",
-        "mode_base",
-        "mode_final",
-        "universe_size",
-        "gross_pnl_try",
-        "net_pnl_try",
-        "realized_pnl_try",
-        "unrealized_pnl_try",
-        "fees_try",
-        "funding_cost_try",
-        "slippage_try",
-        "turnover_try",
-        "equity_try",
-        "max_drawdown_ratio",
-        "rejects",
-        "fill_rate",
-        "intents_planned_count",
-        "oms_submitted_count",
-        "oms_filled_count",
-        "quality_flags_json",
-        "alert_flags_json",
-    ]
     buf = io.StringIO()
-    writer = csv.DictWriter(buf, fieldnames=columns)
-    writer.writeheader()
+    writer = CsvCycleWriter(buf)
     for row in rows:
-        writer.writerow(
-            {
-                "ts": row.ts,
-                "cycle_id": row.cycle_id,
-                "run_id": row.run_id,
-                "mode_base": row.mode_base,
-                "mode_final": row.mode_final,
-                "universe_size": row.universe_size,
-                "gross_pnl_try": str(row.gross_pnl_try),
-                "net_pnl_try": str(row.net_pnl_try),
-                "realized_pnl_try": str(row.realized_pnl_try),
-                "unrealized_pnl_try": str(row.unrealized_pnl_try),
-                "fees_try": str(row.fees_try),
-                "funding_cost_try": str(row.funding_cost_try),
-                "slippage_try": str(row.slippage_try),
-                "turnover_try": str(row.turnover_try),
-                "equity_try": str(row.equity_try),
-                "max_drawdown_ratio": str(row.max_drawdown_ratio),
-                "rejects": row.rejects,
-                "fill_rate": str(row.fill_rate),
-                "intents_planned_count": row.intents_planned_count,
-                "oms_submitted_count": row.oms_submitted_count,
-                "oms_filled_count": row.oms_filled_count,
-                "quality_flags_json": json.dumps(row.quality_flags, sort_keys=True),
-                "alert_flags_json": json.dumps(row.alert_flags, sort_keys=True),
-            }
-        )
+        writer.write(row)
+    writer.close()
     return buf.getvalue()
 
 
+def _csv_record(row: CycleReportRow) -> dict[str, object]:
+    return {
+        "ts": row.ts,
+        "cycle_id": row.cycle_id,
+        "run_id": row.run_id,
+        "mode_base": row.mode_base,
+        "mode_final": row.mode_final,
+        "universe_size": row.universe_size,
+        "gross_pnl_try": str(row.gross_pnl_try),
+        "net_pnl_try": str(row.net_pnl_try),
+        "realized_pnl_try": str(row.realized_pnl_try),
+        "unrealized_pnl_try": str(row.unrealized_pnl_try),
+        "fees_try": str(row.fees_try),
+        "funding_cost_try": str(row.funding_cost_try),
+        "slippage_try": str(row.slippage_try),
+        "turnover_try": str(row.turnover_try),
+        "equity_try": str(row.equity_try),
+        "max_drawdown_ratio": str(row.max_drawdown_ratio),
+        "rejects": row.rejects,
+        "fill_rate": str(row.fill_rate),
+        "intents_planned_count": row.intents_planned_count,
+        "oms_submitted_count": row.oms_submitted_count,
+        "oms_filled_count": row.oms_filled_count,
+        "quality_flags_json": json.dumps(row.quality_flags, sort_keys=True),
+        "alert_flags_json": json.dumps(row.alert_flags, sort_keys=True),
+    }
+
+
+class CsvCycleWriter:
+    """Writes the CSV header on construction and one line per :meth:`write`."""
+
+    def __init__(self, handle: TextIO) -> None:
+        self._writer = csv.DictWriter(handle, fieldnames=list(CSV_COLUMNS))
+        self._writer.writeheader()
+
+    def write(self, row: CycleReportRow) -> None:
+        self._writer.writerow(_csv_record(row))
+
+    def close(self, **_: object) -> None:
+        return None
+
+
+class JsonReportWriter:
+    """Streams the same document :func:`render_json` produces for a full report object.
+
+    Keys are emitted in sorted order (``cycles``, ``rollups``, ``schema_version``,
+    ``validations``); rollups and validations are only known after the last cycle.
+    """
+
+    def __init__(self, handle: TextIO, *, redact: Callable[[object], object]) -> None:
+        self._handle = handle
+        self._redact = redact
+        self._count = 0
+        handle.write('{"cycles": [')
+
+    def write(self, row: CycleReportRow) -> None:
+        if self._count:
+            self._handle.write(", ")
+        self._handle.write(render_json(self._redact(row)))
+        self._count += 1
+
+    def close(
+        self,
+        *,
+        rollups: dict[str, RollupReport],
+        validations: list[ValidationFinding],
+    ) -> None:
+        self._handle.write('], "rollups": ')
+        self._handle.write(render_json(self._redact(rollups)))
+        self._handle.write(', "schema_version": ')
+        self._handle.write(json.dumps(self._redact(STAGE7_REPORT_SCHEMA_VERSION)))
+        self._handle.write(', "validations": ')
+        self._handle.write(render_json(self._redact(validations)))
+        self._handle.write("}")
+
+
+class JsonlReportWriter:
+    """One JSON object per line: a header, each cycle, then rollup buckets and findings."""
+
+    def __init__(self, handle: TextIO, *, redact: Callable[[object], object]) -> None:
+        self._handle = handle
+        self._redact = redact
+        self._line({"record": "header", "schema_version": STAGE7_REPORT_SCHEMA_VERSION})
+
+    def _line(self, payload: dict[str, object]) -> None:
+        self._handle.write(render_json(self._redact(payload)) + "\n")
+
+    def write(self, row: CycleReportRow) -> None:
+        self._line({"record": "cycle", **_to_jsonable(row)})
+
+    def close(
+        self,
+        *,
+        rollups: dict[str, RollupReport],
+        validations: list[ValidationFinding],
+    ) -> None:
+        for period, report in rollups.items():
+            for bucket in report.buckets:
+                self._line({"record": "rollup", "period": period, **_to_jsonable(bucket)})
+        for finding in validations:
+            self._line({"record": "validation", **_to_jsonable(finding)})
+
+
+@dataclass(slots=True)
+class StreamedReport:
+    cycles_count: int
+    rollups: dict[str, RollupReport]
+    validations: list[ValidationFinding]
+    newest_key: tuple[str, str] | None = None
+    errors: list[ValidationFinding] = field(default_factory=list)
+
+
+def stream_report(
+    rows: Iterable[CycleReportRow],
+    writers: Iterable[CsvCycleWriter | JsonReportWriter | JsonlReportWriter] = (),
+    *,
+    rollup_source: (
+        Callable[[tuple[str, str], tuple[str, str]], dict[str, RollupReport]] | None
+    ) = None,
+) -> StreamedReport:
+    """Validate, roll up and write rows in one pass without keeping them in memory.
+
+    With ``rollup_source`` (see :func:`materialized_rollups`) rows are not re-bucketed;
+    the rollups for the streamed key range are fetched once the range is known.
+    """
+    writers = list(writers)
+    validator = CycleRowValidator()
+    accumulators = (
+        None
+        if rollup_source is not None
+        else {period: RollupAccumulator(period) for period in ROLLUP_PERIODS}
+    )
+    count = 0
+    newest_key: tuple[str, str] | None = None
+    oldest_key: tuple[str, str] | None = None
+    for row in rows:
+        oldest_key = (row.ts, row.cycle_id)
+        if newest_key is None:
+            newest_key = oldest_key
+        validator.check(row)
+        if accumulators is not None:
+            for accumulator in accumulators.values():
+                accumulator.add(row)
+        for writer in writers:
+            writer.write(row)
+        count += 1
+    if accumulators is not None:
+        rollups = {period: item.report() for period, item in accumulators.items()}
+    elif newest_key is not None and oldest_key is not None:
+        rollups = rollup_source(oldest_key, newest_key)
+    else:
+        rollups = {period: RollupReport(period=period, buckets=[]) for period in ROLLUP_PERIODS}
+    for writer in writers:
+        writer.close(rollups=rollups, validations=validator.findings)
+    return StreamedReport(
+        cycles_count=count,
+        rollups=rollups,
+        validations=validator.findings,
+        newest_key=newest_key,
+        errors=[finding for finding in validator.findings if finding.severity == "error"],
+    )
+
+
 def render_json(report_obj: object) -> str:
     return json.dumps(_to_jsonable(report_obj), sort_keys=True)
 
@@ -356,32 +565,3 @@ def _as_dict(value: object) -> dict[str, object]:
     if isinstance(value, dict):
         return value
     return {}
-
-
-def _parse_ts_utc(raw: str) -> datetime:
-    normalized = raw[:-1] + "+00:00" if raw.endswith("Z") else raw
-    parsed = datetime.fromisoformat(normalized)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=UTC)
-    return parsed.astimezone(UTC)
-
-
-def _normalize_drawdown_fields(
-    *,
-    raw_ratio: object | None,
-    raw_pct: object | None,
-) -> tuple[Decimal, Decimal | None]:
-    if raw_ratio not in (None, ""):
-        ratio = _as_decimal(raw_ratio)
-        if ratio > Decimal("1"):
-            # Some legacy rows persisted percentage-like values in ratio columns.
-            pct = ratio
-            ratio = ratio / Decimal("100")
-            return ratio, pct
-        pct = ratio * Decimal("100")
-        return ratio, pct
-    if raw_pct in (None, ""):
-        return _DECIMAL_ZERO, None
-    pct = _as_decimal(raw_pct)
-    ratio = pct / Decimal("100") if pct > Decimal("1") else pct
-    return ratio, pct
@@ -0,0 +1,632 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from btcbot.services.ledger_service import LEDGER_RETENTION_BASE_SCOPE, LedgerService
+from btcbot.services.parity import FINGERPRINT_TABLE
+from btcbot.services.state_store import StateStore
+
+if TYPE_CHECKING:
+    from btcbot.config import Settings
+
+logger = logging.getLogger(__name__)
+
+Summary = dict[str, object]
+RowFold = Callable[[Summary, Mapping[str, object]], None]
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long rows of one table stay hot and how older rows are folded away.
+
+    ``fold_day`` merges a row into its day's summary in ``state_retention_daily``;
+    ``fold_checkpoint`` merges it into the running aggregate kept in
+    ``state_retention_checkpoints`` for readers that need all-time values.
+    ``guard_sql`` is an extra predicate a row must satisfy to be removed.
+    """
+
+    table: str
+    hot_days: int
+    ts_column: str = "ts"
+    fold_day: RowFold | None = None
+    fold_checkpoint: RowFold | None = None
+    guard_sql: str | None = None
+
+
+@dataclass(frozen=True)
+class TableRetentionResult:
+    table: str
+    cutoff: str
+    archived_rows: int
+    chunks: int
+    days: tuple[str, ...]
+    complete: bool
+
+
+@dataclass
+class _ChunkWork:
+    rows: list[sqlite3.Row] = field(default_factory=list)
+    by_day: dict[str, list[sqlite3.Row]] = field(default_factory=dict)
+    fingerprints_dropped: int = 0
+
+
+def _dec(value: object) -> Decimal | None:
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def _add(summary: Summary, key: str, value: Decimal) -> None:
+    summary[key] = str(Decimal(str(summary.get(key, "0"))) + value)
+
+
+def _count(summary: Summary, group: str, key: str) -> None:
+    counts = summary.setdefault(group, {})
+    assert isinstance(counts, dict)
+    counts[key] = int(counts.get(key, 0)) + 1
+
+
+def _ohlc(summary: Summary, prefix: str, ts: str, value: Decimal | None) -> None:
+    if value is None:
+        return
+    if summary.get(f"{prefix}_open_ts") is None or ts < str(summary[f"{prefix}_open_ts"]):
+        summary[f"{prefix}_open_ts"] = ts
+        summary[f"{prefix}_open"] = str(value)
+    if summary.get(f"{prefix}_close_ts") is None or ts >= str(summary[f"{prefix}_close_ts"]):
+        summary[f"{prefix}_close_ts"] = ts
+        summary[f"{prefix}_close"] = str(value)
+    high = _dec(summary.get(f"{prefix}_high"))
+    low = _dec(summary.get(f"{prefix}_low"))
+    summary[f"{prefix}_high"] = str(value if high is None else max(high, value))
+    summary[f"{prefix}_low"] = str(value if low is None else min(low, value))
+
+
+def _fold_ledger_day(summary: Summary, row: Mapping[str, object]) -> None:
+    _count(summary, "by_type", str(row["type"]))
+    _fold_ledger_totals(summary, row)
+
+
+def _fold_ledger_totals(summary: Summary, row: Mapping[str, object]) -> None:
+    price = _dec(row["price"])
+    qty = _dec(row["qty"])
+    if str(row["type"]) == "FILL" and price is not None and qty is not None:
+        _add(summary, "fill_notional_try", abs(price * qty))
+    fee = _dec(row["fee"])
+    if fee is not None and row["fee_currency"] is not None:
+        fees = summary.setdefault("fees_by_currency", {})
+        assert isinstance(fees, dict)
+        currency = str(row["fee_currency"]).upper()
+        fees[currency] = str(Decimal(str(fees.get(currency, "0"))) + fee)
+
+
+def _fold_pnl_day(summary: Summary, row: Mapping[str, object]) -> None:
+    ts = str(row["ts"])
+    _ohlc(summary, "equity", ts, _dec(row["total_equity_try"]))
+    _ohlc(summary, "realized_total", ts, _dec(row["realized_total_try"]))
+
+
+def _fold_pnl_drawdown(summary: Summary, row: Mapping[str, object]) -> None:
+    # Same recurrence as domain.ledger.compute_max_drawdown, carried across chunks.
+    equity = _dec(row["total_equity_try"])
+    if equity is None:
+        return
+    ts = str(row["ts"])
+    if summary.get("last_ts") is None or ts > str(summary["last_ts"]):
+        summary["last_ts"] = ts
+    peak = _dec(summary.get("peak"))
+    if peak is None or equity > peak:
+        summary["peak"] = str(equity)
+        return
+    if peak <= 0:
+        return
+    drawdown = (peak - equity) / peak
+    if drawdown > (_dec(summary.get("max_drawdown")) or Decimal("0")):
+        summary["max_drawdown"] = str(drawdown)
+        summary["mdd_peak"] = str(peak)
+        summary["mdd_trough"] = str(equity)
+
+
+def _fold_stage7_run_metrics_day(summary: Summary, row: Mapping[str, object]) -> None:
+    _count(summary, "by_mode_final", str(row["mode_final"]))
+    for column in ("oms_submitted_count", "oms_filled_count", "oms_rejected_count"):
+        _add(summary, column, Decimal(int(row[column] or 0)))
+    _ohlc(summary, "equity", str(row["ts"]), _dec(row["equity_try"]))
+
+
+def _fold_stage7_ledger_metrics_day(summary: Summary, row: Mapping[str, object]) -> None:
+    ts = str(row["ts"])
+    _ohlc(summary, "equity", ts, _dec(row["equity_try"]))
+    _ohlc(summary, "net_pnl", ts, _dec(row["net_pnl_try"]))
+    ratio = _dec(row["max_drawdown_ratio"])
+    current = _dec(summary.get("max_drawdown_ratio"))
+    if ratio is not None and (current is None or ratio > current):
+        summary["max_drawdown_ratio"] = str(ratio)
+
+
+def _counter_fold(column: str, group: str) -> RowFold:
+    def fold(summary: Summary, row: Mapping[str, object]) -> None:
+        _count(summary, group, str(row[column]))
+
+    return fold
+
+
+def _fold_price_cache_day(summary: Summary, row: Mapping[str, object]) -> None:
+    closes = summary.setdefault("close_by_symbol", {})
+    assert isinstance(closes, dict)
+    symbol = str(row["pair_symbol"])
+    ts = str(row["ts_bucket"])
+    current = closes.get(symbol)
+    if current is None or ts >= str(current[0]):
+        closes[symbol] = [ts, str(row["mid_price"])]
+
+
+DEFAULT_HOT_DAYS: dict[str, int] = {
+    "ledger_events": 365,
+    "universe_price_cache": 14,
+    "metrics_snapshots": 14,
+}
+
+# Children before parents: stage7_ledger_metrics references stage7_cycle_trace.
+_POLICY_TEMPLATES: tuple[RetentionPolicy, ...] = (
+    RetentionPolicy(
+        "ledger_events",
+        0,
+        fold_day=_fold_ledger_day,
+        fold_checkpoint=_fold_ledger_totals,
+    ),
+    RetentionPolicy("pnl_snapshots", 0, fold_day=_fold_pnl_day, fold_checkpoint=_fold_pnl_drawdown),
+    RetentionPolicy("stage7_run_metrics", 0, fold_day=_fold_stage7_run_metrics_day),
+    RetentionPolicy("stage7_ledger_metrics", 0, fold_day=_fold_stage7_ledger_metrics_day),
+    RetentionPolicy(
+        "stage7_cycle_trace",
+        0,
+        guard_sql=(
+            "NOT EXISTS (SELECT 1 FROM stage7_ledger_metrics m "
+            "WHERE m.cycle_id = stage7_cycle_trace.cycle_id)"
+        ),
+    ),
+    RetentionPolicy("cycle_audit", 0),
+    RetentionPolicy("metrics_snapshots", 0),
+    RetentionPolicy("anomaly_events", 0, fold_day=_counter_fold("code", "by_code")),
+    RetentionPolicy(
+        "stage7_order_events", 0, fold_day=_counter_fold("event_type", "by_event_type")
+    ),
+    RetentionPolicy(
+        "universe_price_cache", 0, ts_column="ts_bucket", fold_day=_fold_price_cache_day
+    ),
+)
+
+RETENTION_TABLES: tuple[str, ...] = tuple(policy.table for policy in _POLICY_TEMPLATES)
+
+# Tables joined into the stored parity chain (``stage7_cycle_fingerprints``).
+_PARITY_SOURCE_TABLES = frozenset({"stage7_ledger_metrics", "stage7_cycle_trace"})
+
+
+def build_retention_policies(
+    *, default_hot_days: int, overrides: Mapping[str, int] | None = None
+) -> tuple[RetentionPolicy, ...]:
+    overrides = dict(overrides or {})
+    unknown = sorted(set(overrides) - set(RETENTION_TABLES))
+    if unknown:
+        raise ValueError(f"unknown retention tables: {','.join(unknown)}")
+    policies = []
+    for template in _POLICY_TEMPLATES:
+        hot_days = overrides.get(
+            template.table, DEFAULT_HOT_DAYS.get(template.table, default_hot_days)
+        )
+        if int(hot_days) < 1:
+            raise ValueError(f"retention hot_days for {template.table} must be >= 1")
+        policies.append(
+            RetentionPolicy(
+                table=template.table,
+                hot_days=int(hot_days),
+                ts_column=template.ts_column,
+                fold_day=template.fold_day,
+                fold_checkpoint=template.fold_checkpoint,
+                guard_sql=template.guard_sql,
+            )
+        )
+    return tuple(policies)
+
+
+class StateRetentionService:
+    """Moves rows older than each table's hot window out of the state DB.
+
+    Every chunk runs in its own short ``BEGIN IMMEDIATE`` transaction: candidate rowid
+    ranges are located with a plain read (no write lock under WAL), then the chunk's
+    rows are appended to gzip JSONL archives partitioned by table and day, folded into
+    daily summaries and running checkpoints, and deleted. Archives are at-least-once
+    (a crash between the file append and the commit leaves duplicates, each tagged with
+    ``_rowid``); summaries and checkpoints commit atomically with the delete.
+    """
+
+    def __init__(
+        self,
+        state_store: StateStore,
+        *,
+        policies: tuple[RetentionPolicy, ...],
+        archive_dir: str | Path | None = None,
+        chunk_rows: int = 2000,
+        pause_seconds: float = 0.0,
+        archive: bool = True,
+    ) -> None:
+        self.state_store = state_store
+        self.policies = policies
+        self.archive_dir = (
+            Path(archive_dir)
+            if archive_dir is not None
+            else Path(f"{Path(state_store.db_path_abs).with_suffix('')}_archive")
+        )
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.pause_seconds = max(0.0, float(pause_seconds))
+        self.archive = archive
+
+    @classmethod
+    def from_settings(
+        cls,
+        state_store: StateStore,
+        settings: Settings,
+        *,
+        archive_dir: str | None = None,
+        archive: bool = True,
+    ) -> StateRetentionService:
+        return cls(
+            state_store,
+            policies=build_retention_policies(
+                default_hot_days=settings.state_retention_default_hot_days,
+                overrides=settings.state_retention_hot_days,
+            ),
+            archive_dir=archive_dir or settings.state_retention_archive_dir,
+            chunk_rows=settings.state_retention_chunk_rows,
+            archive=archive,
+        )
+
+    def size_report(self, *, now: datetime | None = None) -> dict[str, object]:
+        now_utc = (now or datetime.now(UTC)).astimezone(UTC)
+        db_path = Path(self.state_store.db_path_abs)
+        with self.state_store._connect() as conn:
+            page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+            page_count = int(conn.execute("PRAGMA page_count").fetchone()[0])
+            freelist = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+            table_bytes = _dbstat_bytes(conn)
+            tables: list[dict[str, object]] = []
+            for policy in self.policies:
+                if not _table_exists(conn, policy.table):
+                    continue
+                cutoff = self._cutoff(policy, now_utc)
+                total = conn.execute(f"SELECT COUNT(*) FROM {policy.table}").fetchone()[0]
+                eligible = conn.execute(
+                    f"SELECT COUNT(*) FROM {policy.table} WHERE {self._predicate(policy)}",
+                    (cutoff,),
+                ).fetchone()[0]
+                tables.append(
+                    {
+                        "table": policy.table,
+                        "hot_days": policy.hot_days,
+                        "cutoff": cutoff,
+                        "rows": int(total),
+                        "rows_eligible": int(eligible),
+                        "bytes": table_bytes.get(policy.table),
+                    }
+                )
+        wal_path = Path(f"{db_path}-wal")
+        return {
+            "db_path": str(db_path),
+            "db_bytes": db_path.stat().st_size if db_path.exists() else 0,
+            "wal_bytes": wal_path.stat().st_size if wal_path.exists() else 0,
+            "page_size": page_size,
+            "page_count": page_count,
+            "freelist_pages": freelist,
+            "archive_dir": str(self.archive_dir) if self.archive else None,
+            "tables": tables,
+        }
+
+    def run(
+        self, *, now: datetime | None = None, max_chunks: int | None = None
+    ) -> list[TableRetentionResult]:
+        """Archive eligible rows table by table; ``max_chunks`` bounds one invocation."""
+        now_utc = (now or datetime.now(UTC)).astimezone(UTC)
+        budget = max_chunks
+        results: list[TableRetentionResult] = []
+        for policy in self.policies:
+            if budget is not None and budget <= 0:
+                break
+            with self.state_store._connect() as conn:
+                if not _table_exists(conn, policy.table):
+                    continue
+            rowid_ceiling = self._checkpoint_ledger() if policy.table == "ledger_events" else None
+            result = self._run_table(
+                policy,
+                cutoff=self._cutoff(policy, now_utc),
+                rowid_ceiling=rowid_ceiling,
+                max_chunks=budget,
+            )
+            if budget is not None:
+                budget -= result.chunks
+            results.append(result)
+            logger.info(
+                "state_retention_table_done",
+                extra={
+                    "extra": {
+                        "table": result.table,
+                        "cutoff": result.cutoff,
+                        "archived_rows": result.archived_rows,
+                        "chunks": result.chunks,
+                        "complete": result.complete,
+                    }
+                },
+            )
+        return results
+
+    def _checkpoint_ledger(self) -> int:
+        """Advance every reducer scope and pin a base checkpoint; return the safe rowid.
+
+        Only rows already folded into all checkpoints may be archived, and the newest
+        row is always kept so SQLite never hands out a rowid a checkpoint has passed.
+        """
+        ledger = LedgerService(self.state_store, logger)
+        with self.state_store._connect() as conn:
+            scopes = {
+                str(row["scope_id"])
+                for row in conn.execute("SELECT scope_id FROM ledger_reducer_checkpoints")
+            }
+        scopes.discard(LEDGER_RETENTION_BASE_SCOPE)
+        scopes.add("global")
+        for scope_id in sorted(scopes):
+            ledger.load_state_incremental(scope_id)
+        checkpoints = [self.state_store.get_ledger_checkpoint(scope) for scope in scopes]
+        base = min((cp for cp in checkpoints if cp is not None), key=lambda cp: cp.last_rowid)
+        self.state_store.upsert_ledger_checkpoint(
+            scope_id=LEDGER_RETENTION_BASE_SCOPE,
+            last_rowid=base.last_rowid,
+            snapshot_json=base.snapshot_json,
+            snapshot_version=base.snapshot_version,
+            updated_at=datetime.now(UTC).isoformat(),
+        )
+        return min(base.last_rowid, self.state_store.get_latest_ledger_event_rowid() - 1)
+
+    @staticmethod
+    def _cutoff(policy: RetentionPolicy, now_utc: datetime) -> str:
+        return (now_utc - timedelta(days=policy.hot_days)).isoformat()
+
+    @staticmethod
+    def _predicate(policy: RetentionPolicy) -> str:
+        predicate = f"{policy.ts_column} < ?"
+        if policy.guard_sql:
+            predicate += f" AND {policy.guard_sql}"
+        return predicate
+
+    def _run_table(
+        self,
+        policy: RetentionPolicy,
+        *,
+        cutoff: str,
+        rowid_ceiling: int | None,
+        max_chunks: int | None,
+    ) -> TableRetentionResult:
+        predicate = self._predicate(policy)
+        params: tuple[object, ...] = (cutoff,)
+        if rowid_ceiling is not None:
+            predicate += " AND rowid <= ?"
+            params = (cutoff, rowid_ceiling)
+        after_rowid = 0
+        archived = 0
+        chunks = 0
+        days: set[str] = set()
+        fingerprints_dropped = 0
+        while max_chunks is None or chunks < max_chunks:
+            with self.state_store._connect() as conn:
+                row = conn.execute(
+                    f"""
+                    SELECT MAX(rowid) FROM (
+                        SELECT rowid FROM {policy.table}
+                        WHERE rowid > ? AND {predicate}
+                        ORDER BY rowid
+                        LIMIT ?
+                    )
+                    """,
+                    (after_rowid, *params, self.chunk_rows),
+                ).fetchone()
+            upper = row[0] if row is not None else None
+            if upper is None:
+                self._rechain_fingerprints(fingerprints_dropped)
+                return TableRetentionResult(
+                    policy.table, cutoff, archived, chunks, tuple(sorted(days)), True
+                )
+            with self.state_store.transaction() as conn:
+                moved = self._move_chunk(
+                    conn,
+                    policy,
+                    predicate=predicate,
+                    params=params,
+                    lower=after_rowid,
+                    upper=int(upper),
+                )
+            archived += len(moved.rows)
+            days.update(moved.by_day)
+            fingerprints_dropped += moved.fingerprints_dropped
+            after_rowid = int(upper)
+            chunks += 1
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+        self._rechain_fingerprints(fingerprints_dropped)
+        return TableRetentionResult(
+            policy.table, cutoff, archived, chunks, tuple(sorted(days)), False
+        )
+
+    def _rechain_fingerprints(self, dropped: int) -> None:
+        """Rebuild the parity chain from genesis once archived cycles have left it.
+
+        Until then the remaining rows still fold to the raw-row fingerprint, but the
+        chain values include the archived cycles, so range lookups skip the O(1) path.
+        """
+        if not dropped:
+            return
+        with self.state_store.transaction() as conn:
+            self.state_store._rechain_stage7_fingerprints_with_conn(conn, after=None)
+
+    def _move_chunk(
+        self,
+        conn: sqlite3.Connection,
+        policy: RetentionPolicy,
+        *,
+        predicate: str,
+        params: tuple[object, ...],
+        lower: int,
+        upper: int,
+    ) -> _ChunkWork:
+        where = f"rowid > ? AND rowid <= ? AND {predicate}"
+        work = _ChunkWork()
+        work.rows = conn.execute(
+            f"SELECT rowid AS _rowid, * FROM {policy.table} WHERE {where} ORDER BY rowid",
+            (lower, upper, *params),
+        ).fetchall()
+        if not work.rows:
+            return work
+        for row in work.rows:
+            work.by_day.setdefault(str(row[policy.ts_column])[:10], []).append(row)
+
+        archive_paths: dict[str, str] = {}
+        if self.archive:
+            for day, rows in work.by_day.items():
+                archive_paths[day] = self._append_archive(policy.table, day, rows)
+        self._fold_days(conn, policy, work.by_day, archive_paths)
+        self._fold_checkpoint(conn, policy, work.rows)
+        conn.execute(f"DELETE FROM {policy.table} WHERE {where}", (lower, upper, *params))
+        if policy.table in _PARITY_SOURCE_TABLES and _table_exists(conn, FINGERPRINT_TABLE):
+            # The cycle no longer joins into a parity record; drop it from the chain in
+            # the same transaction so stored fingerprints never cover archived rows.
+            cursor = conn.executemany(
+                f"DELETE FROM {FINGERPRINT_TABLE} WHERE cycle_id = ?",
+                [(str(row["cycle_id"]),) for row in work.rows],
+            )
+            work.fingerprints_dropped = max(0, cursor.rowcount)
+        return work
+
+    def _append_archive(self, table: str, day: str, rows: list[sqlite3.Row]) -> str:
+        path = self.archive_dir / table / day[:7] / f"{table}-{day}.jsonl.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Appending writes a new gzip member; readers see one continuous stream.
+        with gzip.open(path, "at", encoding="utf-8") as handle:
+            for row in rows:
+                handle.write(json.dumps(dict(row), sort_keys=True, default=str) + "\n")
+        return str(path)
+
+    def _fold_days(
+        self,
+        conn: sqlite3.Connection,
+        policy: RetentionPolicy,
+        by_day: dict[str, list[sqlite3.Row]],
+        archive_paths: dict[str, str],
+    ) -> None:
+        now_iso = datetime.now(UTC).isoformat()
+        for day, rows in sorted(by_day.items()):
+            existing = conn.execute(
+                """
+                SELECT row_count, summary_json FROM state_retention_daily
+                WHERE table_name = ? AND day = ?
+                """,
+                (policy.table, day),
+            ).fetchone()
+            summary: Summary = json.loads(str(existing["summary_json"])) if existing else {}
+            row_count = int(existing["row_count"]) if existing else 0
+            for row in rows:
+                ts = str(row[policy.ts_column])
+                if summary.get("first_ts") is None or ts < str(summary["first_ts"]):
+                    summary["first_ts"] = ts
+                if summary.get("last_ts") is None or ts > str(summary["last_ts"]):
+                    summary["last_ts"] = ts
+                if policy.fold_day is not None:
+                    policy.fold_day(summary, row)
+            conn.execute(
+                """
+                INSERT INTO state_retention_daily(
+                    table_name, day, row_count, summary_json, archive_path, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(table_name, day) DO UPDATE SET
+                    row_count=excluded.row_count,
+                    summary_json=excluded.summary_json,
+                    archive_path=COALESCE(excluded.archive_path, archive_path),
+                    updated_at=excluded.updated_at
+                """,
+                (
+                    policy.table,
+                    day,
+                    row_count + len(rows),
+                    json.dumps(summary, sort_keys=True),
+                    archive_paths.get(day),
+                    now_iso,
+                ),
+            )
+
+    @staticmethod
+    def _fold_checkpoint(
+        conn: sqlite3.Connection, policy: RetentionPolicy, rows: list[sqlite3.Row]
+    ) -> None:
+        existing = conn.execute(
+            "SELECT archived_rows, state_json FROM state_retention_checkpoints "
+            "WHERE table_name = ?",
+            (policy.table,),
+        ).fetchone()
+        state: Summary = json.loads(str(existing["state_json"])) if existing else {}
+        if policy.fold_checkpoint is not None:
+            for row in sorted(rows, key=lambda item: str(item[policy.ts_column])):
+                policy.fold_checkpoint(state, row)
+        conn.execute(
+            """
+            INSERT INTO state_retention_checkpoints(
+                table_name, archived_rows, state_json, updated_at
+            ) VALUES (?, ?, ?, ?)
+            ON CONFLICT(table_name) DO UPDATE SET
+                archived_rows=excluded.archived_rows,
+                state_json=excluded.state_json,
+                updated_at=excluded.updated_at
+            """,
+            (
+                policy.table,
+                (int(existing["archived_rows"]) if existing else 0) + len(rows),
+                json.dumps(state, sort_keys=True),
+                datetime.now(UTC).isoformat(),
+            ),
+        )
+
+
+def read_archive(path: str | Path) -> list[dict[str, object]]:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    return row is not None
+
+
+def _dbstat_bytes(conn: sqlite3.Connection) -> dict[str, int]:
+    """Per-table bytes including indexes, when SQLite is built with dbstat."""
+    try:
+        rows = conn.execute(
+            """
+            SELECT COALESCE(m.tbl_name, s.name) AS table_name, SUM(s.pgsize) AS bytes
+            FROM dbstat AS s
+            LEFT JOIN sqlite_master AS m ON m.name = s.name
+            GROUP BY table_name
+            """
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {str(row["table_name"]): int(row["bytes"] or 0) for row in rows}
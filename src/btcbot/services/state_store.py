@@ -5,13 +5,14 @@ import json
 import logging
 import os
 import sqlite3
-from collections.abc import Iterator, Mapping
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 from uuid import uuid4
 
 from btcbot.domain.account_snapshot import AccountSnapshot, Holding
@@ -25,16 +26,58 @@ from btcbot.domain.order_state import OrderEvent, Stage7Order
 from btcbot.domain.order_state import OrderStatus as Stage7OrderStatus
 from btcbot.domain.risk_mode_codec import dump_risk_mode, parse_risk_mode
 from btcbot.domain.stage4 import Fill as Stage4Fill
+from btcbot.domain.stage4 import Order as Stage4Order
 from btcbot.domain.stage4 import PnLSnapshot
 from btcbot.domain.stage4 import Position as Stage4Position
-from btcbot.persistence.sqlite.sqlite_connection import create_sqlite_connection
-from btcbot.persistence.uow import UnitOfWorkFactory
+from btcbot.domain.stage7_rollups import (
+    ROLLUP_PERIODS,
+    RollupTotals,
+    parse_ts_utc,
+    rollup_bucket_bounds,
+)
+from btcbot.persistence.sqlite.sqlite_connection import (
+    create_readonly_sqlite_connection,
+    create_sqlite_connection,
+    readonly_sqlite_connection_context,
+)
+from btcbot.persistence.uow import UnitOfWork, UnitOfWorkFactory
+from btcbot.services.control_state import (
+    CONTROL_OP_STATE_PREFIXES,
+    ControlStateCache,
+    shared_control_state_cache,
+)
+from btcbot.services.order_index import (
+    TERMINAL_STATUSES,
+    OrderIndexDrift,
+    Stage4OrderIndex,
+    shared_order_index,
+)
+from btcbot.services.parity import (
+    CANONICAL_SOURCE_COLUMNS,
+    CHAIN_GENESIS,
+    FINGERPRINT_TABLE,
+    canonical_cycle_record,
+    chain_digest,
+    record_digest,
+)
 
 if TYPE_CHECKING:
     from btcbot.domain.anomalies import AnomalyEvent
     from btcbot.domain.risk_budget import Mode, RiskDecision
     from btcbot.domain.risk_engine import CycleRiskOutput
 
+# Bump when a schema change must be applied before read-only (monitor) access.
+STATE_SCHEMA_VERSION = 2
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER on older builds (999).
+_SQLITE_IN_CHUNK_SIZE = 500
+
+_STAGE7_ROLLUP_SOURCE_COLUMNS = (
+    "ts, gross_pnl_try, net_pnl_try, fees_try, slippage_try, turnover_try, "
+    "oms_submitted_count, oms_filled_count, oms_rejected_count, "
+    "max_drawdown_ratio, max_drawdown_pct"
+)
+
 
 def _stage7_ctx(cycle_id: str, run_id: str | None = None) -> str:
     if run_id:
@@ -99,6 +142,12 @@ class IdempotencyConflictError(ValueError):
 
 PENDING_GRACE_SECONDS = 60
 UNKNOWN_ESCALATION_ATTEMPTS = 8
+IDEMPOTENCY_PRUNE_INTERVAL_SECONDS = 300
+IDEMPOTENCY_PRUNE_BATCH_SIZE = 500
+IDEMPOTENCY_PRUNE_MAX_BATCHES = 4
+_IDEMPOTENCY_PRUNE_DUE_KEY = "idempotency_prune_due_epoch"
+
+_T = TypeVar("_T")
 
 logger = logging.getLogger(__name__)
 
@@ -172,6 +221,17 @@ class ReservationResult:
     next_recovery_at_epoch: int | None
 
 
+@dataclass(frozen=True)
+class DynamicUniverseSymbolStateUpdate:
+    symbol: str
+    updated_at: datetime
+    last_selected_ts: datetime | None = None
+    cooldown_until_ts: datetime | None = None
+    probation_until_ts: datetime | None = None
+    reject_window_start_ts: datetime | None = None
+    reject_counts: dict[str, int] | None = None
+
+
 @dataclass(frozen=True)
 class Stage4ReplaceTransaction:
     new_client_order_id: str
@@ -249,17 +309,35 @@ class StateStore:
         strict_instance_lock: bool = False,
         read_only: bool = False,
         process_instance_ttl_seconds: int = 180,
+        heartbeat_interval_seconds: float = 0.0,
     ) -> None:
         self.db_path = db_path
         self.db_path_abs = str(Path(db_path).expanduser().resolve())
         self.strict_instance_lock = strict_instance_lock
         self.read_only = read_only
         self.process_instance_ttl_seconds = max(1, int(process_instance_ttl_seconds))
+        self.heartbeat_interval_seconds = max(0.0, float(heartbeat_interval_seconds))
+        self._last_heartbeat_monotonic: float | None = None
         self._uow_factory = UnitOfWorkFactory(db_path, read_only=read_only)
         scope_digest = hashlib.sha256(self.db_path_abs.encode("utf-8")).hexdigest()[:12]
         self.instance_id = f"{os.getpid()}-{scope_digest}-{uuid4().hex[:8]}"
         self._transaction_conn: sqlite3.Connection | None = None
         self._shared_conn: sqlite3.Connection | None = None
+        self._idempotency_prune_due_epoch = 0
+        if read_only:
+            # Monitor/report access: no DDL, no process_instances row, never a writer.
+            logger.info(
+                "state_store_startup",
+                extra={
+                    "extra": {
+                        "db_path": self.db_path_abs,
+                        "instance_id": self.instance_id,
+                        "pid": os.getpid(),
+                        "read_only": True,
+                    }
+                },
+            )
+            return
         self._init_db()
         with self._connect() as conn:
             self._ensure_risk_budget_schema(conn)
@@ -268,8 +346,17 @@ class StateStore:
             self._ensure_agent_audit_schema(conn)
             self._ensure_idempotency_schema(conn)
             self._ensure_op_state_schema(conn)
+            self._ensure_control_state_schema(conn)
+            self._ensure_retention_schema(conn)
+            self._ensure_metrics_snapshot_schema(conn)
+            self._ensure_alert_window_schema(conn)
             self._ensure_instance_lock_schema(conn)
             self._register_instance_lock(conn)
+            # Stamped last so read-only openers only trust a fully migrated schema.
+            conn.execute(
+                "INSERT OR IGNORE INTO schema_version(version) VALUES (?)",
+                (STATE_SCHEMA_VERSION,),
+            )
         logger.info(
             "state_store_startup",
             extra={
@@ -281,12 +368,44 @@ class StateStore:
             },
         )
 
+    @classmethod
+    def open_read_only(cls, db_path: str, **kwargs: object) -> StateStore:
+        """Return a read-only store, migrating the schema first only if it is behind.
+
+        A database the current code has already initialized is opened with ``mode=ro``
+        and nothing is written to it. A missing or older database goes through the
+        normal read-write initialization once (whose instance row is released at once).
+        """
+        if cls.schema_version(db_path) < STATE_SCHEMA_VERSION:
+            bootstrap = cls(db_path, **kwargs)
+            bootstrap.release_instance_lock()
+        return cls(db_path, read_only=True, **kwargs)
+
+    @staticmethod
+    def schema_version(db_path: str) -> int:
+        """Highest schema version stamped in ``db_path``; 0 if missing or unstamped."""
+        if db_path == ":memory:" or not Path(db_path).expanduser().is_file():
+            return 0
+        try:
+            with readonly_sqlite_connection_context(db_path) as conn:
+                row = conn.execute("SELECT MAX(version) AS version FROM schema_version").fetchone()
+        except sqlite3.Error:
+            return 0
+        return 0 if row is None or row["version"] is None else int(row["version"])
+
     @contextmanager
     def _connect(self) -> Iterator[sqlite3.Connection]:
         tx_conn = getattr(self, "_transaction_conn", None)
         if tx_conn is not None:
             yield tx_conn
             return
+        if getattr(self, "read_only", False):
+            conn = create_readonly_sqlite_connection(self.db_path)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
         if self.db_path == ":memory:":
             if self._shared_conn is None:
                 self._shared_conn = create_sqlite_connection(self.db_path)
@@ -312,6 +431,8 @@ class StateStore:
         if tx_conn is not None:
             yield tx_conn
             return
+        if self.read_only:
+            raise RuntimeError(f"state store is read-only db_path={self.db_path_abs}")
         conn = create_sqlite_connection(self.db_path)
         conn.execute("BEGIN IMMEDIATE")
         self._transaction_conn = conn
@@ -325,6 +446,31 @@ class StateStore:
             self._transaction_conn = None
             conn.close()
 
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Serve every read inside the block from one consistent point-in-time view.
+
+        Opens a single deferred read transaction; under WAL it pins the snapshot taken at
+        the first read without blocking writers. Nested calls reuse the outer view.
+        """
+        tx_conn = getattr(self, "_transaction_conn", None)
+        if tx_conn is not None:
+            yield tx_conn
+            return
+        conn = (
+            create_readonly_sqlite_connection(self.db_path)
+            if self.read_only
+            else create_sqlite_connection(self.db_path)
+        )
+        conn.execute("BEGIN")
+        self._transaction_conn = conn
+        try:
+            yield conn
+        finally:
+            self._transaction_conn = None
+            conn.rollback()
+            conn.close()
+
     def _init_db(self) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -723,7 +869,10 @@ class StateStore:
                 alert_flags_json TEXT NOT NULL,
                 no_trades_reason TEXT,
                 no_metrics_reason TEXT,
-                run_id TEXT
+                run_id TEXT,
+                db_stats_json TEXT,
+                resource_stats_json TEXT,
+                http_stats_json TEXT
             )
             """
         )
@@ -765,9 +914,19 @@ class StateStore:
             conn.execute("ALTER TABLE stage7_run_metrics ADD COLUMN no_trades_reason TEXT")
         if "no_metrics_reason" not in run_metric_columns:
             conn.execute("ALTER TABLE stage7_run_metrics ADD COLUMN no_metrics_reason TEXT")
+        if "db_stats_json" not in run_metric_columns:
+            conn.execute("ALTER TABLE stage7_run_metrics ADD COLUMN db_stats_json TEXT")
+        if "resource_stats_json" not in run_metric_columns:
+            conn.execute("ALTER TABLE stage7_run_metrics ADD COLUMN resource_stats_json TEXT")
+        if "http_stats_json" not in run_metric_columns:
+            conn.execute("ALTER TABLE stage7_run_metrics ADD COLUMN http_stats_json TEXT")
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_stage7_run_metrics_ts ON stage7_run_metrics(ts)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_stage7_run_metrics_ts_cycle_id "
+            "ON stage7_run_metrics(ts, cycle_id)"
+        )
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_stage7_run_metrics_run_id ON stage7_run_metrics(run_id)"
         )
@@ -923,6 +1082,171 @@ class StateStore:
                 "ALTER TABLE stage7_cycle_trace "
                 "ADD COLUMN param_change_json TEXT NOT NULL DEFAULT '{}'"
             )
+        self._ensure_stage7_rollup_schema(conn)
+        self._ensure_stage7_fingerprint_schema(conn)
+
+    def _ensure_stage7_fingerprint_schema(self, conn: sqlite3.Connection) -> None:
+        created = not self._table_exists(conn, FINGERPRINT_TABLE)
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {FINGERPRINT_TABLE} (
+                cycle_id TEXT PRIMARY KEY,
+                ts TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                record_hash TEXT NOT NULL,
+                chain_hash TEXT NOT NULL,
+                record_hash_adapt TEXT NOT NULL,
+                chain_hash_adapt TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{FINGERPRINT_TABLE}_seq ON {FINGERPRINT_TABLE}(seq)"
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{FINGERPRINT_TABLE}_ts_cycle_id "
+            f"ON {FINGERPRINT_TABLE}(ts, cycle_id)"
+        )
+        if created:
+            # One-time backfill for databases that predate the stored chain.
+            self._rechain_stage7_fingerprints_with_conn(conn, after=None)
+
+    def _refresh_stage7_fingerprint_with_conn(
+        self, conn: sqlite3.Connection, cycle_id: str
+    ) -> None:
+        """Re-hash one cycle's parity record and keep the chain in ``(ts, cycle_id)`` order.
+
+        Appending the newest cycle (the normal case) touches one row. A rewritten or
+        out-of-order cycle re-chains everything after its position.
+        """
+        source = conn.execute(
+            f"""
+            SELECT {CANONICAL_SOURCE_COLUMNS}
+            FROM stage7_cycle_trace c
+            JOIN stage7_ledger_metrics l ON l.cycle_id = c.cycle_id
+            WHERE c.cycle_id = ?
+            """,
+            (cycle_id,),
+        ).fetchone()
+        existing = conn.execute(
+            f"SELECT ts FROM {FINGERPRINT_TABLE} WHERE cycle_id = ?", (cycle_id,)
+        ).fetchone()
+        newest = conn.execute(
+            f"SELECT ts, cycle_id, seq, chain_hash, chain_hash_adapt FROM {FINGERPRINT_TABLE} "
+            "ORDER BY ts DESC, cycle_id DESC LIMIT 1"
+        ).fetchone()
+        if (
+            source is not None
+            and existing is None
+            and (
+                newest is None or (str(source["ts"]), cycle_id) > (newest["ts"], newest["cycle_id"])
+            )
+        ):
+            self._insert_stage7_fingerprint_with_conn(
+                conn,
+                source,
+                seq=1 if newest is None else int(newest["seq"]) + 1,
+                chain=CHAIN_GENESIS if newest is None else str(newest["chain_hash"]),
+                chain_adapt=(CHAIN_GENESIS if newest is None else str(newest["chain_hash_adapt"])),
+            )
+            return
+        keys = [str(source["ts"])] if source is not None else []
+        if existing is not None:
+            keys.append(str(existing["ts"]))
+        if not keys:
+            return
+        conn.execute(f"DELETE FROM {FINGERPRINT_TABLE} WHERE cycle_id = ?", (cycle_id,))
+        self._rechain_stage7_fingerprints_with_conn(conn, after=(min(keys), ""))
+
+    def _rechain_stage7_fingerprints_with_conn(
+        self, conn: sqlite3.Connection, *, after: tuple[str, str] | None
+    ) -> None:
+        predecessor = None
+        if after is not None:
+            predecessor = conn.execute(
+                f"SELECT seq, chain_hash, chain_hash_adapt FROM {FINGERPRINT_TABLE} "
+                "WHERE (ts, cycle_id) < (?, ?) ORDER BY ts DESC, cycle_id DESC LIMIT 1",
+                after,
+            ).fetchone()
+            conn.execute(f"DELETE FROM {FINGERPRINT_TABLE} WHERE (ts, cycle_id) >= (?, ?)", after)
+        else:
+            conn.execute(f"DELETE FROM {FINGERPRINT_TABLE}")
+        seq = 0 if predecessor is None else int(predecessor["seq"])
+        chain = CHAIN_GENESIS if predecessor is None else str(predecessor["chain_hash"])
+        chain_adapt = CHAIN_GENESIS if predecessor is None else str(predecessor["chain_hash_adapt"])
+        where, params = ("", ()) if after is None else ("WHERE (c.ts, c.cycle_id) >= (?, ?)", after)
+        rows = conn.execute(
+            f"""
+            SELECT {CANONICAL_SOURCE_COLUMNS}
+            FROM stage7_cycle_trace c
+            JOIN stage7_ledger_metrics l ON l.cycle_id = c.cycle_id
+            {where}
+            ORDER BY c.ts ASC, c.cycle_id ASC
+            """,
+            params,
+        ).fetchall()
+        for row in rows:
+            seq += 1
+            chain, chain_adapt = self._insert_stage7_fingerprint_with_conn(
+                conn, row, seq=seq, chain=chain, chain_adapt=chain_adapt
+            )
+
+    def _insert_stage7_fingerprint_with_conn(
+        self,
+        conn: sqlite3.Connection,
+        source: Mapping[str, object],
+        *,
+        seq: int,
+        chain: str,
+        chain_adapt: str,
+    ) -> tuple[str, str]:
+        digest = record_digest(canonical_cycle_record(source))
+        digest_adapt = record_digest(canonical_cycle_record(source, include_adaptation=True))
+        chain = chain_digest(chain, digest)
+        chain_adapt = chain_digest(chain_adapt, digest_adapt)
+        conn.execute(
+            f"""
+            INSERT INTO {FINGERPRINT_TABLE}(
+                cycle_id, ts, seq, record_hash, chain_hash, record_hash_adapt, chain_hash_adapt
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                str(source["cycle_id"]),
+                str(source["ts"]),
+                seq,
+                digest,
+                chain,
+                digest_adapt,
+                chain_adapt,
+            ),
+        )
+        return chain, chain_adapt
+
+    def _ensure_stage7_rollup_schema(self, conn: sqlite3.Connection) -> None:
+        created = not self._table_exists(conn, "stage7_rollups")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stage7_rollups (
+                period TEXT NOT NULL,
+                period_start TEXT NOT NULL,
+                period_end TEXT NOT NULL,
+                cycles_count INTEGER NOT NULL,
+                gross_pnl_try TEXT NOT NULL,
+                net_pnl_try TEXT NOT NULL,
+                fees_try TEXT NOT NULL,
+                slippage_try TEXT NOT NULL,
+                turnover_try TEXT NOT NULL,
+                rejects INTEGER NOT NULL,
+                fill_rate_total TEXT NOT NULL,
+                max_drawdown_ratio TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY(period, period_start)
+            )
+            """
+        )
+        if created:
+            # One-time backfill for databases that predate the materialized rollups.
+            self._write_stage7_rollups_with_conn(conn, self._compute_stage7_rollups_with_conn(conn))
 
     def save_stage7_run_metrics(self, cycle_id: str, metrics_dict: dict[str, object]) -> None:
         with self._connect() as conn:
@@ -937,6 +1261,9 @@ class StateStore:
         cycle_id: str,
         metrics_dict: dict[str, object],
     ) -> None:
+        previous = conn.execute(
+            "SELECT ts FROM stage7_run_metrics WHERE cycle_id = ?", (cycle_id,)
+        ).fetchone()
         conn.execute(
             """
             INSERT INTO stage7_run_metrics(
@@ -950,12 +1277,13 @@ class StateStore:
                 max_drawdown_pct, max_drawdown_ratio, turnover_try,
                 latency_ms_total, selection_ms, planning_ms, intents_ms,
                 oms_ms, ledger_ms, persist_ms,
-                quality_flags_json, alert_flags_json, no_trades_reason, no_metrics_reason, run_id
+                quality_flags_json, alert_flags_json, no_trades_reason, no_metrics_reason, run_id,
+                db_stats_json, resource_stats_json, http_stats_json
             ) VALUES (
                 ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
                 ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
                 ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                ?, ?, ?, ?, ?, ?, ?
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
             )
             ON CONFLICT(cycle_id) DO UPDATE SET
                 ts=excluded.ts,
@@ -993,7 +1321,10 @@ class StateStore:
                 alert_flags_json=excluded.alert_flags_json,
                 no_trades_reason=excluded.no_trades_reason,
                 no_metrics_reason=excluded.no_metrics_reason,
-                run_id=excluded.run_id
+                run_id=excluded.run_id,
+                db_stats_json=excluded.db_stats_json,
+                resource_stats_json=excluded.resource_stats_json,
+                http_stats_json=excluded.http_stats_json
             """,
             (
                 cycle_id,
@@ -1045,54 +1376,351 @@ class StateStore:
                     if metrics_dict.get("run_id") not in (None, "")
                     else None
                 ),
+                (
+                    json.dumps(metrics_dict["db_stats"], sort_keys=True)
+                    if metrics_dict.get("db_stats") is not None
+                    else None
+                ),
+                (
+                    json.dumps(metrics_dict["resource_stats"], sort_keys=True)
+                    if metrics_dict.get("resource_stats") is not None
+                    else None
+                ),
+                (
+                    json.dumps(metrics_dict["http_stats"], sort_keys=True)
+                    if metrics_dict.get("http_stats") is not None
+                    else None
+                ),
+            ),
+        )
+        self._apply_stage7_rollups_with_conn(
+            conn,
+            cycle_id=cycle_id,
+            previous_ts=None if previous is None else str(previous["ts"]),
+        )
+
+    def _apply_stage7_rollups_with_conn(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        cycle_id: str,
+        previous_ts: str | None,
+    ) -> None:
+        """Fold one freshly written run-metrics row into its daily and weekly buckets.
+
+        Runs on the caller's connection, so the buckets commit (or roll back) together
+        with the row. A rewritten cycle recomputes the buckets it leaves and enters
+        from raw rows, since a bucket's max drawdown cannot be un-applied.
+        """
+        row = conn.execute(
+            f"SELECT {_STAGE7_ROLLUP_SOURCE_COLUMNS} FROM stage7_run_metrics WHERE cycle_id = ?",
+            (cycle_id,),
+        ).fetchone()
+        ts = parse_ts_utc(str(row["ts"]))
+        for period in ROLLUP_PERIODS:
+            start, end = rollup_bucket_bounds(ts, period)
+            if previous_ts is not None:
+                starts = {start, rollup_bucket_bounds(parse_ts_utc(previous_ts), period)[0]}
+                for bucket_start in sorted(starts):
+                    self._recompute_stage7_rollup_with_conn(conn, period, bucket_start)
+                continue
+            existing = conn.execute(
+                "SELECT * FROM stage7_rollups WHERE period = ? AND period_start = ?",
+                (period, start.isoformat()),
+            ).fetchone()
+            totals = (
+                RollupTotals()
+                if existing is None
+                else RollupTotals.from_record(dict(zip(existing.keys(), existing, strict=True)))
+            )
+            totals.add(RollupTotals.from_metrics_row(dict(zip(row.keys(), row, strict=True))))
+            self._upsert_stage7_rollup_with_conn(conn, period, start, end, totals)
+
+    def _upsert_stage7_rollup_with_conn(
+        self,
+        conn: sqlite3.Connection,
+        period: str,
+        start: datetime,
+        end: datetime,
+        totals: RollupTotals,
+    ) -> None:
+        record = totals.to_record()
+        conn.execute(
+            """
+            INSERT INTO stage7_rollups(
+                period, period_start, period_end, cycles_count, gross_pnl_try, net_pnl_try,
+                fees_try, slippage_try, turnover_try, rejects, fill_rate_total,
+                max_drawdown_ratio, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(period, period_start) DO UPDATE SET
+                period_end=excluded.period_end,
+                cycles_count=excluded.cycles_count,
+                gross_pnl_try=excluded.gross_pnl_try,
+                net_pnl_try=excluded.net_pnl_try,
+                fees_try=excluded.fees_try,
+                slippage_try=excluded.slippage_try,
+                turnover_try=excluded.turnover_try,
+                rejects=excluded.rejects,
+                fill_rate_total=excluded.fill_rate_total,
+                max_drawdown_ratio=excluded.max_drawdown_ratio,
+                updated_at=excluded.updated_at
+            """,
+            (
+                period,
+                start.isoformat(),
+                end.isoformat(),
+                record["cycles_count"],
+                record["gross_pnl_try"],
+                record["net_pnl_try"],
+                record["fees_try"],
+                record["slippage_try"],
+                record["turnover_try"],
+                record["rejects"],
+                record["fill_rate_total"],
+                record["max_drawdown_ratio"],
+                datetime.now(UTC).isoformat(),
             ),
         )
 
+    def _stage7_bucket_rows_with_conn(
+        self, conn: sqlite3.Connection, period: str, start: datetime
+    ) -> list[dict[str, object]]:
+        _, end = rollup_bucket_bounds(start, period)
+        # Range on the raw column (index-backed) with a day of slack either side so any
+        # ISO offset spelling is caught, then keep only rows that really fall in the bucket.
+        rows = conn.execute(
+            f"""
+            SELECT {_STAGE7_ROLLUP_SOURCE_COLUMNS}, cycle_id FROM stage7_run_metrics
+            WHERE ts >= ? AND ts < ?
+            ORDER BY ts, cycle_id
+            """,
+            (
+                (start - timedelta(days=1)).date().isoformat(),
+                (end + timedelta(days=2)).date().isoformat(),
+            ),
+        ).fetchall()
+        return [
+            {key: row[key] for key in row.keys()}
+            for row in rows
+            if rollup_bucket_bounds(parse_ts_utc(str(row["ts"])), period)[0] == start
+        ]
+
+    def _recompute_stage7_rollup_with_conn(
+        self, conn: sqlite3.Connection, period: str, start: datetime
+    ) -> None:
+        totals = RollupTotals()
+        for row in self._stage7_bucket_rows_with_conn(conn, period, start):
+            totals.add(RollupTotals.from_metrics_row(row))
+        if totals.cycles_count == 0:
+            conn.execute(
+                "DELETE FROM stage7_rollups WHERE period = ? AND period_start = ?",
+                (period, start.isoformat()),
+            )
+            return
+        _, end = rollup_bucket_bounds(start, period)
+        self._upsert_stage7_rollup_with_conn(conn, period, start, end, totals)
+
+    def _compute_stage7_rollups_with_conn(
+        self, conn: sqlite3.Connection
+    ) -> dict[tuple[str, datetime], RollupTotals]:
+        buckets: dict[tuple[str, datetime], RollupTotals] = {}
+        cursor = conn.execute(f"SELECT {_STAGE7_ROLLUP_SOURCE_COLUMNS} FROM stage7_run_metrics")
+        for row in cursor:
+            contribution = RollupTotals.from_metrics_row(dict(zip(row.keys(), row, strict=True)))
+            ts = parse_ts_utc(str(row["ts"]))
+            for period in ROLLUP_PERIODS:
+                key = (period, rollup_bucket_bounds(ts, period)[0])
+                buckets.setdefault(key, RollupTotals()).add(contribution)
+        return buckets
+
+    def _write_stage7_rollups_with_conn(
+        self,
+        conn: sqlite3.Connection,
+        buckets: Mapping[tuple[str, datetime], RollupTotals],
+    ) -> None:
+        for (period, start), totals in sorted(buckets.items()):
+            _, end = rollup_bucket_bounds(start, period)
+            self._upsert_stage7_rollup_with_conn(conn, period, start, end, totals)
+
+    def load_stage7_rollups(
+        self,
+        period: str,
+        *,
+        start_after: datetime | None = None,
+        start_before: datetime | None = None,
+    ) -> list[dict[str, object]]:
+        """Materialized buckets newest first, optionally bounded (exclusive) by start."""
+        query = "SELECT * FROM stage7_rollups WHERE period = ?"
+        params: list[object] = [period]
+        if start_after is not None:
+            query += " AND period_start > ?"
+            params.append(start_after.isoformat())
+        if start_before is not None:
+            query += " AND period_start < ?"
+            params.append(start_before.isoformat())
+        query += " ORDER BY period_start DESC"
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [{key: row[key] for key in row.keys()} for row in rows]
+
+    def load_stage7_bucket_rows(self, period: str, start: datetime) -> list[dict[str, object]]:
+        """Raw run-metrics rows of one bucket (oldest first), for windows that cut a bucket."""
+        with self._connect() as conn:
+            return self._stage7_bucket_rows_with_conn(conn, period, start)
+
+    def rebuild_stage7_rollups(self, *, apply: bool = True) -> list[dict[str, object]]:
+        """Recompute rollups from raw run metrics and report buckets that disagree.
+
+        Buckets that retention has partially or fully archived can no longer be rebuilt
+        from raw rows; they are left untouched and skipped by the comparison.
+        With ``apply`` the differing buckets are rewritten in one transaction.
+        """
+        with self.transaction() as conn:
+            expected = self._compute_stage7_rollups_with_conn(conn)
+            floor = self._stage7_rollup_rebuild_floor(conn)
+            stored: dict[tuple[str, datetime], RollupTotals] = {
+                (str(row["period"]), parse_ts_utc(str(row["period_start"]))): (
+                    RollupTotals.from_record(dict(zip(row.keys(), row, strict=True)))
+                )
+                for row in conn.execute("SELECT * FROM stage7_rollups")
+            }
+            mismatches: list[dict[str, object]] = []
+            for key in sorted(set(expected) | set(stored)):
+                period, start = key
+                if floor is not None and start <= rollup_bucket_bounds(floor, period)[0]:
+                    continue
+                want = expected.get(key)
+                have = stored.get(key)
+                if want == have:
+                    continue
+                mismatches.append(
+                    {
+                        "period": period,
+                        "period_start": start.isoformat(),
+                        "expected": None if want is None else want.to_record(),
+                        "stored": None if have is None else have.to_record(),
+                    }
+                )
+                if not apply:
+                    continue
+                if want is None:
+                    conn.execute(
+                        "DELETE FROM stage7_rollups WHERE period = ? AND period_start = ?",
+                        (period, start.isoformat()),
+                    )
+                else:
+                    _, end = rollup_bucket_bounds(start, period)
+                    self._upsert_stage7_rollup_with_conn(conn, period, start, end, want)
+        return mismatches
+
+    def _stage7_rollup_rebuild_floor(self, conn: sqlite3.Connection) -> datetime | None:
+        if not self._table_exists(conn, "state_retention_checkpoints"):
+            return None
+        row = conn.execute(
+            "SELECT archived_rows FROM state_retention_checkpoints WHERE table_name = ?",
+            ("stage7_run_metrics",),
+        ).fetchone()
+        if row is None or int(row["archived_rows"] or 0) <= 0:
+            return None
+        oldest = conn.execute("SELECT MIN(ts) AS ts FROM stage7_run_metrics").fetchone()
+        if oldest is None or oldest["ts"] is None:
+            return datetime.max.replace(tzinfo=UTC)
+        return parse_ts_utc(str(oldest["ts"]))
+
     def fetch_stage7_run_metrics(
-        self, limit: int, order_desc: bool = True
+        self,
+        limit: int,
+        order_desc: bool = True,
+        *,
+        upper_key: tuple[str, str] | None = None,
     ) -> list[dict[str, object]]:
         order_sql = "DESC" if order_desc else "ASC"
+        where = "WHERE (ts, cycle_id) <= (?, ?)" if upper_key is not None else ""
         with self._connect() as conn:
             rows = conn.execute(
                 f"""
                 SELECT * FROM stage7_run_metrics
+                {where}
                 ORDER BY ts {order_sql}
                 LIMIT ?
                 """,
-                (max(0, int(limit)),),
+                (*(upper_key or ()), max(0, int(limit))),
             ).fetchall()
         payload: list[dict[str, object]] = []
         for row in rows:
             item = {key: row[key] for key in row.keys()}
             item["quality_flags"] = json.loads(str(item.pop("quality_flags_json")))
             item["alert_flags"] = json.loads(str(item.pop("alert_flags_json")))
+            db_stats_json = item.pop("db_stats_json", None)
+            item["db_stats"] = json.loads(str(db_stats_json)) if db_stats_json else None
+            resource_stats_json = item.pop("resource_stats_json", None)
+            item["resource_stats"] = (
+                json.loads(str(resource_stats_json)) if resource_stats_json else None
+            )
+            http_stats_json = item.pop("http_stats_json", None)
+            item["http_stats"] = json.loads(str(http_stats_json)) if http_stats_json else None
             payload.append(item)
         return payload
 
     def fetch_stage7_cycles_for_export(self, limit: int) -> list[dict[str, object]]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT m.*, c.intents_summary_json, c.mode_json,
-                       l.realized_pnl_try AS ledger_realized_pnl_try,
-                       l.unrealized_pnl_try AS ledger_unrealized_pnl_try
-                FROM stage7_run_metrics m
-                LEFT JOIN stage7_cycle_trace c ON c.cycle_id = m.cycle_id
-                LEFT JOIN stage7_ledger_metrics l ON l.cycle_id = m.cycle_id
-                ORDER BY m.ts DESC
-                LIMIT ?
-                """,
-                (max(0, int(limit)),),
-            ).fetchall()
-        exports: list[dict[str, object]] = []
-        for row in rows:
-            record = {key: row[key] for key in row.keys()}
-            record["quality_flags"] = json.loads(str(record.pop("quality_flags_json")))
-            record["alert_flags"] = json.loads(str(record.pop("alert_flags_json")))
-            record["intents_summary"] = json.loads(str(record.get("intents_summary_json") or "{}"))
-            record["mode_payload"] = json.loads(str(record.get("mode_json") or "{}"))
-            exports.append(record)
-        return exports
+        return list(self.iter_stage7_cycles_for_export(limit=limit))
+
+    def iter_stage7_cycles_for_export(
+        self,
+        *,
+        limit: int,
+        page_size: int = 500,
+        upper_key: tuple[str, str] | None = None,
+    ) -> Iterator[dict[str, object]]:
+        """Yield export rows newest first, one keyset page per short-lived connection.
+
+        Pages are ordered by ``(ts, cycle_id)`` descending and each page resumes strictly
+        after the previous page's last key, so no read transaction (and no WAL snapshot)
+        spans more than one page. ``upper_key`` pins the newest row (inclusive) so that
+        repeated passes over the same window see the same rows.
+        """
+        remaining = max(0, int(limit))
+        page_size = max(1, int(page_size))
+        after_key: tuple[str, str] | None = None
+        while remaining > 0:
+            clauses: list[str] = []
+            params: list[object] = []
+            if after_key is not None:
+                clauses.append("(m.ts, m.cycle_id) < (?, ?)")
+                params.extend(after_key)
+            elif upper_key is not None:
+                clauses.append("(m.ts, m.cycle_id) <= (?, ?)")
+                params.extend(upper_key)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            batch = min(page_size, remaining)
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT m.*, c.intents_summary_json, c.mode_json,
+                           l.realized_pnl_try AS ledger_realized_pnl_try,
+                           l.unrealized_pnl_try AS ledger_unrealized_pnl_try
+                    FROM stage7_run_metrics m
+                    LEFT JOIN stage7_cycle_trace c ON c.cycle_id = m.cycle_id
+                    LEFT JOIN stage7_ledger_metrics l ON l.cycle_id = m.cycle_id
+                    {where}
+                    ORDER BY m.ts DESC, m.cycle_id DESC
+                    LIMIT ?
+                    """,
+                    (*params, batch),
+                ).fetchall()
+            for row in rows:
+                record = {key: row[key] for key in row.keys()}
+                record["quality_flags"] = json.loads(str(record.pop("quality_flags_json")))
+                record["alert_flags"] = json.loads(str(record.pop("alert_flags_json")))
+                record["intents_summary"] = json.loads(
+                    str(record.get("intents_summary_json") or "{}")
+                )
+                record["mode_payload"] = json.loads(str(record.get("mode_json") or "{}"))
+                yield record
+            if len(rows) < batch:
+                return
+            remaining -= len(rows)
+            after_key = (str(rows[-1]["ts"]), str(rows[-1]["cycle_id"]))
 
     def get_stage7_cycle_trace(self, cycle_id: str) -> dict[str, object] | None:
         with self._connect() as conn:
@@ -1300,6 +1928,14 @@ class StateStore:
                         f"save_stage7_cycle failed at ledger_metrics_upsert "
                         f"{_stage7_ctx(cycle_id, run_id)}"
                     ) from exc
+
+                try:
+                    self._refresh_stage7_fingerprint_with_conn(conn, cycle_id)
+                except Exception as exc:  # noqa: BLE001
+                    raise RuntimeError(
+                        f"save_stage7_cycle failed at fingerprint_upsert "
+                        f"{_stage7_ctx(cycle_id, run_id)}"
+                    ) from exc
         except RuntimeError:
             raise
         except Exception as exc:  # noqa: BLE001
@@ -2024,10 +2660,21 @@ class StateStore:
                 pair_symbol TEXT NOT NULL,
                 ts_bucket TEXT NOT NULL,
                 mid_price TEXT NOT NULL,
+                ts_epoch INTEGER,
                 PRIMARY KEY(pair_symbol, ts_bucket)
             )
             """
         )
+        price_cache_cols = {
+            str(row["name"]) for row in conn.execute("PRAGMA table_info(universe_price_cache)")
+        }
+        if "ts_epoch" not in price_cache_cols:
+            conn.execute("ALTER TABLE universe_price_cache ADD COLUMN ts_epoch INTEGER")
+            conn.execute(
+                "UPDATE universe_price_cache "
+                "SET ts_epoch = CAST(strftime('%s', ts_bucket) AS INTEGER) "
+                "WHERE ts_epoch IS NULL"
+            )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS dynamic_universe_cycles (
@@ -2074,6 +2721,15 @@ class StateStore:
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS indicator_states (
+                series_key TEXT PRIMARY KEY,
+                payload_json TEXT NOT NULL,
+                updated_at_ts TEXT NOT NULL
+            )
+            """
+        )
         conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_dynamic_universe_cycles_ts "
             "ON dynamic_universe_cycles(ts)"
@@ -2082,6 +2738,10 @@ class StateStore:
             "CREATE INDEX IF NOT EXISTS idx_universe_price_cache_pair_ts "
             "ON universe_price_cache(pair_symbol, ts_bucket)"
         )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_universe_price_cache_pair_epoch "
+            "ON universe_price_cache(pair_symbol, ts_epoch)"
+        )
 
     def _ensure_cycle_metrics_schema(self, conn: sqlite3.Connection) -> None:
         conn.execute(
@@ -2109,6 +2769,29 @@ class StateStore:
         )
         conn.execute("CREATE INDEX IF NOT EXISTS idx_cycle_metrics_mode ON cycle_metrics(mode)")
 
+    def _ensure_metrics_snapshot_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metrics_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts TEXT NOT NULL,
+                payload_json TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_snapshots_ts ON metrics_snapshots(ts)")
+
+    def _ensure_alert_window_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS alert_metric_windows (
+                metric_name TEXT PRIMARY KEY,
+                samples_json TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+
     def _ensure_stage4_run_metrics_schema(self, conn: sqlite3.Connection) -> None:
         conn.execute(
             """
@@ -2130,6 +2813,15 @@ class StateStore:
             "CREATE INDEX IF NOT EXISTS idx_stage4_run_metrics_ts ON stage4_run_metrics(ts)"
         )
         self._migrate_stage4_run_metrics_schema(conn)
+        columns = {
+            str(row["name"]) for row in conn.execute("PRAGMA table_info(stage4_run_metrics)")
+        }
+        if "db_stats_json" not in columns:
+            conn.execute("ALTER TABLE stage4_run_metrics ADD COLUMN db_stats_json TEXT")
+        if "resource_stats_json" not in columns:
+            conn.execute("ALTER TABLE stage4_run_metrics ADD COLUMN resource_stats_json TEXT")
+        if "http_stats_json" not in columns:
+            conn.execute("ALTER TABLE stage4_run_metrics ADD COLUMN http_stats_json TEXT")
 
     def _migrate_stage4_run_metrics_schema(self, conn: sqlite3.Connection) -> None:
         fks = conn.execute("PRAGMA foreign_key_list(stage4_run_metrics)").fetchall()
@@ -2382,17 +3074,26 @@ class StateStore:
             except Exception:  # pragma: no cover
                 pass
 
-    def heartbeat_instance_lock(self) -> None:
+    def heartbeat_instance_lock(self) -> bool:
+        """Refresh this instance's heartbeat; calls within ``heartbeat_interval_seconds`` of
+        the last write are coalesced. Returns whether a write happened."""
+        now_monotonic = time.monotonic()
+        last = getattr(self, "_last_heartbeat_monotonic", None)
+        interval = getattr(self, "heartbeat_interval_seconds", 0.0)
+        if last is not None and now_monotonic - last < interval:
+            return False
         now_epoch = int(datetime.now(UTC).timestamp())
         with self._connect() as conn:
             conn.execute(
                 "UPDATE process_instances SET heartbeat_at_epoch = ? WHERE instance_id = ?",
                 (now_epoch, self.instance_id),
             )
+        self._last_heartbeat_monotonic = now_monotonic
         logger.info(
             "instance_heartbeat_update",
             extra={"extra": {"instance_id": self.instance_id, "heartbeat_at_epoch": now_epoch}},
         )
+        return True
 
     def release_instance_lock(self, *, status: str = "ended") -> None:
         now_epoch = int(datetime.now(UTC).timestamp())
@@ -2406,6 +3107,59 @@ class StateStore:
                 (status, now_epoch, now_epoch, self.instance_id),
             )
 
+    def _ensure_control_state_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS control_state_version (
+                id INTEGER PRIMARY KEY CHECK(id = 1),
+                version INTEGER NOT NULL
+            )
+            """
+        )
+        # Self-seeding upsert, so no row has to be written at startup. (A trigger's OR
+        # REPLACE would be overridden by the outer statement's conflict policy.)
+        bump = """
+            INSERT INTO control_state_version(id, version) VALUES (1, 1)
+            ON CONFLICT(id) DO UPDATE SET version = version + 1;
+        """
+        new_key = " OR ".join(f"NEW.key LIKE '{prefix}%'" for prefix in CONTROL_OP_STATE_PREFIXES)
+        old_key = new_key.replace("NEW.", "OLD.")
+        triggers = {
+            "trg_op_state_control_insert": f"AFTER INSERT ON op_state WHEN {new_key}",
+            "trg_op_state_control_update": (
+                f"AFTER UPDATE ON op_state WHEN {new_key} OR {old_key}"
+            ),
+            "trg_op_state_control_delete": f"AFTER DELETE ON op_state WHEN {old_key}",
+            "trg_degrade_state_control_insert": "AFTER INSERT ON degrade_state_current",
+            "trg_degrade_state_control_update": "AFTER UPDATE ON degrade_state_current",
+            "trg_degrade_state_control_delete": "AFTER DELETE ON degrade_state_current",
+        }
+        for name, event in triggers.items():
+            conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {bump} END")
+
+    def _control_state_cache(self) -> ControlStateCache | None:
+        if getattr(self, "db_path", ":memory:") == ":memory:":
+            return None
+        return shared_control_state_cache(self.db_path_abs)
+
+    def _control_state_version(self) -> int | None:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT version FROM control_state_version WHERE id = 1"
+                ).fetchone()
+        except sqlite3.OperationalError:
+            # Database predating the version triggers: nothing can be cached safely.
+            return None
+        return int(row["version"]) if row is not None else 0
+
+    def _cached_control_state(self, key: str, load: Callable[[], _T]) -> _T:
+        cache = self._control_state_cache()
+        version = self._control_state_version() if cache is not None else None
+        if cache is None or version is None:
+            return load()
+        return cache.get(version, key, load)
+
     def _ensure_op_state_schema(self, conn: sqlite3.Connection) -> None:
         conn.execute(
             """
@@ -2430,6 +3184,31 @@ class StateStore:
             """
         )
 
+    def _ensure_retention_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS state_retention_daily (
+                table_name TEXT NOT NULL,
+                day TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                summary_json TEXT NOT NULL,
+                archive_path TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY(table_name, day)
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS state_retention_checkpoints (
+                table_name TEXT PRIMARY KEY,
+                archived_rows INTEGER NOT NULL,
+                state_json TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+
     def _ensure_idempotency_schema(self, conn: sqlite3.Connection) -> None:
         conn.execute(
             """
@@ -2673,127 +3452,132 @@ class StateStore:
         now_epoch = int(datetime.now(UTC).timestamp())
         expires_at = now_epoch + max(1, ttl_seconds)
         with self._connect() as conn:
-            try:
+            # Fast path, one statement: claim the key if it is free or its previous holder
+            # has expired (expired rows are reclaimed here, so pruning can lag behind).
+            claimed = conn.execute(
+                """
+                INSERT INTO idempotency_keys(
+                    action_type, key, payload_hash, created_at_epoch,
+                    expires_at_epoch, status
+                ) VALUES (?, ?, ?, ?, ?, 'PENDING')
+                ON CONFLICT(action_type, key) DO UPDATE SET
+                    payload_hash = excluded.payload_hash,
+                    created_at_epoch = excluded.created_at_epoch,
+                    expires_at_epoch = excluded.expires_at_epoch,
+                    status = 'PENDING',
+                    action_id = NULL,
+                    client_order_id = NULL,
+                    order_id = NULL,
+                    recovery_attempts = 0,
+                    next_recovery_at_epoch = NULL
+                WHERE idempotency_keys.expires_at_epoch <= excluded.created_at_epoch
+                RETURNING *
+                """,
+                (action_type, key, payload_hash, now_epoch, expires_at),
+            ).fetchone()
+            if claimed is not None:
+                return self._row_to_reservation_result(claimed, reserved=True)
+            row = conn.execute(
+                """
+                SELECT * FROM idempotency_keys
+                WHERE action_type = ? AND key = ?
+                """,
+                (action_type, key),
+            ).fetchone()
+            if row is None:
+                raise RuntimeError(f"idempotency key vanished during reserve {action_type}:{key}")
+            status = str(row["status"]).upper()
+            if str(row["payload_hash"]) != payload_hash:
+                if not (allow_promote_simulated and status == "SIMULATED"):
+                    raise IdempotencyConflictError(
+                        f"idempotency key conflict for {action_type}:{key}: "
+                        f"existing={row['payload_hash']} incoming={payload_hash}"
+                    )
+            age_seconds = max(0, now_epoch - int(row["created_at_epoch"]))
+            if status == "PENDING" and age_seconds > PENDING_GRACE_SECONDS:
+                if row["action_id"] is None and row["client_order_id"] is None:
+                    conn.execute(
+                        """
+                        UPDATE idempotency_keys
+                        SET status = 'FAILED'
+                        WHERE action_type = ? AND key = ?
+                        """,
+                        (action_type, key),
+                    )
+                    row = conn.execute(
+                        """
+                        SELECT * FROM idempotency_keys
+                        WHERE action_type = ? AND key = ?
+                        """,
+                        (action_type, key),
+                    ).fetchone()
+                    if row is None:
+                        raise RuntimeError(
+                            f"failed to mark stale idempotency key failed {action_type}:{key}"
+                        )
+                    status = str(row["status"]).upper()
+            if (
+                allow_promote_simulated
+                and status == "SIMULATED"
+                and int(row["expires_at_epoch"]) > now_epoch
+            ):
                 conn.execute(
                     """
-                    INSERT INTO idempotency_keys(
-                        action_type, key, payload_hash, created_at_epoch,
-                        expires_at_epoch, status
-                    ) VALUES (?, ?, ?, ?, ?, 'PENDING')
+                    UPDATE idempotency_keys
+                    SET status = 'PENDING',
+                        payload_hash = ?,
+                        created_at_epoch = ?,
+                        expires_at_epoch = ?,
+                        action_id = NULL,
+                        client_order_id = NULL,
+                        order_id = NULL,
+                        recovery_attempts = 0,
+                        next_recovery_at_epoch = NULL
+                    WHERE action_type = ? AND key = ?
                     """,
-                    (action_type, key, payload_hash, now_epoch, expires_at),
+                    (payload_hash, now_epoch, expires_at, action_type, key),
                 )
-                row = conn.execute(
+                promoted = conn.execute(
                     """
                     SELECT * FROM idempotency_keys
                     WHERE action_type = ? AND key = ?
                     """,
                     (action_type, key),
                 ).fetchone()
-                assert row is not None
-                return self._row_to_reservation_result(row, reserved=True)
-            except sqlite3.IntegrityError as exc:
-                row = conn.execute(
+                if promoted is None:
+                    raise RuntimeError(
+                        f"failed to promote simulated idempotency key {action_type}:{key}"
+                    )
+                return self._row_to_reservation_result(promoted, reserved=True)
+            if status == "FAILED":
+                conn.execute(
+                    """
+                    UPDATE idempotency_keys
+                    SET status = 'PENDING',
+                        created_at_epoch = ?,
+                        expires_at_epoch = ?,
+                        action_id = NULL,
+                        client_order_id = NULL,
+                        order_id = NULL,
+                        recovery_attempts = 0,
+                        next_recovery_at_epoch = NULL
+                    WHERE action_type = ? AND key = ?
+                    """,
+                    (now_epoch, expires_at, action_type, key),
+                )
+                retry_row = conn.execute(
                     """
                     SELECT * FROM idempotency_keys
                     WHERE action_type = ? AND key = ?
                     """,
                     (action_type, key),
                 ).fetchone()
-                if row is None:
-                    raise
-                status = str(row["status"]).upper()
-                if str(row["payload_hash"]) != payload_hash:
-                    if not (allow_promote_simulated and status == "SIMULATED"):
-                        raise IdempotencyConflictError(
-                            f"idempotency key conflict for {action_type}:{key}: "
-                            f"existing={row['payload_hash']} incoming={payload_hash}"
-                        ) from exc
-                age_seconds = max(0, now_epoch - int(row["created_at_epoch"]))
-                if status == "PENDING" and age_seconds > PENDING_GRACE_SECONDS:
-                    if row["action_id"] is None and row["client_order_id"] is None:
-                        conn.execute(
-                            """
-                            UPDATE idempotency_keys
-                            SET status = 'FAILED'
-                            WHERE action_type = ? AND key = ?
-                            """,
-                            (action_type, key),
-                        )
-                        row = conn.execute(
-                            """
-                            SELECT * FROM idempotency_keys
-                            WHERE action_type = ? AND key = ?
-                            """,
-                            (action_type, key),
-                        ).fetchone()
-                        if row is None:
-                            raise RuntimeError(
-                                f"failed to mark stale idempotency key failed {action_type}:{key}"
-                            ) from exc
-                        status = str(row["status"]).upper()
-                if (
-                    allow_promote_simulated
-                    and status == "SIMULATED"
-                    and int(row["expires_at_epoch"]) > now_epoch
-                ):
-                    conn.execute(
-                        """
-                        UPDATE idempotency_keys
-                        SET status = 'PENDING',
-                            payload_hash = ?,
-                            created_at_epoch = ?,
-                            expires_at_epoch = ?,
-                            action_id = NULL,
-                            client_order_id = NULL,
-                            order_id = NULL,
-                            recovery_attempts = 0,
-                            next_recovery_at_epoch = NULL
-                        WHERE action_type = ? AND key = ?
-                        """,
-                        (payload_hash, now_epoch, expires_at, action_type, key),
-                    )
-                    promoted = conn.execute(
-                        """
-                        SELECT * FROM idempotency_keys
-                        WHERE action_type = ? AND key = ?
-                        """,
-                        (action_type, key),
-                    ).fetchone()
-                    if promoted is None:
-                        raise RuntimeError(
-                            f"failed to promote simulated idempotency key {action_type}:{key}"
-                        ) from exc
-                    return self._row_to_reservation_result(promoted, reserved=True)
-                if status == "FAILED":
-                    conn.execute(
-                        """
-                        UPDATE idempotency_keys
-                        SET status = 'PENDING',
-                            created_at_epoch = ?,
-                            expires_at_epoch = ?,
-                            action_id = NULL,
-                            client_order_id = NULL,
-                            order_id = NULL,
-                            recovery_attempts = 0,
-                            next_recovery_at_epoch = NULL
-                        WHERE action_type = ? AND key = ?
-                        """,
-                        (now_epoch, expires_at, action_type, key),
+                if retry_row is None:
+                    raise RuntimeError(
+                        f"failed to re-reserve failed idempotency key {action_type}:{key}"
                     )
-                    retry_row = conn.execute(
-                        """
-                        SELECT * FROM idempotency_keys
-                        WHERE action_type = ? AND key = ?
-                        """,
-                        (action_type, key),
-                    ).fetchone()
-                    if retry_row is None:
-                        raise RuntimeError(
-                            f"failed to re-reserve failed idempotency key {action_type}:{key}"
-                        ) from exc
-                    return self._row_to_reservation_result(retry_row, reserved=True)
-                return self._row_to_reservation_result(row, reserved=False)
+                return self._row_to_reservation_result(retry_row, reserved=True)
+            return self._row_to_reservation_result(row, reserved=False)
 
     def finalize_idempotency_key(
         self,
@@ -2845,14 +3629,75 @@ class StateStore:
                 ),
             )
 
-    def prune_expired_idempotency_keys(self, now_epoch: int | None = None) -> int:
+    def prune_expired_idempotency_keys(
+        self,
+        now_epoch: int | None = None,
+        *,
+        batch_size: int = IDEMPOTENCY_PRUNE_BATCH_SIZE,
+        max_batches: int | None = None,
+    ) -> int:
+        """Delete expired keys in short batches (each its own write transaction).
+
+        Stops after ``max_batches`` when given, so a large backlog is worked off across
+        calls instead of holding the write lock for one long DELETE.
+        """
         resolved_now = now_epoch or int(datetime.now(UTC).timestamp())
+        limit = max(1, int(batch_size))
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with self._connect() as conn:
+                cur = conn.execute(
+                    """
+                    DELETE FROM idempotency_keys
+                    WHERE rowid IN (
+                        SELECT rowid FROM idempotency_keys
+                        WHERE expires_at_epoch <= ?
+                        LIMIT ?
+                    )
+                    """,
+                    (resolved_now, limit),
+                )
+                removed = int(cur.rowcount)
+            deleted += removed
+            batches += 1
+            if removed < limit:
+                break
+        return deleted
+
+    def prune_expired_idempotency_keys_if_due(
+        self,
+        now_epoch: int | None = None,
+        *,
+        interval_seconds: int = IDEMPOTENCY_PRUNE_INTERVAL_SECONDS,
+        batch_size: int = IDEMPOTENCY_PRUNE_BATCH_SIZE,
+        max_batches: int = IDEMPOTENCY_PRUNE_MAX_BATCHES,
+    ) -> int:
+        """Amortized pruning for the submit path: a bounded batch run at most once per interval.
+
+        Reservation reclaims expired keys itself, so pruning only keeps the table small.
+        The next due time lives in ``op_state`` so short-lived stores share the schedule.
+        """
+        resolved_now = now_epoch or int(datetime.now(UTC).timestamp())
+        if resolved_now < getattr(self, "_idempotency_prune_due_epoch", 0):
+            return 0
         with self._connect() as conn:
-            cur = conn.execute(
-                "DELETE FROM idempotency_keys WHERE expires_at_epoch <= ?",
-                (resolved_now,),
-            )
-            return int(cur.rowcount)
+            row = conn.execute(
+                "SELECT int_value FROM op_state WHERE key = ?", (_IDEMPOTENCY_PRUNE_DUE_KEY,)
+            ).fetchone()
+        due_epoch = int(row["int_value"]) if row and row["int_value"] is not None else 0
+        if resolved_now < due_epoch:
+            self._idempotency_prune_due_epoch = due_epoch
+            return 0
+        deleted = self.prune_expired_idempotency_keys(
+            resolved_now, batch_size=batch_size, max_batches=max_batches
+        )
+        # A full final batch means backlog remains: stay due so the next call continues.
+        backlog = deleted >= max(1, int(batch_size)) * max(1, int(max_batches))
+        next_due = resolved_now if backlog else resolved_now + max(1, int(interval_seconds))
+        self.set_runtime_counter(_IDEMPOTENCY_PRUNE_DUE_KEY, next_due)
+        self._idempotency_prune_due_epoch = next_due
+        return deleted
 
     def set_runtime_counter(self, key: str, value: int) -> None:
         now = datetime.now(UTC).isoformat()
@@ -2974,6 +3819,11 @@ class StateStore:
             )
 
     def get_kill_switch(self, role: str) -> tuple[bool, str | None, str | None]:
+        return self._cached_control_state(
+            f"kill_switch:{role}", lambda: self._load_kill_switch(role)
+        )
+
+    def _load_kill_switch(self, role: str) -> tuple[bool, str | None, str | None]:
         keys = _role_key_candidates("kill_switch", role)
         canonical_key = keys[0]
         found = self._find_op_state_row_by_keys(keys)
@@ -3077,6 +3927,12 @@ class StateStore:
         )
 
     def stage4_get_freeze(self, process_role: str) -> Stage4FreezeState:
+        state = self._cached_control_state(
+            f"stage4_freeze:{process_role}", lambda: self._load_stage4_freeze(process_role)
+        )
+        return replace(state, details=dict(state.details))
+
+    def _load_stage4_freeze(self, process_role: str) -> Stage4FreezeState:
         keys = _role_key_candidates("stage4_freeze", process_role)
         canonical_key = keys[0]
         found = self._find_op_state_row_by_keys(keys)
@@ -3593,23 +4449,107 @@ class StateStore:
         return risk_mode
 
     # Stage 4 helpers
+    def _stage4_order_index(self) -> Stage4OrderIndex | None:
+        """Shared write-through index of ``stage4_orders``; ``None`` where it cannot stay exact.
+
+        Read-only stores run beside the writer process and ``:memory:`` unit-of-work
+        connections each see a fresh database, so both keep reading SQLite.
+        """
+        index = getattr(self, "_order_index", None)
+        if index is not None:
+            return index
+        if getattr(self, "read_only", False) or getattr(self, "db_path", ":memory:") == ":memory:":
+            return None
+        index = shared_order_index(self.db_path_abs, self._load_stage4_order_index_rows)
+        self._order_index = index
+        return index
+
+    def _load_stage4_order_index_rows(self) -> list[tuple[int, Stage4Order]]:
+        with self._uow_factory() as uow:
+            return uow.orders.stage4_order_index_rows()
+
+    @contextmanager
+    def _stage4_orders_write(
+        self,
+        *,
+        client_order_id: str | None = None,
+        exchange_order_id: str | None = None,
+    ) -> Iterator[UnitOfWork]:
+        """Unit of work for a ``stage4_orders`` write; the touched rows are re-read in the
+        same transaction and applied to the index only once it commits."""
+        index = self._stage4_order_index()
+        with self._uow_factory() as uow:
+            yield uow
+            rows = (
+                uow.orders.stage4_order_index_rows(
+                    client_order_id=client_order_id, exchange_order_id=exchange_order_id
+                )
+                if index is not None and (client_order_id or exchange_order_id)
+                else []
+            )
+        if index is not None:
+            index.upsert(rows)
+
+    def verify_stage4_order_index(self) -> OrderIndexDrift | None:
+        """Check the order index against ``stage4_orders``, rebuilding it on any drift."""
+        index = self._stage4_order_index()
+        if index is None:
+            return None
+        drift = index.verify(self._load_stage4_order_index_rows)
+        if not drift.ok:
+            logger.warning(
+                "stage4_order_index_drift",
+                extra={
+                    "extra": {
+                        "db_path": self.db_path_abs,
+                        "rows": drift.rows,
+                        "missing": drift.missing,
+                        "stale": drift.stale,
+                        "extra": drift.extra,
+                    }
+                },
+            )
+        return drift
+
+    def verify_stage4_order_index_if_due(self) -> OrderIndexDrift | None:
+        index = self._stage4_order_index()
+        if index is None or not index.verify_due():
+            return None
+        return self.verify_stage4_order_index()
+
     def client_order_id_exists(self, client_order_id: str) -> bool:
+        index = self._stage4_order_index()
+        if index is not None:
+            return index.status_for(client_order_id) is not None
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.client_order_id_exists(client_order_id)
 
     def stage4_has_unknown_orders(self) -> bool:
+        index = self._stage4_order_index()
+        if index is not None:
+            return index.has_unknown()
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.stage4_has_unknown_orders()
 
     def stage4_unknown_client_order_ids(self) -> list[str]:
+        index = self._stage4_order_index()
+        if index is not None:
+            return index.unknown_client_order_ids()
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.stage4_unknown_client_order_ids()
 
     def get_stage4_order_by_client_id(self, client_order_id: str):
         """Load a Stage4 order by client_order_id."""
+        index = self._stage4_order_index()
+        if index is not None:
+            if index.status_for(client_order_id) is None:
+                return None
+            order = index.live_order(client_order_id)
+            if order is not None:
+                return order
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.get_stage4_order_by_client_id(client_order_id)
@@ -3621,6 +4561,13 @@ class StateStore:
         include_external: bool = False,
         include_unknown: bool = False,
     ):
+        index = self._stage4_order_index()
+        if index is not None:
+            return index.open_orders(
+                normalize_symbol(symbol) if symbol is not None else None,
+                include_external=include_external,
+                include_unknown=include_unknown,
+            )
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.list_stage4_open_orders(
@@ -3630,6 +4577,9 @@ class StateStore:
             )
 
     def is_order_terminal(self, client_order_id: str) -> bool:
+        index = self._stage4_order_index()
+        if index is not None:
+            return index.status_for(client_order_id) in TERMINAL_STATUSES
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.is_order_terminal(client_order_id)
@@ -3669,7 +4619,7 @@ class StateStore:
         status: str = "open",
     ) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.record_stage4_order_submitted(
                 symbol=symbol,
                 client_order_id=client_order_id,
@@ -3692,7 +4642,7 @@ class StateStore:
         qty: Decimal,
     ) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.record_stage4_order_simulated_submit(
                 symbol=symbol,
                 client_order_id=client_order_id,
@@ -3703,12 +4653,12 @@ class StateStore:
 
     def record_stage4_order_cancel_requested(self, client_order_id: str) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.record_stage4_order_cancel_requested(client_order_id)
 
     def record_stage4_order_canceled(self, client_order_id: str) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.record_stage4_order_canceled(client_order_id)
 
     def record_stage4_order_error(
@@ -3725,7 +4675,7 @@ class StateStore:
         error_code: int | None = None,
     ) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.record_stage4_order_error(
                 client_order_id=client_order_id,
                 reason=reason,
@@ -3751,7 +4701,7 @@ class StateStore:
         error_code: int | None = None,
     ) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.record_stage4_order_rejected(
                 client_order_id,
                 reason,
@@ -4127,20 +5077,30 @@ class StateStore:
 
     def update_stage4_order_exchange_id(self, client_order_id: str, exchange_order_id: str) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.update_stage4_order_exchange_id(client_order_id, exchange_order_id)
 
     def mark_stage4_unknown_closed(self, client_order_id: str) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(client_order_id=client_order_id) as uow:
             uow.orders.mark_stage4_unknown_closed(client_order_id)
 
     def import_stage4_external_order(self, order) -> None:
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
-        with self._uow_factory() as uow:
+        with self._stage4_orders_write(
+            client_order_id=getattr(order, "client_order_id", None),
+            exchange_order_id=getattr(order, "exchange_order_id", None),
+        ) as uow:
             uow.orders.import_stage4_external_order(order)
 
     def get_stage4_order_by_exchange_id(self, exchange_order_id: str):
+        index = self._stage4_order_index()
+        if index is not None:
+            if not index.knows_exchange_id(exchange_order_id):
+                return None
+            order = index.live_order_by_exchange_id(exchange_order_id)
+            if order is not None:
+                return order
         # TODO(P2-2): remove facade once all callers migrate to UnitOfWork directly.
         with self._uow_factory() as uow:
             return uow.orders.get_stage4_order_by_exchange_id(exchange_order_id)
@@ -4340,6 +5300,9 @@ class StateStore:
         with self._connect() as conn:
             rows = conn.execute("SELECT total_equity_try FROM pnl_snapshots").fetchall()
         values = [Decimal(str(row["total_equity_try"])) for row in rows]
+        archived = self.get_retention_checkpoint("pnl_snapshots")
+        if archived is not None and archived.get("peak") is not None:
+            values.append(Decimal(str(archived["peak"])))
         peak = max(values + [equity_now]) if values else equity_now
         if peak <= 0:
             return Decimal("0")
@@ -4433,15 +5396,28 @@ class StateStore:
         ts_bucket: datetime,
         mid_price: Decimal,
     ) -> None:
+        self.upsert_universe_price_snapshots_many([(pair_symbol, ts_bucket, mid_price)])
+
+    def upsert_universe_price_snapshots_many(
+        self, snapshots: Iterable[tuple[str, datetime, Decimal]]
+    ) -> None:
+        """Upsert ``(pair_symbol, ts_bucket, mid_price)`` rows in one transaction."""
+        rows = []
+        for pair_symbol, ts_bucket, mid_price in snapshots:
+            bucket = ensure_utc(ts_bucket)
+            rows.append((pair_symbol, bucket.isoformat(), str(mid_price), int(bucket.timestamp())))
+        if not rows:
+            return
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
-                INSERT INTO universe_price_cache(pair_symbol, ts_bucket, mid_price)
-                VALUES (?, ?, ?)
+                INSERT INTO universe_price_cache(pair_symbol, ts_bucket, mid_price, ts_epoch)
+                VALUES (?, ?, ?, ?)
                 ON CONFLICT(pair_symbol, ts_bucket) DO UPDATE SET
-                    mid_price=excluded.mid_price
+                    mid_price=excluded.mid_price,
+                    ts_epoch=excluded.ts_epoch
                 """,
-                (pair_symbol, ensure_utc(ts_bucket).isoformat(), str(mid_price)),
+                rows,
             )
 
     def get_universe_price_lookback(
@@ -4451,24 +5427,58 @@ class StateStore:
         target_ts: datetime,
         tolerance: timedelta,
     ) -> Decimal | None:
-        target = ensure_utc(target_ts)
-        start = (target - tolerance).isoformat()
-        end = (target + tolerance).isoformat()
+        return self.get_universe_price_lookbacks(
+            pair_symbols=[pair_symbol], target_ts=target_ts, tolerance=tolerance
+        ).get(pair_symbol)
+
+    def get_universe_price_lookbacks(
+        self,
+        *,
+        pair_symbols: Iterable[str],
+        target_ts: datetime,
+        tolerance: timedelta,
+    ) -> dict[str, Decimal]:
+        """Return the cached mid price closest to ``target_ts`` for each pair.
+
+        Pairs without a snapshot inside ``target_ts +/- tolerance`` are omitted. Ties are
+        broken towards the older bucket, matching the single-pair lookup.
+        """
+        symbols = sorted(set(pair_symbols))
+        if not symbols:
+            return {}
+        target_epoch = int(ensure_utc(target_ts).timestamp())
+        tolerance_seconds = int(tolerance.total_seconds())
+        result: dict[str, Decimal] = {}
         with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT mid_price
-                FROM universe_price_cache
-                WHERE pair_symbol = ?
-                  AND ts_bucket BETWEEN ? AND ?
-                ORDER BY ABS(strftime('%s', ts_bucket) - strftime('%s', ?)) ASC, ts_bucket ASC
-                LIMIT 1
-                """,
-                (pair_symbol, start, end, target.isoformat()),
-            ).fetchone()
-        if row is None:
-            return None
-        return Decimal(str(row["mid_price"]))
+            for start in range(0, len(symbols), _SQLITE_IN_CHUNK_SIZE):
+                chunk = symbols[start : start + _SQLITE_IN_CHUNK_SIZE]
+                rows = conn.execute(
+                    f"""
+                    SELECT pair_symbol, mid_price
+                    FROM (
+                        SELECT
+                            pair_symbol,
+                            mid_price,
+                            ROW_NUMBER() OVER (
+                                PARTITION BY pair_symbol
+                                ORDER BY ABS(ts_epoch - ?) ASC, ts_epoch ASC
+                            ) AS rank
+                        FROM universe_price_cache
+                        WHERE pair_symbol IN ({",".join("?" for _ in chunk)})
+                          AND ts_epoch BETWEEN ? AND ?
+                    )
+                    WHERE rank = 1
+                    """,
+                    (
+                        target_epoch,
+                        *chunk,
+                        target_epoch - tolerance_seconds,
+                        target_epoch + tolerance_seconds,
+                    ),
+                ).fetchall()
+                for row in rows:
+                    result[str(row["pair_symbol"])] = Decimal(str(row["mid_price"]))
+        return result
 
     @staticmethod
     def _canonicalize_stage7_universe_role(role: str) -> str:
@@ -4682,16 +5692,32 @@ class StateStore:
         return churn_count
 
     def get_dynamic_universe_symbol_state(self, symbol: str) -> dict[str, object] | None:
+        return self.load_dynamic_universe_states([symbol]).get(symbol)
+
+    def load_dynamic_universe_states(self, symbols: Iterable[str]) -> dict[str, dict[str, object]]:
+        """Load persisted per-symbol universe state for ``symbols`` keyed by symbol.
+
+        Symbols without a stored row are omitted.
+        """
+        wanted = sorted(set(symbols))
+        states: dict[str, dict[str, object]] = {}
+        if not wanted:
+            return states
         with self._connect() as conn:
-            row = conn.execute(
-                "SELECT * FROM dynamic_universe_symbol_state WHERE symbol = ?",
-                (symbol,),
-            ).fetchone()
-        if row is None:
-            return None
-        payload = {key: row[key] for key in row.keys()}
-        payload["reject_counts"] = json.loads(str(payload.pop("reject_counts_json") or "{}"))
-        return payload
+            for start in range(0, len(wanted), _SQLITE_IN_CHUNK_SIZE):
+                chunk = wanted[start : start + _SQLITE_IN_CHUNK_SIZE]
+                rows = conn.execute(
+                    "SELECT * FROM dynamic_universe_symbol_state "
+                    f"WHERE symbol IN ({','.join('?' for _ in chunk)})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    payload = {key: row[key] for key in row.keys()}
+                    payload["reject_counts"] = json.loads(
+                        str(payload.pop("reject_counts_json") or "{}")
+                    )
+                    states[str(row["symbol"])] = payload
+        return states
 
     def upsert_dynamic_universe_symbol_state(
         self,
@@ -4704,8 +5730,42 @@ class StateStore:
         reject_window_start_ts: datetime | None = None,
         reject_counts: dict[str, int] | None = None,
     ) -> None:
+        self.upsert_dynamic_universe_symbol_states_many(
+            [
+                DynamicUniverseSymbolStateUpdate(
+                    symbol=symbol,
+                    updated_at=updated_at,
+                    last_selected_ts=last_selected_ts,
+                    cooldown_until_ts=cooldown_until_ts,
+                    probation_until_ts=probation_until_ts,
+                    reject_window_start_ts=reject_window_start_ts,
+                    reject_counts=reject_counts,
+                )
+            ]
+        )
+
+    def upsert_dynamic_universe_symbol_states_many(
+        self, updates: Iterable[DynamicUniverseSymbolStateUpdate]
+    ) -> None:
+        def _iso(value: datetime | None) -> str | None:
+            return ensure_utc(value).isoformat() if value else None
+
+        rows = [
+            (
+                item.symbol,
+                _iso(item.last_selected_ts),
+                _iso(item.cooldown_until_ts),
+                _iso(item.probation_until_ts),
+                _iso(item.reject_window_start_ts),
+                json.dumps(item.reject_counts or {}, sort_keys=True),
+                ensure_utc(item.updated_at).isoformat(),
+            )
+            for item in updates
+        ]
+        if not rows:
+            return
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO dynamic_universe_symbol_state(
                     symbol, last_selected_ts, cooldown_until_ts, probation_until_ts,
@@ -4719,17 +5779,104 @@ class StateStore:
                     reject_counts_json=excluded.reject_counts_json,
                     updated_at_ts=excluded.updated_at_ts
                 """,
-                (
-                    symbol,
-                    ensure_utc(last_selected_ts).isoformat() if last_selected_ts else None,
-                    ensure_utc(cooldown_until_ts).isoformat() if cooldown_until_ts else None,
-                    ensure_utc(probation_until_ts).isoformat() if probation_until_ts else None,
-                    ensure_utc(reject_window_start_ts).isoformat()
-                    if reject_window_start_ts
-                    else None,
-                    json.dumps(reject_counts or {}, sort_keys=True),
-                    ensure_utc(updated_at).isoformat(),
-                ),
+                rows,
+            )
+
+    def get_retention_checkpoint(self, table_name: str) -> dict[str, object] | None:
+        """Running aggregates carried over rows that retention has removed from ``table_name``."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT state_json FROM state_retention_checkpoints WHERE table_name = ?",
+                (table_name,),
+            ).fetchone()
+        if row is None:
+            return None
+        payload = json.loads(str(row["state_json"]))
+        return payload if isinstance(payload, dict) else None
+
+    def load_retention_daily_summaries(
+        self,
+        table_name: str,
+        *,
+        day_min: str | None = None,
+        day_max: str | None = None,
+    ) -> list[dict[str, object]]:
+        query = (
+            "SELECT day, row_count, summary_json, archive_path FROM state_retention_daily "
+            "WHERE table_name = ?"
+        )
+        params: list[object] = [table_name]
+        if day_min is not None:
+            query += " AND day >= ?"
+            params.append(day_min)
+        if day_max is not None:
+            query += " AND day <= ?"
+            params.append(day_max)
+        query += " ORDER BY day"
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {
+                "day": str(row["day"]),
+                "row_count": int(row["row_count"]),
+                "summary": json.loads(str(row["summary_json"])),
+                "archive_path": row["archive_path"],
+            }
+            for row in rows
+        ]
+
+    def load_indicator_states(
+        self, series_keys: Iterable[str] | None = None, *, key_prefix: str | None = None
+    ) -> dict[str, dict[str, object]]:
+        """Return persisted indicator payloads keyed by series.
+
+        With ``series_keys`` only those series are loaded; otherwise every series whose key
+        starts with ``key_prefix`` (all series when no prefix is given).
+        """
+        states: dict[str, dict[str, object]] = {}
+        with self._connect() as conn:
+            if series_keys is None:
+                prefix = key_prefix or ""
+                rows = conn.execute(
+                    "SELECT series_key, payload_json FROM indicator_states "
+                    "WHERE substr(series_key, 1, ?) = ?",
+                    (len(prefix), prefix),
+                ).fetchall()
+            else:
+                wanted = sorted(set(series_keys))
+                rows = []
+                for start in range(0, len(wanted), _SQLITE_IN_CHUNK_SIZE):
+                    chunk = wanted[start : start + _SQLITE_IN_CHUNK_SIZE]
+                    rows.extend(
+                        conn.execute(
+                            "SELECT series_key, payload_json FROM indicator_states "
+                            f"WHERE series_key IN ({','.join('?' for _ in chunk)})",
+                            chunk,
+                        ).fetchall()
+                    )
+        for row in rows:
+            states[str(row["series_key"])] = json.loads(str(row["payload_json"]))
+        return states
+
+    def save_indicator_states(
+        self, payloads: Mapping[str, Mapping[str, object]], *, updated_at: datetime
+    ) -> None:
+        if not payloads:
+            return
+        updated_iso = ensure_utc(updated_at).isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO indicator_states(series_key, payload_json, updated_at_ts)
+                VALUES (?, ?, ?)
+                ON CONFLICT(series_key) DO UPDATE SET
+                    payload_json=excluded.payload_json,
+                    updated_at_ts=excluded.updated_at_ts
+                """,
+                [
+                    (key, json.dumps(payload, sort_keys=True), updated_iso)
+                    for key, payload in payloads.items()
+                ],
             )
 
     def record_cycle_audit(
@@ -5029,6 +6176,47 @@ class StateStore:
                 ),
             )
 
+    def save_metrics_snapshot(self, *, ts: str, series: list[dict[str, object]]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO metrics_snapshots(ts, payload_json) VALUES (?, ?)",
+                (ts, json.dumps(series, sort_keys=True, default=str)),
+            )
+
+    def save_alert_metric_windows(self, samples: Mapping[str, list[tuple[int, float]]]) -> None:
+        updated_at = datetime.now(UTC).isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO alert_metric_windows(metric_name, samples_json, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(metric_name) DO UPDATE SET
+                    samples_json=excluded.samples_json,
+                    updated_at=excluded.updated_at
+                """,
+                [
+                    (name, json.dumps([[int(ts), float(value)] for ts, value in items]), updated_at)
+                    for name, items in sorted(samples.items())
+                ],
+            )
+
+    def load_alert_metric_windows(self) -> dict[str, list[tuple[int, float]]]:
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT metric_name, samples_json FROM alert_metric_windows"
+                ).fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        windows: dict[str, list[tuple[int, float]]] = {}
+        for row in rows:
+            try:
+                items = json.loads(str(row["samples_json"]))
+                windows[str(row["metric_name"])] = [(int(ts), float(value)) for ts, value in items]
+            except (TypeError, ValueError):
+                continue
+        return windows
+
     def save_stage4_run_metrics(
         self,
         *,
@@ -5042,6 +6230,9 @@ class StateStore:
         rejects_by_code: dict[str, int],
         breaker_state: str,
         degraded_mode: bool,
+        db_stats: Mapping[str, object] | None = None,
+        resource_stats: Mapping[str, object] | None = None,
+        http_stats: Mapping[str, object] | None = None,
     ) -> None:
         with self._connect() as conn:
             conn.execute(
@@ -5056,8 +6247,11 @@ class StateStore:
                     orders_submitted,
                     rejects_by_code_json,
                     breaker_state,
-                    degraded_mode
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    degraded_mode,
+                    db_stats_json,
+                    resource_stats_json,
+                    http_stats_json
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(cycle_id) DO UPDATE SET
                     ts=excluded.ts,
                     reasons_no_action_json=excluded.reasons_no_action_json,
@@ -5067,7 +6261,10 @@ class StateStore:
                     orders_submitted=excluded.orders_submitted,
                     rejects_by_code_json=excluded.rejects_by_code_json,
                     breaker_state=excluded.breaker_state,
-                    degraded_mode=excluded.degraded_mode
+                    degraded_mode=excluded.degraded_mode,
+                    db_stats_json=excluded.db_stats_json,
+                    resource_stats_json=excluded.resource_stats_json,
+                    http_stats_json=excluded.http_stats_json
                 """,
                 (
                     cycle_id,
@@ -5083,6 +6280,13 @@ class StateStore:
                     ),
                     breaker_state,
                     1 if degraded_mode else 0,
+                    None if db_stats is None else json.dumps(dict(db_stats), sort_keys=True),
+                    (
+                        None
+                        if resource_stats is None
+                        else json.dumps(dict(resource_stats), sort_keys=True)
+                    ),
+                    None if http_stats is None else json.dumps(dict(http_stats), sort_keys=True),
                 ),
             )
 
@@ -5245,6 +6449,11 @@ class StateStore:
         return [str(row["code"]) for row in rows]
 
     def get_degrade_state_current(self) -> dict[str, str]:
+        return dict(
+            self._cached_control_state("degrade_state_current", self._load_degrade_state_current)
+        )
+
+    def _load_degrade_state_current(self) -> dict[str, str]:
         with self._connect() as conn:
             row = conn.execute("SELECT * FROM degrade_state_current WHERE state_id = 1").fetchone()
         if row is None:
@@ -5549,6 +6758,7 @@ class StateStore:
                     cycle_id,
                 ),
             )
+            self._refresh_stage7_fingerprint_with_conn(conn, cycle_id)
 
     def get_last_good_stage7_params_checkpoint(self) -> Stage7Params | None:
         with self._connect() as conn:
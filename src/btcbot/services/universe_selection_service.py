@@ -2,14 +2,18 @@ from __future__ import annotations
 
 import logging
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from math import sqrt
+from time import monotonic, perf_counter
 from typing import TYPE_CHECKING
 
 from btcbot.domain.symbols import canonical_symbol, quote_currency
 from btcbot.domain.universe import UniverseCandidate, UniverseSelectionResult
+from btcbot.observability import get_instrumentation
+from btcbot.services.indicator_engine import IndicatorEngine, candle_series_key
 from btcbot.services.state_store import StateStore
 
 if TYPE_CHECKING:
@@ -51,34 +55,22 @@ class UniverseSelectionService:
         )
 
         ticker_stats = self._fetch_ticker_stats(exchange)
-        raw_metrics: dict[str, _RawMetrics] = {}
-        observed_ages: list[float | None] = []
-        for symbol in symbols:
-            volume_try = self._extract_quote_volume_try(symbol=symbol, ticker_stats=ticker_stats)
-            spread_bps, age_sec = self._fetch_spread_bps_and_age(
-                exchange=exchange,
-                symbol=symbol,
-                now_utc=now_utc,
-            )
-            volatility = self._fetch_volatility(
-                exchange=exchange,
-                symbol=symbol,
-                settings=settings,
-                ticker_stats=ticker_stats,
-            )
-            if age_sec is None or age_sec > settings.stage7_max_data_age_sec:
-                stale_detected = True
-            raw_metrics[symbol] = _RawMetrics(
-                volume_try=volume_try,
-                spread_bps=spread_bps,
-                volatility=volatility,
-                age_sec=age_sec,
-            )
-            observed_ages.append(age_sec)
-
+        indicators = self._restore_indicators(store=store, settings=settings, symbols=symbols)
+        raw_metrics, fetch_latency_ms, timed_out = self._collect_raw_metrics(
+            exchange=exchange,
+            symbols=symbols,
+            settings=settings,
+            ticker_stats=ticker_stats,
+            now_utc=now_utc,
+            indicators=indicators,
+        )
+        self._persist_indicators(indicators=indicators, store=store, now_utc=now_utc)
+        # Deadline misses are scored with the missing-metric penalty rather than treated
+        # as stale data; only a pass that collected nothing at all freezes on staleness.
+        observed_ages = [raw_metrics[symbol].age_sec for symbol in fetch_latency_ms]
         stale_detected = any(
             age is None or age > settings.stage7_max_data_age_sec for age in observed_ages
-        )
+        ) or (bool(symbols) and not observed_ages)
         if stale_detected:
             freeze_reasons.append("STALE_DATA")
 
@@ -157,8 +149,168 @@ class UniverseSelectionService:
             freeze_reasons=freeze_reasons,
             excluded_counts=excluded_counts,
             churn_count=churn_total,
+            fetch_latency_ms=fetch_latency_ms,
+            fetch_timed_out_symbols=timed_out,
         )
 
+    def _restore_indicators(
+        self, *, store: StateStore, settings: Settings, symbols: Sequence[str]
+    ) -> IndicatorEngine | None:
+        if not settings.indicator_engine_enabled:
+            return None
+        engine = IndicatorEngine.from_settings(settings)
+        try:
+            engine.restore(store, [candle_series_key(symbol) for symbol in symbols])
+        except Exception:  # noqa: BLE001
+            logger.warning("stage7_indicator_restore_failed", exc_info=True)
+        return engine
+
+    @staticmethod
+    def _persist_indicators(
+        *, indicators: IndicatorEngine | None, store: StateStore, now_utc: datetime
+    ) -> None:
+        if indicators is None:
+            return
+        try:
+            indicators.persist(store, now_utc=now_utc)
+        except Exception:  # noqa: BLE001
+            logger.warning("stage7_indicator_persist_failed", exc_info=True)
+
+    def _collect_raw_metrics(
+        self,
+        *,
+        exchange: object,
+        symbols: list[str],
+        settings: Settings,
+        ticker_stats: dict[str, dict[str, Decimal]],
+        now_utc: datetime,
+        indicators: IndicatorEngine | None = None,
+    ) -> tuple[dict[str, _RawMetrics], dict[str, float], list[str]]:
+        """Fetch per-symbol orderbook/candle metrics concurrently under a cycle deadline.
+
+        Symbols whose fetch has not completed by the deadline keep their ticker-derived
+        volume but get no spread/volatility/age, so scoring applies the missing-metric
+        penalty. Stragglers are abandoned, not joined; they end at the client timeout.
+        Fetches that raised get the same penalty but are counted as errors, not timeouts.
+        """
+
+        concurrency = max(1, min(settings.stage7_universe_fetch_concurrency, len(symbols)))
+        started = monotonic()
+        deadline = started + settings.stage7_universe_fetch_deadline_sec
+        collected: dict[str, tuple[_RawMetrics, float]] = {}
+        failed: dict[str, str] = {}
+
+        def _collect(symbol: str) -> tuple[_RawMetrics, float]:
+            return self._collect_symbol_metrics(
+                exchange=exchange,
+                symbol=symbol,
+                settings=settings,
+                ticker_stats=ticker_stats,
+                now_utc=now_utc,
+                indicators=indicators,
+            )
+
+        if concurrency <= 1:
+            for symbol in symbols:
+                if monotonic() >= deadline:
+                    break
+                collected[symbol] = _collect(symbol)
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="universe-metrics"
+            )
+            try:
+                futures = {executor.submit(_collect, symbol): symbol for symbol in symbols}
+                done, _pending = wait(futures, timeout=max(0.0, deadline - monotonic()))
+                for future in done:
+                    exc = future.exception()
+                    if exc is None:
+                        collected[futures[future]] = future.result()
+                    else:
+                        failed[futures[future]] = type(exc).__name__
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        instrumentation = get_instrumentation()
+        raw_metrics: dict[str, _RawMetrics] = {}
+        fetch_latency_ms: dict[str, float] = {}
+        timed_out: list[str] = []
+        for symbol in symbols:
+            item = collected.get(symbol)
+            if item is None:
+                if symbol not in failed:
+                    timed_out.append(symbol)
+                raw_metrics[symbol] = _RawMetrics(
+                    volume_try=self._extract_quote_volume_try(
+                        symbol=symbol, ticker_stats=ticker_stats
+                    ),
+                    spread_bps=None,
+                    volatility=None,
+                    age_sec=None,
+                )
+                continue
+            raw_metrics[symbol], fetch_latency_ms[symbol] = item
+            instrumentation.histogram("universe_symbol_fetch_ms", item[1], attrs={"symbol": symbol})
+        if timed_out:
+            instrumentation.counter("universe_symbol_fetch_timeouts_total", len(timed_out))
+        error_counts: dict[str, int] = {}
+        for error_type in failed.values():
+            error_counts[error_type] = error_counts.get(error_type, 0) + 1
+        for error_type, count in sorted(error_counts.items()):
+            instrumentation.counter(
+                "universe_symbol_fetch_errors_total", count, attrs={"error_type": error_type}
+            )
+
+        slowest = sorted(fetch_latency_ms.items(), key=lambda kv: (-kv[1], kv[0]))[:5]
+        logger.info(
+            "stage7_universe_metrics_collected",
+            extra={
+                "extra": {
+                    "candidate_count": len(symbols),
+                    "collected_count": len(fetch_latency_ms),
+                    "timed_out_count": len(timed_out),
+                    "timed_out_symbols": timed_out[:20],
+                    "failed_count": len(failed),
+                    "failed_symbols": dict(sorted(failed.items())[:20]),
+                    "concurrency": concurrency,
+                    "elapsed_ms": round((monotonic() - started) * 1000.0, 3),
+                    "slowest_symbols_ms": {sym: round(ms, 3) for sym, ms in slowest},
+                }
+            },
+        )
+        return raw_metrics, fetch_latency_ms, timed_out
+
+    def _collect_symbol_metrics(
+        self,
+        *,
+        exchange: object,
+        symbol: str,
+        settings: Settings,
+        ticker_stats: dict[str, dict[str, Decimal]],
+        now_utc: datetime,
+        indicators: IndicatorEngine | None = None,
+    ) -> tuple[_RawMetrics, float]:
+        started = perf_counter()
+        spread_bps, age_sec = self._fetch_spread_bps_and_age(
+            exchange=exchange,
+            symbol=symbol,
+            now_utc=now_utc,
+        )
+        volatility = self._fetch_volatility(
+            exchange=exchange,
+            symbol=symbol,
+            settings=settings,
+            ticker_stats=ticker_stats,
+            indicators=indicators,
+        )
+        metrics = _RawMetrics(
+            volume_try=self._extract_quote_volume_try(symbol=symbol, ticker_stats=ticker_stats),
+            spread_bps=spread_bps,
+            volatility=volatility,
+            age_sec=age_sec,
+        )
+        return metrics, (perf_counter() - started) * 1000.0
+
     def _discover_symbols(
         self,
         *,
@@ -462,12 +614,21 @@ class UniverseSelectionService:
         symbol: str,
         settings: Settings,
         ticker_stats: dict[str, dict[str, Decimal]],
+        indicators: IndicatorEngine | None = None,
     ) -> Decimal | None:
-        closes = self._fetch_candle_closes(
+        rows = self._fetch_candle_rows(
             exchange=exchange,
             symbol=symbol,
             lookback=max(2, settings.stage7_vol_lookback),
         )
+        if indicators is not None:
+            # Only candles newer than the persisted state (plus the forming one) are applied.
+            key = candle_series_key(symbol)
+            indicators.update_candles(key, rows)
+            snapshot = indicators.snapshot(key)
+            if snapshot is not None and snapshot.return_std is not None:
+                return snapshot.return_std
+        closes = self._extract_candle_closes(rows)
         if len(closes) >= 2:
             return self._compute_return_std(closes)
 
@@ -484,21 +645,33 @@ class UniverseSelectionService:
             return None
         return change.copy_abs() / Decimal("100")
 
-    def _fetch_candle_closes(
+    def _fetch_candle_rows(
         self,
         *,
         exchange: object,
         symbol: str,
         lookback: int,
-    ) -> list[Decimal]:
+    ) -> list[object]:
         getter = getattr(exchange, "get_candles", None)
         if not callable(getter):
             return []
         try:
-            rows = getter(symbol, lookback)
+            return list(getter(symbol, lookback))
         except Exception:  # noqa: BLE001
             return []
 
+    def _fetch_candle_closes(
+        self,
+        *,
+        exchange: object,
+        symbol: str,
+        lookback: int,
+    ) -> list[Decimal]:
+        return self._extract_candle_closes(
+            self._fetch_candle_rows(exchange=exchange, symbol=symbol, lookback=lookback)
+        )
+
+    def _extract_candle_closes(self, rows: Sequence[object]) -> list[Decimal]:
         closes: list[Decimal] = []
         for row in rows:
             if isinstance(row, dict):
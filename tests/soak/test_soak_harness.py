@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from btcbot.config import Settings
+from btcbot.services.soak_harness import (
+    SoakHarness,
+    SoakSample,
+    SoakThresholds,
+    evaluate_soak_samples,
+    format_soak_report,
+    synthetic_replay,
+)
+
+
+def _sample(cycle: int, *, rss: int, p99_ms: float, dicts: int = 1000) -> SoakSample:
+    return SoakSample(
+        cycle=cycle,
+        simulated_ts=f"2026-01-01T00:{cycle:02d}:00+00:00",
+        wall_seconds=float(cycle),
+        rss_bytes=rss,
+        open_fds=12,
+        db_bytes=4096,
+        wal_bytes=0,
+        object_counts={"dict": dicts, "list": 500},
+        phase_p99_ms={"stage7_cycle": p99_ms},
+    )
+
+
+def test_monotonic_rss_growth_is_reported_as_leak() -> None:
+    thresholds = SoakThresholds(warmup_samples=1, max_rss_growth_bytes=10_000_000)
+    samples = [
+        _sample(cycle, rss=100_000_000 + cycle * 5_000_000, p99_ms=20.0) for cycle in range(8)
+    ]
+
+    checks = {check.name: check for check in evaluate_soak_samples(samples, thresholds)}
+
+    assert checks["rss_bytes"].ok is False
+    assert checks["rss_bytes"].growth == 30_000_000
+    assert checks["rss_bytes"].monotonic_fraction == 1.0
+    assert checks["open_fds"].ok is True
+
+
+def test_noisy_rss_without_trend_passes() -> None:
+    thresholds = SoakThresholds(warmup_samples=0, max_rss_growth_bytes=10_000_000)
+    rss = [100, 160, 90, 150, 95, 170, 120]
+    samples = [_sample(i, rss=value * 1_000_000, p99_ms=20.0) for i, value in enumerate(rss)]
+
+    checks = {check.name: check for check in evaluate_soak_samples(samples, thresholds)}
+
+    assert checks["rss_bytes"].growth == 20_000_000
+    assert checks["rss_bytes"].ok is True
+
+
+def test_object_growth_and_p99_drift_are_flagged() -> None:
+    thresholds = SoakThresholds(warmup_samples=0, max_object_growth=1000)
+    samples = [
+        _sample(cycle, rss=100_000_000, p99_ms=20.0 + cycle * 5, dicts=1000 + cycle * 600)
+        for cycle in range(4)
+    ]
+
+    checks = {check.name: check for check in evaluate_soak_samples(samples, thresholds)}
+
+    assert checks["objects:dict"].ok is False
+    assert "objects:list" not in checks
+    assert checks["p99_ms:stage7_cycle"].ok is False
+    assert checks["p99_ms:stage7_cycle"].growth == 15.0
+
+
+def test_short_replay_soak_reports_samples(tmp_path) -> None:
+    settings = Settings(
+        DRY_RUN=True,
+        KILL_SWITCH=False,
+        STATE_DB_PATH=str(tmp_path / "soak.db"),
+        SYMBOLS="BTC_TRY,ETH_TRY",
+    )
+    replay = synthetic_replay(settings.symbols, hours=0.5, step_seconds=60, seed=7)
+
+    report = SoakHarness(run_stage4=False).run(settings, replay=replay, cycles=12, sample_every=3)
+
+    assert report.cycles_run == 12
+    assert report.cycle_failures == 0
+    assert report.simulated_seconds == 11 * 60
+    assert [sample.cycle for sample in report.samples] == [3, 6, 9, 12]
+    assert "stage7_cycle" in report.samples[-1].phase_p99_ms
+    assert report.to_dict()["samples"][0]["top_object_types"]
+    assert format_soak_report(report).startswith("# Soak report:")
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import math
+import random
+
+import pytest
+
 from btcbot.domain.risk_budget import Mode
 from btcbot.obs.alert_engine import AlertDedupe, AlertRuleEvaluator, MetricWindowStore
 from btcbot.obs.alerts import BASELINE_ALERT_RULES, DRY_RUN_ALERT_RULES, AlertRule
 from btcbot.obs.stage4_alarm_hook import build_cycle_metrics
+from btcbot.services.state_store import StateStore
 
 
 def test_condition_parser_rate_and_value() -> None:
@@ -186,3 +192,63 @@ def test_baseline_alerts_trigger_api_spike_cycle_stuck_and_reject_1123() -> None
     assert "api_error_rate_spike" in names
     assert "stuck_cycles" in names
     assert "reject_spike_1123" in names
+
+
+def _reference_window_stats(samples: list[tuple[int, float]], window_seconds: int):
+    # Sort-per-query implementation the incremental windows replaced.
+    cutoff = samples[-1][0] - window_seconds
+    window = [(ts, value) for ts, value in samples if ts >= cutoff]
+    (first_ts, first_value), (last_ts, last_value) = window[0], window[-1]
+    elapsed_minutes = (last_ts - first_ts) / 60.0
+    ordered = sorted(value for _, value in window)
+    rank = max(1, math.ceil(0.95 * len(ordered)))
+    return {
+        "value": last_value,
+        "delta": last_value - first_value,
+        "rate_per_minute": (last_value - first_value) / elapsed_minutes if elapsed_minutes else 0.0,
+        "p95": ordered[rank - 1],
+        "count": float(len(window)),
+    }
+
+
+def test_incremental_windows_match_sorted_reference() -> None:
+    rng = random.Random(11)
+    store = MetricWindowStore(max_samples_per_metric=64)
+    samples: list[tuple[int, float]] = []
+    ts = 0
+    for step in range(400):
+        ts += rng.choice([0, 5, 30, 60, 240])
+        value = rng.choice([0.0, -3.5, rng.uniform(0, 10_000), float(step)])
+        store.record("m", value, ts)
+        samples = [*samples, (ts, value)][-64:]
+        for window, seconds in (("1m", 60), ("5m", 300), ("1h", 3600)):
+            actual = store.compute(window, "m")
+            expected = _reference_window_stats(samples, seconds)
+            assert {k: v for k, v in actual.items() if k != "p95"} == pytest.approx(
+                {k: v for k, v in expected.items() if k != "p95"}
+            )
+            assert actual["p95"] == pytest.approx(expected["p95"], rel=0.02, abs=1e-9)
+
+
+def test_alert_windows_survive_restart(tmp_path) -> None:
+    state_store = StateStore(str(tmp_path / "state.db"))
+    store = MetricWindowStore()
+    for minute in range(6):
+        store.record("bot_api_errors_total", minute * 15, minute * 60)
+    store.compute("5m", "bot_api_errors_total")
+    store.persist(state_store)
+
+    restarted = MetricWindowStore()
+    restarted.record("bot_api_errors_total", 90, 360)
+    restarted.load(StateStore(str(tmp_path / "state.db")))
+
+    # Samples from before the restart (ts 60..300) are back in the 5m window.
+    assert restarted.compute("5m", "bot_api_errors_total") == {
+        "value": 90.0,
+        "delta": 75.0,
+        "rate_per_minute": 15.0,
+        "p95": 90.0,
+        "count": 6.0,
+    }
+    events = AlertRuleEvaluator().evaluate_rules(BASELINE_ALERT_RULES, restarted, now_epoch=360)
+    assert "api_error_rate_spike" in {event.rule_name for event in events}
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import shutil
 import sqlite3
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
 
 from btcbot.config import Settings
 from btcbot.services.market_data_replay import MarketDataReplay
-from btcbot.services.parity import compute_run_fingerprint
+from btcbot.services.parity import compute_run_fingerprint, find_first_divergence
 from btcbot.services.stage7_backtest_runner import Stage7BacktestRunner
 from btcbot.services.stage7_single_cycle_driver import Stage7SingleCycleDriver
 from btcbot.services.state_store import StateStore
@@ -250,3 +252,89 @@ def test_backtest_repeated_run_same_db_does_not_duplicate_cycles(tmp_path: Path)
         ).fetchone()[0]
 
     assert int(cycle_count) == int(unique_cycle_count)
+
+
+_T0 = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _save_parity_cycle(store: StateStore, idx: int, *, net: str = "1.5") -> None:
+    store.save_stage7_cycle(
+        cycle_id=f"c{idx:03d}",
+        ts=_T0 + timedelta(minutes=idx),
+        selected_universe=["BTCTRY"],
+        universe_scores=[],
+        intents_summary={"order_intents_total": idx % 3},
+        mode_payload={"base_mode": "NORMAL", "final_mode": "NORMAL"},
+        order_decisions=[],
+        portfolio_plan={},
+        ledger_metrics={
+            "gross_pnl_try": Decimal("2"),
+            "realized_pnl_try": Decimal("2"),
+            "unrealized_pnl_try": Decimal("0"),
+            "net_pnl_try": Decimal(net),
+            "fees_try": Decimal("0.3"),
+            "slippage_try": Decimal("0.2"),
+            "turnover_try": Decimal("100"),
+            "equity_try": Decimal("1000"),
+            "max_drawdown": Decimal("0"),
+        },
+    )
+
+
+def _scan_only_copy(db_path: Path, tmp_path: Path) -> Path:
+    copy = tmp_path / f"scan_{db_path.name}"
+    shutil.copy(db_path, copy)
+    with sqlite3.connect(copy) as conn:
+        conn.execute("DROP TABLE stage7_cycle_fingerprints")
+    return copy
+
+
+def test_stored_fingerprint_chain_matches_raw_recompute(tmp_path: Path) -> None:
+    db_path = tmp_path / "chain.db"
+    store = StateStore(str(db_path))
+    for idx in [0, 1, 2, 5, 4, 3, 6, 7]:  # out-of-order writes re-chain the tail
+        _save_parity_cycle(store, idx)
+    _save_parity_cycle(store, 2, net="1.25")  # rewrite
+    store.update_stage7_cycle_adaptation_metadata(
+        cycle_id="c006", active_param_version=3, param_change=None
+    )
+    scan_db = _scan_only_copy(db_path, tmp_path)
+
+    for start, end in [(0, 10), (0, 4), (3, 6)]:
+        for adaptation in (False, True):
+            args = (_T0 + timedelta(minutes=start), _T0 + timedelta(minutes=end))
+            assert compute_run_fingerprint(
+                db_path, *args, include_adaptation=adaptation
+            ) == compute_run_fingerprint(scan_db, *args, include_adaptation=adaptation)
+
+
+def test_first_divergence_reports_cycle_and_field(tmp_path: Path) -> None:
+    db_a = tmp_path / "a.db"
+    db_b = tmp_path / "b.db"
+    store_a = StateStore(str(db_a))
+    store_b = StateStore(str(db_b))
+    for idx in range(40):
+        _save_parity_cycle(store_a, idx)
+        _save_parity_cycle(store_b, idx, net="1.4" if idx == 23 else "1.5")
+    _save_parity_cycle(store_b, 40)
+    start, end = _T0, _T0 + timedelta(hours=1)
+
+    divergence = find_first_divergence(db_a, db_b, start, end)
+    assert divergence is not None
+    assert (divergence["index"], divergence["cycle_id_a"], divergence["fields"]) == (
+        23,
+        "c023",
+        ["net_pnl_try"],
+    )
+    assert divergence["values_b"] == {"net_pnl_try": "1.4"}
+    assert (
+        find_first_divergence(
+            _scan_only_copy(db_a, tmp_path), _scan_only_copy(db_b, tmp_path), start, end
+        )
+        == divergence
+    )
+
+    tail = find_first_divergence(db_a, db_b, _T0 + timedelta(minutes=30), end)
+    assert tail is not None
+    assert (tail["index"], tail["cycle_id_a"], tail["cycle_id_b"]) == (10, None, "c040")
+    assert find_first_divergence(db_a, db_a, start, end) is None
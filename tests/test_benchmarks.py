@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+
+from benchmarks.cases import CASES
+from benchmarks.runner import BASELINE_PATH, compare_to_baseline, run_benchmarks
+
+
+def test_every_case_runs_and_has_a_baseline(tmp_path) -> None:
+    for case in CASES:
+        case_dir = tmp_path / case.name
+        case_dir.mkdir()
+        case.setup(case_dir)()
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    assert {item["name"] for item in baseline["results"]} == {case.name for case in CASES}
+
+
+def test_compare_flags_slowdowns_beyond_tolerance() -> None:
+    baseline = {"results": [{"name": "a", "normalized": 10.0}, {"name": "b", "normalized": 4.0}]}
+    current = {
+        "results": [
+            {"name": "a", "normalized": 12.0},
+            {"name": "b", "normalized": 5.2},
+            {"name": "c", "normalized": 1.0},
+        ]
+    }
+
+    statuses = {
+        item.name: item.status for item in compare_to_baseline(current, baseline, tolerance=0.25)
+    }
+
+    assert statuses == {"a": "ok", "b": "regressed", "c": "new"}
+
+
+def test_run_benchmarks_reports_normalized_timings() -> None:
+    results = run_benchmarks([CASES[2]], repeats=2, min_time_s=0.001)["results"]
+
+    assert results[0]["name"] == "money_policy.size_order_from_notional"
+    assert results[0]["normalized"] > 0
+    assert results[0]["best_ns"] <= results[0]["median_ns"]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import base64
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from btcbot.adapters.btcturk_http import BtcturkHttpClient, BtcturkHttpClientStage4
+from btcbot.adapters.btcturk_simulator import (
+    BtcturkSimulatorServer,
+    FaultProfile,
+    LatencyProfile,
+    SimulatedExchange,
+    SimulatedPair,
+)
+
+_SECRET = base64.b64encode(b"simulator-secret").decode()
+
+
+def _exchange(**kwargs) -> SimulatedExchange:
+    pairs = [SimulatedPair(symbol="BTCTRY", mid_price=Decimal("1000000"))]
+    return SimulatedExchange(pairs, balances={"TRY": Decimal("100000")}, seed=7, **kwargs)
+
+
+def _client(server: BtcturkSimulatorServer) -> BtcturkHttpClient:
+    return BtcturkHttpClient(api_key="sim-key", api_secret=_SECRET, base_url=server.base_url)
+
+
+def test_simulator_serves_public_endpoints_to_http_client() -> None:
+    with BtcturkSimulatorServer(_exchange()) as server:
+        client = _client(server)
+        try:
+            bid, ask = client.get_orderbook("BTC_TRY")
+            assert Decimal("0") < bid < ask
+
+            tickers = client.get_ticker_stats()
+            assert [row["pairSymbol"] for row in tickers] == ["BTCTRY"]
+
+            pairs = client.get_exchange_info()
+            assert pairs[0].pair_symbol == "BTCTRY"
+            assert pairs[0].min_total_amount == Decimal("10")
+            assert pairs[0].tick_size == Decimal("0.01")
+        finally:
+            client.close()
+
+
+def test_simulator_matches_marketable_order_and_rests_passive_order() -> None:
+    with BtcturkSimulatorServer(_exchange(volatility_bps=Decimal("0"))) as server:
+        client = _client(server)
+        stage4 = BtcturkHttpClientStage4(client)
+        try:
+            bid, ask = client.get_orderbook("BTCTRY")
+
+            taker = client.submit_limit_order("BTCTRY", "buy", ask, Decimal("0.01"), "cid-taker")
+            fills = stage4.get_recent_fills("BTCTRY")
+            assert [fill.order_id for fill in fills] == [taker.exchange_order_id]
+            assert fills[0].price == ask
+
+            resting_price = (bid - Decimal("1000")).quantize(Decimal("0.01"))
+            maker = client.submit_limit_order(
+                "BTCTRY", "buy", resting_price, Decimal("0.01"), "cid-maker"
+            )
+            open_orders = stage4.list_open_orders("BTCTRY")
+            assert [order.client_order_id for order in open_orders] == ["cid-maker"]
+
+            assert client.cancel_order(maker.exchange_order_id) is True
+            assert stage4.list_open_orders("BTCTRY") == []
+
+            balances = {item.asset: item for item in client.get_balances()}
+            assert balances["BTC"].free == Decimal("0.01")
+            assert balances["TRY"].locked == Decimal("0")
+        finally:
+            client.close()
+
+
+def test_simulator_rejects_min_total_with_btcturk_error_code() -> None:
+    with BtcturkSimulatorServer(_exchange()) as server:
+        response = httpx.post(
+            f"{server.base_url}/api/v1/order",
+            json={
+                "pairSymbol": "BTCTRY",
+                "price": "100",
+                "quantity": "0.01",
+                "orderMethod": "limit",
+                "orderType": "buy",
+                "newOrderClientId": "cid-small",
+            },
+            headers={"X-PCK": "sim-key", "X-Signature": "sig", "X-Stamp": "1"},
+        )
+        assert response.status_code == 400
+        assert response.json()["code"] == 1123
+        assert response.json()["message"] == "FAILED_MIN_TOTAL_AMOUNT"
+
+
+def test_simulator_injects_429_and_storms_and_counts_them() -> None:
+    faults = FaultProfile(rate_429_probability=1.0, retry_after_seconds=2)
+    with BtcturkSimulatorServer(_exchange(), faults=faults) as server:
+        response = httpx.get(f"{server.base_url}/api/v2/ticker")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        stats = httpx.get(f"{server.base_url}/__sim/stats").json()["data"]
+        assert stats["by_status"] == {"429": 1}
+
+    storm = FaultProfile(storm_every_seconds=60.0, storm_duration_seconds=60.0)
+    with BtcturkSimulatorServer(_exchange(), faults=storm) as server:
+        assert httpx.get(f"{server.base_url}/api/v2/ticker").status_code == 503
+
+
+def test_simulator_private_endpoints_require_auth_headers() -> None:
+    with BtcturkSimulatorServer(_exchange()) as server:
+        response = httpx.get(f"{server.base_url}/api/v1/users/balances")
+        assert response.status_code == 401
+
+
+def test_latency_and_fault_profiles_validate_inputs() -> None:
+    with pytest.raises(ValueError):
+        LatencyProfile(distribution="pareto")
+    with pytest.raises(ValueError):
+        FaultProfile(rate_429_probability=1.5)
+    with pytest.raises(ValueError):
+        FaultProfile(storm_status_code=429)
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from time import time
+
+import httpx
+
+from btcbot.adapters.btcturk_http import BtcturkHttpClient
+from btcbot.domain.market_data_models import Candle
+from btcbot.services.candle_store import CandleStore
+
+
+def _candle(ts: datetime, close: str) -> Candle:
+    price = Decimal(close)
+    return Candle(ts=ts, open=price, high=price, low=price, close=price, volume=Decimal("2"))
+
+
+def test_candle_store_serves_most_recent_candles_oldest_first(tmp_path) -> None:
+    store = CandleStore(str(tmp_path / "candles.db"), interval_seconds=3600)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    store.upsert_candles(
+        "BTC_TRY",
+        [_candle(start + timedelta(hours=idx), str(100 + idx)) for idx in range(10)],
+        source="kline",
+    )
+
+    candles = store.get_candles("BTCTRY", 3)
+
+    assert [item.close for item in candles] == [Decimal("107"), Decimal("108"), Decimal("109")]
+    assert candles[-1].ts == start + timedelta(hours=9)
+    assert store.latest_bucket_epoch("BTCTRY") == int((start + timedelta(hours=9)).timestamp())
+    assert store.get_candles("ETHTRY", 3) == []
+
+
+def test_record_prices_extends_buckets_incrementally(tmp_path) -> None:
+    store = CandleStore(str(tmp_path / "candles.db"), interval_seconds=60)
+    t0 = datetime(2025, 1, 1, 12, 0, 5, tzinfo=UTC)
+    store.upsert_candles("BTCTRY", [_candle(t0, "100")], source="kline")
+
+    store.record_prices([("BTCTRY", t0 + timedelta(seconds=10), Decimal("104"))])
+    store.record_prices(
+        [
+            ("BTCTRY", t0 + timedelta(seconds=20), Decimal("97")),
+            ("BTCTRY", t0 + timedelta(seconds=30), Decimal("99")),
+            ("BTCTRY", t0 + timedelta(seconds=70), Decimal("101")),
+        ]
+    )
+
+    first, second = store.get_candles("BTCTRY", 5)
+    assert (first.open, first.high, first.low, first.close) == (
+        Decimal("100"),
+        Decimal("104"),
+        Decimal("97"),
+        Decimal("99"),
+    )
+    assert first.volume == Decimal("2")
+    assert (second.open, second.close, second.volume) == (
+        Decimal("101"),
+        Decimal("101"),
+        Decimal("0"),
+    )
+
+
+def test_http_client_backfills_once_then_serves_from_store(tmp_path) -> None:
+    store = CandleStore(str(tmp_path / "candles.db"), interval_seconds=3600)
+    now_bucket = store.bucket_epoch(time())
+    kline_requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/klines/history":
+            kline_requests.append(request)
+            times = [now_bucket - 3600 * idx for idx in (2, 1, 0)]
+            return httpx.Response(
+                200,
+                json={
+                    "s": "ok",
+                    "t": times,
+                    "o": [100, 101, 102],
+                    "h": [101, 102, 103],
+                    "l": [99, 100, 101],
+                    "c": [101, 102, 103],
+                    "v": [1.5, 2.5, 3.5],
+                },
+            )
+        if request.url.path == "/api/v2/ticker":
+            return httpx.Response(
+                200,
+                json={"success": True, "data": [{"pairSymbol": "BTCTRY", "last": "105"}]},
+            )
+        return httpx.Response(404)
+
+    client = BtcturkHttpClient(
+        transport=httpx.MockTransport(handler),
+        base_url="https://api.btcturk.com",
+        graph_base_url="https://graph.example",
+        candle_store=store,
+        candle_backfill_limit=50,
+    )
+    try:
+        candles = client.get_candles("BTC_TRY", 2)
+        assert [row["close"] for row in candles] == ["102", "103"]
+        assert len(kline_requests) == 1
+        assert kline_requests[0].url.host == "graph.example"
+        assert kline_requests[0].url.params["symbol"] == "BTCTRY"
+        assert kline_requests[0].url.params["resolution"] == "60"
+
+        client.get_ticker_stats()
+        candles = client.get_candles("BTCTRY", 1)
+        assert candles[0]["close"] == "105"
+        assert candles[0]["high"] == "105"
+        assert len(kline_requests) == 1
+    finally:
+        client.close()
+
+
+def test_http_client_backfills_after_ticker_observed_current_bucket(tmp_path) -> None:
+    store = CandleStore(str(tmp_path / "candles.db"), interval_seconds=3600)
+    now_bucket = store.bucket_epoch(time())
+    kline_starts: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/klines/history":
+            start = int(request.url.params["from"])
+            kline_starts.append(start)
+            times = [bucket for bucket in range(start, now_bucket + 1, 3600)]
+            return httpx.Response(
+                200,
+                json={
+                    "s": "ok",
+                    "t": times,
+                    "o": [100] * len(times),
+                    "h": [101] * len(times),
+                    "l": [99] * len(times),
+                    "c": [100] * len(times),
+                    "v": [1] * len(times),
+                },
+            )
+        return httpx.Response(
+            200, json={"success": True, "data": [{"pairSymbol": "BTCTRY", "last": "105"}]}
+        )
+
+    client = BtcturkHttpClient(
+        transport=httpx.MockTransport(handler),
+        graph_base_url="https://graph.example",
+        candle_store=store,
+        candle_backfill_limit=24,
+    )
+    try:
+        # Real cycle order: the ticker writes the current bucket before candles are read.
+        client.get_ticker_stats()
+        assert len(client.get_candles("BTCTRY", 30)) == 25
+        assert kline_starts == [now_bucket - 24 * 3600]
+
+        client.get_ticker_stats()
+        client.get_candles("BTCTRY", 30)
+        assert len(kline_starts) == 1
+
+        # Buckets after the newest kline candle that were never observed: gap backfill.
+        with sqlite3.connect(store.db_path) as conn:
+            conn.execute(
+                "DELETE FROM market_candles WHERE bucket_epoch >= ?", (now_bucket - 5 * 3600,)
+            )
+        client.get_ticker_stats()
+        client.get_candles("BTCTRY", 30)
+        assert kline_starts[1:] == [now_bucket - 6 * 3600]
+    finally:
+        client.close()
+
+
+def test_http_client_without_store_keeps_empty_candles() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError(f"unexpected request {request.url}")
+
+    client = BtcturkHttpClient(transport=httpx.MockTransport(handler))
+    try:
+        assert client.get_candles("BTCTRY", 20) == []
+    finally:
+        client.close()
+
+
+def test_http_client_backfill_failure_falls_back_to_observed_candles(tmp_path) -> None:
+    store = CandleStore(str(tmp_path / "candles.db"), interval_seconds=3600)
+    store.record_prices([("BTCTRY", datetime.now(UTC), Decimal("100"))])
+    store.upsert_candles(
+        "ETHTRY", [_candle(datetime.now(UTC) - timedelta(days=3), "50")], source="kline"
+    )
+    calls = {"klines": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["klines"] += 1
+        return httpx.Response(400)
+
+    client = BtcturkHttpClient(transport=httpx.MockTransport(handler), candle_store=store)
+    try:
+        # Observed candles alone are not history: backfill is attempted, then backs off.
+        assert [row["close"] for row in client.get_candles("BTCTRY", 5)] == ["100"]
+        assert [row["close"] for row in client.get_candles("BTCTRY", 5)] == ["100"]
+        assert calls["klines"] == 1
+        assert [row["close"] for row in client.get_candles("ETHTRY", 5)] == ["50"]
+        assert [row["close"] for row in client.get_candles("ETHTRY", 5)] == ["50"]
+        assert calls["klines"] == 2
+    finally:
+        client.close()
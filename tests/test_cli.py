@@ -2598,8 +2598,8 @@ def test_main_doctor_runs_without_state_db_path(monkeypatch) -> None:
 
     captured: dict[str, object] = {}
 
-    def _fake_run_doctor(*, settings, db_path, dataset_path, json_output):
-        del settings, dataset_path, json_output
+    def _fake_run_doctor(*, settings, db_path, dataset_path, json_output, db_perf, apply_indexes):
+        del settings, dataset_path, json_output, db_perf, apply_indexes
         captured["db_path"] = db_path
         return 0
 
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from btcbot import cli
+from btcbot.config import Settings
+from btcbot.obs.cycle_trace import (
+    CycleTracer,
+    active_tracer,
+    format_hotspot_table,
+    trace_phase,
+    trace_span,
+    traced,
+)
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.value = 0
+
+    def __call__(self) -> int:
+        return self.value
+
+
+def test_phases_nest_under_spans_and_count_calls() -> None:
+    http = _Counter()
+    sql = _Counter()
+    tracer = CycleTracer({"http_calls": http, "sql_calls": sql})
+
+    @traced("ledger.report")
+    def report() -> str:
+        sql.value += 2
+        return "ok"
+
+    with tracer.activate():
+        for _ in range(2):
+            with trace_span("cycle"):
+                trace_phase("universe")
+                http.value += 1
+                trace_phase("ledger")
+                sql.value += 1
+                assert report() == "ok"
+                trace_phase("execution")
+                http.value += 3
+    assert active_tracer() is None
+
+    cycle = tracer.root.children["cycle"]
+    assert list(cycle.children) == ["universe", "ledger", "execution"]
+    assert cycle.calls == 2
+    assert cycle.counters == {"http_calls": 8, "sql_calls": 6}
+    ledger = cycle.children["ledger"]
+    assert ledger.calls == 2
+    assert ledger.counters == {"http_calls": 0, "sql_calls": 6}
+    assert ledger.self_counter("sql_calls") == 2
+    assert ledger.children["ledger.report"].counters["sql_calls"] == 4
+    assert cycle.children["execution"].counters["http_calls"] == 6
+
+    spans = {row["span"]: row for row in tracer.hotspots(top_n=10)}
+    assert spans["cycle;ledger;ledger.report"]["calls"] == 2
+    assert spans["cycle;ledger"]["sql_calls"] == 2
+    table = format_hotspot_table(list(spans.values()))
+    assert table.splitlines()[0].split() == [
+        "span",
+        "calls",
+        "total_ms",
+        "self_ms",
+        "self_cpu_ms",
+        "http_calls",
+        "sql_calls",
+    ]
+
+
+def test_helpers_are_noops_without_active_tracer() -> None:
+    calls: list[int] = []
+
+    @traced("idle")
+    def work(value: int) -> int:
+        calls.append(value)
+        return value * 2
+
+    trace_phase("ignored")
+    with trace_span("ignored"):
+        assert work(21) == 42
+    assert calls == [21]
+
+
+def test_collapsed_stacks_report_self_time_in_microseconds() -> None:
+    tracer = CycleTracer()
+    with tracer.activate(), trace_span("cycle"):
+        trace_phase("planning")
+        sum(range(20000))
+
+    lines = tracer.collapsed_stacks()
+    assert lines
+    for line in lines:
+        stack, value = line.rsplit(" ", 1)
+        assert stack.startswith("profile;cycle")
+        assert int(value) > 0
+    assert any(line.startswith("profile;cycle;planning ") for line in lines)
+
+
+def test_profile_cycle_command_writes_collapsed_stacks(monkeypatch, tmp_path, capsys) -> None:
+    class _FakeRunner:
+        @traced("stage4_cycle")
+        def run_one_cycle(self, settings: Settings) -> int:
+            assert settings.dry_run is True
+            assert settings.sqlite_profile_enabled is True
+            trace_phase("planning")
+            sum(range(20000))
+            trace_phase("execution")
+            return 0
+
+    monkeypatch.setattr(cli, "Stage4CycleRunner", _FakeRunner)
+    out_path = tmp_path / "cycle.collapsed"
+
+    rc = cli.run_profile_cycle(
+        Settings(_env_file=None),
+        cycles=3,
+        source="live",
+        seed=0,
+        db_path=str(tmp_path / "state.db"),
+        out_path=str(out_path),
+        top_n=5,
+    )
+
+    assert rc == 0
+    stacks = out_path.read_text(encoding="utf-8").splitlines()
+    assert any(line.startswith("profile;stage4_cycle;planning ") for line in stacks)
+    output = capsys.readouterr().out
+    assert "stage4_cycle;planning" in output
+    assert "profile-cycle: 3 cycle(s) from live, 0 failed" in output
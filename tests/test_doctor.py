@@ -8,7 +8,15 @@ import pytest
 
 from btcbot import cli
 from btcbot.config import Settings
-from btcbot.services.doctor import DoctorCheck, DoctorReport, run_health_checks
+from btcbot.services.db_perf import plan_flags
+from btcbot.services.doctor import (
+    DoctorCheck,
+    DoctorReport,
+    _run_db_perf_checks,
+    apply_missing_indexes,
+    run_health_checks,
+)
+from btcbot.services.state_store import StateStore
 
 
 def _fixture_symbols(name: str) -> list[dict[str, object]]:
@@ -668,3 +676,45 @@ def test_doctor_ops_checks_fail_on_monitor_live_db_path(
     checks = {(check.category, check.name): check for check in report.checks}
     assert checks[("ops", "shared_db_between_roles")].status == "fail"
     assert any("state-db-unlock" in action for action in report.actions)
+
+
+def test_db_perf_audit_proposes_and_applies_missing_indexes(tmp_path) -> None:
+    db_path = str(tmp_path / "state.db")
+    StateStore(db_path).release_instance_lock()
+    checks: list[DoctorCheck] = []
+    actions: list[str] = []
+
+    _run_db_perf_checks(db_path=db_path, checks=checks, actions=actions)
+
+    by_name = {check.name: check for check in checks}
+    open_orders = by_name["plan_open_or_unknown_orders"]
+    assert open_orders.status == "warn"
+    assert "flags=full_scan" in open_orders.message
+    assert "idx_orders_status_symbol" in open_orders.message
+    ledger_tail = by_name["plan_ledger_checkpoint_tail"]
+    assert "temp_btree" in ledger_tail.message
+    # Sorting the (small) open-order set is an accepted temp B-tree.
+    assert by_name["plan_stage4_open_orders"].status == "pass"
+    assert by_name["object_sizes"].message.startswith("largest=")
+    assert "Apply missing indexes: btcbot doctor --db-perf --apply-indexes" in actions
+
+    applied = apply_missing_indexes(db_path)
+
+    assert {"idx_orders_status_symbol", "idx_ledger_events_ts_event_id"} <= set(applied)
+    checks_after: list[DoctorCheck] = []
+    actions_after: list[str] = []
+    _run_db_perf_checks(db_path=db_path, checks=checks_after, actions=actions_after)
+    assert all(check.status == "pass" for check in checks_after)
+    assert actions_after == []
+    assert apply_missing_indexes(db_path) == []
+
+
+def test_plan_flags_distinguish_index_walks_from_full_scans() -> None:
+    assert plan_flags(["SCAN orders"]) == ["full_scan"]
+    assert plan_flags(["SCAN pnl_snapshots USING INDEX idx_pnl_snapshots_ts"]) == []
+    assert plan_flags(
+        [
+            "SEARCH stage4_orders USING INDEX idx_stage4_orders_status (status=?)",
+            "USE TEMP B-TREE FOR ORDER BY",
+        ]
+    ) == ["temp_btree"]
@@ -561,3 +561,93 @@ def test_unparseable_timestamp_is_soft_failure_with_fetch_time_fallback(tmp_path
     assert diagnostics.get("timestamp_parse_fail_count", 0) >= 1
     assert diagnostics.get("orderbook_unavailable_count") == 0
     assert diagnostics.get("depth_unavailable_count") == 0
+
+
+def _count_connections(store: StateStore, monkeypatch) -> list[int]:
+    calls = [0]
+    original = store._connect
+
+    def _counting_connect():
+        calls[0] += 1
+        return original()
+
+    monkeypatch.setattr(store, "_connect", _counting_connect)
+    return calls
+
+
+def test_selection_query_count_is_independent_of_scan_budget(tmp_path, monkeypatch) -> None:
+    now = datetime(2025, 1, 2, 12, 0, tzinfo=UTC)
+    connections: list[int] = []
+    for size in (2, 12):
+        store = StateStore(db_path=str(tmp_path / f"state-{size}.db"))
+        symbols = [f"S{idx:03d}TRY" for idx in range(size)]
+        exchange = _MockExchange(
+            _MockClient(symbols, {s: ("120", "500", "121", "500") for s in symbols}, ts=now)
+        )
+        _seed_lookback(store, now, symbols)
+        calls = _count_connections(store, monkeypatch)
+        result = DynamicUniverseService().select(
+            exchange=exchange,
+            state_store=store,
+            settings=Settings(
+                DRY_RUN=True,
+                KILL_SWITCH=False,
+                SYMBOLS="[]",
+                UNIVERSE_TOP_N=2,
+                UNIVERSE_SCAN_BUDGET_SYMBOLS=size,
+                UNIVERSE_MAX_ORDERBOOK_REQUESTS_PER_CYCLE=size,
+                UNIVERSE_SPREAD_MAX_BPS=Decimal("200"),
+                UNIVERSE_MIN_DEPTH_TRY=Decimal("1"),
+            ),
+            now_utc=now,
+            cycle_id=f"batch-{size}",
+        )
+        assert len(result.selected_symbols) == 2
+        connections.append(calls[0])
+
+    assert connections[0] == connections[1]
+
+
+def test_reject_1123_cooldown_is_written_in_batch(tmp_path) -> None:
+    now = datetime(2025, 1, 2, 12, 0, tzinfo=UTC)
+    store = StateStore(db_path=str(tmp_path / "state.db"))
+    exchange = _MockExchange(
+        _MockClient(
+            ["AAAATRY", "BBBBTRY"],
+            {
+                "AAAATRY": ("120", "500", "121", "500"),
+                "BBBBTRY": ("120", "500", "121", "500"),
+            },
+            ts=now,
+        )
+    )
+    _seed_lookback(store, now, ["AAAATRY", "BBBBTRY"])
+    store.upsert_dynamic_universe_symbol_state(
+        symbol="AAAATRY",
+        updated_at=now,
+        reject_window_start_ts=now - timedelta(minutes=1),
+        reject_counts={"1123": 10},
+    )
+
+    result = DynamicUniverseService().select(
+        exchange=exchange,
+        state_store=store,
+        settings=Settings(
+            DRY_RUN=True,
+            KILL_SWITCH=False,
+            SYMBOLS="[]",
+            UNIVERSE_SPREAD_MAX_BPS=Decimal("200"),
+            UNIVERSE_MIN_DEPTH_TRY=Decimal("1"),
+        ),
+        now_utc=now,
+        cycle_id="reject-1",
+    )
+
+    assert result.selected_symbols == ("BBBBTRY",)
+    assert result.ineligible_counts["reject_1123"] == 1
+    states = store.load_dynamic_universe_states(["AAAATRY", "BBBBTRY", "CCCCTRY"])
+    assert set(states) == {"AAAATRY", "BBBBTRY"}
+    assert states["AAAATRY"]["cooldown_until_ts"] is not None
+    assert states["AAAATRY"]["reject_counts"] == {"1123": 10}
+    assert states["BBBBTRY"]["last_selected_ts"] == now.isoformat()
+    assert states["BBBBTRY"]["probation_until_ts"] is not None
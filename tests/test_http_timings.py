@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import UTC, datetime
+
+import httpx
+
+from btcbot.adapters.btcturk_http import BtcturkHttpClient
+from btcbot.obs.http_timings import (
+    HttpTimingCapture,
+    begin_http_timing_capture,
+    endpoint_label,
+)
+from btcbot.services.rate_limiter import EndpointBudget
+from btcbot.services.state_store import StateStore
+
+
+def _ticker_client(**kwargs: object) -> BtcturkHttpClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v2/ticker"
+        return httpx.Response(200, json={"success": True, "data": [{"pair": "BTCTRY"}]})
+
+    return BtcturkHttpClient(
+        transport=httpx.MockTransport(handler),
+        base_url="https://api.btcturk.com",
+        live_rules_require_exchangeinfo=False,
+        **kwargs,
+    )
+
+
+def test_endpoint_label_collapses_id_segments() -> None:
+    assert endpoint_label("delete", "/api/v1/order/123456") == "DELETE /api/v1/order/{id}"
+    assert endpoint_label("GET", "https://api.btcturk.com/api/v2/ticker?pairSymbol=X") == (
+        "GET /api/v2/ticker"
+    )
+
+
+def test_capture_summarizes_endpoints_and_groups() -> None:
+    capture = HttpTimingCapture()
+    for total in (10.0, 20.0, 30.0):
+        capture.add(
+            "GET /api/v2/ticker",
+            "market_data",
+            {"limiter_wait_ms": 5.0, "total_ms": total, "response_bytes": 100},
+        )
+
+    summary = capture.summary()
+
+    ticker = summary["endpoints"]["GET /api/v2/ticker"]
+    assert ticker["requests"] == 3
+    assert ticker["total_ms"] == {"count": 3, "sum": 60.0, "p50": 20.0, "p95": 30.0, "max": 30.0}
+    assert "connect_ms" not in ticker
+    assert summary["groups"]["market_data"] == {
+        "requests": 3,
+        "limiter_wait_ms": 15.0,
+        "wire_ms": 60.0,
+        "bytes_in": 300,
+    }
+
+
+def test_client_requests_feed_capture_and_health_snapshot() -> None:
+    assert begin_http_timing_capture(enabled=False) is None
+    capture = begin_http_timing_capture(enabled=True)
+    assert capture is not None
+    client = _ticker_client()
+    client.get_ticker_stats()
+    client.get_ticker_stats()
+    snapshot = client.health_snapshot()
+    client.close()
+
+    ticker = capture.summary()["endpoints"]["GET /api/v2/ticker"]
+    assert ticker["requests"] == 2
+    assert ticker["response_bytes"]["max"] > 20
+    assert ticker["json_parse_ms"]["count"] == 2
+    assert set(snapshot["endpoint_latency_ms"]["GET /api/v2/ticker"]) == {"p50", "p95", "max"}
+
+
+def test_health_snapshot_reads_latency_windows_during_concurrent_requests() -> None:
+    client = _ticker_client(
+        endpoint_budgets={
+            group: EndpointBudget(group, rps=1000.0, burst=100)
+            for group in ("default", "market_data")
+        }
+    )
+    errors: list[BaseException] = []
+
+    def _requests() -> None:
+        try:
+            for _ in range(25):
+                client.get_ticker_stats()
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    workers = [threading.Thread(target=_requests) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers):
+        client.health_snapshot()
+        time.sleep(0.001)
+    for worker in workers:
+        worker.join()
+    snapshot = client.health_snapshot()
+    client.close()
+
+    assert errors == []
+    assert list(client._latency_window) == ["GET /api/v2/ticker"]
+    assert len(client._latency_window["GET /api/v2/ticker"]) == 100
+    assert snapshot["endpoint_latency_ms"]["GET /api/v2/ticker"]["max"] >= 0
+
+
+def test_run_metrics_persist_http_stats(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    store.save_stage4_run_metrics(
+        cycle_id="c1",
+        ts=datetime(2026, 1, 1, tzinfo=UTC),
+        reasons_no_action=[],
+        intents_created=0,
+        intents_after_risk=0,
+        intents_executed=0,
+        orders_submitted=0,
+        rejects_by_code={},
+        breaker_state="closed",
+        degraded_mode=False,
+        http_stats={"groups": {"market_data": {"requests": 2}}},
+    )
+
+    with sqlite3.connect(str(tmp_path / "state.db")) as con:
+        raw = con.execute("SELECT http_stats_json FROM stage4_run_metrics").fetchone()[0]
+    assert json.loads(raw) == {"groups": {"market_data": {"requests": 2}}}
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from btcbot.config import Settings
+from btcbot.domain.indicators import RollingWindow, SeriesIndicators
+from btcbot.domain.stage4 import PnLSnapshot
+from btcbot.services.decision_pipeline_service import DecisionPipelineService
+from btcbot.services.indicator_engine import (
+    EQUITY_SERIES_KEY,
+    IndicatorEngine,
+    candle_series_key,
+)
+from btcbot.services.risk_budget_service import RiskBudgetService
+from btcbot.services.state_store import StateStore
+from btcbot.services.universe_selection_service import UniverseSelectionService
+
+
+def _population_std(values: list[float]) -> float:
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((item - mean) ** 2 for item in values) / len(values))
+
+
+def test_rolling_window_matches_brute_force_with_revisions() -> None:
+    rng = random.Random(11)
+    window = RollingWindow(7)
+    reference: list[float] = []
+    for step in range(200):
+        value = rng.uniform(-5.0, 5.0)
+        if step % 5 == 4:
+            window.replace_last(value)
+            reference[-1] = value
+        else:
+            window.push(value)
+            reference = (reference + [value])[-7:]
+        assert window.values() == reference
+        assert window.mean == pytest.approx(sum(reference) / len(reference), abs=1e-9)
+        assert window.std == pytest.approx(_population_std(reference), abs=1e-9)
+        assert window.minimum == min(reference)
+        assert window.maximum == max(reference)
+
+
+def test_series_ignores_old_samples_and_revises_forming_candle() -> None:
+    series = SeriesIndicators(window=4, ema_span=3, atr_period=2)
+    for ts, close in [(60, 100.0), (120, 110.0), (180, 99.0)]:
+        assert series.update(ts, close) is True
+    assert series.update(120, 500.0) is False
+
+    series.update(180, 105.0)
+
+    assert series.prices.values() == [100.0, 110.0, 105.0]
+    assert series.returns.values() == pytest.approx([0.1, 105.0 / 110.0 - 1.0])
+    fresh = SeriesIndicators(window=4, ema_span=3, atr_period=2)
+    for ts, close in [(60, 100.0), (120, 110.0), (180, 105.0)]:
+        fresh.update(ts, close)
+    assert series.ema == pytest.approx(fresh.ema)
+    assert series.atr == pytest.approx(fresh.atr)
+
+
+def test_engine_persists_and_restores_state(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    engine = IndicatorEngine(window=5, ema_span=3, atr_period=2)
+    rows = [{"ts": 3600 * idx, "close": str(100 + idx * idx)} for idx in range(8)]
+    assert engine.update_candles("candles:BTCTRY", rows) == 8
+    assert engine.update_candles("candles:BTCTRY", rows) == 1  # only the forming candle
+    assert engine.persist(store) == 1
+    assert engine.persist(store) == 0
+
+    restored = IndicatorEngine(window=5, ema_span=3, atr_period=2)
+    assert restored.restore(store, key_prefix="candles:") == 1
+    before = engine.snapshot("candles:BTCTRY")
+    after = restored.snapshot("candles:BTCTRY")
+    assert before is not None and after is not None
+    # Restore re-derives the running moments from the stored window values.
+    assert float(after.return_std) == pytest.approx(float(before.return_std), rel=1e-12)
+    assert replace(after, return_std=None, return_mean=None) == replace(
+        before, return_std=None, return_mean=None
+    )
+
+    reconfigured = IndicatorEngine(window=6, ema_span=3, atr_period=2)
+    assert reconfigured.restore(store) == 0
+
+
+def test_universe_volatility_from_engine_matches_full_recompute(tmp_path) -> None:
+    closes = [Decimal(str(100 + (idx % 5) * 3 - idx)) for idx in range(30)]
+
+    class _Exchange:
+        def get_candles(self, symbol: str, limit: int) -> list[dict[str, object]]:
+            del symbol
+            return [{"ts": 3600 * idx, "close": str(close)} for idx, close in enumerate(closes)][
+                -limit:
+            ]
+
+    settings = Settings(STATE_DB_PATH=str(tmp_path / "state.db"), STAGE7_VOL_LOOKBACK=10)
+    store = StateStore(settings.state_db_path)
+    service = UniverseSelectionService()
+    engine = IndicatorEngine.from_settings(settings)
+
+    vol = service._fetch_volatility(
+        exchange=_Exchange(),
+        symbol="BTCTRY",
+        settings=settings,
+        ticker_stats={},
+        indicators=engine,
+    )
+    engine.persist(store)
+
+    expected = service._compute_return_std(closes[-10:])
+    assert vol is not None
+    assert float(vol) == pytest.approx(float(expected), rel=1e-9)
+    assert list(store.load_indicator_states([candle_series_key("BTCTRY")])) == ["candles:BTCTRY"]
+
+
+def test_risk_budget_equity_volatility_uses_engine_and_matches_static(tmp_path) -> None:
+    settings = Settings(
+        STATE_DB_PATH=str(tmp_path / "state.db"),
+        STAGE7_VOL_LOOKBACK=8,
+        STAGE7_VOL_LOW_THRESHOLD=Decimal("0.001"),
+        STAGE7_VOL_HIGH_THRESHOLD=Decimal("0.5"),
+    )
+    store = StateStore(settings.state_db_path)
+    service = RiskBudgetService(store, settings=settings)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    equities = [1000, 1012, 990, 1030, 1001, 1044, 1020, 1060, 1015, 1070]
+    snapshots_desc = [
+        PnLSnapshot(
+            total_equity_try=Decimal(equity),
+            realized_today_try=Decimal("0"),
+            drawdown_pct=Decimal("0"),
+            ts=start + timedelta(minutes=idx),
+            realized_total_try=Decimal("0"),
+        )
+        for idx, equity in enumerate(equities)
+    ][::-1]
+
+    regime, vol = service._equity_volatility_regime(snapshots_desc)
+    static_regime, static_vol = RiskBudgetService.compute_volatility_regime(
+        snapshots_desc,
+        lookback=8,
+        low_threshold=settings.stage7_vol_low_threshold,
+        high_threshold=settings.stage7_vol_high_threshold,
+    )
+
+    assert (regime, vol) == (static_regime, static_vol)
+    assert EQUITY_SERIES_KEY in store.load_indicator_states([EQUITY_SERIES_KEY])
+
+
+def test_decision_pipeline_anchor_follows_mark_ema_when_enabled() -> None:
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    engine = IndicatorEngine(window=5, ema_span=3)
+    ema_pipeline = DecisionPipelineService(
+        settings=Settings(STRATEGY_ANCHOR_SOURCE="ema"), indicator_engine=engine
+    )
+    mark_pipeline = DecisionPipelineService(settings=Settings(), indicator_engine=engine)
+
+    assert ema_pipeline._anchor_price("BTCTRY", mark=Decimal("100"), now_ts=start) is None
+    anchor = ema_pipeline._anchor_price(
+        "BTCTRY", mark=Decimal("110"), now_ts=start + timedelta(minutes=1)
+    )
+    assert anchor == Decimal("105.0")
+    assert mark_pipeline._anchor_price("BTCTRY", mark=Decimal("120"), now_ts=start) is None
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from btcbot.config import Settings
+from btcbot.obs.log_sampling import (
+    DEFAULT_SAMPLING_RULES,
+    SUPPRESSED_EVENT,
+    LogSamplingFilter,
+    SamplingRule,
+    install_log_sampling,
+)
+from btcbot.services import market_data_service
+from btcbot.services.market_data_service import RestMarketDataProvider
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def sampled_logger():
+    handler = _ListHandler()
+    test_logger = logging.getLogger("btcbot.tests.log_sampling")
+    test_logger.addHandler(handler)
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    # Suppression summaries are logged through the module logger; route them here too.
+    summary_logger = logging.getLogger("btcbot.obs.log_sampling")
+    summary_logger.addHandler(handler)
+    try:
+        yield test_logger, handler
+    finally:
+        test_logger.removeHandler(handler)
+        summary_logger.removeHandler(handler)
+
+
+def _events(handler: _ListHandler, name: str) -> list[logging.LogRecord]:
+    return [record for record in handler.records if record.msg == name]
+
+
+def test_first_n_then_every_kth_per_key(sampled_logger) -> None:
+    test_logger, handler = sampled_logger
+    handler.addFilter(
+        LogSamplingFilter(
+            {"parse_failed": SamplingRule(first=2, every=3, by=("symbol",))},
+            summary_interval_seconds=3600,
+        )
+    )
+
+    for _ in range(8):
+        test_logger.info("parse_failed", extra={"extra": {"symbol": "BTCTRY"}})
+    test_logger.info("parse_failed", extra={"extra": {"symbol": "ETHTRY"}})
+    test_logger.info("unrelated")
+
+    kept = [record.extra["symbol"] for record in _events(handler, "parse_failed")]
+    # Occurrences 1, 2, 5 and 8 for BTCTRY; the first ETHTRY one is never lost.
+    assert kept == ["BTCTRY", "BTCTRY", "BTCTRY", "BTCTRY", "ETHTRY"]
+    assert len(_events(handler, "unrelated")) == 1
+
+
+def test_token_bucket_and_suppression_summary(sampled_logger) -> None:
+    test_logger, handler = sampled_logger
+    clock = _Clock()
+    sampling = LogSamplingFilter(
+        {"EXCHANGE_429_BACKOFF": SamplingRule(rate_per_second=1.0, burst=2)},
+        summary_interval_seconds=10,
+        clock=clock,
+    )
+    handler.addFilter(sampling)
+
+    for _ in range(5):
+        test_logger.warning("EXCHANGE_429_BACKOFF")
+    assert len(_events(handler, "EXCHANGE_429_BACKOFF")) == 2
+
+    clock.now = 1.5
+    test_logger.warning("EXCHANGE_429_BACKOFF")
+    assert len(_events(handler, "EXCHANGE_429_BACKOFF")) == 3
+    assert _events(handler, SUPPRESSED_EVENT) == []
+
+    clock.now = 10.0
+    test_logger.warning("EXCHANGE_429_BACKOFF")
+    summaries = _events(handler, SUPPRESSED_EVENT)
+    assert [summary.extra["suppressed"] for summary in summaries] == [{"EXCHANGE_429_BACKOFF": 3}]
+
+    test_logger.warning("EXCHANGE_429_BACKOFF")
+    test_logger.warning("EXCHANGE_429_BACKOFF")
+    sampling.flush()
+    assert _events(handler, SUPPRESSED_EVENT)[-1].extra["suppressed_total"] == 1
+
+
+class _FailingAfterFirstExchange:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_orderbook(self, symbol: str, limit: int | None = None) -> tuple[float, float]:
+        del symbol, limit
+        self.calls += 1
+        if self.calls > 2:
+            raise RuntimeError("exchange down")
+        return (100.0, 101.0)
+
+
+def test_default_rules_sample_stale_cache_fallback_per_symbol() -> None:
+    handler = _ListHandler()
+    handler.addFilter(LogSamplingFilter(DEFAULT_SAMPLING_RULES, summary_interval_seconds=3600))
+    provider_logger = logging.getLogger(market_data_service.__name__)
+    provider_logger.addHandler(handler)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    clock = _Clock()
+    provider = RestMarketDataProvider(
+        exchange=_FailingAfterFirstExchange(),
+        now_provider=lambda: start + timedelta(seconds=clock.now),
+        orderbook_ttl_ms=500,
+        orderbook_max_staleness_ms=600_000,
+    )
+    try:
+        for _ in range(150):
+            provider.get_snapshot(["BTCTRY", "ETHTRY"])
+            clock.now += 1.0
+    finally:
+        provider_logger.removeHandler(handler)
+
+    kept = _events(handler, "market_data_degraded_serving_stale_cache")
+    # 149 fallbacks per symbol: the first and every 100th one are logged.
+    assert [record.extra["symbol"] for record in kept] == ["BTCTRY", "ETHTRY"] * 2
+
+
+def test_install_replaces_filter_and_empty_rules_disable() -> None:
+    handler = _ListHandler()
+    first = install_log_sampling(handler, {"a": SamplingRule()})
+    second = install_log_sampling(handler, {"b": SamplingRule()})
+
+    assert handler.filters == [second]
+    assert first is not second
+    assert install_log_sampling(handler, {}) is None
+    assert handler.filters == []
+
+
+def test_settings_parse_sampling_rules() -> None:
+    settings = Settings(
+        _env_file=None,
+        LOG_SAMPLING_RULES='{"metric_emit": {"first": 5, "every": 0}}',
+    )
+    assert settings.log_sampling_rules == {"metric_emit": SamplingRule(first=5, every=0)}
+
+    with pytest.raises(ValueError, match="LOG_SAMPLING_RULES"):
+        Settings(_env_file=None, LOG_SAMPLING_RULES='{"metric_emit": {"first": 0}}')
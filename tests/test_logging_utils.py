@@ -3,8 +3,10 @@ from __future__ import annotations
 import json
 import logging
 import sys
+import threading
 
-from btcbot.logging_utils import JsonFormatter, setup_logging
+from btcbot.logging_context import with_cycle_context
+from btcbot.logging_utils import JsonFormatter, QueueLoggingHandler, setup_logging
 
 
 def test_json_formatter_includes_exception_details() -> None:
@@ -130,3 +132,114 @@ def test_json_formatter_redacts_non_record_extra_fields() -> None:
     rendered = formatter.format(record)
     assert "SUPERSECRET" not in rendered
 
+
+class _ListHandler(logging.Handler):
+    def __init__(self, release: threading.Event | None = None) -> None:
+        super().__init__()
+        self.setFormatter(JsonFormatter())
+        self.gate = release
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.lines.append(self.format(record))
+
+
+def _record(msg: str, *args: object) -> logging.LogRecord:
+    return logging.LogRecord("btcbot.test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_queue_handler_formats_on_listener_with_caller_context() -> None:
+    target = _ListHandler()
+    handler = QueueLoggingHandler(target, capacity=16)
+    try:
+        with with_cycle_context(cycle_id="cycle-1", run_id="run-1"):
+            handler.handle(_record("order %s", "cid-1"))
+        assert handler.flush()
+    finally:
+        handler.close()
+
+    payload = json.loads(target.lines[0])
+    assert payload["message"] == "order cid-1"
+    assert payload["cycle_id"] == "cycle-1"
+    assert payload["run_id"] == "run-1"
+    assert "log_context" not in payload
+
+
+def test_queue_handler_counts_and_reports_overflow() -> None:
+    release = threading.Event()
+    target = _ListHandler(release)
+    handler = QueueLoggingHandler(target, capacity=2)
+    try:
+        for idx in range(10):
+            handler.handle(_record(f"event-{idx}"))
+        release.set()
+        assert handler.flush()
+        stats = handler.stats()
+    finally:
+        handler.close()
+
+    messages = [json.loads(line)["message"] for line in target.lines]
+    overflow = [json.loads(line) for line in target.lines if "log_queue_overflow" in line]
+    assert stats["enqueued_total"] + stats["dropped_total"] == 10
+    assert stats["dropped_total"] >= 7
+    assert sum(item["dropped"] for item in overflow) == stats["dropped_total"]
+    assert len(messages) == stats["enqueued_total"] + len(overflow)
+
+
+def test_queue_handler_snapshots_structured_extras() -> None:
+    release = threading.Event()
+    target = _ListHandler(release)
+    handler = QueueLoggingHandler(target, capacity=16)
+    extras = {"symbol": "BTCTRY", "attempt": 1}
+    try:
+        record = _record("retry")
+        record.extra = extras
+        handler.handle(record)
+        extras["attempt"] = 2
+        extras["late"] = True
+        release.set()
+        assert handler.flush()
+    finally:
+        handler.close()
+
+    payload = json.loads(target.lines[0])
+    assert payload["attempt"] == 1
+    assert "late" not in payload
+
+
+def test_queue_handler_counts_concurrent_emits() -> None:
+    target = _ListHandler()
+    handler = QueueLoggingHandler(target, capacity=100_000)
+
+    def _emit() -> None:
+        for idx in range(500):
+            handler.handle(_record(f"event-{idx}"))
+
+    workers = [threading.Thread(target=_emit) for _ in range(8)]
+    try:
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert handler.flush()
+        stats = handler.stats()
+    finally:
+        handler.close()
+
+    assert (stats["enqueued_total"], stats["dropped_total"]) == (4000, 0)
+    assert len(target.lines) == 4000
+
+
+def test_setup_logging_queue_capacity_env(monkeypatch) -> None:
+    monkeypatch.setenv("LOG_QUEUE_CAPACITY", "0")
+    setup_logging("INFO")
+    assert not any(isinstance(h, QueueLoggingHandler) for h in logging.getLogger().handlers)
+
+    monkeypatch.setenv("LOG_QUEUE_CAPACITY", "128")
+    setup_logging("INFO")
+    handlers = [h for h in logging.getLogger().handlers if isinstance(h, QueueLoggingHandler)]
+    assert len(handlers) == 1
+    assert handlers[0].stats()["capacity"] == 128
+    assert handlers[0].flush()
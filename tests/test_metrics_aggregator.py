@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import urllib.request
+
+import pytest
+
+from btcbot.obs.metric_registry import REGISTRY
+from btcbot.obs.metrics import (
+    get_metrics_sink,
+    inc_counter,
+    observe_histogram,
+    set_gauge,
+    set_metrics_sink,
+)
+from btcbot.obs.metrics_aggregator import (
+    AggregatingMetricsSink,
+    persist_metrics_snapshot_if_due,
+    render_prometheus,
+    start_metrics_http_server,
+)
+from btcbot.services.state_store import StateStore
+
+
+@pytest.fixture
+def sink():
+    previous = get_metrics_sink()
+    aggregating = AggregatingMetricsSink(buckets={"bot_cycle_latency_ms": (10.0, 100.0)})
+    set_metrics_sink(aggregating)
+    try:
+        yield aggregating
+    finally:
+        set_metrics_sink(previous)
+
+
+def _by_name(sink: AggregatingMetricsSink) -> dict[str, list[dict[str, object]]]:
+    grouped: dict[str, list[dict[str, object]]] = {}
+    for item in sink.snapshot():
+        grouped.setdefault(str(item["name"]), []).append(item)
+    return grouped
+
+
+def test_aggregates_counters_gauges_and_histograms(sink) -> None:
+    api = {"exchange": "btcturk", "endpoint": "/ticker", "process_role": "LIVE"}
+    inc_counter("bot_api_errors_total", api)
+    # Same label set in a different order lands on the same series.
+    inc_counter("bot_api_errors_total", dict(reversed(api.items())), delta=2)
+    inc_counter("bot_api_errors_total", {**api, "endpoint": "/orders"})
+    set_gauge("bot_killswitch_enabled", 1, {"process_role": "LIVE"})
+    set_gauge("bot_killswitch_enabled", 0, {"process_role": "LIVE"})
+    latency_labels = {"process_role": "LIVE", "mode_final": "NORMAL"}
+    for value in (5, 10, 50, 500):
+        observe_histogram("bot_cycle_latency_ms", value, latency_labels)
+
+    grouped = _by_name(sink)
+
+    assert [
+        (item["labels"]["endpoint"], item["value"]) for item in grouped["bot_api_errors_total"]
+    ] == [
+        ("/orders", 1.0),
+        ("/ticker", 3.0),
+    ]
+    assert grouped["bot_killswitch_enabled"][0]["value"] == 0.0
+    histogram = grouped["bot_cycle_latency_ms"][0]
+    assert histogram["count"] == 4
+    assert histogram["sum"] == 565.0
+    assert histogram["buckets"] == [[10.0, 2], [100.0, 3], ["+Inf", 4]]
+
+
+def test_missing_labels_are_rejected_on_first_use(sink) -> None:
+    with pytest.raises(ValueError, match="missing labels"):
+        inc_counter("bot_api_errors_total", {"exchange": "btcturk"})
+    assert sink.snapshot() == []
+
+
+def test_render_prometheus_text_format(sink) -> None:
+    inc_counter(
+        "bot_api_errors_total",
+        {"exchange": "btcturk", "endpoint": 'a"b', "process_role": "LIVE"},
+    )
+    observe_histogram("bot_cycle_latency_ms", 42, {"process_role": "LIVE", "mode_final": "NORMAL"})
+
+    text = render_prometheus(sink.snapshot())
+
+    assert "# TYPE bot_api_errors_total counter" in text
+    assert 'bot_api_errors_total{endpoint="a\\"b",exchange="btcturk",process_role="LIVE"} 1' in text
+    assert "# TYPE bot_cycle_latency_ms histogram" in text
+    assert 'bot_cycle_latency_ms_bucket{mode_final="NORMAL",process_role="LIVE",le="10"} 0' in text
+    assert (
+        'bot_cycle_latency_ms_bucket{mode_final="NORMAL",process_role="LIVE",le="+Inf"} 1' in text
+    )
+    assert 'bot_cycle_latency_ms_count{mode_final="NORMAL",process_role="LIVE"} 1' in text
+
+
+def test_http_endpoint_serves_current_series(sink) -> None:
+    set_gauge("bot_killswitch_enabled", 1, {"process_role": "LIVE"})
+    server = start_metrics_http_server(sink.render_prometheus, port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert 'bot_killswitch_enabled{process_role="LIVE"} 1' in body
+
+
+def test_snapshot_is_persisted_at_most_once_per_interval(sink, tmp_path) -> None:
+    db_path = tmp_path / "state.db"
+    store = StateStore(str(db_path))
+    set_gauge("bot_killswitch_enabled", 1, {"process_role": "LIVE"})
+
+    assert persist_metrics_snapshot_if_due(sink, store, interval_seconds=60, now_monotonic=100.0)
+    assert not persist_metrics_snapshot_if_due(
+        sink, store, interval_seconds=60, now_monotonic=130.0
+    )
+    assert persist_metrics_snapshot_if_due(sink, store, interval_seconds=60, now_monotonic=161.0)
+    assert not persist_metrics_snapshot_if_due(sink, store, interval_seconds=0)
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT payload_json FROM metrics_snapshots ORDER BY id").fetchall()
+    assert len(rows) == 2
+    assert json.loads(rows[0][0]) == [
+        {
+            "labels": {"process_role": "LIVE"},
+            "name": "bot_killswitch_enabled",
+            "type": REGISTRY["bot_killswitch_enabled"].type.value,
+            "value": 1.0,
+        }
+    ]
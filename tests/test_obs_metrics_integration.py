@@ -2,16 +2,26 @@ from __future__ import annotations
 
 import logging
 
-from btcbot.obs.metrics import observe_histogram
+from btcbot.obs.metrics import (
+    LoggingMetricsSink,
+    get_metrics_sink,
+    observe_histogram,
+    set_metrics_sink,
+)
 
 
 def test_metric_emission_logs_record(caplog) -> None:
-    with caplog.at_level(logging.INFO):
-        observe_histogram(
-            "bot_cycle_latency_ms",
-            123,
-            labels={"process_role": "MONITOR", "mode_final": "OBSERVE_ONLY"},
-        )
+    previous = get_metrics_sink()
+    set_metrics_sink(LoggingMetricsSink())
+    try:
+        with caplog.at_level(logging.INFO):
+            observe_histogram(
+                "bot_cycle_latency_ms",
+                123,
+                labels={"process_role": "MONITOR", "mode_final": "OBSERVE_ONLY"},
+            )
+    finally:
+        set_metrics_sink(previous)
 
     records = [r for r in caplog.records if r.getMessage() == "metric_emit"]
     assert records
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+
+from btcbot.persistence.uow import UnitOfWorkFactory
+from btcbot.services.state_store import StateStore
+
+
+@dataclass(frozen=True)
+class _ExternalOrder:
+    symbol: str
+    side: str
+    price: Decimal
+    qty: Decimal
+    status: str
+    exchange_order_id: str
+    client_order_id: str | None = None
+
+
+def _db_view(factory: UnitOfWorkFactory, client_ids: list[str], exchange_ids: list[str]):
+    with factory() as uow:
+        orders = uow.orders
+        return {
+            "exists": [orders.client_order_id_exists(cid) for cid in client_ids],
+            "terminal": [orders.is_order_terminal(cid) for cid in client_ids],
+            "by_client": [orders.get_stage4_order_by_client_id(cid) for cid in client_ids],
+            "by_exchange": [orders.get_stage4_order_by_exchange_id(eid) for eid in exchange_ids],
+            "has_unknown": orders.stage4_has_unknown_orders(),
+            "unknown_ids": orders.stage4_unknown_client_order_ids(),
+            "open": orders.list_stage4_open_orders(),
+            "open_all": orders.list_stage4_open_orders(include_external=True, include_unknown=True),
+            "open_eth": orders.list_stage4_open_orders("ethtry", include_unknown=True),
+        }
+
+
+def _store_view(store: StateStore, client_ids: list[str], exchange_ids: list[str]):
+    return {
+        "exists": [store.client_order_id_exists(cid) for cid in client_ids],
+        "terminal": [store.is_order_terminal(cid) for cid in client_ids],
+        "by_client": [store.get_stage4_order_by_client_id(cid) for cid in client_ids],
+        "by_exchange": [store.get_stage4_order_by_exchange_id(eid) for eid in exchange_ids],
+        "has_unknown": store.stage4_has_unknown_orders(),
+        "unknown_ids": store.stage4_unknown_client_order_ids(),
+        "open": store.list_stage4_open_orders(),
+        "open_all": store.list_stage4_open_orders(include_external=True, include_unknown=True),
+        "open_eth": store.list_stage4_open_orders("ethtry", include_unknown=True),
+    }
+
+
+def test_order_index_matches_database_through_every_write_path(tmp_path) -> None:
+    db_path = str(tmp_path / "state.db")
+    store = StateStore(db_path)
+    factory = UnitOfWorkFactory(db_path)
+    rng = random.Random(7)
+    client_ids = [f"cid-{idx}" for idx in range(8)]
+    exchange_ids = [f"ex-{idx}" for idx in range(10)]
+
+    for _ in range(120):
+        cid = rng.choice(client_ids)
+        action = rng.randrange(9)
+        order_kwargs = {
+            "symbol": rng.choice(["BTCTRY", "ETHTRY"]),
+            "side": rng.choice(["buy", "sell"]),
+            "price": Decimal(rng.randrange(90, 110)),
+            "qty": Decimal("0.1"),
+        }
+        if action == 0:
+            store.record_stage4_order_submitted(
+                client_order_id=cid,
+                exchange_order_id=rng.choice(exchange_ids),
+                mode="live",
+                status=rng.choice(["open", "submitted", "unknown"]),
+                **order_kwargs,
+            )
+        elif action == 1:
+            store.record_stage4_order_simulated_submit(client_order_id=cid, **order_kwargs)
+        elif action == 2:
+            store.record_stage4_order_cancel_requested(cid)
+        elif action == 3:
+            store.record_stage4_order_canceled(cid)
+        elif action == 4:
+            store.record_stage4_order_error(
+                client_order_id=cid, reason="boom", mode="live", **order_kwargs
+            )
+        elif action == 5:
+            store.record_stage4_order_rejected(cid, "min_notional")
+        elif action == 6:
+            store.update_stage4_order_exchange_id(cid, rng.choice(exchange_ids))
+        elif action == 7:
+            store.mark_stage4_unknown_closed(cid)
+        else:
+            store.import_stage4_external_order(
+                _ExternalOrder(
+                    status="open",
+                    exchange_order_id=rng.choice(exchange_ids),
+                    client_order_id=rng.choice([None, cid]),
+                    **order_kwargs,
+                )
+            )
+        assert _store_view(store, client_ids, exchange_ids) == _db_view(
+            factory, client_ids, exchange_ids
+        )
+
+    drift = store.verify_stage4_order_index()
+    assert drift is not None and drift.ok
+
+
+def test_order_index_serves_lookups_without_sqlite_and_repairs_drift(tmp_path) -> None:
+    db_path = str(tmp_path / "state.db")
+    store = StateStore(db_path)
+    store.record_stage4_order_submitted(
+        symbol="BTCTRY",
+        client_order_id="cid-1",
+        exchange_order_id="ex-1",
+        side="buy",
+        price=Decimal("100"),
+        qty=Decimal("0.1"),
+        mode="live",
+    )
+
+    # A later store in the same process shares the index: live lookups are dict reads.
+    cycle_store = StateStore(db_path)
+
+    def _no_sqlite():
+        raise AssertionError("order lookup reached SQLite")
+
+    cycle_store._uow_factory = _no_sqlite
+    assert cycle_store.client_order_id_exists("cid-1")
+    assert not cycle_store.client_order_id_exists("cid-404")
+    assert [order.client_order_id for order in cycle_store.list_stage4_open_orders()] == ["cid-1"]
+    assert cycle_store.get_stage4_order_by_exchange_id("ex-1").client_order_id == "cid-1"
+    assert not cycle_store.stage4_has_unknown_orders()
+
+    # Writes that bypass the StateStore are invisible until the integrity check runs.
+    with UnitOfWorkFactory(db_path)() as uow:
+        uow.orders.mark_stage4_unknown_closed("cid-1")
+        uow.orders.record_stage4_order_submitted(
+            symbol="ETHTRY",
+            client_order_id="cid-2",
+            exchange_order_id="ex-2",
+            side="sell",
+            price=Decimal("50"),
+            qty=Decimal("1"),
+            mode="live",
+            status="unknown",
+        )
+    assert store.list_stage4_open_orders()
+
+    drift = store.verify_stage4_order_index()
+
+    assert drift is not None
+    assert (drift.rows, drift.missing, drift.stale, drift.extra) == (2, 1, 1, 0)
+    assert store.list_stage4_open_orders() == []
+    assert store.is_order_terminal("cid-1")
+    assert store.stage4_unknown_client_order_ids() == ["cid-2"]
+    assert store.verify_stage4_order_index().ok
+
+
+def test_read_only_store_bypasses_order_index(tmp_path) -> None:
+    db_path = str(tmp_path / "state.db")
+    writer = StateStore(db_path)
+    writer.record_stage4_order_simulated_submit(
+        symbol="BTCTRY",
+        client_order_id="cid-1",
+        side="buy",
+        price=Decimal("100"),
+        qty=Decimal("0.1"),
+    )
+
+    reader = StateStore.open_read_only(db_path)
+
+    assert reader.verify_stage4_order_index() is None
+    assert reader.client_order_id_exists("cid-1")
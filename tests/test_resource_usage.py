@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import tracemalloc
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+from btcbot.adapters import btcturk_http
+from btcbot.adapters.btcturk_http import BtcturkHttpClient
+from btcbot.obs.alert_engine import AlertRuleEvaluator, MetricWindowStore
+from btcbot.obs.alerts import RESOURCE_ALERT_RULES
+from btcbot.obs.resource_usage import begin_resource_capture
+from btcbot.obs.stage4_alarm_hook import build_cycle_metrics
+from btcbot.services.state_store import StateStore
+
+
+@pytest.fixture(autouse=True)
+def _stop_tracemalloc():
+    yield
+    tracemalloc.stop()
+
+
+def test_disabled_capture_is_none() -> None:
+    assert begin_resource_capture(enabled=False, tracemalloc_enabled=True) is None
+
+
+def test_capture_reports_counter_and_wal_deltas(tmp_path) -> None:
+    db_path = str(tmp_path / "state.db")
+    sent = [100]
+    capture = begin_resource_capture(
+        enabled=True, db_path=db_path, counters={"http_bytes_in": lambda: sent[0]}
+    )
+    assert capture is not None
+
+    sent[0] += 2048
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("CREATE TABLE t (v TEXT)")
+        conn.executemany("INSERT INTO t(v) VALUES (?)", [("x" * 100,)] * 200)
+        summary = capture.summary()
+
+    assert summary["http_bytes_in"] == 2048
+    assert summary["sqlite_wal_bytes"] > 0
+    assert summary["sqlite_wal_growth_bytes"] == summary["sqlite_wal_bytes"]
+    assert summary["cpu_ms"] >= 0
+    assert "tracemalloc" not in summary
+
+
+def test_tracemalloc_reports_retained_allocation_sites() -> None:
+    capture = begin_resource_capture(enabled=True, tracemalloc_enabled=True, tracemalloc_top_n=3)
+    assert capture is not None
+
+    retained = [bytearray(1024) for _ in range(500)]
+    traced = capture.summary()["tracemalloc"]
+
+    assert traced["net_bytes"] >= 500 * 1024
+    assert traced["net_blocks"] >= 500
+    assert 0 < len(traced["top"]) <= 3
+    assert traced["top"][0]["site"].startswith(__file__)
+    assert len(retained) == 500
+
+
+def test_rss_growth_rule_fires_from_cycle_metrics() -> None:
+    store = MetricWindowStore()
+    evaluator = AlertRuleEvaluator()
+    for cycle in range(12):
+        metrics = build_cycle_metrics(
+            stage4_cycle_summary={},
+            reconcile_result=None,
+            health_snapshot=None,
+            final_mode={},
+            cursor_diag=None,
+            resource_stats={"rss_bytes": 100_000_000 + cycle * 20_000_000, "cpu_ms": 12.5},
+        )
+        for name, value in metrics.items():
+            store.record(name, value, cycle * 60)
+
+    events = evaluator.evaluate_rules(RESOURCE_ALERT_RULES, store, now_epoch=660)
+
+    assert [event.rule_name for event in events] == ["process_rss_growth"]
+    assert events[0].value == 220_000_000
+
+
+def test_cycle_metrics_skip_resource_series_without_stats() -> None:
+    metrics = build_cycle_metrics({}, None, None, {}, None)
+
+    assert "bot_process_rss_bytes" not in metrics
+
+
+def test_http_client_counts_wire_bytes() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"success": True, "data": [{"pair": "BTCTRY"}]})
+
+    client = BtcturkHttpClient(
+        transport=httpx.MockTransport(handler),
+        base_url="https://api.btcturk.com",
+        live_rules_require_exchangeinfo=False,
+    )
+    counters = btcturk_http.http_traffic_counters()
+    before = {name: source() for name, source in counters.items()}
+
+    client.get_ticker_stats()
+    client.close()
+
+    assert counters["http_requests"]() - before["http_requests"] == 1
+    assert counters["http_bytes_in"]() - before["http_bytes_in"] > 20
+
+
+def test_http_traffic_counters_do_not_lose_concurrent_updates() -> None:
+    request = httpx.Request("POST", "https://api.btcturk.com/api/v1/order", content=b"x" * 10)
+    response = httpx.Response(200, content=b"y" * 7)
+    before_requests = btcturk_http.http_requests_sent()
+    before_in = btcturk_http.http_bytes_received()
+
+    def _hammer() -> None:
+        for _ in range(2000):
+            btcturk_http._count_request(request)
+            btcturk_http._count_response(response)
+
+    workers = [threading.Thread(target=_hammer) for _ in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert btcturk_http.http_requests_sent() - before_requests == 16_000
+    assert btcturk_http.http_bytes_received() - before_in == 16_000 * 7
+
+
+def test_run_metrics_persist_resource_stats(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    store.save_stage4_run_metrics(
+        cycle_id="c1",
+        ts=datetime(2026, 1, 1, tzinfo=UTC),
+        reasons_no_action=[],
+        intents_created=0,
+        intents_after_risk=0,
+        intents_executed=0,
+        orders_submitted=0,
+        rejects_by_code={},
+        breaker_state="closed",
+        degraded_mode=False,
+        resource_stats={"cpu_ms": 1.5, "rss_bytes": 1024},
+    )
+
+    with sqlite3.connect(str(tmp_path / "state.db")) as con:
+        raw = con.execute("SELECT resource_stats_json FROM stage4_run_metrics").fetchone()[0]
+    assert raw == '{"cpu_ms": 1.5, "rss_bytes": 1024}'
@@ -4,9 +4,13 @@ import json
 import logging
 from decimal import Decimal
 
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
 from btcbot import cli
 from btcbot.logging_utils import JsonFormatter
-from btcbot.security.redaction import sanitize_mapping, sanitize_text
+from btcbot.security import redaction
+from btcbot.security.redaction import redact_data, sanitize_mapping, sanitize_text
 from btcbot.services.doctor import DoctorReport
 
 FAKE_KEY = "AK_test_1234567890"
@@ -136,3 +140,96 @@ def test_redact_data_and_mapping_deep_redaction() -> None:
 def test_sanitize_text_accepts_none_known_secrets() -> None:
     value = sanitize_text("token=abc123", known_secrets=None)
     assert value == "token=[REDACTED]"
+
+
+# Pre-optimization engine (no key cache, no trigger pre-filter), kept as the oracle for
+# the differential property test below.
+def _reference_is_sensitive_key(key: object) -> bool:
+    normalized = redaction._safe_to_str(key).replace("-", "_").casefold()
+    compact = normalized.replace("_", "")
+    return compact in redaction._SENSITIVE_COMPACT_KEYS or any(
+        part in normalized for part in redaction._SENSITIVE_PARTS
+    )
+
+
+def _reference_sanitize_text(text: str) -> str:
+    redacted = redaction._safe_to_str(text)
+    for pattern in redaction._PLAIN_SECRET_PATTERNS:
+        redacted = pattern.sub(redaction._redact_text_match, redacted)
+    redacted = redaction._QUERY_PARAM_PATTERN.sub(
+        lambda m: f"{m.group(1)}{m.group(2)}={redaction._TEXT_REDACTED}", redacted
+    )
+    return redaction._JSON_KEY_VALUE_PATTERN.sub(
+        lambda m: f"{m.group(1)}{redaction._TEXT_REDACTED}{m.group(3)}", redacted
+    )
+
+
+def _reference_redact_data(payload):
+    if isinstance(payload, dict):
+        return {
+            str(key): redaction.REDACTED
+            if _reference_is_sensitive_key(key)
+            else _reference_redact_data(value)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [_reference_redact_data(item) for item in payload]
+    if isinstance(payload, tuple):
+        return tuple(_reference_redact_data(item) for item in payload)
+    if isinstance(payload, str):
+        return _reference_sanitize_text(payload)
+    return payload
+
+
+_FRAGMENTS = st.sampled_from(
+    [
+        "Authorization: Bearer ",
+        "authorization=",
+        "X-API-KEY: ",
+        "x-pck=",
+        "X-Signature:",
+        "x-stamp = ",
+        "BTCTURK_API_KEY=",
+        "btcturk_api_secret:",
+        "?apiKey=",
+        "&signature=",
+        " token=",
+        '{"token": "',
+        '"api_secret":"',
+        '"AUTH" : "',
+        "sİgnature=",
+        "tokın=",
+        "SECRET",
+        "passphrase",
+        "cycle_id",
+        "1234.5600",
+        "BTCTRY",
+        '"',
+        "&",
+        " ",
+        ",",
+    ]
+)
+_TEXT = st.lists(_FRAGMENTS | st.text(max_size=8), max_size=8).map("".join)
+_KEYS = st.sampled_from(
+    ["cycle_id", "symbol", "price", "api-key", "X_API_KEY", "apiKey", "auth", "Token", "nested"]
+) | st.text(max_size=12)
+_PAYLOADS = st.recursive(
+    _TEXT | st.integers() | st.none() | st.booleans(),
+    lambda children: st.lists(children, max_size=4)
+    | st.lists(children, max_size=3).map(tuple)
+    | st.dictionaries(_KEYS, children, max_size=4),
+    max_leaves=20,
+)
+
+
+@settings(max_examples=400, deadline=None)
+@given(_TEXT)
+def test_sanitize_text_matches_reference_engine(text: str) -> None:
+    assert sanitize_text(text) == _reference_sanitize_text(text)
+
+
+@settings(max_examples=300, deadline=None)
+@given(_PAYLOADS)
+def test_redact_data_matches_reference_engine(payload) -> None:
+    assert redact_data(payload) == _reference_redact_data(payload)
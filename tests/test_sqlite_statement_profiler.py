@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from datetime import UTC, datetime
+
+import pytest
+
+from btcbot.persistence.sqlite import sqlite_connection
+from btcbot.persistence.sqlite.sqlite_connection import (
+    InstrumentedConnection,
+    begin_statement_capture,
+    configure_statement_profiler,
+    create_sqlite_connection,
+    sql_fingerprint,
+)
+from btcbot.services.state_store import StateStore
+
+
+@pytest.fixture(autouse=True)
+def _reset_profiler():
+    yield
+    configure_statement_profiler(enabled=False, slow_query_ms=0)
+
+
+def test_sql_fingerprint_groups_literals_and_in_lists() -> None:
+    first = sql_fingerprint("SELECT *  FROM t\n WHERE a = 'x' AND b IN (?, ?, ?) LIMIT 5")
+    second = sql_fingerprint("SELECT * FROM t WHERE a = 'y''z' AND b IN (?,?) LIMIT 10")
+
+    assert first == second == "SELECT * FROM t WHERE a = ? AND b IN (?...) LIMIT ?"
+    assert sql_fingerprint("SELECT 1 FROM stage7_run_metrics") == (
+        "SELECT ? FROM stage7_run_metrics"
+    )
+
+
+def test_disabled_profiler_keeps_plain_connections(tmp_path) -> None:
+    assert begin_statement_capture(enabled=False, slow_query_ms=10) is None
+
+    conn = create_sqlite_connection(str(tmp_path / "plain.db"))
+    try:
+        assert type(conn) is sqlite3.Connection
+    finally:
+        conn.close()
+
+
+def test_capture_aggregates_per_fingerprint_and_logs_slow_plans(tmp_path, caplog) -> None:
+    stats = begin_statement_capture(enabled=True, slow_query_ms=0)
+    assert stats is not None
+    db_path = str(tmp_path / "profiled.db")
+
+    with caplog.at_level(logging.WARNING, logger=sqlite_connection.__name__):
+        conn = create_sqlite_connection(db_path)
+        try:
+            assert isinstance(conn, InstrumentedConnection)
+            conn.execute("CREATE TABLE t (k INTEGER PRIMARY KEY, v TEXT)")
+            conn.executemany("INSERT INTO t(k, v) VALUES (?, ?)", [(i, str(i)) for i in range(6)])
+            for limit in (2, 3):
+                conn.execute("SELECT k, v FROM t WHERE v != 'x' LIMIT ?", (limit,)).fetchall()
+            assert sum(1 for _ in conn.execute("SELECT k FROM t")) == 6
+        finally:
+            conn.close()
+
+    summary = stats.summary()
+    by_fingerprint = {item["fingerprint"]: item for item in summary["top"]}
+    select = by_fingerprint["SELECT k, v FROM t WHERE v != ? LIMIT ?"]
+    assert (select["count"], select["rows"]) == (2, 5)
+    assert select["p95_ms"] <= select["total_ms"]
+    assert by_fingerprint["INSERT INTO t(k, v) VALUES (?...)"]["rows"] == 6
+    assert by_fingerprint["SELECT k FROM t"]["rows"] == 6
+    assert summary["slow_statements"] == summary["statements"]
+    plans = [
+        record.extra["query_plan"]
+        for record in caplog.records
+        if record.getMessage() == "sqlite_slow_query"
+        and record.extra["fingerprint"] == "SELECT k FROM t"
+    ]
+    assert plans and any("SCAN" in line for line in plans[0])
+
+
+def test_stage4_run_metrics_persist_db_stats(tmp_path) -> None:
+    stats = begin_statement_capture(enabled=True, slow_query_ms=1000)
+    assert stats is not None
+    store = StateStore(str(tmp_path / "state.db"))
+    store.get_last_cycle_id()
+
+    store.save_stage4_run_metrics(
+        cycle_id="c1",
+        ts=datetime(2026, 1, 1, tzinfo=UTC),
+        reasons_no_action=[],
+        intents_created=0,
+        intents_after_risk=0,
+        intents_executed=0,
+        orders_submitted=0,
+        rejects_by_code={},
+        breaker_state="closed",
+        degraded_mode=False,
+        db_stats=stats.summary(),
+    )
+
+    with sqlite3.connect(str(tmp_path / "state.db")) as con:
+        raw = con.execute("SELECT db_stats_json FROM stage4_run_metrics").fetchone()[0]
+    assert '"statements"' in raw and '"top"' in raw
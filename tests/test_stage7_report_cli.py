@@ -1,3 +1,4 @@
+import json
 import sqlite3
 import sys
 from datetime import UTC, datetime
@@ -11,11 +12,13 @@ from btcbot.services.stage4_cycle_runner import Stage4CycleRunner
 from btcbot.services.state_store import StateStore
 
 
-def _seed_metrics(store: StateStore) -> None:
+def _seed_metrics(
+    store: StateStore, cycle_id: str = "c1", ts: str = "2024-01-01T00:00:00+00:00"
+) -> None:
     store.save_stage7_run_metrics(
-        "c1",
+        cycle_id,
         {
-            "ts": "2024-01-01T00:00:00+00:00",
+            "ts": ts,
             "run_id": "r1",
             "mode_base": "NORMAL",
             "mode_final": "NORMAL",
@@ -66,6 +69,44 @@ def test_stage7_report_and_alerts(capsys, tmp_path: Path) -> None:
     assert "cycle_id ts alerts" in alerts
 
 
+def test_stage7_report_holds_no_read_transaction_while_writing(
+    monkeypatch, capsys, tmp_path: Path
+) -> None:
+    settings = Settings(STATE_DB_PATH=str(tmp_path / "s7.db"))
+    store = StateStore(db_path=settings.state_db_path)
+    _seed_metrics(store)
+    stdout = sys.stdout
+    checkpoints: list[int] = []
+
+    class _SlowConsumer:
+        def write(self, text: str) -> int:
+            if not checkpoints:
+                # A cycle lands mid-report; it must stay out of the pinned window.
+                _seed_metrics(store, "c2", "2024-01-02T00:00:00+00:00")
+                conn = sqlite3.connect(settings.state_db_path, timeout=0)
+                try:
+                    busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+                finally:
+                    conn.close()
+                checkpoints.append(busy)
+            return stdout.write(text)
+
+        def flush(self) -> None:
+            stdout.flush()
+
+    monkeypatch.setattr(sys, "stdout", _SlowConsumer())
+    assert cli.run_stage7_report(settings, db_path=settings.state_db_path, last=5) == 0
+    monkeypatch.setattr(sys, "stdout", stdout)
+    out = capsys.readouterr().out
+
+    assert checkpoints == [0]
+    assert out.startswith("stage7-report: cycles=1 ")
+    document = json.loads(out.splitlines()[1])
+    assert [cycle["cycle_id"] for cycle in document["cycles"]] == ["c1"]
+    assert "c2 " not in out
+    assert "rows=1" in out
+
+
 def test_stage7_export_jsonl(tmp_path: Path) -> None:
     settings = Settings(STATE_DB_PATH=str(tmp_path / "s7.db"))
     store = StateStore(db_path=settings.state_db_path)
@@ -89,6 +130,70 @@ def test_stage7_export_jsonl(tmp_path: Path) -> None:
     assert "realized_pnl_try" in payload
 
 
+def test_stage7_export_jsonl_streams_one_record_per_line(tmp_path: Path) -> None:
+    settings = Settings(STATE_DB_PATH=str(tmp_path / "s7.db"))
+    store = StateStore(db_path=settings.state_db_path)
+    _seed_metrics(store)
+
+    out = tmp_path / "metrics.jsonl"
+    assert (
+        cli.run_stage7_export(
+            settings,
+            db_path=settings.state_db_path,
+            last=5,
+            export_format="jsonl",
+            out_path=str(out),
+        )
+        == 0
+    )
+
+    records = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [item["record"] for item in records] == ["header", "cycle", "rollup", "rollup"]
+    assert records[1]["cycle_id"] == "c1"
+    assert not (tmp_path / "metrics.jsonl.partial").exists()
+
+
+def test_stage7_export_fail_closed_leaves_no_output_file(capsys, tmp_path: Path) -> None:
+    settings = Settings(STATE_DB_PATH=str(tmp_path / "s7.db"))
+    store = StateStore(db_path=settings.state_db_path)
+    _seed_metrics(store)
+    with store._connect() as conn:
+        conn.execute("UPDATE stage7_run_metrics SET net_pnl_try = '5'")
+
+    out = tmp_path / "metrics.csv"
+    assert (
+        cli.run_stage7_export(
+            settings, db_path=settings.state_db_path, last=5, export_format="csv", out_path=str(out)
+        )
+        == 1
+    )
+    assert "FAIL_CLOSED" in capsys.readouterr().err
+    assert list(tmp_path.glob("metrics.csv*")) == []
+
+
+def test_stage7_rollups_rebuild_verifies_and_repairs(capsys, tmp_path: Path) -> None:
+    settings = Settings(STATE_DB_PATH=str(tmp_path / "s7.db"))
+    store = StateStore(db_path=settings.state_db_path)
+    _seed_metrics(store)
+    with store._connect() as conn:
+        conn.execute("UPDATE stage7_rollups SET net_pnl_try = '9' WHERE period = 'daily'")
+
+    assert (
+        cli.run_stage7_rollups_rebuild(settings, db_path=settings.state_db_path, verify_only=True)
+        == 1
+    )
+    report = json.loads(capsys.readouterr().out)
+    assert report["mismatched_buckets"] == 1
+    assert report["mismatches"][0]["expected"]["net_pnl_try"] == "1.7"
+
+    assert cli.run_stage7_rollups_rebuild(settings, db_path=settings.state_db_path) == 0
+    capsys.readouterr()
+    assert (
+        cli.run_stage7_rollups_rebuild(settings, db_path=settings.state_db_path, verify_only=True)
+        == 0
+    )
+
+
 def test_stage7_alerts_all_false_only_header(capsys, tmp_path: Path) -> None:
     settings = Settings(STATE_DB_PATH=str(tmp_path / "s7.db"))
     store = StateStore(db_path=settings.state_db_path)
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
 import csv
-from datetime import UTC, datetime
+import io
+import logging
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
+from functools import partial
 
+from btcbot.persistence.sqlite import sqlite_connection
+from btcbot.persistence.sqlite.sqlite_connection import configure_statement_profiler
+from btcbot.security.redaction import redact_data
 from btcbot.services.stage7_reporting import (
+    STAGE7_REPORT_SCHEMA_VERSION,
+    CsvCycleWriter,
     CycleReportRow,
+    JsonReportWriter,
     build_cycle_rows,
+    iter_cycle_rows,
+    materialized_rollups,
     render_csv,
+    render_json,
     rollup,
+    stream_report,
     validate_cycle_rows,
 )
 from btcbot.services.state_store import StateStore
@@ -285,3 +298,140 @@ def test_csv_schema_stable() -> None:
         "alert_flags_json",
     ]
     assert len(parsed) == 2
+
+
+def _seed_hourly_cycles(store: StateStore, count: int) -> None:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    for idx in range(count):
+        ts = start + timedelta(hours=idx * 7)
+        metrics = _run_metrics(
+            ts.isoformat(), gross="3", net="2.5", fees="0.3", slippage="0.2", drawdown_pct="1"
+        )
+        _save_cycle(store, f"c{idx:02d}", ts, metrics)
+
+
+def test_keyset_pages_match_single_query_and_pin_upper_key(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "stage7_reporting.db"))
+    _seed_hourly_cycles(store, 7)
+
+    paged = list(iter_cycle_rows(store, 6, page_size=2))
+    assert [row.cycle_id for row in paged] == [row.cycle_id for row in build_cycle_rows(store, 6)]
+    assert [row.cycle_id for row in paged] == ["c06", "c05", "c04", "c03", "c02", "c01"]
+
+    pinned = list(iter_cycle_rows(store, 3, page_size=2, upper_key=(paged[2].ts, "c04")))
+    assert [row.cycle_id for row in pinned] == ["c04", "c03", "c02"]
+
+
+def test_streamed_report_matches_in_memory_render(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "stage7_reporting.db"))
+    _seed_hourly_cycles(store, 9)
+    rows = build_cycle_rows(store, 50)
+    expected_json = render_json(
+        redact_data(
+            {
+                "schema_version": STAGE7_REPORT_SCHEMA_VERSION,
+                "cycles": rows,
+                "rollups": {"daily": rollup(rows, "daily"), "weekly": rollup(rows, "weekly")},
+                "validations": validate_cycle_rows(rows),
+            }
+        )
+    )
+
+    json_buf = io.StringIO()
+    csv_buf = io.StringIO()
+    streamed = stream_report(
+        iter_cycle_rows(store, 50, page_size=4),
+        [JsonReportWriter(json_buf, redact=redact_data), CsvCycleWriter(csv_buf)],
+    )
+
+    assert json_buf.getvalue() == expected_json
+    assert csv_buf.getvalue() == render_csv(rows)
+    assert streamed.cycles_count == 9
+    assert streamed.newest_key == (rows[0].ts, rows[0].cycle_id)
+    assert streamed.errors == []
+
+
+def _seed_varied_cycles(store: StateStore, count: int) -> None:
+    start = datetime(2024, 1, 3, 5, tzinfo=UTC)
+    for idx in range(count):
+        ts = start + timedelta(hours=idx * 7)
+        metrics = _run_metrics(
+            ts.isoformat(),
+            gross=str(idx % 4),
+            net=str(Decimal(idx % 4) - Decimal("0.15")),
+            fees="0.1",
+            slippage="0.05",
+            drawdown_pct=str(idx % 9),
+        )
+        metrics["oms_submitted_count"] = 3 + idx % 5
+        _save_cycle(store, f"c{idx:02d}", ts, metrics)
+
+
+def test_materialized_rollups_match_rebucketed_rows(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "stage7_reporting.db"))
+    _seed_varied_cycles(store, 30)
+
+    for last in (30, 11, 1):
+        rows = build_cycle_rows(store, last)
+        streamed = stream_report(
+            iter_cycle_rows(store, last), rollup_source=partial(materialized_rollups, store)
+        )
+        assert streamed.rollups == {
+            "daily": rollup(rows, "daily"),
+            "weekly": rollup(rows, "weekly"),
+        }
+
+    assert len(store.load_stage7_rollups("weekly")) == 2
+    assert sum(int(item["cycles_count"]) for item in store.load_stage7_rollups("daily")) == 30
+
+
+def test_rewritten_cycle_and_rebuild_keep_rollups_consistent(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "stage7_reporting.db"))
+    _seed_varied_cycles(store, 12)
+    moved = datetime(2024, 1, 20, tzinfo=UTC)
+    metrics = _run_metrics(
+        moved.isoformat(), gross="1", net="0.85", fees="0.1", slippage="0.05", drawdown_pct="0"
+    )
+    _save_cycle(store, "c05", moved, metrics)
+    assert store.rebuild_stage7_rollups(apply=False) == []
+
+    with store._connect() as conn:
+        conn.execute("UPDATE stage7_rollups SET cycles_count = 99 WHERE period = 'weekly'")
+        conn.execute(
+            "DELETE FROM stage7_rollups WHERE period = 'daily' AND period_start LIKE '2024-01-20%'"
+        )
+
+    mismatches = store.rebuild_stage7_rollups(apply=False)
+    assert {(item["period"], item["period_start"][:10]) for item in mismatches} == {
+        ("weekly", "2024-01-01"),
+        ("weekly", "2024-01-15"),
+        ("daily", "2024-01-20"),
+    }
+    assert len(store.rebuild_stage7_rollups()) == 3
+    assert store.rebuild_stage7_rollups(apply=False) == []
+
+
+def test_bucket_row_lookup_uses_ts_index(tmp_path, caplog) -> None:
+    store = StateStore(str(tmp_path / "stage7_reporting.db"))
+    _seed_varied_cycles(store, 12)
+    bucket = datetime(2024, 1, 4, tzinfo=UTC)
+
+    configure_statement_profiler(enabled=True, slow_query_ms=0)
+    try:
+        with caplog.at_level(logging.WARNING, logger=sqlite_connection.__name__):
+            rows = store.load_stage7_bucket_rows("daily", bucket)
+    finally:
+        configure_statement_profiler(enabled=False, slow_query_ms=0)
+
+    assert [row["cycle_id"] for row in rows] == ["c03", "c04", "c05", "c06"]
+    plans = [
+        record.extra["query_plan"]
+        for record in caplog.records
+        if record.getMessage() == "sqlite_slow_query"
+        and "FROM stage7_run_metrics WHERE ts >=" in record.extra["fingerprint"]
+    ]
+    assert plans
+    # A bare SCAN (even one walking the index in order) would read every cycle row.
+    assert plans[0] == [
+        "SEARCH stage7_run_metrics USING INDEX idx_stage7_run_metrics_ts_cycle_id (ts>? AND ts<?)"
+    ]
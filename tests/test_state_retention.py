@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import logging
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from btcbot.domain.ledger import LedgerEvent, LedgerEventType, serialize_ledger_state
+from btcbot.domain.stage4 import PnLSnapshot
+from btcbot.services.ledger_service import LEDGER_RETENTION_BASE_SCOPE, LedgerService
+from btcbot.services.parity import compute_run_fingerprint, find_first_divergence
+from btcbot.services.state_retention import (
+    StateRetentionService,
+    build_retention_policies,
+    read_archive,
+)
+from btcbot.services.state_store import StateStore
+
+NOW = datetime(2026, 6, 1, tzinfo=UTC)
+
+
+def _fill(event_id: str, ts: datetime, side: str, qty: str, price: str) -> LedgerEvent:
+    return LedgerEvent(
+        event_id=event_id,
+        ts=ts,
+        symbol="BTCTRY",
+        type=LedgerEventType.FILL,
+        side=side,
+        qty=Decimal(qty),
+        price=Decimal(price),
+        fee=None,
+        fee_currency=None,
+        exchange_trade_id=event_id,
+        exchange_order_id=None,
+        client_order_id=None,
+        meta={},
+    )
+
+
+def _service(store: StateStore, tmp_path, **kwargs) -> StateRetentionService:
+    return StateRetentionService(
+        store,
+        policies=build_retention_policies(default_hot_days=30),
+        archive_dir=tmp_path / "archive",
+        **kwargs,
+    )
+
+
+def _seed_ledger(store: StateStore) -> None:
+    old = NOW - timedelta(days=400)
+    store.append_ledger_events(
+        [
+            _fill("f1", old, "BUY", "1", "100"),
+            _fill("f2", old + timedelta(days=1), "BUY", "1", "120"),
+            _fill("f3", old + timedelta(days=2), "SELL", "1", "150"),
+            _fill("f4", NOW - timedelta(days=1), "BUY", "0.5", "200"),
+        ]
+    )
+
+
+def test_ledger_retention_preserves_reducer_state_and_turnover(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    ledger = LedgerService(store, logging.getLogger(__name__))
+    _seed_ledger(store)
+    full_state = ledger.load_state_incremental("global")[0]
+    turnover = ledger._compute_turnover_try()
+
+    results = _service(store, tmp_path).run(now=NOW)
+
+    ledger_result = next(item for item in results if item.table == "ledger_events")
+    assert ledger_result.archived_rows == 3
+    assert ledger_result.complete
+    assert store.get_ledger_checkpoint(LEDGER_RETENTION_BASE_SCOPE) is not None
+    # A scope that never checkpointed starts from the retention base, not an empty ledger.
+    fresh_state = ledger.load_state_incremental("stage7")[0]
+    assert serialize_ledger_state(fresh_state) == serialize_ledger_state(full_state)
+    assert ledger._compute_turnover_try() == turnover
+    assert [event.event_id for event in store.load_ledger_events()] == ["f4"]
+
+    days = store.load_retention_daily_summaries("ledger_events")
+    assert [item["row_count"] for item in days] == [1, 1, 1]
+    archived = read_archive(days[0]["archive_path"])
+    assert [row["event_id"] for row in archived] == ["f1"]
+
+
+def test_ledger_retention_keeps_newest_row_and_unreduced_rows(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    old = NOW - timedelta(days=400)
+    store.append_ledger_events([_fill("only", old, "BUY", "1", "100")])
+
+    _service(store, tmp_path).run(now=NOW)
+
+    # Deleting the max rowid would let SQLite reuse it behind the checkpoint cursor.
+    assert [event.event_id for event in store.load_ledger_events()] == ["only"]
+
+
+def test_pnl_retention_preserves_drawdown(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    ledger = LedgerService(store, logging.getLogger(__name__))
+    start = NOW - timedelta(days=60)
+    equities = [1000, 1200, 900, 1100, 1300, 1250, 1280]
+    for idx, equity in enumerate(equities):
+        store.save_stage4_pnl_snapshot(
+            PnLSnapshot(
+                total_equity_try=Decimal(equity),
+                realized_today_try=Decimal("0"),
+                drawdown_pct=Decimal("0"),
+                ts=start + timedelta(days=idx * 10),
+                realized_total_try=Decimal("0"),
+            )
+        )
+    before = ledger.snapshot(mark_prices={}, cash_try=Decimal("1000"), ts=NOW)
+    drawdown_before = store.compute_drawdown_pct(Decimal("1000"))
+
+    results = _service(store, tmp_path).run(now=NOW)
+
+    assert next(item for item in results if item.table == "pnl_snapshots").archived_rows == 3
+    after = ledger.snapshot(mark_prices={}, cash_try=Decimal("1000"), ts=NOW)
+    assert after.max_drawdown == before.max_drawdown == Decimal("0.25")
+    assert store.compute_drawdown_pct(Decimal("1000")) == drawdown_before
+    assert len(store.list_pnl_snapshots_recent(10)) == 4
+
+
+def test_retention_runs_in_bounded_resumable_chunks(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    old = NOW - timedelta(days=45)
+    with store._connect() as conn:
+        for idx in range(7):
+            conn.execute(
+                "INSERT INTO cycle_audit(cycle_id, ts, counts_json, decisions_json) "
+                "VALUES (?, ?, '{}', '[]')",
+                (f"c{idx}", (old + timedelta(hours=idx * 6)).isoformat()),
+            )
+        conn.execute(
+            "INSERT INTO cycle_audit(cycle_id, ts, counts_json, decisions_json) "
+            "VALUES ('hot', ?, '{}', '[]')",
+            (NOW.isoformat(),),
+        )
+    service = _service(store, tmp_path, chunk_rows=3, archive=False)
+
+    report = service.size_report(now=NOW)
+    audit = next(item for item in report["tables"] if item["table"] == "cycle_audit")
+    assert (audit["rows"], audit["rows_eligible"]) == (8, 7)
+
+    first = next(item for item in service.run(now=NOW, max_chunks=2) if item.table == "cycle_audit")
+    assert (first.archived_rows, first.chunks, first.complete) == (6, 2, False)
+    second = next(item for item in service.run(now=NOW) if item.table == "cycle_audit")
+    assert (second.archived_rows, second.complete) == (1, True)
+
+    with store._connect() as conn:
+        remaining = [row["cycle_id"] for row in conn.execute("SELECT cycle_id FROM cycle_audit")]
+    assert remaining == ["hot"]
+    days = store.load_retention_daily_summaries("cycle_audit")
+    assert sum(int(item["row_count"]) for item in days) == 7
+    assert all(item["archive_path"] is None for item in days)
+
+
+def _save_stage7_cycle(store: StateStore, cycle_id: str, ts: datetime) -> None:
+    store.save_stage7_cycle(
+        cycle_id=cycle_id,
+        ts=ts,
+        selected_universe=["BTCTRY"],
+        universe_scores=[],
+        intents_summary={"order_intents_total": 1},
+        mode_payload={"base_mode": "NORMAL", "final_mode": "NORMAL"},
+        order_decisions=[],
+        portfolio_plan={},
+        ledger_metrics={
+            "gross_pnl_try": Decimal("2"),
+            "realized_pnl_try": Decimal("2"),
+            "unrealized_pnl_try": Decimal("0"),
+            "net_pnl_try": Decimal("1.5"),
+            "fees_try": Decimal("0.3"),
+            "slippage_try": Decimal("0.2"),
+            "turnover_try": Decimal("100"),
+            "equity_try": Decimal("1000"),
+            "max_drawdown": Decimal("0"),
+        },
+    )
+
+
+def test_stage7_retention_keeps_parity_chain_consistent(tmp_path) -> None:
+    store = StateStore(str(tmp_path / "state.db"))
+    hot_only = StateStore(str(tmp_path / "hot.db"))
+    old = NOW - timedelta(days=400)
+    for idx in range(10):
+        _save_stage7_cycle(store, f"old{idx}", old + timedelta(hours=idx))
+    for idx in range(5):
+        ts = NOW - timedelta(hours=5 - idx)
+        _save_stage7_cycle(store, f"hot{idx}", ts)
+        _save_stage7_cycle(hot_only, f"hot{idx}", ts)
+
+    _service(store, tmp_path, chunk_rows=4, archive=False).run(now=NOW)
+
+    with store._connect() as conn:
+        chain = conn.execute(
+            "SELECT cycle_id, seq FROM stage7_cycle_fingerprints ORDER BY seq"
+        ).fetchall()
+        traces = conn.execute("SELECT COUNT(*) FROM stage7_cycle_trace").fetchone()[0]
+    assert traces == 5
+    assert [(row["cycle_id"], row["seq"]) for row in chain] == [
+        (f"hot{idx}", idx + 1) for idx in range(5)
+    ]
+    window = (old, NOW)
+    assert compute_run_fingerprint(store.db_path_abs, *window) == compute_run_fingerprint(
+        hot_only.db_path_abs, *window
+    )
+    assert find_first_divergence(store.db_path_abs, hot_only.db_path_abs, *window) is None
@@ -251,6 +251,69 @@ def test_state_store_heartbeat_updates_timestamp(tmp_path) -> None:
     assert after >= before
 
 
+def test_state_store_heartbeat_is_coalesced_to_interval(tmp_path) -> None:
+    store = StateStore(db_path=str(tmp_path / "heartbeat.db"), heartbeat_interval_seconds=60)
+
+    assert store.heartbeat_instance_lock() is True
+    assert store.heartbeat_instance_lock() is False
+
+    store._last_heartbeat_monotonic -= 61
+    assert store.heartbeat_instance_lock() is True
+
+
+def test_control_state_is_cached_until_any_writer_changes_it(tmp_path, monkeypatch) -> None:
+    db_path = tmp_path / "control.db"
+    store = StateStore(db_path=str(db_path))
+    store.set_kill_switch("LIVE", True, "ops", None)
+    store.stage4_set_freeze("LIVE", reason="unknown_orders", details={"count": 1})
+    assert store.get_kill_switch("LIVE") == (True, "ops", None)
+    assert store.stage4_get_freeze("LIVE").active
+    assert store.get_degrade_state_current() == {}
+
+    loads = {"kill": 0, "freeze": 0}
+    load_kill, load_freeze = store._load_kill_switch, store._load_stage4_freeze
+
+    def _count_kill(role):
+        loads["kill"] += 1
+        return load_kill(role)
+
+    def _count_freeze(role):
+        loads["freeze"] += 1
+        return load_freeze(role)
+
+    # A fresh store (the per-cycle pattern) shares the process-wide cache.
+    cycle_store = StateStore(db_path=str(db_path))
+    monkeypatch.setattr(cycle_store, "_load_kill_switch", _count_kill)
+    monkeypatch.setattr(cycle_store, "_load_stage4_freeze", _count_freeze)
+    for _ in range(3):
+        assert cycle_store.get_kill_switch("LIVE") == (True, "ops", None)
+        freeze = cycle_store.stage4_get_freeze("LIVE")
+        freeze.details["mutated"] = True
+    assert loads == {"kill": 0, "freeze": 0}
+    assert cycle_store.stage4_get_freeze("LIVE").details == {"count": 1}
+
+    # An operator in another process flips the switch with plain SQL: seen on the next read.
+    conn = sqlite3.connect(str(db_path))
+    with conn:
+        conn.execute("UPDATE op_state SET int_value = 0 WHERE key = 'kill_switch:LIVE'")
+        conn.execute(
+            "INSERT INTO degrade_state_current(state_id, current_override_mode) "
+            "VALUES (1, 'REDUCE_RISK_ONLY')"
+        )
+    conn.close()
+
+    assert cycle_store.get_kill_switch("LIVE")[0] is False
+    assert cycle_store.get_degrade_state_current()["current_override_mode"] == "REDUCE_RISK_ONLY"
+    assert loads == {"kill": 1, "freeze": 0}
+
+    # Unrelated op_state writes leave the version, and so the cache, alone.
+    store.set_runtime_counter("unrelated", 1)
+    cycle_store.stage4_get_freeze("LIVE")
+    assert loads == {"kill": 1, "freeze": 1}
+    cycle_store.stage4_get_freeze("LIVE")
+    assert loads == {"kill": 1, "freeze": 1}
+
+
 def test_state_store_memory_db_instance_lock_lifecycle() -> None:
     store = StateStore(db_path=":memory:")
 
@@ -295,6 +358,51 @@ def test_reserve_idempotency_existing_key_returns_not_reserved(tmp_path) -> None
     assert second.status == "PENDING"
 
 
+def test_reserve_idempotency_reclaims_expired_key_without_prune(tmp_path) -> None:
+    store = StateStore(db_path=str(tmp_path / "state.db"))
+    store.reserve_idempotency_key("place_order", "k-exp", "payload-a", ttl_seconds=60)
+    store.finalize_idempotency_key(
+        "place_order",
+        "k-exp",
+        action_id=7,
+        client_order_id="cid",
+        order_id="o1",
+        status="COMMITTED",
+    )
+    with store._connect() as conn:
+        conn.execute("UPDATE idempotency_keys SET expires_at_epoch = 1")
+
+    reclaimed = store.reserve_idempotency_key("place_order", "k-exp", "payload-b", ttl_seconds=60)
+
+    assert reclaimed.reserved is True
+    assert (reclaimed.payload_hash, reclaimed.status) == ("payload-b", "PENDING")
+    assert reclaimed.action_id is None and reclaimed.client_order_id is None
+
+
+def test_idempotency_prune_is_batched_and_only_runs_when_due(tmp_path) -> None:
+    store = StateStore(db_path=str(tmp_path / "state.db"))
+    with store._connect() as conn:
+        conn.executemany(
+            "INSERT INTO idempotency_keys(action_type, key, payload_hash, created_at_epoch, "
+            "expires_at_epoch, status) VALUES ('place_order', ?, 'h', 0, ?, 'COMMITTED')",
+            [(f"k{idx}", 100 if idx < 12 else 10_000) for idx in range(13)],
+        )
+
+    def prune(now: int) -> int:
+        return store.prune_expired_idempotency_keys_if_due(
+            now, interval_seconds=600, batch_size=5, max_batches=2
+        )
+
+    assert prune(1_000) == 10  # bounded: two batches of five
+    assert prune(1_000) == 2  # backlog left, so still due
+    assert prune(1_100) == 0  # not due until 1_600
+    fresh = StateStore(db_path=str(tmp_path / "state.db"))
+    assert fresh.prune_expired_idempotency_keys_if_due(1_200) == 0  # schedule is shared
+    with store._connect() as conn:
+        remaining = conn.execute("SELECT COUNT(*) FROM idempotency_keys").fetchone()[0]
+    assert remaining == 1
+
+
 def test_reserve_idempotency_stale_pending_without_metadata_is_recovered(
     monkeypatch, tmp_path
 ) -> None:
@@ -1353,3 +1461,84 @@ def test_get_consecutive_critical_errors_canonical_wins_over_legacy(tmp_path) ->
         )
 
     assert store.get_consecutive_critical_errors("LIVE") == 5
+
+
+def test_universe_price_lookbacks_use_epoch_column_and_backfill_legacy_rows(tmp_path) -> None:
+    db_path = tmp_path / "legacy_prices.sqlite"
+    with sqlite3.connect(str(db_path)) as con:
+        con.execute(
+            "CREATE TABLE universe_price_cache ("
+            "pair_symbol TEXT NOT NULL, ts_bucket TEXT NOT NULL, mid_price TEXT NOT NULL, "
+            "PRIMARY KEY(pair_symbol, ts_bucket))"
+        )
+        con.execute(
+            "INSERT INTO universe_price_cache VALUES (?, ?, ?)",
+            ("AAATRY", "2025-01-01T11:55:00+00:00", "90"),
+        )
+
+    store = StateStore(str(db_path))
+    target = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+    store.upsert_universe_price_snapshots_many(
+        [
+            ("AAATRY", target + timedelta(minutes=5), Decimal("110")),
+            ("BBBTRY", target + timedelta(minutes=2), Decimal("50")),
+            ("CCCTRY", target + timedelta(hours=2), Decimal("70")),
+        ]
+    )
+
+    prices = store.get_universe_price_lookbacks(
+        pair_symbols=["AAATRY", "BBBTRY", "CCCTRY"],
+        target_ts=target,
+        tolerance=timedelta(minutes=10),
+    )
+
+    # Equidistant buckets resolve to the older one; out-of-tolerance pairs are omitted.
+    assert prices == {"AAATRY": Decimal("90"), "BBBTRY": Decimal("50")}
+    assert store.get_universe_price_lookback(
+        pair_symbol="BBBTRY", target_ts=target, tolerance=timedelta(minutes=10)
+    ) == Decimal("50")
+    with sqlite3.connect(str(db_path)) as con:
+        plan = " ".join(
+            str(row[3])
+            for row in con.execute(
+                "EXPLAIN QUERY PLAN SELECT mid_price FROM universe_price_cache "
+                "WHERE pair_symbol = ? AND ts_epoch BETWEEN ? AND ?",
+                ("AAATRY", 0, 1),
+            )
+        )
+    assert "idx_universe_price_cache_pair_epoch" in plan
+
+
+def test_read_only_store_reads_under_a_held_write_lock_and_never_writes(tmp_path) -> None:
+    db_path = str(tmp_path / "state.db")
+    writer = StateStore(db_path)
+    writer.set_last_cycle_id("c-1")
+
+    reader = StateStore.open_read_only(db_path)
+
+    with sqlite3.connect(db_path) as con:
+        registered = con.execute("SELECT COUNT(*) FROM process_instances").fetchone()[0]
+    assert registered == 1  # only the writer
+    with pytest.raises(RuntimeError, match="read-only"):
+        with reader.transaction():
+            pass
+    with writer.transaction():
+        # A monitor must not wait behind (or contend for) the cycle's write lock.
+        with reader.snapshot():
+            assert reader.get_last_cycle_id() == "c-1"
+    with pytest.raises(sqlite3.OperationalError):
+        with reader._connect() as conn:
+            conn.execute("DELETE FROM process_instances")
+
+
+def test_open_read_only_bootstraps_missing_schema_once(tmp_path) -> None:
+    db_path = str(tmp_path / "fresh.db")
+    assert StateStore.schema_version(db_path) == 0
+
+    reader = StateStore.open_read_only(db_path)
+
+    assert StateStore.schema_version(db_path) == state_store_module.STATE_SCHEMA_VERSION
+    assert reader.read_only
+    with sqlite3.connect(db_path) as con:
+        statuses = [row[0] for row in con.execute("SELECT status FROM process_instances")]
+    assert statuses == ["ended"]  # the bootstrap writer does not linger as a live instance
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
@@ -126,6 +129,27 @@ class _GovernanceExchange(_Exchange):
         return Decimal("99.9"), Decimal("100"), self.now
 
 
+class _SlowExchange(_Exchange):
+    def __init__(self, *, now: datetime | None = None, slow: set[str], delay: float) -> None:
+        super().__init__(now=now)
+        self._slow = slow
+        self._delay = delay
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get_orderbook_with_timestamp(self, symbol: str):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self._delay if symbol in self._slow else 0.05)
+            return super().get_orderbook_with_timestamp(symbol)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
 def _settings(tmp_path, **extra):
     env = {
         "DRY_RUN": True,
@@ -299,3 +323,75 @@ def test_spread_bps_computation() -> None:
         best_ask=Decimal("101"),
     )
     assert spread == Decimal("200")
+
+
+def test_metric_collection_runs_concurrently_and_reports_latency(tmp_path) -> None:
+    now = datetime(2024, 1, 1, tzinfo=UTC)
+    exchange = _SlowExchange(now=now, slow=set(), delay=0.0)
+    result = UniverseSelectionService().select_universe(
+        exchange=exchange,
+        settings=_settings(tmp_path, STAGE7_UNIVERSE_FETCH_CONCURRENCY=3),
+        now_utc=now,
+    )
+
+    assert exchange.max_in_flight > 1
+    assert set(result.fetch_latency_ms) == {"ADATRY", "BTCTRY", "ETHTRY"}
+    assert all(value >= 0 for value in result.fetch_latency_ms.values())
+    assert result.fetch_timed_out_symbols == []
+
+
+def test_metric_collection_deadline_penalizes_late_symbols_without_freezing(tmp_path) -> None:
+    now = datetime(2024, 1, 1, tzinfo=UTC)
+    exchange = _SlowExchange(now=now, slow={"ADATRY"}, delay=2.0)
+    settings = _settings(
+        tmp_path,
+        STAGE7_UNIVERSE_FETCH_CONCURRENCY=3,
+        STAGE7_UNIVERSE_FETCH_DEADLINE_SEC=0.5,
+    )
+    service = UniverseSelectionService()
+
+    raw_metrics, latency_ms, timed_out = service._collect_raw_metrics(
+        exchange=exchange,
+        symbols=["ADATRY", "BTCTRY", "ETHTRY"],
+        settings=settings,
+        ticker_stats=service._fetch_ticker_stats(exchange),
+        now_utc=now,
+    )
+    assert timed_out == ["ADATRY"]
+    assert "ADATRY" not in latency_ms
+    assert raw_metrics["ADATRY"].spread_bps is None
+    assert raw_metrics["ADATRY"].volume_try == Decimal("400")
+
+    result = service.select_universe(exchange=exchange, settings=settings, now_utc=now)
+    assert result.fetch_timed_out_symbols == ["ADATRY"]
+    assert "stale_market_data" not in result.reasons
+    assert result.selected_symbols == ["ETHTRY"]
+
+
+def test_metric_collection_counts_fetch_errors_apart_from_timeouts(tmp_path, caplog) -> None:
+    now = datetime(2024, 1, 1, tzinfo=UTC)
+    exchange = _SlowExchange(now=now, slow=set(), delay=0.0)
+    service = UniverseSelectionService()
+    collect = service._collect_symbol_metrics
+
+    def _failing_collect(**kwargs):
+        if kwargs["symbol"] == "BTCTRY":
+            raise ConnectionError("orderbook endpoint down")
+        return collect(**kwargs)
+
+    service._collect_symbol_metrics = _failing_collect
+    with caplog.at_level(logging.INFO):
+        raw_metrics, latency_ms, timed_out = service._collect_raw_metrics(
+            exchange=exchange,
+            symbols=["ADATRY", "BTCTRY", "ETHTRY"],
+            settings=_settings(tmp_path, STAGE7_UNIVERSE_FETCH_CONCURRENCY=3),
+            ticker_stats=service._fetch_ticker_stats(exchange),
+            now_utc=now,
+        )
+
+    assert timed_out == []
+    assert raw_metrics["BTCTRY"].spread_bps is None
+    assert set(latency_ms) == {"ADATRY", "ETHTRY"}
+    [record] = [r for r in caplog.records if r.getMessage() == "stage7_universe_metrics_collected"]
+    assert record.extra["timed_out_count"] == 0
+    assert record.extra["failed_symbols"] == {"BTCTRY": "ConnectionError"}